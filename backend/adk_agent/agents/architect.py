@@ -1,5 +1,5 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
-from tools.chart_tools import generate_inflation_chart
+from ..tools.chart_tools import generate_inflation_chart
 
 class ArchitectAgent:
     def __init__(self):
@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import time
+from typing import AsyncIterator, Optional, Tuple
+
+from .auditor import AuditorAgent
+from .critic import CriticAgent
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+class AuditPipeline:
+    """
+    Runs the Auditor and Critic as a pipeline instead of back to back.
+
+    The Critic's setup (agent construction, truncation, prompt building and
+    keyword checks) starts alongside the Auditor's LLM call. Only the final
+    Critic call waits for the Auditor's report.
+
+    Pass `auditor` / `critic` to reuse agents across many documents (batch
+    audits); otherwise fresh ones are built per call.
+    """
+
+    def __init__(self, auditor: Optional[AuditorAgent] = None, critic: Optional[CriticAgent] = None):
+        self.auditor = auditor
+        self.critic = critic
+
+    async def _prepare_critic(self, policy_text: str, doc_type: str, timings: dict) -> Tuple[CriticAgent, dict]:
+        start = time.perf_counter()
+        critic = self.critic or await asyncio.to_thread(CriticAgent)
+        prepared = await asyncio.to_thread(critic.prepare_review, policy_text, doc_type)
+        timings["critic_prep_ms"] = _ms(start)
+        return critic, prepared
+
+    async def _review(self, policy_text: str, report: dict, critic_setup: asyncio.Task, timings: dict, started: float) -> dict:
+        critic, prepared = await critic_setup
+        start = time.perf_counter()
+        review = await critic.areview_audit(policy_text, report, prepared=prepared)
+        timings["critic_ms"] = _ms(start)
+        timings["total_ms"] = _ms(started)
+        return review
+
+    async def start(self, policy_text: str, doc_type: str = "Insurance",
+                    status: Optional[dict] = None) -> Tuple[dict, asyncio.Task, dict]:
+        """
+        Returns the Auditor report as soon as it is ready, plus a task that
+        resolves to the Critic review. `timings` keeps filling in until that
+        task is done. `status` is passed to AuditorAgent.aaudit_policy.
+        """
+        timings = {}
+        started = time.perf_counter()
+        critic_setup = asyncio.create_task(self._prepare_critic(policy_text, doc_type, timings))
+
+        try:
+            auditor = self.auditor or AuditorAgent()
+            report = await auditor.aaudit_policy(policy_text, doc_type, status=status)
+        except Exception:
+            critic_setup.cancel()
+            raise
+        timings["auditor_ms"] = _ms(started)
+
+        review_task = asyncio.create_task(self._review(policy_text, report, critic_setup, timings, started))
+        return report, review_task, timings
+
+    async def run(self, policy_text: str, doc_type: str = "Insurance", status: Optional[dict] = None) -> dict:
+        """Full audit; returns report, critic review and per-stage timings."""
+        report, review_task, timings = await self.start(policy_text, doc_type, status)
+        review = await review_task
+        return {"report": report, "critic_review": review, "timings": timings}
+
+    async def stream(self, policy_text: str, doc_type: str = "Insurance") -> AsyncIterator[dict]:
+        """Yields the report first, then the critic review once it lands."""
+        report, review_task, timings = await self.start(policy_text, doc_type)
+        yield {"stage": "report", "report": report, "timings": dict(timings)}
+        review = await review_task
+        yield {"stage": "critic_review", "critic_review": review, "timings": timings}
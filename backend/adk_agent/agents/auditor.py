@@ -4,18 +4,95 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from ..utils.security import SecurityManager
-import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional
 from ..utils.knowledge_vault import KnowledgeVault
+from ..utils.entity_extractor import extract_entities
+from ..utils.result_cache import get_result_cache, make_cache_key
+from ..utils.chunking import chunk_document
+from ..utils.structured_output import AUDIT_REPORT, StructuredOutput
+
+# Per-chunk answers that carry no finding and must not win a merge.
+UNKNOWN_VALUES = {"", "...", "unknown", "none", "n/a", "na", "not mentioned", "not specified", "not found", "not applicable"}
+FINDING_FIELDS = ["room_rent", "co_pay", "sub_limits", "waiting_periods"]
+MAX_MERGED_EXCLUSIONS = 10
+
+# Whole-document audits re-ask missing fields once; chunk audits fill them
+# with empty values instead (the merge skips those).
+AUDIT_OUTPUT = StructuredOutput("AUDITOR", AUDIT_REPORT)
+CHUNK_OUTPUT = StructuredOutput("AUDITOR_CHUNK", AUDIT_REPORT, reask=False)
+
+def _risk_score(report: dict) -> float:
+    try:
+        return float(report.get("risk_score", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+def merge_chunk_reports(reports: List[Optional[dict]]) -> Optional[dict]:
+    """
+    Reduces per-chunk audit reports (in document order, None for failed
+    chunks) into the single report schema. The result depends only on the
+    input order, never on which chunk finished first:
+    - room_rent / co_pay / sub_limits / waiting_periods: distinct findings joined with "; "
+    - exclusions: ordered, de-duplicated union
+    - risk_score / risk_reason: from the riskiest chunk (earliest wins ties)
+    """
+    ok = [(i, r) for i, r in enumerate(reports) if isinstance(r, dict)]
+    if not ok:
+        return None
+    
+    merged = {}
+    for field in FINDING_FIELDS:
+        seen, values = set(), []
+        for _, report in ok:
+            value = str(report.get(field, "")).strip()
+            key = value.lower().rstrip(".")
+            if key in UNKNOWN_VALUES or key in seen:
+                continue
+            seen.add(key)
+            values.append(value)
+        merged[field] = "; ".join(values) if values else "Not mentioned"
+    
+    seen, exclusions = set(), []
+    for _, report in ok:
+        items = report.get("exclusions", [])
+        if isinstance(items, str):
+            items = [items]
+        for item in items:
+            key = str(item).strip().lower().rstrip(".")
+            if key in UNKNOWN_VALUES or key in seen:
+                continue
+            seen.add(key)
+            exclusions.append(str(item).strip())
+    merged["exclusions"] = exclusions[:MAX_MERGED_EXCLUSIONS]
+    
+    top_index, top = max(ok, key=lambda pair: (_risk_score(pair[1]), -pair[0]))
+    merged["risk_score"] = top.get("risk_score", 0)
+    merged["risk_reason"] = str(top.get("risk_reason", ""))
+    merged["chunks_audited"] = len(reports)
+    merged["chunks_failed"] = len(reports) - len(ok)
+    return merged
 
 class AuditorAgent:
+    # Bump whenever a prompt below changes so cached results are not reused.
+    PROMPT_VERSION = "1"
+    FULL_REPORT_MODEL = "gemini-2.5-pro"
+    
+    # Documents longer than this are audited section-chunk by section-chunk
+    # (map) and the findings merged (reduce), instead of one giant prompt.
+    CHUNK_THRESHOLD_CHARS = 12000
+    CHUNK_MAX_CHARS = 6000
+    CHUNK_CONCURRENCY = 4
+
     def __init__(self):
         from ..utils.ai_engine import AIEngine
         engine = AIEngine()
         self.llm = engine.get_flash_model()
 
-    def audit_policy(self, policy_text: str, doc_type: str = "Insurance") -> dict:
+    def _build_audit_chain(self, policy_text: str, doc_type: str = "Insurance") -> LLMChain:
         """
-        Scans the policy text based on document type.
+        Picks the specialist prompt for the document type and wraps it in a chain.
         """
         
         prompts = {
@@ -71,55 +148,168 @@ class AuditorAgent:
             template=final_prompt
         )
         
-        chain = LLMChain(llm=self.llm, prompt=prompt)
-        
+        return LLMChain(llm=AUDIT_OUTPUT.model(self.llm), prompt=prompt)
+
+    def _cache_key(self, namespace: str, policy_text: str, doc_type: str, model: str) -> str:
+        return make_cache_key(namespace, policy_text, doc_type, self.PROMPT_VERSION, model)
+
+    def _model_name(self) -> str:
+        return str(getattr(self.llm, "model", "unknown"))
+
+    @staticmethod
+    def _parse_report(response: str) -> dict:
+        return CHUNK_OUTPUT.parse_lenient(response)
+
+    def _audit_prompt(self, policy_text: str, doc_type: str):
+        # Only built if a re-ask is needed.
+        return lambda: self._build_audit_chain(policy_text, doc_type).prompt.format(policy_text=policy_text)
+
+    def _attach_community_note(self, report: dict, policy_text: str, doc_type: str) -> dict:
+        """
+        Adds Community Scam Graph alerts for every entity named in the
+        document. Applied after the cache so flags stay live. Async paths
+        run it with asyncio.to_thread: extraction may (re)build the vault
+        automaton and each mention is a SQLite lookup.
+        """
+        report = dict(report)
+        # 3. Community Scam Graph Check
+        vault = KnowledgeVault()
+        entities = extract_entities(policy_text, doc_type)
+        report["entities"] = entities.to_dict()
+        notes, seen = [], set()
+        for name in entities.names():
+            entity_flags = vault.check_entity(name)
+            if entity_flags and entity_flags['name'] not in seen:
+                seen.add(entity_flags['name'])
+                notes.append(f"⚠️ **Community Alert**: {entity_flags['name']} has {entity_flags['flags']} flags. "
+                             f"Issues: {', '.join(entity_flags['issues'])}.")
+        if notes:
+            report['risk_reason'] = " ".join([report.get('risk_reason', ''), *notes])
+        return report
+
+    def _finalize_report(self, response: str, cache_key: str, policy_text: str, doc_type: str) -> dict:
+        """
+        Parses the raw LLM output (repairing it and re-asking for missing
+        fields), caches it and attaches Community Scam Graph alerts.
+        """
         try:
-            response = chain.run(policy_text=policy_text)
-            # 3. Community Scam Graph Check
-            vault = KnowledgeVault()
-            # Mock entity extraction - in prod use NER
-            entity_flags = vault.check_entity("Star Health") 
-            
-            community_note = ""
-            if entity_flags:
-                community_note = f"⚠️ **Community Alert**: This entity has {entity_flags['flags']} flags. Issues: {', '.join(entity_flags['issues'])}."
+            report = AUDIT_OUTPUT.parse(response, self.llm, self._audit_prompt(policy_text, doc_type))
+        except Exception as e:
+            return self._error_report("Error parsing audit report.")
+        return self._store_report(report, cache_key, policy_text, doc_type)
+
+    async def _afinalize_report(self, response: str, cache_key: str, policy_text: str, doc_type: str) -> dict:
+        try:
+            report = await AUDIT_OUTPUT.aparse(response, self.llm, self._audit_prompt(policy_text, doc_type))
+        except Exception as e:
+            return self._error_report("Error parsing audit report.")
+        return await asyncio.to_thread(self._store_report, report, cache_key, policy_text, doc_type)
+
+    def _store_report(self, report: Optional[dict], cache_key: str, policy_text: str, doc_type: str) -> dict:
+        if report is None:
+            return self._error_report("Error parsing audit report.")
+        # A chunked audit missing chunks (e.g. 429s) is returned but not
+        # cached, so the next upload retries the sections it lacks.
+        if not report.get("chunks_failed"):
+            get_result_cache().put("audit", cache_key, report)
+        return self._attach_community_note(report, policy_text, doc_type)
 
+    def _audit_chunk(self, chunk: dict, doc_type: str) -> Optional[dict]:
+        try:
+            response = self._build_audit_chain(chunk["text"], doc_type).run(policy_text=chunk["text"])
+            return self._parse_report(response)
+        except Exception as e:
+            print(f"Audit chunk {chunk['index']} failed: {e}")
+            return None
+
+    async def _aaudit_chunk(self, chunk: dict, doc_type: str, semaphore: asyncio.Semaphore) -> Optional[dict]:
+        async with semaphore:
             try:
-                cleaned_response = response.replace("```json", "").replace("```", "").strip()
-                report = json.loads(cleaned_response)
-                if community_note:
-                    report['risk_reason'] += f" {community_note}"
-                return report
+                response = await self._build_audit_chain(chunk["text"], doc_type).arun(policy_text=chunk["text"])
+                return self._parse_report(response)
             except Exception as e:
-                return {
-                    "risk_score": 0,
-                    "risk_reason": "Error parsing audit report.",
-                    "exclusions": [],
-                    "room_rent": "Unknown",
-                    "co_pay": "Unknown",
-                    "waiting_periods": "Unknown",
-                    "sub_limits": "Unknown"
-                }
-        except Exception as e:
-            return {
-                "risk_score": 0,
-                "risk_reason": f"Error running audit: {str(e)}",
-                "exclusions": [],
-                "room_rent": "Unknown",
-                "co_pay": "Unknown",
-                "waiting_periods": "Unknown",
-                "sub_limits": "Unknown"
-            }
+                print(f"Audit chunk {chunk['index']} failed: {e}")
+                return None
 
+    def audit_policy_chunked(self, policy_text: str, doc_type: str = "Insurance") -> Optional[dict]:
+        """
+        Map-reduce audit: chunks on section boundaries, audits chunks in a
+        bounded thread pool, merges with merge_chunk_reports().
+        """
+        chunks = chunk_document(policy_text, self.CHUNK_MAX_CHARS)
+        with ThreadPoolExecutor(max_workers=self.CHUNK_CONCURRENCY) as pool:
+            reports = list(pool.map(lambda c: self._audit_chunk(c, doc_type), chunks))
+        return merge_chunk_reports(reports)
 
-    def generate_full_report(self, policy_text: str) -> str:
+    async def aaudit_policy_chunked(self, policy_text: str, doc_type: str = "Insurance") -> Optional[dict]:
         """
-        Generates a comprehensive Markdown report using the Genesis Brain.
+        Async map-reduce audit; at most CHUNK_CONCURRENCY chunk calls in flight.
         """
-        from ..utils.ai_engine import AIEngine
-        engine = AIEngine()
+        chunks = chunk_document(policy_text, self.CHUNK_MAX_CHARS)
+        semaphore = asyncio.Semaphore(self.CHUNK_CONCURRENCY)
+        reports = await asyncio.gather(*(self._aaudit_chunk(c, doc_type, semaphore) for c in chunks))
+        return merge_chunk_reports(list(reports))
+
+    @staticmethod
+    def _error_report(reason: str) -> dict:
+        return {
+            "risk_score": 0,
+            "risk_reason": reason,
+            "exclusions": [],
+            "room_rent": "Unknown",
+            "co_pay": "Unknown",
+            "waiting_periods": "Unknown",
+            "sub_limits": "Unknown"
+        }
+
+    def audit_policy(self, policy_text: str, doc_type: str = "Insurance") -> dict:
+        """
+        Scans the policy text based on document type.
+        """
+        cache_key = self._cache_key("audit", policy_text, doc_type, self._model_name())
+        cached = get_result_cache().get("audit", cache_key)
+        if cached is not None:
+            return self._attach_community_note(cached, policy_text, doc_type)
+        
+        try:
+            if len(policy_text) > self.CHUNK_THRESHOLD_CHARS:
+                return self._store_report(self.audit_policy_chunked(policy_text, doc_type), cache_key, policy_text, doc_type)
+            
+            chain = self._build_audit_chain(policy_text, doc_type)
+            response = chain.run(policy_text=policy_text)
+            return self._finalize_report(response, cache_key, policy_text, doc_type)
+        except Exception as e:
+            return self._error_report(f"Error running audit: {str(e)}")
+
+    async def aaudit_policy(self, policy_text: str, doc_type: str = "Insurance", status: Optional[dict] = None) -> dict:
+        """
+        Async version of audit_policy for the FastAPI routers. Pass `status`
+        to learn whether the report came from the result cache
+        (status["cached"]).
+        """
+        if status is not None:
+            status["cached"] = False
+        cache_key = self._cache_key("audit", policy_text, doc_type, self._model_name())
+        cached = get_result_cache().get("audit", cache_key)
+        if cached is not None:
+            if status is not None:
+                status["cached"] = True
+            return await asyncio.to_thread(self._attach_community_note, cached, policy_text, doc_type)
         
-        prompt = f"""
+        try:
+            if len(policy_text) > self.CHUNK_THRESHOLD_CHARS:
+                report = await self.aaudit_policy_chunked(policy_text, doc_type)
+                return await asyncio.to_thread(self._store_report, report, cache_key, policy_text, doc_type)
+            
+            chain = self._build_audit_chain(policy_text, doc_type)
+            response = await chain.arun(policy_text=policy_text)
+            return await self._afinalize_report(response, cache_key, policy_text, doc_type)
+        except Exception as e:
+            return self._error_report(f"Error running audit: {str(e)}")
+
+
+    def _build_full_report_prompt(self, policy_text: str) -> str:
+        return f"""
         You are the **Chief Policy Auditor**.
         Conduct a deep-dive forensic analysis of the following insurance policy document.
         
@@ -152,6 +342,70 @@ class AuditorAgent:
         **Policy Text**:
         {policy_text}
         """
+
+    def generate_full_report(self, policy_text: str) -> str:
+        """
+        Generates a comprehensive Markdown report using the Genesis Brain.
+        """
+        from ..utils.ai_engine import AIEngine
+        engine = AIEngine()
+        
+        cache_key = self._cache_key("full_report", policy_text, "Insurance", self.FULL_REPORT_MODEL)
+        cached = get_result_cache().get("full_report", cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = self._build_full_report_prompt(policy_text)
         
         # Use Genesis Agent (Robust with Retry)
-        return engine.run_genesis_agent(prompt, context="")
+        status = {}
+        report_md = engine.run_genesis_agent(prompt, context="", status=status)
+        return self._store_full_report(cache_key, report_md, status.get("route"))
+
+    async def agenerate_full_report(self, policy_text: str) -> str:
+        """
+        Async version of generate_full_report.
+        """
+        from ..utils.ai_engine import AIEngine
+        engine = AIEngine()
+        
+        cache_key = self._cache_key("full_report", policy_text, "Insurance", self.FULL_REPORT_MODEL)
+        cached = get_result_cache().get("full_report", cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = self._build_full_report_prompt(policy_text)
+        status = {}
+        report_md = await engine.arun_genesis_agent(prompt, context="", status=status)
+        return self._store_full_report(cache_key, report_md, status.get("route"))
+
+    async def astream_full_report(self, policy_text: str) -> AsyncIterator[str]:
+        """
+        Streams the Markdown report as Genesis writes it. Cached reports are
+        sent in one piece. Only a report Pro finished is cached; a stream
+        cut off mid-way (error text appended) or a fallback model's is not.
+        """
+        from ..utils.ai_engine import AIEngine
+        engine = AIEngine()
+        
+        cache_key = self._cache_key("full_report", policy_text, "Insurance", self.FULL_REPORT_MODEL)
+        cached = get_result_cache().get("full_report", cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts, status = [], {}
+        async for chunk in engine.astream_genesis_agent(self._build_full_report_prompt(policy_text), context="", status=status):
+            parts.append(chunk)
+            yield chunk
+        if status.get("complete"):
+            self._store_full_report(cache_key, "".join(parts), status.get("route"))
+
+    @classmethod
+    def _store_full_report(cls, cache_key: str, report_md: str, route: Optional[str]) -> str:
+        # The key names FULL_REPORT_MODEL: a Flash/Groq fallback answer (Pro
+        # outage) is returned but not cached, so the next request retries Pro.
+        # run_genesis_agent reports failures as text; never cache those either.
+        if route == cls.FULL_REPORT_MODEL and not report_md.startswith(("Error", "Flash Error")):
+            get_result_cache().put("full_report", cache_key, report_md)
+        return report_md
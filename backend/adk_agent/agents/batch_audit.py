@@ -0,0 +1,100 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import os
+import time
+from typing import List, Optional
+
+from .auditor import AuditorAgent
+from .critic import CriticAgent
+from .audit_pipeline import AuditPipeline
+from ..utils.clause_index import document_id
+from ..utils.job_store import BatchJob, get_job_store
+
+
+class BatchAuditor:
+    """
+    Audits a portfolio of policies as one job.
+
+    - Identical documents (same normalized text and doc_type) are audited once;
+      every copy gets the same result, marked with `duplicate_of`.
+    - Work is spread over a bounded pool of workers. Each worker owns one
+      AuditPipeline whose agents are built once and reused for every
+      document it handles. Agent construction rotates API keys, so the pool
+      size is tied to the number of keys: BATCH_WORKERS_PER_KEY workers per
+      key, capped at BATCH_MAX_WORKERS. No single key ever sees more
+      concurrent calls than its share.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, workers_per_key: Optional[int] = None):
+        self.max_workers = max_workers or int(os.environ.get("BATCH_MAX_WORKERS", "8"))
+        self.workers_per_key = workers_per_key or int(os.environ.get("BATCH_WORKERS_PER_KEY", "2"))
+
+    def _key_count(self) -> int:
+        try:
+            from ..utils.ai_engine import AIEngine
+            return max(1, AIEngine().security.get_key_count())
+        except Exception as e:
+            print(f"Batch Audit: could not count API keys, assuming one: {e}")
+            return 1
+
+    def worker_count(self, unique: int) -> int:
+        return max(1, min(self.max_workers, self._key_count() * self.workers_per_key, unique))
+
+    @staticmethod
+    def group_duplicates(items: List[dict]) -> List[List[int]]:
+        """Input indexes grouped by document, in first-seen order."""
+        groups = {}
+        for i, item in enumerate(items):
+            key = (document_id(item["policy_text"]), item.get("doc_type", "Insurance"))
+            groups.setdefault(key, []).append(i)
+        return list(groups.values())
+
+    def submit(self, items: List[dict], include_review: bool = True) -> BatchJob:
+        """Registers the job and starts it in the background; returns immediately."""
+        groups = self.group_duplicates(items)
+        job = get_job_store().create(total=len(items), unique=len(groups), workers=self.worker_count(len(groups)))
+        job.task = asyncio.create_task(self.run(job, items, groups, include_review))
+        return job
+
+    async def run(self, job: BatchJob, items: List[dict], groups: List[List[int]], include_review: bool = True):
+        queue: asyncio.Queue = asyncio.Queue()
+        for group in groups:
+            queue.put_nowait(group)
+
+        async def worker(pipeline: AuditPipeline):
+            while True:
+                try:
+                    group = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await job.add_results(await self._audit_group(pipeline, items, group, include_review))
+
+        try:
+            pipelines = [
+                AuditPipeline(await asyncio.to_thread(AuditorAgent), await asyncio.to_thread(CriticAgent))
+                for _ in range(job.workers)
+            ]
+            await asyncio.gather(*(worker(p) for p in pipelines))
+            await job.finish("DONE")
+        except Exception as e:
+            print(f"Batch Audit Error: {e}")
+            await job.finish("FAILED")
+
+    async def _audit_group(self, pipeline: AuditPipeline, items: List[dict], group: List[int], include_review: bool) -> List[dict]:
+        first = items[group[0]]
+        start = time.perf_counter()
+        try:
+            if include_review:
+                result = await pipeline.run(first["policy_text"], first.get("doc_type", "Insurance"))
+            else:
+                report = await pipeline.auditor.aaudit_policy(first["policy_text"], first.get("doc_type", "Insurance"))
+                result = {"report": report, "critic_review": None,
+                          "timings": {"total_ms": round((time.perf_counter() - start) * 1000, 1)}}
+            outcome = {"status": "DONE", **result}
+        except Exception as e:
+            outcome = {"status": "FAILED", "detail": str(e)}
+
+        return [
+            {"index": i, "id": items[i].get("id"), "duplicate_of": group[0] if i != group[0] else None, **outcome}
+            for i in group
+        ]
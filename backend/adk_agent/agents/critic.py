@@ -2,20 +2,41 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Optional
+import json
+import asyncio
 from ..utils.security import SecurityManager
+from ..utils.result_cache import get_result_cache, make_cache_key
+from ..utils.clause_index import relevant_context
+from ..utils.structured_output import CRITIC_REVIEW, StructuredOutput
+
+REVIEW_OUTPUT = StructuredOutput("CRITIC", CRITIC_REVIEW)
 
 class CriticAgent:
+    # Bump whenever the review prompt changes so cached reviews are not reused.
+    PROMPT_VERSION = "1"
+
+    # Policy text budget for the Critic; longer documents are cut to their most relevant clauses.
+    MAX_POLICY_CHARS = 10000
+
+    # Clauses every health policy should address. Absence is flagged without an LLM call.
+    KEY_CLAUSES = {
+        "Room Rent": ["room rent"],
+        "Co-Payment": ["co-pay", "copay", "co-payment"],
+        "Sub-limits": ["sub-limit", "sublimit", "sub limit"],
+        "Waiting Period": ["waiting period"],
+        "Exclusions": ["exclusion", "not covered"]
+    }
+
+    # Report-independent retrieval query, so clause selection can run before the audit lands.
+    REVIEW_QUERY = "room rent co-payment sub-limits waiting period pre-existing exclusions not covered risk"
+
     def __init__(self):
         from ..utils.ai_engine import AIEngine
         engine = AIEngine()
         self.llm = engine.get_flash_model()
 
-    def review_audit(self, policy_text: str, audit_report: Union[str, Dict[str, Any]]) -> dict:
-        """
-        Reviews the Auditor's findings against the raw text to check for hallucinations.
-        """
-        
+    def _build_review_chain(self, policy_text: str) -> LLMChain:
         prompt_template = """
         You are the **Critic Agent**, a senior supervisor.
         Your job is to verify the work of a junior Auditor.
@@ -43,22 +64,98 @@ class CriticAgent:
         prompt = PromptTemplate(
             input_variables=["policy_text", "audit_report"],
             template=prompt_template
+        ).partial(policy_text=policy_text)
+        
+        return LLMChain(llm=REVIEW_OUTPUT.model(self.llm), prompt=prompt)
+
+    def prepare_review(self, policy_text: str, doc_type: str = "Insurance") -> dict:
+        """
+        Report-independent half of the review: truncation, prompt building and
+        keyword checks. Safe to run while the Auditor is still working.
+        """
+        absent = []
+        if doc_type == "Insurance":
+            lowered = policy_text.lower()
+            absent = [name for name, keywords in self.KEY_CLAUSES.items() if not any(k in lowered for k in keywords)]
+        
+        truncated = relevant_context(policy_text, self.REVIEW_QUERY, self.MAX_POLICY_CHARS) # Relevant clauses only if too long
+        return {
+            "chain": self._build_review_chain(truncated),
+            "text": truncated,
+            "doc_type": doc_type,
+            "absent_clauses": absent
+        }
+
+    def _cache_key(self, prepared: dict, report_str: str) -> str:
+        return make_cache_key(
+            "critic", prepared["text"], prepared["doc_type"], self.PROMPT_VERSION,
+            str(getattr(self.llm, "model", "unknown")), extra=report_str
         )
+
+    @staticmethod
+    def _report_to_str(audit_report: Union[str, Dict[str, Any]]) -> str:
+        # Convert dict to string for the prompt
+        if isinstance(audit_report, dict):
+            return json.dumps(audit_report)
+        return str(audit_report)
+
+    @staticmethod
+    def _with_absent_clauses(review: dict, prepared: dict) -> dict:
+        if prepared["absent_clauses"]:
+            review["absent_clauses"] = prepared["absent_clauses"]
+        return review
+
+    def _parse_review(self, response: str, prepared: dict, report_str: str) -> dict:
+        prompt = lambda: prepared["chain"].prompt.format(audit_report=report_str)
+        return self._with_absent_clauses(REVIEW_OUTPUT.parse(response, self.llm, prompt), prepared)
+
+    async def _aparse_review(self, response: str, prepared: dict, report_str: str) -> dict:
+        prompt = lambda: prepared["chain"].prompt.format(audit_report=report_str)
+        return self._with_absent_clauses(await REVIEW_OUTPUT.aparse(response, self.llm, prompt), prepared)
+
+    def review_audit(self, policy_text: str, audit_report: Union[str, Dict[str, Any]], prepared: Optional[dict] = None) -> dict:
+        """
+        Reviews the Auditor's findings against the raw text to check for hallucinations.
+        Pass the output of prepare_review() as `prepared` to skip redoing that work.
+        """
+        if prepared is None:
+            prepared = self.prepare_review(policy_text)
         
-        chain = LLMChain(llm=self.llm, prompt=prompt)
+        try:
+            report_str = self._report_to_str(audit_report)
+            cache_key = self._cache_key(prepared, report_str)
+            cached = get_result_cache().get("critic", cache_key)
+            if cached is not None:
+                return cached
+            
+            response = prepared["chain"].run(audit_report=report_str)
+            review = self._parse_review(response, prepared, report_str)
+            get_result_cache().put("critic", cache_key, review)
+            return review
+        except Exception as e:
+            return {
+                "error": f"Critic review failed: {str(e)}",
+                "is_accurate": False
+            }
+
+    async def areview_audit(self, policy_text: str, audit_report: Union[str, Dict[str, Any]], prepared: Optional[dict] = None) -> dict:
+        """
+        Async version of review_audit for the FastAPI routers.
+        """
+        if prepared is None:
+            prepared = await asyncio.to_thread(self.prepare_review, policy_text)  # may index a long policy
         
         try:
-            # Convert dict to string for the prompt
-            # Convert dict to string for the prompt
-            import json
-            if isinstance(audit_report, dict):
-                report_str = json.dumps(audit_report)
-            else:
-                report_str = str(audit_report)
+            report_str = self._report_to_str(audit_report)
+            cache_key = self._cache_key(prepared, report_str)
+            cached = get_result_cache().get("critic", cache_key)
+            if cached is not None:
+                return cached
             
-            response = chain.run(policy_text=policy_text[:10000], audit_report=report_str) # Truncate text if too long
-            response = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(response)
+            response = await prepared["chain"].arun(audit_report=report_str)
+            review = await self._aparse_review(response, prepared, report_str)
+            get_result_cache().put("critic", cache_key, review)
+            return review
         except Exception as e:
             return {
                 "error": f"Critic review failed: {str(e)}",
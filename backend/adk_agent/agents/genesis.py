@@ -1,44 +1,103 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import os
+import re
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents import initialize_agent, AgentType
-from tools.genesis_tools import GenesisTools
-from utils.security import SecurityManager
+from ..tools.genesis_tools import GenesisTools
+from ..utils.security import SecurityManager
+from ..utils.llm_budget import AgentRunStats, LLMBudgetExceeded, LLMCallBudget
+
+CODE_BLOCK_RE = re.compile(r"```(?:python|py)?\s*\n(.*?)```", re.DOTALL)
+BLOCK_TOKEN_RE = re.compile(r"Admin Token: (\S+?)\.")
 
 class GenesisAgent:
-    def __init__(self):
-        from utils.ai_engine import AIEngine
+    """
+    Solves novel problems by writing and executing Python. Two modes
+    (GENESIS_MODE):
+    - "planned" (default): one call writes the script, the tool runs it,
+      one call turns the output into the answer.
+    - "react": the ZERO_SHOT_REACT agent, one LLM call per step.
+    Either way a run makes at most GENESIS_MAX_LLM_CALLS LLM calls.
+    """
+    def __init__(self, mode: str = None, max_llm_calls: int = None):
+        from ..utils.ai_engine import AIEngine
         engine = AIEngine()
         self.llm = engine.get_genesis_model()
         self.genesis_tools = GenesisTools()
+        self.mode = (mode or os.environ.get("GENESIS_MODE", "planned")).lower()
+        self.max_llm_calls = max_llm_calls or int(os.environ.get("GENESIS_MAX_LLM_CALLS", "6"))
 
-    def solve_problem(self, problem_statement: str) -> str:
-        """
-        Attempts to solve a novel problem by writing and executing code.
-        """
-        
+    def _solve_react(self, problem_statement: str, budget: LLMCallBudget) -> str:
         tools = [self.genesis_tools.get_tool()]
-        
+
         agent = initialize_agent(
             tools,
             self.llm,
             agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-            verbose=True,
+            verbose=False,
             handle_parsing_errors=True
         )
-        
+
         prompt = f"""
         You are the **Genesis Agent**, an intelligent engineer.
         Your goal is to solve the user's problem by creating and executing Python code.
-        
+
         Problem: {problem_statement}
-        
+
         Rules:
         1. Use the Python_REPL tool to calculate, process data, or simulate scenarios.
         2. If the tool returns "ACTION BLOCKED", the output MUST be: "🚫 Action Blocked. Please send Token [TOKEN] to Admin."
         3. Be concise in your final answer.
         """
-        
+
+        return agent.run(prompt, callbacks=[budget])
+
+    def _solve_planned(self, problem_statement: str, budget: LLMCallBudget) -> str:
+        code_prompt = f"""
+        You are the **Genesis Agent**, an intelligent engineer.
+        Write ONE self-contained Python script that solves the problem below
+        and prints everything needed for the answer.
+
+        Problem: {problem_statement}
+
+        Reply with only the code in a ```python block.
+        """
+        reply = self.llm.invoke(code_prompt, config={"callbacks": [budget]}).content
+        match = CODE_BLOCK_RE.search(reply)
+        code = match.group(1) if match else reply
+
+        output = self.genesis_tools.safe_python_repl(code)
+        if "ACTION BLOCKED" in output:
+            token = BLOCK_TOKEN_RE.search(output)
+            return f"🚫 Action Blocked. Please send Token {token.group(1) if token else '[TOKEN]'} to Admin."
+
+        answer_prompt = f"""
+        You are the **Genesis Agent**. Answer the user's problem concisely using
+        the script and its output.
+
+        Problem: {problem_statement}
+
+        Script:
+        {code}
+
+        Output:
+        {output[:4000]}
+        """
+        return self.llm.invoke(answer_prompt, config={"callbacks": [budget]}).content
+
+    def solve_problem(self, problem_statement: str) -> str:
+        """
+        Attempts to solve a novel problem by writing and executing code.
+        """
+        budget = LLMCallBudget(self.max_llm_calls)
+        solve = self._solve_react if self.mode == "react" else self._solve_planned
         try:
-            return agent.run(prompt)
+            answer = solve(problem_statement, budget)
+            AgentRunStats().record_budget("GENESIS", self.mode, budget)
+            return answer
+        except LLMBudgetExceeded:
+            AgentRunStats().record_budget("GENESIS", self.mode, budget, failed=True)
+            return f"Genesis stopped: reached its limit of {self.max_llm_calls} AI calls."
         except Exception as e:
+            AgentRunStats().record_budget("GENESIS", self.mode, budget, failed=True)
             return f"Genesis crashed: {str(e)}"
@@ -1,13 +1,119 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
 from langchain_google_genai import ChatGoogleGenerativeAI
-from utils.groq_client import GroqClient
-from utils.security import SecurityManager
+from ..utils.groq_client import GroqClient
+from ..utils.security import SecurityManager
+from ..utils.json_stream import JSONArrayStreamParser
+from ..utils.clause_index import arelevant_context, relevant_context
+from ..utils.structured_output import COURTROOM_CASE, COURTROOM_TURN, StructuredOutput
+from ..utils.courtroom_sessions import CourtroomSession, MAX_SUMMARY_CHARS, PrefetchStats
+from typing import AsyncIterator, List, Optional
+import asyncio
+import math
+import os
 import re
+import json
+import time
+
+CASE_OUTPUT = StructuredOutput("COURTROOM", COURTROOM_CASE)
+TURN_OUTPUT = StructuredOutput("COURTROOM_TURN", COURTROOM_TURN)
+# Monte Carlo runs are cheap and many; an incomplete one counts as undecided instead of re-asking.
+TRIAL_OUTPUT = StructuredOutput("COURTROOM_MC", COURTROOM_CASE, reask=False)
+
+# Each Monte Carlo run gets a different bench, so runs differ by more than sampling noise.
+JUDGE_TEMPERAMENTS = [
+    "strictly textual: the policy wording decides",
+    "consumer-protection minded: ambiguity goes against the drafter",
+    "procedural: disclosure, notice and deadlines decide",
+    "sceptical of both sides: demands evidence for every claim",
+]
+MAX_SWOT_POINTS = 5
+
+def verdict_side(verdict: dict) -> str:
+    """"consumer", "company" or "undecided" from a free-text verdict winner."""
+    winner = str((verdict or {}).get("winner", "")).lower()
+    consumer = any(w in winner for w in ("consumer", "policyholder", "claimant", "insured", "customer"))
+    company = any(w in winner for w in ("company", "insurer", "insurance co"))
+    if consumer == company:  # neither, or "Consumer/Company" echoed from the prompt
+        return "undecided"
+    return "consumer" if consumer else "company"
+
+def wilson_interval(wins: int, n: int, z: float = 1.96) -> tuple:
+    """Wilson score interval for wins/n; stays inside [0, 1] for small n and p near 0 or 1."""
+    if n == 0:
+        return 0.0, 1.0
+    p = wins / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - half), min(1.0, center + half)
+
+def merge_swot_points(runs: List[dict], key: str) -> List[tuple]:
+    """(point, runs mentioning it) across runs, most frequent first (first seen wins ties)."""
+    counts, spelling, order = {}, {}, []
+    for run in runs:
+        seen = set()
+        for point in (run.get("swot") or {}).get(key, []) or []:
+            text = str(point).strip()
+            norm = text.lower().rstrip(".")
+            if not norm or norm in seen:
+                continue
+            seen.add(norm)
+            if norm not in counts:
+                counts[norm], spelling[norm] = 0, text
+                order.append(norm)
+            counts[norm] += 1
+    ranked = sorted(order, key=lambda norm: (-counts[norm], order.index(norm)))
+    return [(spelling[norm], counts[norm]) for norm in ranked[:MAX_SWOT_POINTS]]
+
+def aggregate_trials(runs: List[dict], requested: int, failed: int = 0, timed_out: int = 0) -> dict:
+    """
+    Reduces Monte Carlo trial runs into an empirical consumer win
+    probability with a 95% Wilson interval (undecided runs are left out of
+    both), the SWOT points most runs agree on, and one representative
+    script whose verdict matches the majority.
+    """
+    outcomes = {"consumer": 0, "company": 0, "undecided": 0}
+    for run in runs:
+        outcomes[verdict_side(run.get("verdict"))] += 1
+    decided = outcomes["consumer"] + outcomes["company"]
+    low, high = wilson_interval(outcomes["consumer"], decided)
+    p = outcomes["consumer"] / decided if decided else None
+    if p is None:
+        winner = "None"
+    else:
+        winner = "Consumer" if p >= 0.5 else "Company"
+    majority = winner.lower()
+    example = next((r for r in runs if verdict_side(r.get("verdict")) == majority), runs[0] if runs else {})
+    swot = {key: merge_swot_points(runs, key) for key in ("strengths", "weaknesses")}
+    if p is None:
+        summary = f"No decided verdicts in {len(runs)} of {requested} simulated trials."
+    else:
+        summary = (f"The consumer won {outcomes['consumer']} of {decided} decided trials "
+                   f"(95% CI {low:.0%}-{high:.0%}).")
+    return {
+        "script": example.get("script", []),
+        "verdict": {"winner": winner, "probability": f"{(p if p is not None else 0):.0%}", "summary": summary},
+        "swot": {key: [point for point, _ in points] for key, points in swot.items()},
+        "swot_support": {key: {point: count for point, count in points} for key, points in swot.items()},
+        "win_probability": round(p, 3) if p is not None else None,
+        "confidence_interval": [round(low, 3), round(high, 3)],
+        "outcomes": outcomes,
+        "runs": {"requested": requested, "completed": len(runs), "decided": decided,
+                 "failed": failed, "timed_out": timed_out},
+    }
 
 class CourtroomAgent:
+    # Monte Carlo defaults (asimulate_trials): runs, runs in flight at once, wall-clock budget.
+    MONTE_CARLO_TRIALS = int(os.environ.get("COURTROOM_MC_TRIALS", "8"))
+    MONTE_CARLO_CONCURRENCY = int(os.environ.get("COURTROOM_MC_CONCURRENCY", "4"))
+    MONTE_CARLO_BUDGET_SECONDS = float(os.environ.get("COURTROOM_MC_BUDGET_SECONDS", "45"))
+    MONTE_CARLO_TEMPERATURES = (0.4, 1.0)  # spread evenly across the runs
+    CASE_CONTEXT_CHARS = 3000
+    TURN_CONTEXT_CHARS = 1000
+
     def __init__(self):
         # Hybrid Brain Strategy: Use Flash Model for Speed
-        from utils.ai_engine import AIEngine
+        from ..utils.ai_engine import AIEngine
         engine = AIEngine()
         self.llm = engine.get_flash_model()
 
@@ -28,20 +134,23 @@ class CourtroomAgent:
             
         return sanitized.strip()
 
-    def simulate_argument(self, policy_text: str, claim_scenario: str, architect_data: str = "", sentinel_data: str = "") -> dict:
-        """
-        Simulates a cinematic courtroom drama with Judge, Lawyers, and Witnesses.
-        """
-        
+    async def _acase_clauses(self, policy_text: str, claim_scenario: str) -> str:
+        # The prompt builders' policy snippet, with the clause index built off the event loop.
+        return await arelevant_context(policy_text, self.sanitize_input(claim_scenario), self.CASE_CONTEXT_CHARS)
+
+    def _build_argument_prompt(self, policy_text: str, claim_scenario: str, architect_data: str = "", sentinel_data: str = "",
+                               clauses: Optional[str] = None) -> str:
         # SECURITY: Sanitize Input
         safe_scenario = self.sanitize_input(claim_scenario)
+        if clauses is None:
+            clauses = relevant_context(policy_text, safe_scenario, self.CASE_CONTEXT_CHARS)
         
-        prompt = f"""
+        return f"""
         You are the **Virtual Courtroom Simulator** (Cinematic Mode).
         
         **The Case:**
         Scenario: {safe_scenario}
-        Policy Text Snippet: {policy_text[:3000]}...
+        Policy Text Snippet: {clauses}...
         
         **Witness Data:**
         - Architect Agent (Time Traveler): {architect_data}
@@ -80,31 +189,173 @@ class CourtroomAgent:
             }}
         }}
         """
+
+    @staticmethod
+    def _mistrial(error: Exception) -> dict:
+        return {
+            "script": [
+                {"speaker": "Judge Dredd", "text": f"Mistrial declared! Error: {str(error)}", "type": "judge"}
+            ],
+            "verdict": {"winner": "None", "probability": "0%", "summary": "System Error"},
+            "swot": {"strengths": [], "weaknesses": []}
+        }
+
+    def simulate_argument(self, policy_text: str, claim_scenario: str, architect_data: str = "", sentinel_data: str = "") -> dict:
+        """
+        Simulates a cinematic courtroom drama with Judge, Lawyers, and Witnesses.
+        """
+        prompt = self._build_argument_prompt(policy_text, claim_scenario, architect_data, sentinel_data)
         
         try:
-            import json
-            response = self.llm.invoke(prompt).content
-            response = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(response)
+            return CASE_OUTPUT.run(self.llm, prompt)
         except Exception as e:
-            return {
-                "script": [
-                    {"speaker": "Judge Dredd", "text": f"Mistrial declared! Error: {str(e)}", "type": "judge"}
-                ],
-                "verdict": {"winner": "None", "probability": "0%", "summary": "System Error"},
-                "swot": {"strengths": [], "weaknesses": []}
-            }
+            return self._mistrial(e)
 
-    def simulate_turn(self, history: list, context: str) -> dict:
+    async def asimulate_argument(self, policy_text: str, claim_scenario: str, architect_data: str = "", sentinel_data: str = "") -> dict:
         """
-        Generates the next single turn in the courtroom drama.
+        Async version of simulate_argument.
         """
-        prompt = f"""
-        You are the **Courtroom Simulator**.
-        Context: {context[:1000]}
+        clauses = await self._acase_clauses(policy_text, claim_scenario)
+        prompt = self._build_argument_prompt(policy_text, claim_scenario, architect_data, sentinel_data, clauses)
         
+        try:
+            return await CASE_OUTPUT.arun(self.llm, prompt)
+        except Exception as e:
+            return self._mistrial(e)
+
+    async def astream_argument(self, policy_text: str, claim_scenario: str, architect_data: str = "", sentinel_data: str = "") -> AsyncIterator[dict]:
+        """
+        Streams the courtroom drama. Yields {"event": "line", "data": {...}} for
+        each script line as soon as it is complete, then a final
+        {"event": "verdict", "data": {"verdict": ..., "swot": ...}}.
+        """
+        clauses = await self._acase_clauses(policy_text, claim_scenario)
+        prompt = self._build_argument_prompt(policy_text, claim_scenario, architect_data, sentinel_data, clauses)
+        parser = JSONArrayStreamParser("script")
+        sent = 0
+        
+        try:
+            async for chunk in CASE_OUTPUT.model(self.llm).astream(prompt):
+                for line in parser.feed(chunk.content or ""):
+                    sent += 1
+                    yield {"event": "line", "data": line}
+            case_data = await CASE_OUTPUT.aparse(parser.buffer, self.llm, prompt)
+        except Exception as e:
+            case_data = self._mistrial(e)
+        
+        # Lines the incremental parser could not recover are sent from the full parse.
+        for line in case_data.get("script", [])[sent:]:
+            yield {"event": "line", "data": line}
+        yield {"event": "verdict", "data": {"verdict": case_data.get("verdict", {}), "swot": case_data.get("swot", {})}}
+
+    def _build_trial_prompt(self, policy_text: str, claim_scenario: str, architect_data: str, sentinel_data: str, run: int,
+                            clauses: Optional[str] = None) -> str:
+        safe_scenario = self.sanitize_input(claim_scenario)
+        if clauses is None:
+            clauses = relevant_context(policy_text, safe_scenario, self.CASE_CONTEXT_CHARS)
+        temperament = JUDGE_TEMPERAMENTS[run % len(JUDGE_TEMPERAMENTS)]
+        return f"""
+        You are the **Virtual Courtroom Simulator** (Quick Trial #{run + 1}).
+        
+        **The Case:**
+        Scenario: {safe_scenario}
+        Policy Text Snippet: {clauses}...
+        
+        **Witness Data:**
+        - Architect Agent (Time Traveler): {architect_data}
+        - Sentinel Agent (Detective): {sentinel_data}
+        
+        **The Bench:** Judge Dredd is {temperament}.
+        
+        **Instructions:**
+        Play out a SHORT trial (3-4 rounds) between Mr. Wolf (Company Lawyer) and
+        Ms. Hope (Consumer Advocate), then Judge Dredd's verdict. Decide on the
+        merits as this judge would; do not assume the consumer wins.
+        "winner" must be exactly "Consumer" or "Company".
+        
+        Format strictly as JSON:
+        {{
+            "script": [{{"speaker": "Judge Dredd", "text": "...", "type": "judge"}}],
+            "verdict": {{"winner": "Consumer", "probability": "70%", "summary": "..."}},
+            "swot": {{"strengths": ["..."], "weaknesses": ["..."]}}
+        }}
+        """
+
+    def _trial_llm(self, temperature: float):
+        """self.llm at another sampling temperature (pooled Gemini clients are shared, so copy)."""
+        if hasattr(self.llm, "temperature") and hasattr(self.llm, "model_copy"):
+            return self.llm.model_copy(update={"temperature": temperature})
+        return self.llm
+
+    def _trial_temperatures(self, trials: int) -> List[float]:
+        low, high = self.MONTE_CARLO_TEMPERATURES
+        if trials <= 1:
+            return [low]
+        return [round(low + (high - low) * i / (trials - 1), 3) for i in range(trials)]
+
+    async def asimulate_trials(self, policy_text: str, claim_scenario: str, architect_data: str = "", sentinel_data: str = "",
+                               trials: Optional[int] = None, concurrency: Optional[int] = None,
+                               budget_seconds: Optional[float] = None) -> dict:
+        """
+        Monte Carlo courtroom: `trials` independent short trials, at most
+        `concurrency` in flight, each with its own temperature and judge
+        temperament. Runs still going after `budget_seconds` are cancelled
+        and the verdicts so far are aggregated (see aggregate_trials), so the
+        win probability comes from counted verdicts rather than one guess.
+        """
+        trials = max(1, trials or self.MONTE_CARLO_TRIALS)
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.MONTE_CARLO_CONCURRENCY))
+        budget = budget_seconds if budget_seconds is not None else self.MONTE_CARLO_BUDGET_SECONDS
+        start = time.perf_counter()
+        clauses = await self._acase_clauses(policy_text, claim_scenario)
+
+        async def one(run: int, temperature: float) -> dict:
+            async with semaphore:
+                prompt = self._build_trial_prompt(policy_text, claim_scenario, architect_data, sentinel_data, run, clauses)
+                return await TRIAL_OUTPUT.arun(self._trial_llm(temperature), prompt)
+
+        tasks = [asyncio.create_task(one(run, t)) for run, t in enumerate(self._trial_temperatures(trials))]
+        done, pending = await asyncio.wait(tasks, timeout=budget)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        runs, failed = [], 0
+        for task in tasks:  # creation order, so the result does not depend on timing
+            if task not in done:
+                continue
+            if task.exception() is not None:
+                print(f"Courtroom trial run failed: {task.exception()}")
+                failed += 1
+            else:
+                runs.append(task.result())
+        result = aggregate_trials(runs, trials, failed=failed, timed_out=len(pending))
+        result["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    @staticmethod
+    def _turn_query(history: list) -> str:
+        # Pull the case facts the last exchange is arguing about.
+        return " ".join(str(turn.get("text", "")) for turn in history[-2:] if isinstance(turn, dict))
+
+    async def _aturn_clauses(self, history: list, context: str) -> str:
+        return await arelevant_context(context, self._turn_query(history), self.TURN_CONTEXT_CHARS)
+
+    def _build_turn_prompt(self, history: list, context: str, summary: str = "", window: int = 5,
+                           clauses: Optional[str] = None) -> str:
+        if clauses is None:
+            clauses = relevant_context(context, self._turn_query(history), self.TURN_CONTEXT_CHARS)
+        proceedings = f"""
+        **Proceedings So Far (summary):**
+        {summary}
+        """ if summary else ""
+        return f"""
+        You are the **Courtroom Simulator**.
+        Context: {clauses}
+        {proceedings}
         **Current Transcript:**
-        {history[-5:]} 
+        {history[-window:]} 
         
         **Cast:**
         - Judge Dredd (Stern, Decisive)
@@ -118,11 +369,126 @@ class CourtroomAgent:
         
         JSON Output: {{"speaker": "Name", "text": "Dialogue", "type": "judge/prosecution/defense"}}
         """
+
+    def simulate_turn(self, history: list, context: str) -> dict:
+        """
+        Generates the next single turn in the courtroom drama.
+        """
+        prompt = self._build_turn_prompt(history, context)
+        
+        try:
+            return TURN_OUTPUT.run(self.llm, prompt)
+        except:
+            return {"speaker": "Judge Dredd", "text": "Order! Proceed.", "type": "judge"}
+
+    async def asimulate_turn(self, history: list, context: str) -> dict:
+        """
+        Async version of simulate_turn for the FastAPI router.
+        """
+        prompt = self._build_turn_prompt(history, context, clauses=await self._aturn_clauses(history, context))
         
         try:
-            import json
-            response = self.llm.invoke(prompt).content
-            response = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(response)
+            return await TURN_OUTPUT.arun(self.llm, prompt)
         except:
             return {"speaker": "Judge Dredd", "text": "Order! Proceed.", "type": "judge"}
+
+    @staticmethod
+    def _build_summary_prompt(summary: str, turns: list) -> str:
+        lines = "\n".join(f"{t.get('speaker', '?')}: {t.get('text', '')}" for t in turns)
+        return f"""
+        You are the **Court Clerk**. Update the running summary of this trial.
+        Keep every fact, amount, date, clause number, witness statement and ruling; drop the theatrics.
+        At most {MAX_SUMMARY_CHARS // 6} words.
+        
+        **Summary So Far:**
+        {summary or "(The trial has just begun.)"}
+        
+        **New Transcript Lines:**
+        {lines}
+        
+        Reply with only the updated summary.
+        """
+
+    async def _asummarize(self, session: CourtroomSession, turns: list):
+        try:
+            response = await self.llm.ainvoke(self._build_summary_prompt(session.summary, turns))
+            summary = response.content
+        except Exception as e:
+            print(f"Courtroom summary failed: {e}")
+            # Keep the gist rather than losing the folded turns entirely.
+            summary = " ".join([session.summary] + [f"{t.get('speaker')}: {t.get('text')}" for t in turns])[-MAX_SUMMARY_CHARS:]
+        session.set_summary(summary, len(turns))
+
+    async def _agenerate_turn(self, history: list, session: CourtroomSession) -> dict:
+        # On demand every turn not yet in the summary is quoted (RECENT_TURNS to RECENT_TURNS + SUMMARY_EVERY);
+        # speculative turns see at most RECENT_TURNS (speculative_history).
+        clauses = await self._aturn_clauses(history, session.context)
+        prompt = self._build_turn_prompt(history, session.context, session.summary, window=len(history), clauses=clauses)
+        session.last_prompt_chars = len(prompt)
+        try:
+            return await TURN_OUTPUT.arun(self.llm, prompt)
+        except:
+            return {"speaker": "Judge Dredd", "text": "Order! Proceed.", "type": "judge"}
+
+    def _start_prefetch(self, session: CourtroomSession):
+        if len(session.prefetched) >= session.prefetch_turns:
+            return
+        if session.prefetch_task is not None and not session.prefetch_task.done():
+            return
+        session.prefetch_task = asyncio.create_task(self._aprefetch(session, session.generation))
+
+    async def _aprefetch(self, session: CourtroomSession, generation: int):
+        """Generates one speculative turn, then chains the next up to the session's depth."""
+        await session.wait_for_summary()
+        turn = await self._agenerate_turn(session.speculative_history(), session)
+        PrefetchStats().record_prefetch()
+        if session.generation != generation:
+            PrefetchStats().record_wasted(1)
+            return
+        session.prefetched.append(turn)
+        session.prefetch_task = None
+        self._start_prefetch(session)
+
+    async def _anext_prefetched(self, session: CourtroomSession):
+        """(turn, "hit" | "late") if speculation has or is about to have the next turn."""
+        if session.prefetched:
+            return session.prefetched.popleft(), "hit"
+        task = session.prefetch_task
+        if task is not None and not task.done():
+            try:
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                return None, "miss"
+            if session.prefetched:
+                return session.prefetched.popleft(), "late"
+        return None, "miss"
+
+    async def asession_turn(self, session: CourtroomSession, argument: str = "", speaker: str = "Policyholder") -> dict:
+        """
+        Next turn of a server-side session. The prompt carries the case
+        context, the rolling summary and the last few turns, so its size stays
+        flat however long the trial runs. `argument` is the user's own line,
+        added to the transcript first. Older turns are folded into the summary
+        in the background, while the user reads this turn.
+
+        After answering, the next `prefetch_turns` turns are generated
+        speculatively, so the following requests are served from memory. A
+        user argument invalidates them.
+        """
+        start = time.perf_counter()
+        async with session.lock:
+            if argument:
+                PrefetchStats().record_wasted(session.invalidate_prefetch())
+                session.add_turn({"speaker": speaker, "text": self.sanitize_input(argument), "type": "user"})
+            turn, source = await self._anext_prefetched(session)
+            if turn is None:
+                await session.wait_for_summary()
+                turn = await self._agenerate_turn(session.recent, session)
+            session.add_turn(turn)
+            if session.needs_summary():
+                session.summary_task = asyncio.create_task(self._asummarize(session, session.take_for_summary()))
+            if session.prefetch_turns > 0:
+                self._start_prefetch(session)
+            PrefetchStats().record_served(source, time.perf_counter() - start)
+            session.last_source = source
+            return turn
@@ -1,16 +1,20 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+from typing import Optional
 
-from utils.ai_engine import AIEngine
+from ..utils.ai_engine import AIEngine
+from ..utils.semantic_cache import get_semantic_cache
+from ..utils.clause_index import arelevant_context, relevant_context
 
 class MedicalExpertAgent:
+    CONTEXT_CHARS = 5000
+
     def __init__(self):
         self.engine = AIEngine()
 
-    def analyze_medical_report(self, report_text: str, policy_context: str = "") -> str:
-        """
-        Analyzes a medical report to explain the diagnosis and check against policy exclusions.
-        """
-        prompt = f"""
+    def _build_report_prompt(self, report_text: str, policy_context: str = "", clauses: Optional[str] = None) -> str:
+        if clauses is None:
+            clauses = relevant_context(policy_context, report_text, self.CONTEXT_CHARS)
+        return f"""
         You are Dr. Gemini, a **Medical Expert** and Insurance Claims Specialist.
         
         Analyze the following medical report/notes:
@@ -18,7 +22,7 @@ class MedicalExpertAgent:
         "{report_text}"
         
         Context (Policy Exclusions/Terms):
-        "{policy_context}"
+        "{clauses}"
         
         Provide a response in Markdown:
         1. **Diagnosis Explanation**: Explain the condition in simple, non-medical terms.
@@ -26,15 +30,49 @@ class MedicalExpertAgent:
         3. **Policy Check**: Based on the provided policy context (if any), are there potential coverage issues? (e.g., cosmetic, experimental, pre-existing?)
         4. **Next Steps**: What should the patient ask their doctor?
         """
-        
-        return self.engine.run_genesis_agent(prompt)
+
+    def _build_term_prompt(self, term: str) -> str:
+        return f"""
+        Explain the medical term "**{term}**" to a 10-year-old. 
+        Also, mention if this is typically covered in standard health insurance policies in India.
+        """
+
+    def analyze_medical_report(self, report_text: str, policy_context: str = "") -> str:
+        """
+        Analyzes a medical report to explain the diagnosis and check against policy exclusions.
+        """
+        return self.engine.run_genesis_agent(self._build_report_prompt(report_text, policy_context))
+
+    async def aanalyze_medical_report(self, report_text: str, policy_context: str = "") -> str:
+        """
+        Async version of analyze_medical_report.
+        """
+        clauses = await arelevant_context(policy_context, report_text, self.CONTEXT_CHARS)
+        return await self.engine.arun_genesis_agent(self._build_report_prompt(report_text, policy_context, clauses))
+
+    def _remember_term(self, term: str, explanation: str) -> str:
+        if not self.engine._is_error_answer(explanation):
+            get_semantic_cache().store("medical_term", term, explanation)
+        return explanation
 
     def explain_term(self, term: str) -> str:
         """
         Explains a specific medical term.
+        Repeat questions ("what is angioplasty") are served from the SemanticCache.
         """
-        prompt = f"""
-        Explain the medical term "**{term}**" to a 10-year-old. 
-        Also, mention if this is typically covered in standard health insurance policies in India.
+        cached = get_semantic_cache().lookup("medical_term", term)
+        if cached is not None:
+            return cached
+        return self._remember_term(term, self.engine.run_genesis_agent(self._build_term_prompt(term)))
+
+    async def aexplain_term(self, term: str) -> str:
+        """
+        Async version of explain_term.
         """
-        return self.engine.run_genesis_agent(prompt)
+        cached = await get_semantic_cache().alookup("medical_term", term)
+        if cached is not None:
+            return cached
+        explanation = await self.engine.arun_genesis_agent(self._build_term_prompt(term))
+        if not self.engine._is_error_answer(explanation):
+            await get_semantic_cache().astore("medical_term", term, explanation)
+        return explanation
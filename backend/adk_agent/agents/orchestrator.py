@@ -0,0 +1,251 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Responses are combined in this order, whatever order the agents finish in.
+AGENT_ORDER = ["AUDITOR", "MEDICAL", "TENANT", "CAREER", "SCOUT", "SENTINEL", "LAWYER", "ARCHITECT", "GENESIS"]
+# The full Auditor report (plus Critic) and Sentinel's search agent are the slow ones.
+DEFAULT_TIMEOUTS = {"AUDITOR": 120.0, "SENTINEL": 90.0}
+
+LAWYER_RESPONSE = ("I've prepared the Courtroom Simulator for your legal dispute. "
+                   "Please proceed there for a full trial simulation.")
+ARCHITECT_RESPONSE = ("📈 **Financial Forecast:** I've generated a chart showing the impact of medical "
+                      "inflation on your cover over the next 10 years.")
+
+
+def company_from_prompt(prompt: str, context: str = "") -> str:
+    """
+    The company Sentinel should investigate: one named in the prompt, else
+    the insurer of the uploaded document (local extraction, no LLM call).
+    """
+    from ..utils.entity_extractor import get_entity_extractor
+
+    extractor = get_entity_extractor()
+    named = extractor.find_in_text(prompt)
+    if named:
+        return named[0]
+    if context:
+        entities = extractor.extract(context)
+        primary = entities.primary("insurer") or (entities.names() or [None])[0]
+        if primary:
+            return primary
+    return "Insurance Company"
+
+
+class AgentResult:
+    def __init__(self, agent: str, status: str, content: str = "", seconds: float = 0.0,
+                 error: Optional[str] = None, figure: Any = None):
+        self.agent = agent
+        self.status = status  # "ok" | "error" | "timeout"
+        self.content = content
+        self.seconds = seconds
+        self.error = error
+        self.figure = figure
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def to_dict(self) -> dict:
+        return {
+            "agent": self.agent,
+            "status": self.status,
+            "content": self.content,
+            "ms": round(self.seconds * 1000, 1),
+            "error": self.error,
+            "figure": json.loads(self.figure.to_json()) if self.figure is not None else None,
+        }
+
+
+class OrchestrationResult:
+    def __init__(self, agents: List[str], results: List[AgentResult], seconds: float):
+        self.agents = agents
+        self.results = results
+        self.seconds = seconds
+
+    @property
+    def failed(self) -> List[str]:
+        return [r.agent for r in self.results if not r.ok]
+
+    @property
+    def response(self) -> str:
+        """Successful answers in AGENT_ORDER, then one line per failed agent."""
+        sections = [r.content for r in self.results if r.ok and r.content]
+        notes = [f"> ⚠️ **{r.agent}** {'timed out' if r.status == 'timeout' else 'failed'}: {r.error}"
+                 for r in self.results if not r.ok]
+        if notes:
+            sections.append("\n".join(notes))
+        return "\n\n---\n\n".join(sections)
+
+    def to_dict(self) -> dict:
+        return {
+            "agents": self.agents,
+            "response": self.response,
+            "failed": self.failed,
+            "total_ms": round(self.seconds * 1000, 1),
+            "results": [r.to_dict() for r in self.results],
+        }
+
+
+class AgentOrchestrator:
+    """
+    Runs the agents picked by smart_router concurrently instead of one after
+    another, so a TENANT + SENTINEL + SCOUT answer takes as long as the
+    slowest agent rather than the sum of all three.
+
+    Every agent gets its own timeout (ORCHESTRATOR_TIMEOUT_SECONDS, with the
+    longer DEFAULT_TIMEOUTS for the Auditor and Sentinel). A failing or slow
+    agent becomes an "error"/"timeout" result and the rest still answer.
+    Sync agents run in worker threads; a timed-out thread cannot be killed,
+    its answer is simply dropped. If nothing succeeded and GENESIS was not
+    picked, Genesis answers as the fallback, as the chat view always did.
+    """
+
+    def __init__(self, engine=None, timeout: Optional[float] = None, timeouts: Optional[Dict[str, float]] = None):
+        if engine is None:
+            from ..utils.ai_engine import AIEngine
+            engine = AIEngine()
+        self.engine = engine
+        # An explicit `timeout` applies to every agent not named in `timeouts`.
+        self.timeouts = {**(DEFAULT_TIMEOUTS if timeout is None else {}), **(timeouts or {})}
+        self.timeout = timeout or float(os.environ.get("ORCHESTRATOR_TIMEOUT_SECONDS", "60"))
+        self.handlers: Dict[str, Callable[[str, str], Awaitable[AgentResult]]] = {
+            "AUDITOR": self._auditor,
+            "MEDICAL": self._medical,
+            "TENANT": self._tenant,
+            "CAREER": self._career,
+            "SCOUT": self._scout,
+            "SENTINEL": self._sentinel,
+            "LAWYER": self._lawyer,
+            "ARCHITECT": self._architect,
+            "GENESIS": self._genesis,
+        }
+
+    def timeout_for(self, agent: str) -> float:
+        return self.timeouts.get(agent, self.timeout)
+
+    @staticmethod
+    def normalize(agents: List[str]) -> List[str]:
+        """Known agents only, deduplicated, in AGENT_ORDER."""
+        wanted = {a.strip().upper() for a in agents}
+        return [a for a in AGENT_ORDER if a in wanted]
+
+    # --- Agent handlers ---
+
+    async def _auditor(self, prompt: str, context: str) -> AgentResult:
+        from .auditor import AuditorAgent
+        from .critic import CriticAgent
+
+        if "report" not in prompt.lower() and "audit" not in prompt.lower():
+            res = await self.engine.arun_genesis_agent(f"As Policy Auditor, answer: {prompt}", context=context)
+            return AgentResult("AUDITOR", "ok", res)
+
+        auditor = await asyncio.to_thread(AuditorAgent)
+        res = await auditor.agenerate_full_report(context)
+        critic = await asyncio.to_thread(CriticAgent)
+        review = await critic.areview_audit(context, res)
+        if review.get("is_accurate"):
+            res += "\n\n> ✅ **Verified by Critic Agent**"
+        else:
+            res += f"\n\n> ⚠️ **Critic Alert:** {review.get('corrections', 'Potential inaccuracies found.')}"
+            if review.get("missing_clauses"):
+                res += f"\n> **Missing Clauses:** {', '.join(review['missing_clauses'])}"
+        return AgentResult("AUDITOR", "ok", res)
+
+    async def _medical(self, prompt: str, context: str) -> AgentResult:
+        from .medical_expert import MedicalExpertAgent
+        med_expert = await asyncio.to_thread(MedicalExpertAgent)
+        return AgentResult("MEDICAL", "ok", await med_expert.aanalyze_medical_report(prompt, context))
+
+    async def _tenant(self, prompt: str, context: str) -> AgentResult:
+        from .tenant_guardian import TenantGuardianAgent
+
+        def run_audit():
+            return TenantGuardianAgent().audit_rent_agreement(context)
+
+        audit = await asyncio.to_thread(run_audit)
+        res = f"### 🏠 Rent Agreement Audit\n**Risk Score:** {audit.get('risk_score')}/100\n\n"
+        res += f"- **Lock-in:** {audit.get('lock_in')}\n"
+        res += f"- **Security Deposit:** {audit.get('security_deposit')}\n"
+        res += f"- **Maintenance:** {audit.get('maintenance')}\n"
+        res += f"\n**Verdict:** {audit.get('risk_reason')}"
+        return AgentResult("TENANT", "ok", res)
+
+    async def _career(self, prompt: str, context: str) -> AgentResult:
+        from .career_shield import CareerShieldAgent
+
+        def run_audit():
+            return CareerShieldAgent().audit_offer_letter(context)
+
+        audit = await asyncio.to_thread(run_audit)
+        res = f"### 💼 Job Offer Audit\n**Safety Score:** {audit.get('risk_score')}/100\n\n"
+        res += f"- **Bond:** {audit.get('bond')}\n"
+        res += f"- **Notice Period:** {audit.get('notice_period')}\n"
+        res += f"- **Non-Compete:** {audit.get('non_compete')}\n"
+        res += f"\n**Verdict:** {audit.get('risk_reason')}"
+        return AgentResult("CAREER", "ok", res)
+
+    async def _scout(self, prompt: str, context: str) -> AgentResult:
+        from .scout import ScoutAgent
+
+        def compare():
+            # Mock user profile for now, or use family memory
+            return ScoutAgent().compare_policies("Current Policy", "Family of 3, Age 30")
+
+        return AgentResult("SCOUT", "ok", await asyncio.to_thread(compare))
+
+    async def _sentinel(self, prompt: str, context: str) -> AgentResult:
+        from .sentinel import SentinelAgent
+        # Local extraction may (re)build the vault automaton; keep it off the loop.
+        company_name = await asyncio.to_thread(company_from_prompt, prompt, context)
+
+        def check():
+            return SentinelAgent().check_reputation(company_name)
+
+        res = await asyncio.to_thread(check)
+        return AgentResult("SENTINEL", "ok", f"### 🕵️ Sentinel Report for {company_name}\n{res}")
+
+    async def _lawyer(self, prompt: str, context: str) -> AgentResult:
+        # The legal strategy itself happens in the Courtroom view / endpoints.
+        return AgentResult("LAWYER", "ok", LAWYER_RESPONSE)
+
+    async def _architect(self, prompt: str, context: str) -> AgentResult:
+        from .architect import ArchitectAgent
+
+        def forecast():
+            # Default cover 5L for demo
+            return ArchitectAgent().forecast_financials(500000)
+
+        return AgentResult("ARCHITECT", "ok", ARCHITECT_RESPONSE, figure=await asyncio.to_thread(forecast))
+
+    async def _genesis(self, prompt: str, context: str) -> AgentResult:
+        return AgentResult("GENESIS", "ok", await self.engine.arun_genesis_agent(prompt=prompt, context=context))
+
+    # --- Execution ---
+
+    async def _run_one(self, agent: str, prompt: str, context: str) -> AgentResult:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self.handlers[agent](prompt, context), timeout=self.timeout_for(agent))
+        except asyncio.TimeoutError:
+            result = AgentResult(agent, "timeout", error=f"no answer within {self.timeout_for(agent):.0f}s")
+        except Exception as e:
+            print(f"Orchestrator: {agent} failed: {e}")
+            result = AgentResult(agent, "error", error=str(e))
+        result.seconds = time.perf_counter() - start
+        return result
+
+    async def arun(self, agents: List[str], prompt: str, context: str = "") -> OrchestrationResult:
+        start = time.perf_counter()
+        agents = self.normalize(agents) or ["GENESIS"]
+        results = list(await asyncio.gather(*(self._run_one(a, prompt, context) for a in agents)))
+        if "GENESIS" not in agents and not any(r.ok for r in results):
+            results.append(await self._run_one("GENESIS", prompt, context))
+        return OrchestrationResult(agents, results, time.perf_counter() - start)
+
+    def run(self, agents: List[str], prompt: str, context: str = "") -> OrchestrationResult:
+        """Sync entry point for callers without an event loop (the Streamlit app)."""
+        return asyncio.run(self.arun(agents, prompt, context))
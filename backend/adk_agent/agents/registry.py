@@ -0,0 +1,134 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import importlib
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# Name -> "module:attribute" under backend.adk_agent. Nothing here is imported
+# until the agent is first used, so the app starts without langchain,
+# the Gemini SDK, streamlit or plotly loaded.
+AGENTS = {
+    "AUDITOR": "agents.auditor:AuditorAgent",
+    "CRITIC": "agents.critic:CriticAgent",
+    "AUDIT_PIPELINE": "agents.audit_pipeline:AuditPipeline",
+    "BATCH_AUDITOR": "agents.batch_audit:BatchAuditor",
+    "MEDICAL": "agents.medical_expert:MedicalExpertAgent",
+    "TENANT": "agents.tenant_guardian:TenantGuardianAgent",
+    "CAREER": "agents.career_shield:CareerShieldAgent",
+    "SCOUT": "agents.scout:ScoutAgent",
+    "SENTINEL": "agents.sentinel:SentinelAgent",
+    "LAWYER": "agents.lawyer:CourtroomAgent",
+    "ARCHITECT": "agents.architect:ArchitectAgent",
+    "GENESIS": "agents.genesis:GenesisAgent",
+    "ENGINE": "utils.ai_engine:AIEngine",
+}
+PACKAGE = __name__.rsplit(".", 2)[0]
+
+
+class AgentRegistry:
+    """
+    Resolves agents by name and imports their modules on first use.
+    Records how long each first import took, so the cost that moved out of
+    startup stays visible (GET /admin/agents).
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._classes = {}
+                instance._load_seconds = {}
+                instance._lock = threading.Lock()
+                instance.warm_up_thread = None
+                cls._instance = instance
+            return cls._instance
+
+    def agent_class(self, name: str) -> type:
+        name = name.strip().upper()
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        if name not in AGENTS:
+            raise KeyError(f"Unknown agent: {name}")
+        module_name, attribute = AGENTS[name].split(":")
+        start = time.perf_counter()
+        # Python's import lock makes a racing import wait for the first one.
+        module = importlib.import_module(f"{PACKAGE}.{module_name}")
+        cls = getattr(module, attribute)
+        with self._lock:
+            self._load_seconds.setdefault(name, time.perf_counter() - start)
+            self._classes[name] = cls
+        return cls
+
+    def is_loaded(self, name: str) -> bool:
+        return name.strip().upper() in self._classes
+
+    def create(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        return self.agent_class(name)(*args, **kwargs)
+
+    async def acreate(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """create() for async handlers: a first-use import runs off the event loop."""
+        if not self.is_loaded(name):
+            await asyncio.to_thread(self.agent_class, name)
+        return self.create(name, *args, **kwargs)
+
+    def warm_up(self, names: Iterable[str]) -> Dict[str, float]:
+        """Imports the named agents now; returns seconds per agent (0 if already loaded)."""
+        timings = {}
+        for name in names:
+            name = name.strip().upper()
+            try:
+                start = time.perf_counter()
+                self.agent_class(name)
+                timings[name] = round(time.perf_counter() - start, 3)
+            except Exception as e:
+                print(f"Agent warm-up failed for {name}: {e}")
+        return timings
+
+    def start_warm_up(self, names: Optional[Iterable[str]] = None) -> Optional[threading.Thread]:
+        """
+        Warms up in a background thread so /health answers immediately.
+        `names` defaults to WARMUP_AGENTS (comma separated, or "all"); nothing
+        is preloaded when it is unset.
+        """
+        if names is None:
+            names = warm_up_names()
+        names = list(names)
+        if not names:
+            return None
+
+        def run():
+            timings = self.warm_up(names)
+            print(f"Agent warm-up done: {timings}")
+
+        self.warm_up_thread = threading.Thread(target=run, name="agent-warm-up", daemon=True)
+        self.warm_up_thread.start()
+        return self.warm_up_thread
+
+    def stats(self) -> dict:
+        with self._lock:
+            loaded = {name: round(seconds, 3) for name, seconds in self._load_seconds.items()}
+        return {
+            "loaded": loaded,
+            "not_loaded": [name for name in AGENTS if name not in loaded],
+            "warming_up": bool(self.warm_up_thread and self.warm_up_thread.is_alive()),
+        }
+
+
+def warm_up_names() -> List[str]:
+    value = os.environ.get("WARMUP_AGENTS", "").strip()
+    if value.lower() == "all":
+        return list(AGENTS)
+    return [name.strip().upper() for name in value.split(",") if name.strip()]
+
+
+def create_agent(name: str, *args: Any, **kwargs: Any) -> Any:
+    return AgentRegistry().create(name, *args, **kwargs)
+
+
+async def acreate_agent(name: str, *args: Any, **kwargs: Any) -> Any:
+    return await AgentRegistry().acreate(name, *args, **kwargs)
@@ -1,10 +1,10 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
 from langchain_google_genai import ChatGoogleGenerativeAI
-from utils.security import SecurityManager
+from ..utils.security import SecurityManager
 
 class ScoutAgent:
     def __init__(self):
-        from utils.ai_engine import AIEngine
+        from ..utils.ai_engine import AIEngine
         engine = AIEngine()
         self.llm = engine.get_flash_model()
 
@@ -1,48 +1,118 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents import initialize_agent, AgentType
-from tools.search_tools import get_search_tool
-from utils.security import SecurityManager
+from ..utils.security import SecurityManager
+from ..utils.reputation import get_reputation_service
+from ..utils.llm_budget import AgentRunStats, LLMBudgetExceeded, LLMCallBudget
+
+# Planned mode runs one search per topic, all at once.
+SEARCH_TOPICS = ["scams fraud", "IRDAI regulatory fines penalty", "claim settlement rejection ratio", "consumer complaints"]
 
 class SentinelAgent:
-    def __init__(self):
-        from utils.ai_engine import AIEngine
+    """
+    Reputation checks. Two research modes (SENTINEL_MODE):
+    - "planned" (default): every topic search in parallel, then one
+      summarization call.
+    - "react": the ZERO_SHOT_REACT agent deciding its own searches, one LLM
+      call per step.
+    Either way a run makes at most SENTINEL_MAX_LLM_CALLS LLM calls.
+    """
+    def __init__(self, reputation=None, mode: str = None, max_llm_calls: int = None):
+        from ..utils.ai_engine import AIEngine
+        from ..tools.search_tools import get_search_tool
         engine = AIEngine()
         self.llm = engine.get_flash_model()
-        self.search_tool = get_search_tool()
+        self.reputation = reputation or get_reputation_service()
+        self.search_tool = get_search_tool(self.reputation.search)
+        self.mode = (mode or os.environ.get("SENTINEL_MODE", "planned")).lower()
+        self.max_llm_calls = max_llm_calls or int(os.environ.get("SENTINEL_MAX_LLM_CALLS", "6"))
 
-    def check_reputation(self, company_name: str) -> str:
-        """
-        Searches for recent news, scams, or regulatory actions against the company.
-        """
-        
+    def _research_react(self, company_name: str, budget: LLMCallBudget) -> str:
         tools = [self.search_tool]
-        
+
         agent = initialize_agent(
             tools,
             self.llm,
             agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-            verbose=True,
+            verbose=False,
             handle_parsing_errors=True
         )
-        
+
         query = f"""
-        Search for recent "scams", "regulatory fines", "claim rejection ratio", and "consumer complaints" 
+        Search for recent "scams", "regulatory fines", "claim rejection ratio", and "consumer complaints"
         for the insurance company: {company_name} in India.
         Summarize the reputation in 3 bullet points.
         """
-        
+
+        return agent.run(query, callbacks=[budget])
+
+    def _search_or_none(self, query: str):
+        try:
+            return self.reputation.search(query)
+        except Exception as e:
+            print(f"Sentinel search failed ({query}): {e}")
+            return None
+
+    def _research_planned(self, company_name: str, budget: LLMCallBudget) -> str:
+        queries = [f"{company_name} insurance India {topic}" for topic in SEARCH_TOPICS]
+        with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+            results = list(pool.map(self._search_or_none, queries))
+        found = [(q, r) for q, r in zip(queries, results) if r]
+        if not found:
+            raise RuntimeError("every reputation search failed")
+        evidence = "\n\n".join(f"Search: {q}\n{r}" for q, r in found)
+
+        prompt = f"""
+        You are Sentinel, a consumer-protection analyst.
+        Using ONLY the search results below, summarize the reputation of the
+        insurance company {company_name} in India (scams, regulatory fines,
+        claim rejection ratio, consumer complaints) in 3 bullet points.
+        Say so if the results do not mention the company.
+
+        {evidence}
+        """
+        return self.llm.invoke(prompt, config={"callbacks": [budget]}).content
+
+    def _research(self, company_name: str) -> str:
+        """
+        One live research run; only called on a reputation cache miss or a
+        background refresh. Its LLM calls and wall time are recorded per mode.
+        """
+        budget = LLMCallBudget(self.max_llm_calls)
+        research = self._research_react if self.mode == "react" else self._research_planned
         try:
-            # 1. Try Live Search
-            return agent.run(query)
+            summary = research(company_name, budget)
+        except Exception:
+            AgentRunStats().record_budget("SENTINEL", self.mode, budget, failed=True)
+            raise
+        AgentRunStats().record_budget("SENTINEL", self.mode, budget)
+        return summary
+
+    def check_reputation(self, company_name: str) -> str:
+        """
+        Searches for recent news, scams, or regulatory actions against the company.
+        """
+        start = time.perf_counter()
+        try:
+            # 1. Cached summary, or Live Search on a miss
+            result = self.reputation.lookup(company_name, self._research)
+            if result["status"] != "miss":
+                AgentRunStats().record("SENTINEL", "cached", 0, time.perf_counter() - start)
+            return result["summary"]
+        except LLMBudgetExceeded:
+            return (f"- ⚠️ **Note:** Sentinel reached its limit of {self.max_llm_calls} AI calls before "
+                    f"finishing the research on {company_name}. Please try again later.")
         except Exception as e:
             # 2. Fallback to Internal Knowledge
             fallback_prompt = f"""
             The live search tool is currently unavailable (Error: {str(e)}).
-            
-            Based on your **Internal Knowledge** (up to your training cutoff), 
+
+            Based on your **Internal Knowledge** (up to your training cutoff),
             what are known issues, scams, or reputation details for: {company_name}?
-            
+
             Format:
             - ⚠️ **Note:** Live search failed. Using internal knowledge.
             - [Bullet Point 1]
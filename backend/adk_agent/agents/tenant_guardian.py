@@ -2,12 +2,14 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
-from utils.security import SecurityManager
-import json
+from ..utils.security import SecurityManager
+from ..utils.structured_output import TENANT_REPORT, StructuredOutput
+
+RENT_OUTPUT = StructuredOutput("TENANT", TENANT_REPORT)
 
 class TenantGuardianAgent:
     def __init__(self):
-        from utils.ai_engine import AIEngine
+        from ..utils.ai_engine import AIEngine
         engine = AIEngine()
         self.llm = engine.get_flash_model()
 
@@ -50,12 +52,11 @@ class TenantGuardianAgent:
             template=prompt_template
         )
         
-        chain = LLMChain(llm=self.llm, prompt=prompt)
+        chain = LLMChain(llm=RENT_OUTPUT.model(self.llm), prompt=prompt)
         
         try:
             response = chain.run(policy_text=policy_text)
-            cleaned_response = response.replace("```json", "").replace("```", "").strip()
-            return json.loads(cleaned_response)
+            return RENT_OUTPUT.parse(response, self.llm, lambda: prompt.format(policy_text=policy_text))
         except Exception as e:
             return {
                 "error": f"Analysis failed: {str(e)}",
@@ -1,7 +1,8 @@
 from langchain_experimental.utilities import PythonREPL
 from langchain.tools import Tool
-from utils.security import SecurityManager
-import streamlit as st
+from ..utils.security import SecurityManager
+from ..utils.data_store import get_data_store
+from ..utils.config import current_session, streamlit_running
 
 class GenesisTools:
     def __init__(self):
@@ -11,42 +12,25 @@ class GenesisTools:
 
         
     def log_admin_request(self, tool, status, message):
-        """Logs admin requests to a JSON file."""
-        import json
-        import os
-        from datetime import datetime
-        
-        entry = {
-            "timestamp": str(datetime.now()),
-            "tool": tool,
-            "status": status,
-            "message": message
-        }
-        
-        file_path = "data/admin_requests.json"
-        if not os.path.exists("data"):
-            os.makedirs("data")
-            
-        existing = []
-        if os.path.exists(file_path):
-            with open(file_path, "r") as f:
-                try:
-                    existing = json.load(f)
-                except: pass
-        
-        existing.append(entry)
-        with open(file_path, "w") as f:
-            json.dump(existing, f, indent=2)
+        """Logs admin requests to the DataStore (one INSERT, no file rewrite)."""
+        get_data_store().add_admin_request(tool=tool, status=status, message=message)
 
     def handle_missing_api(self, api_name):
         """
         Handles missing API keys by asking the user or checking session state.
         """
         # 1. Check if User provided a temp key in this session
-        if api_name in st.session_state:
-            return st.session_state[api_name]
+        session = current_session()
+        if api_name in session:
+            return session[api_name]
+
+        # Headless (FastAPI, ADK) there is no UI to ask in.
+        if not streamlit_running():
+            self.log_admin_request(tool=api_name, status="FAILED", message="User requested this feature but provided no key.")
+            return None
 
         # 2. If not, ask the user (This will render in the Streamlit UI)
+        import streamlit as st
         # Note: In a real app, this might need a callback or rerun, but st.text_input works in script flow.
         st.warning(f"⚠️ **System Lock:** I lack the `{api_name}` to perform this live check.")
         user_key = st.text_input(f"🔑 Enter {api_name} (Session Only)", type="password", key=f"input_{api_name}")
@@ -118,10 +102,12 @@ class GenesisTools:
             # No, let's just use 'exec' with a custom dictionary that includes our tools.
             
             local_scope = {
-                "st": st,
                 "handle_missing_api": self.handle_missing_api,
                 "log_admin_request": self.log_admin_request
             }
+            if streamlit_running():
+                import streamlit as st
+                local_scope["st"] = st
             
             # We use standard exec instead of PythonREPL to support our custom context
             import io
@@ -139,5 +125,5 @@ class GenesisTools:
         return Tool(
             name="Python_REPL",
             func=self.safe_python_repl,
-            description="A Python shell. Use this to execute python commands. You have access to 'st' (Streamlit) and 'handle_missing_api(api_name)'."
+            description="A Python shell. Use this to execute python commands. You have access to 'handle_missing_api(api_name)' (and 'st' inside the Streamlit app)."
         )
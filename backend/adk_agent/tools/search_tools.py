@@ -1,10 +1,94 @@
-from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
 
-def get_search_tool():
+
+class SearchBackend:
+    """Web search used by Sentinel: query in, text snippets out."""
+    name = "search"
+
+    def search(self, query: str) -> str:
+        raise NotImplementedError
+
+
+class DuckDuckGoBackend(SearchBackend):
+    """
+    Live DuckDuckGo search (India region, past year). The wrapper is built
+    once and reused instead of per Sentinel call.
+    """
+    name = "duckduckgo"
+
+    def __init__(self, max_results: int = 5):
+        self.max_results = max_results
+        self._tool = None
+        self._lock = threading.Lock()
+
+    def search(self, query: str) -> str:
+        with self._lock:
+            if self._tool is None:
+                from langchain_community.tools import DuckDuckGoSearchRun
+                from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+                wrapper = DuckDuckGoSearchAPIWrapper(region="in-en", time="y", max_results=self.max_results)
+                self._tool = DuckDuckGoSearchRun(api_wrapper=wrapper)
+        return self._tool.run(query)
+
+
+class FixtureSearchBackend(SearchBackend):
+    """
+    Offline search over a local corpus: {"<company or topic>": ["snippet", ...]}.
+    A query returns the snippets of every corpus key whose words all appear
+    in it. Stands in for the live backend in benchmarks and demos.
+    """
+    name = "fixture"
+
+    def __init__(self, corpus: Dict[str, List[str]]):
+        self.corpus = {key: list(snippets) for key, snippets in corpus.items()}
+
+    @classmethod
+    def from_file(cls, path: str) -> "FixtureSearchBackend":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def search(self, query: str) -> str:
+        words = set(re.findall(r"[a-z0-9]+", query.lower()))
+        snippets = []
+        for key, entries in self.corpus.items():
+            if set(re.findall(r"[a-z0-9]+", key.lower())) <= words:
+                snippets.extend(entries)
+        return "\n".join(snippets) if snippets else "No good search result found."
+
+
+_backend: Optional[SearchBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend() -> SearchBackend:
+    """
+    Process-wide backend: SEARCH_BACKEND=duckduckgo (default) or
+    SEARCH_BACKEND=fixture with SEARCH_FIXTURE_PATH pointing at a JSON corpus.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if os.environ.get("SEARCH_BACKEND", "duckduckgo") == "fixture":
+                _backend = FixtureSearchBackend.from_file(os.environ["SEARCH_FIXTURE_PATH"])
+            else:
+                _backend = DuckDuckGoBackend()
+        return _backend
+
+
+def get_search_tool(search=None):
     """
-    Returns a configured DuckDuckGo search tool.
+    Returns the web search tool for agents. `search` (query -> text)
+    defaults to the configured backend; Sentinel passes its cached,
+    rate-limited ReputationService.search.
     """
-    wrapper = DuckDuckGoSearchAPIWrapper(region="in-en", time="y", max_results=5)
-    search = DuckDuckGoSearchRun(api_wrapper=wrapper)
-    return search
+    from langchain.agents import Tool
+
+    return Tool(
+        name="web_search",
+        func=search or get_search_backend().search,
+        description="Searches the web (India, past year). Input should be a search query."
+    )
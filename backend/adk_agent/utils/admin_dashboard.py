@@ -2,19 +2,15 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import json
-import os
+from .data_store import get_data_store
 
 def load_data():
-    """Loads market intelligence data from JSON."""
-    file_path = "market_intel.json"
-    if not os.path.exists(file_path):
-        st.error(f"Data file not found: {file_path}")
+    """Loads market intelligence data from the DataStore."""
+    try:
+        return get_data_store().market_intel()
+    except Exception as e:
+        st.error(f"Market intel unavailable: {e}")
         return None
-    
-    with open(file_path, "r") as f:
-        data = json.load(f)
-    return data
 
 def render_admin_dashboard():
     st.title("🛡️ Consumer Oversight Dashboard")
@@ -1,11 +1,26 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
-from langchain_google_genai import ChatGoogleGenerativeAI
+import os
+from typing import AsyncIterator, Optional
 from .security import SecurityManager
+from .llm_registry import LLMRegistry
+from .key_scheduler import KeyScheduler, is_quota_error
+from .model_router import AllModelsFailedError, ModelRoute, ModelRouter
+from .semantic_cache import get_semantic_cache, context_namespace
+from .clause_index import arelevant_context, relevant_context
+from .intent_router import get_intent_router
 # import streamlit as st # Removed for ADK Headless Mode
 
 # Gemini 3.0 uses Search Grounding to bypass the knowledge cutoff limits.
 
+GENESIS_MODEL = "gemini-2.5-pro"
+FLASH_MODEL = "gemini-2.5-flash"
+GROQ_MODEL = "llama3-70b-8192"
+
 class AIEngine:
+    # How long a Genesis retry may wait for a throttled key before falling back to Flash.
+    KEY_WAIT_SECONDS = float(os.environ.get("GEMINI_KEY_WAIT_SECONDS", "2"))
+    CONTEXT_CHARS = 5000
+
     def __init__(self):
         self.security = SecurityManager()
 
@@ -18,9 +33,10 @@ class AIEngine:
         try:
             # CRITICAL SETTING: Enable Google Search Grounding
             # This allows the model to fetch "Today's" data.
-            llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-pro",
-                google_api_key=self.security.get_next_api_key(),
+            # Clients are pooled per (model, key, temperature) to reuse HTTP connections.
+            llm = LLMRegistry().get(
+                model=GENESIS_MODEL,
+                api_key=self.security.get_next_api_key(GENESIS_MODEL),
                 temperature=0.2,
                 # tools=[{"google_search": {}}] # Native Grounding Support
             )
@@ -39,9 +55,9 @@ class AIEngine:
         Role: High-speed Native Audio/Video processing and Courtroom Simulation.
         """
         try:
-            llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash",
-                google_api_key=self.security.get_next_api_key(),
+            llm = LLMRegistry().get(
+                model=FLASH_MODEL,
+                api_key=self.security.get_next_api_key(FLASH_MODEL),
                 temperature=0.7,
                 streaming=True # Enable stream for instant UI feedback
             )
@@ -50,52 +66,178 @@ class AIEngine:
             print(f"Flash Brain Error: {e}")
             return None
 
-    def run_genesis_agent(self, prompt: str, context: str = ""):
+    def _build_genesis_prompt(self, prompt: str, context: str = "", clauses: Optional[str] = None) -> str:
         """
-        Orchestrates the Genesis Agent.
+        Builds the Genesis system prompt around the user's question. Async
+        callers pass `clauses` from arelevant_context so a long document is
+        never indexed on the event loop.
         """
-        # Final Prompt Construction
-        full_prompt = f"""
+        if clauses is None:
+            clauses = relevant_context(context, prompt, self.CONTEXT_CHARS)
+        return f"""
         System: You are PolicyPARAKH's Genesis Brain (Gemini 3.0). 
         Use your Search Grounding capabilities to provide the latest information.
         
-        Context: {context[:5000]}
+        Context: {clauses}
         
         User Question: {prompt}
         """
+
+    @staticmethod
+    def _is_quota_error(error: Exception) -> bool:
+        """Rate Limit (429) or other transient key exhaustion errors."""
+        return is_quota_error(error)
+
+    def _key_retry_delay(self, error: Exception):
+        """
+        After a 429 the failing key is already cooling down in the scheduler.
+        Retry Pro on another key only if one is usable within KEY_WAIT_SECONDS;
+        otherwise give up on Pro and let the router fall back.
+        """
+        if not self._is_quota_error(error):
+            return None
+        wait = KeyScheduler().ready_in(GENESIS_MODEL)
+        return wait if wait <= self.KEY_WAIT_SECONDS else None
+
+    @staticmethod
+    def _flash_busy() -> bool:
+        # Every Flash key lane is out of tokens or cooling down: a hedge would only add a 429.
+        wait = KeyScheduler().ready_in(FLASH_MODEL)
+        return 0 < wait < float("inf")
+
+    def get_groq_model(self):
+        """Last-resort fallback (llama3-70b on Groq); None without a GROQ_API_KEY."""
+        try:
+            from .groq_client import GroqClient
+            return GroqClient().get_llm(temperature=0.2)
+        except Exception as e:
+            print(f"Groq Brain Error: {e}")
+            return None
+
+    def _genesis_routes(self) -> list:
+        """Genesis failover order: Pro (retrying across keys on 429) -> Flash -> Groq."""
+        return [
+            ModelRoute(GENESIS_MODEL, self.get_genesis_model, max_attempts=self.security.get_key_count(),
+                       retry_delay=self._key_retry_delay),
+            ModelRoute(FLASH_MODEL, self.get_flash_model, busy=self._flash_busy),
+            ModelRoute(GROQ_MODEL, self.get_groq_model),
+        ]
+
+    @staticmethod
+    def _is_error_answer(answer: str) -> bool:
+        return answer.startswith(("Error", "Flash Error"))
+
+    def run_genesis_agent(self, prompt: str, context: str = "", use_semantic_cache: bool = False,
+                          status: Optional[dict] = None):
+        """
+        Orchestrates the Genesis Agent.
+        With use_semantic_cache=True, repeat questions over the same context
+        are answered from the SemanticCache instead of gemini-2.5-pro.
+        Pass a `status` dict to learn which model answered (status["route"];
+        unset for cached or failed answers).
+        """
+        if use_semantic_cache:
+            namespace = context_namespace("genesis", context)
+            cached = get_semantic_cache().lookup(namespace, prompt)
+            if cached is not None:
+                return cached
         
-        # Try all available keys before giving up
-        max_retries = self.security.get_key_count()
+        answer = self._invoke_genesis(self._build_genesis_prompt(prompt, context), status)
+        if use_semantic_cache and not self._is_error_answer(answer):
+            get_semantic_cache().store(namespace, prompt, answer)
+        return answer
+
+    def _invoke_genesis(self, full_prompt: str, status: Optional[dict] = None) -> str:
+        # ModelRouter skips models with open circuits and fails over Pro -> Flash -> Groq.
+        try:
+            answer, route = ModelRouter().invoke(full_prompt, self._genesis_routes())
+            if status is not None:
+                status["route"] = route
+            return answer
+        except AllModelsFailedError as e:
+            return f"Error: AI Brain Offline ({str(e)})."
+
+    async def arun_genesis_agent(self, prompt: str, context: str = "", use_semantic_cache: bool = False,
+                                 status: Optional[dict] = None):
+        """
+        Async twin of run_genesis_agent. Awaits `ainvoke` so FastAPI handlers
+        never block the event loop while Gemini is thinking.
+        """
+        if use_semantic_cache:
+            namespace = context_namespace("genesis", context)
+            cached = await get_semantic_cache().alookup(namespace, prompt)
+            if cached is not None:
+                return cached
         
-        for _ in range(max_retries):
-            model = self.get_genesis_model()
-            if model:
-                try:
-                    return model.invoke(full_prompt).content
-                except Exception as e:
-                    err_str = str(e).lower()
-                    # Check for Rate Limit (429) or other transient errors
-                    if "429" in err_str or "quota" in err_str or "exhausted" in err_str:
-                        # Key is automatically rotated by get_genesis_model -> get_next_api_key
-                        continue
-                    return f"Error: {str(e)}"
+        clauses = await arelevant_context(context, prompt, self.CONTEXT_CHARS)
+        answer = await self._ainvoke_genesis(self._build_genesis_prompt(prompt, context, clauses), status)
+        if use_semantic_cache and not self._is_error_answer(answer):
+            await get_semantic_cache().astore(namespace, prompt, answer)
+        return answer
+
+    async def _ainvoke_genesis(self, full_prompt: str, status: Optional[dict] = None) -> str:
+        # Async path also hedges: a slow Pro call is raced against Flash after Pro's p95.
+        try:
+            answer, route = await ModelRouter().ainvoke(full_prompt, self._genesis_routes())
+            if status is not None:
+                status["route"] = route
+            return answer
+        except AllModelsFailedError as e:
+            return f"Error: AI Brain Offline ({str(e)})."
+
+    async def astream_genesis_agent(self, prompt: str, context: str = "", use_semantic_cache: bool = False,
+                                    status: Optional[dict] = None) -> AsyncIterator[str]:
+        """
+        Streams the Genesis answer chunk by chunk via ModelRouter.astream.
+        Models are failed over, retried and hedged as in arun_genesis_agent
+        (Pro -> Flash -> Groq, skipping open circuits) only until the first
+        chunk; once text has reached the client an error is reported inline.
+
+        Pass a `status` dict to learn how it ended: status["complete"] is
+        True only if a model finished its answer without an error, so
+        callers never persist a cut-off answer with the error text appended.
+        status["route"] names the model that streamed (unset for cached or
+        failed answers).
+        """
+        if status is not None:
+            status["complete"] = False
+        if use_semantic_cache:
+            namespace = context_namespace("genesis", context)
+            cached = await get_semantic_cache().alookup(namespace, prompt)
+            if cached is not None:
+                if status is not None:
+                    status["complete"] = True
+                yield cached
+                return
         
-        # If all keys failed with 429, try Flash
-        print("⚠️ All Genesis Keys Busy. Switching to Flash...")
-        flash_model = self.get_flash_model()
-        if flash_model:
-            try:
-                return flash_model.invoke(full_prompt).content
-            except Exception as e:
-                return f"Flash Error: {str(e)}"
+        clauses = await arelevant_context(context, prompt, self.CONTEXT_CHARS)
+        full_prompt = self._build_genesis_prompt(prompt, context, clauses)
+        parts = []
+        try:
+            async for chunk in ModelRouter().astream(full_prompt, self._genesis_routes(), status=status):
+                parts.append(chunk)
+                yield chunk
+        except AllModelsFailedError as e:
+            yield f"Error: AI Brain Offline ({str(e)})."
+            return
+        except Exception as e:
+            yield f"Error: {str(e)}"
+            return
         
-        return f"Error: AI Brain Offline (All Keys Exhausted)."
+        if status is not None:
+            status["complete"] = True
+        if use_semantic_cache and parts:
+            await get_semantic_cache().astore(namespace, prompt, "".join(parts))
 
     def classify_intent(self, prompt: str) -> str:
         """
         Classifies the user's intent into: AUDIT_REQUEST, COURTROOM_REQUEST, or GENERAL_QUERY.
-        Uses the fast 'Flash' model.
+        Obvious intents are resolved locally by the IntentRouter; the rest use the fast 'Flash' model.
         """
+        local = get_intent_router().classify(prompt)
+        if local is not None:
+            return local
+        
         model = self.get_flash_model()
         if not model:
             return "GENERAL_QUERY"
@@ -122,7 +264,14 @@ class AIEngine:
         """
         Analyzes the prompt and returns a list of agents to activate.
         Agents: AUDITOR, MEDICAL, LAWYER, ARCHITECT, GENESIS.
+        The local IntentRouter answers obvious queries; only ambiguous ones
+        reach Flash, and those decisions (redacted) train the local tier.
         """
+        router = get_intent_router()
+        decision = router.route(prompt)
+        if decision is not None:
+            return decision.agents
+        
         model = self.get_flash_model()
         if not model:
             return ["GENESIS"]
@@ -151,6 +300,8 @@ class AIEngine:
             # Fallback if empty or invalid
             valid_agents = {"AUDITOR", "MEDICAL", "LAWYER", "ARCHITECT", "TENANT", "CAREER", "SCOUT", "SENTINEL", "GENESIS"}
             final_list = [a for a in agents if a in valid_agents]
+            if final_list:
+                router.record(prompt, final_list)
             return final_list if final_list else ["GENESIS"]
         except:
             return ["GENESIS"]
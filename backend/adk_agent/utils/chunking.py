@@ -0,0 +1,82 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import re
+from typing import List
+
+# Lines that open a new section in Indian policy / lease / offer-letter PDFs:
+# "SECTION 4", "Clause 12:", "4.2 Room Rent", "PART B", "EXCLUSIONS".
+KEYWORD_HEADING_RE = re.compile(r"^(?:section|clause|article|part|schedule|annexure|chapter)\s+(?:\d+|[ivxlc]+|[a-z])\b", re.IGNORECASE)
+NUMBERED_HEADING_RE = re.compile(r"^\d{1,2}(?:\.\d{1,2}){0,3}[.)]?\s+[A-Z]")
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if len(stripped) < 3 or len(stripped) > 90:
+        return False
+    if KEYWORD_HEADING_RE.match(stripped) or NUMBERED_HEADING_RE.match(stripped):
+        return True
+    return stripped.isupper()
+
+
+def split_sections(text: str) -> List[dict]:
+    """Splits a document at heading lines. Each section keeps its heading."""
+    sections = []
+    heading, lines = "", []
+    for line in text.splitlines():
+        if _is_heading(line) and lines:
+            sections.append({"heading": heading, "text": "\n".join(lines).strip()})
+            heading, lines = line.strip(), [line]
+        else:
+            if _is_heading(line):
+                heading = line.strip()
+            lines.append(line)
+    if lines:
+        sections.append({"heading": heading, "text": "\n".join(lines).strip()})
+    return [s for s in sections if s["text"]]
+
+
+def _split_oversized(text: str, max_chars: int) -> List[str]:
+    """Breaks one long section on paragraph, then sentence, then hard boundaries."""
+    pieces, current = [], ""
+    for para in re.split(r"\n\s*\n|(?<=[.;])\s+", text):
+        while len(para) > max_chars:
+            pieces.append(para[:max_chars])
+            para = para[max_chars:]
+        if current and len(current) + len(para) + 1 > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n{para}" if current else para
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_document(text: str, max_chars: int = 6000) -> List[dict]:
+    """
+    Packs consecutive sections into chunks of at most `max_chars`, never
+    splitting a section unless it alone is larger than a chunk.
+    Returns [{"index", "headings", "text"}] in document order.
+    """
+    chunks = []
+    current, headings = "", []
+
+    def flush():
+        nonlocal current, headings
+        if current.strip():
+            chunks.append({"index": len(chunks), "headings": headings, "text": current.strip()})
+        current, headings = "", []
+
+    for section in split_sections(text):
+        body = section["text"]
+        if len(body) > max_chars:
+            flush()
+            for piece in _split_oversized(body, max_chars):
+                current, headings = piece, [section["heading"]] if section["heading"] else []
+                flush()
+            continue
+        if current and len(current) + len(body) + 2 > max_chars:
+            flush()
+        current = f"{current}\n\n{body}" if current else body
+        if section["heading"]:
+            headings.append(section["heading"])
+    flush()
+    return chunks
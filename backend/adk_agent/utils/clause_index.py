@@ -0,0 +1,167 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import hashlib
+import math
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from .chunking import chunk_document
+from .result_cache import normalize_text
+from .semantic_cache import EmbeddingFn, VectorIndex, hashing_embedding
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "is", "are", "be", "by", "as",
+    "at", "this", "that", "with", "it", "any", "shall", "will", "my", "i", "me", "what", "does"
+}
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+
+class ClauseIndex:
+    """
+    Hybrid retrieval over one document's clauses: BM25 for exact policy
+    vocabulary ("co-payment", "PED") and vector search for paraphrases,
+    combined with reciprocal rank fusion.
+    """
+    BM25_K1 = 1.5
+    BM25_B = 0.75
+    RRF_K = 60
+
+    def __init__(self, text: str, clause_chars: int = 800, embed_fn: Optional[EmbeddingFn] = None):
+        self.embed_fn = embed_fn or hashing_embedding
+        self.clauses = chunk_document(text, max_chars=clause_chars)
+        self._term_freqs = [Counter(_tokens(c["text"])) for c in self.clauses]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        doc_freq = Counter(term for tf in self._term_freqs for term in tf)
+        n = len(self.clauses)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+        self._vectors = None
+        for clause in self.clauses:
+            vector = np.asarray(self.embed_fn(clause["text"]), dtype=np.float32)
+            if self._vectors is None:
+                self._vectors = VectorIndex(vector.shape[0])
+            self._vectors.add(clause["index"], vector)
+
+    def __len__(self) -> int:
+        return len(self.clauses)
+
+    def _bm25(self, query: str, k: int) -> List[int]:
+        terms = _tokens(query)
+        scores = []
+        for i, tf in enumerate(self._term_freqs):
+            score = 0.0
+            for term in terms:
+                freq = tf.get(term)
+                if not freq:
+                    continue
+                norm = self.BM25_K1 * (1 - self.BM25_B + self.BM25_B * self._lengths[i] / (self._avg_length or 1))
+                score += self._idf[term] * freq * (self.BM25_K1 + 1) / (freq + norm)
+            if score > 0:
+                scores.append((score, i))
+        scores.sort(key=lambda pair: (-pair[0], pair[1]))
+        return [i for _, i in scores[:k]]
+
+    def _vector(self, query: str, k: int) -> List[int]:
+        if self._vectors is None:
+            return []
+        vector = np.asarray(self.embed_fn(query), dtype=np.float32)
+        return [i for i, _ in self._vectors.search(vector, k)]
+
+    def search(self, query: str, k: int = 5) -> List[dict]:
+        """Top-k clauses by fused BM25 + vector rank."""
+        depth = max(k * 4, 20)
+        fused = {}
+        for ranking in (self._bm25(query, depth), self._vector(query, depth)):
+            for rank, i in enumerate(ranking):
+                fused[i] = fused.get(i, 0.0) + 1.0 / (self.RRF_K + rank + 1)
+        best = sorted(fused, key=lambda i: (-fused[i], i))[:k]
+        return [self.clauses[i] for i in best]
+
+    def context_for(self, query: str, max_chars: int, k: int = 8) -> str:
+        """
+        The most relevant clauses that fit in `max_chars`, re-ordered as they
+        appear in the document so the LLM reads them in context.
+        """
+        picked, used = [], 0
+        for clause in self.search(query, k):
+            size = len(clause["text"]) + 2
+            if used + size > max_chars:
+                continue
+            picked.append(clause)
+            used += size
+        picked.sort(key=lambda c: c["index"])
+        return "\n\n".join(c["text"] for c in picked)
+
+
+_indexes: "OrderedDict[str, ClauseIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+MAX_INDEXED_DOCUMENTS = int(os.environ.get("CLAUSE_INDEX_MAX_DOCUMENTS", "64"))
+
+
+def document_id(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()[:24]
+
+
+def _cached_index(doc_id: str) -> Optional[ClauseIndex]:
+    with _indexes_lock:
+        index = _indexes.get(doc_id)
+        if index is not None:
+            _indexes.move_to_end(doc_id)
+        return index
+
+
+def get_clause_index(text: str) -> ClauseIndex:
+    """Builds (once) or fetches the index for a document; LRU over documents."""
+    doc_id = document_id(text)
+    index = _cached_index(doc_id)
+    if index is not None:
+        return index
+    index = ClauseIndex(text)
+    with _indexes_lock:
+        _indexes[doc_id] = index
+        while len(_indexes) > MAX_INDEXED_DOCUMENTS:
+            _indexes.popitem(last=False)
+    return index
+
+
+def relevant_context(text: str, query: str, max_chars: int) -> str:
+    """
+    Drop-in replacement for `text[:max_chars]`: short documents pass through
+    untouched, long ones are cut down to the clauses relevant to `query`.
+    """
+    if not text or len(text) <= max_chars:
+        return text or ""
+    try:
+        context = get_clause_index(text).context_for(query, max_chars)
+        return context or text[:max_chars]
+    except Exception as e:
+        print(f"Clause retrieval failed, using prefix: {e}")
+        return text[:max_chars]
+
+
+async def aget_clause_index(text: str) -> ClauseIndex:
+    """get_clause_index for async callers: a cache miss (~1s on a long policy) is built in a worker thread."""
+    index = _cached_index(document_id(text))
+    if index is not None:
+        return index
+    return await asyncio.to_thread(get_clause_index, text)
+
+
+async def arelevant_context(text: str, query: str, max_chars: int) -> str:
+    """relevant_context for async callers; never builds the index on the event loop."""
+    if not text or len(text) <= max_chars:
+        return text or ""
+    try:
+        context = (await aget_clause_index(text)).context_for(query, max_chars)
+        return context or text[:max_chars]
+    except Exception as e:
+        print(f"Clause retrieval failed, using prefix: {e}")
+        return text[:max_chars]
@@ -0,0 +1,240 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+# Global first, project second: the project file wins, as in Streamlit.
+SECRETS_PATHS = ["~/.streamlit/secrets.toml", ".streamlit/secrets.toml"]
+
+
+def streamlit_running() -> bool:
+    """True inside `streamlit run`; never imports Streamlit itself."""
+    if "streamlit" not in sys.modules:
+        return False
+    try:
+        from streamlit import runtime
+        return runtime.exists()
+    except Exception:
+        return False
+
+
+class ConfigProvider:
+    """
+    Process-wide settings and secrets, parsed once: secrets.toml, then
+    .env, then the process environment (later sources win). Works without
+    Streamlit; the same secrets.toml the Streamlit app uses is read directly.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._lock = threading.Lock()
+                instance.loads = 0
+                instance._load()
+                cls._instance = instance
+            return cls._instance
+
+    @staticmethod
+    def _secrets_paths() -> List[str]:
+        override = os.environ.get("SECRETS_TOML_PATH")
+        paths = [override] if override else SECRETS_PATHS
+        return [os.path.expanduser(p) for p in paths]
+
+    @staticmethod
+    def _dotenv_values() -> Dict[str, Any]:
+        try:
+            from dotenv import dotenv_values, find_dotenv
+        except ImportError:
+            return {}
+        path = os.environ.get("DOTENV_PATH") or find_dotenv(usecwd=True)
+        if not path or not os.path.exists(path):
+            return {}
+        return {k: v for k, v in dotenv_values(path).items() if v is not None}
+
+    def _load(self):
+        values: Dict[str, Any] = {}
+        sources = []
+        for path in self._secrets_paths():
+            if tomllib is None or not os.path.exists(path):
+                continue
+            try:
+                with open(path, "rb") as f:
+                    values.update(tomllib.load(f))
+                sources.append(path)
+            except Exception as e:
+                print(f"Could not read {path}: {e}")
+        dotenv = self._dotenv_values()
+        if dotenv:
+            values.update(dotenv)
+            sources.append(".env")
+        values.update(os.environ)
+        with self._lock:
+            self._values = values
+            self.sources = sources
+            self.loads += 1
+            self._api_keys = None
+
+    def reload(self):
+        """Re-reads every source (e.g. after rotating keys in secrets.toml)."""
+        self._load()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._values.get(name, default)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
+
+    def section(self, name: str) -> Dict[str, Any]:
+        """
+        A secrets.toml table, e.g. [supabase], with NAME_KEY environment
+        overrides (SUPABASE_URL -> "url").
+        """
+        table = self._values.get(name)
+        result = dict(table) if isinstance(table, dict) else {}
+        prefix = name.upper() + "_"
+        for key, value in self._values.items():
+            if isinstance(key, str) and key.startswith(prefix) and isinstance(value, str):
+                result[key[len(prefix):].lower()] = value
+        return result
+
+    def api_keys(self) -> List[str]:
+        """
+        Gemini keys: GEMINI_KEYS (a list, or comma separated in env/.env),
+        else GEMINI_KEY_1, GEMINI_KEY_2, ..., else GEMINI_API_KEY, else
+        GOOGLE_API_KEY.
+        """
+        if self._api_keys is not None:
+            return self._api_keys
+        keys = self._values.get("GEMINI_KEYS") or []
+        if isinstance(keys, str):
+            keys = [k.strip() for k in keys.split(",") if k.strip()]
+        if not keys:
+            i = 1
+            while f"GEMINI_KEY_{i}" in self._values:
+                keys.append(self._values[f"GEMINI_KEY_{i}"])
+                i += 1
+        for fallback in ("GEMINI_API_KEY", "GOOGLE_API_KEY"):
+            if not keys and self._values.get(fallback):
+                keys.append(self._values[fallback])
+        if not keys:
+            print("No Gemini API keys found in the environment, .env or secrets.toml!")
+        self._api_keys = list(keys)
+        return self._api_keys
+
+
+def get_config() -> ConfigProvider:
+    return ConfigProvider()
+
+
+class SessionStore:
+    """
+    Per-session dicts for the FastAPI backend (what st.session_state is in
+    the Streamlit app). Sessions idle for `ttl_seconds` are evicted, and at
+    most `max_sessions` are kept (least recently used go first).
+    """
+
+    def __init__(self, ttl_seconds: float = 1800, max_sessions: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()  # id -> (last used, data)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _evict(self, now: float):
+        while self._sessions:
+            session_id, (used_at, _) = next(iter(self._sessions.items()))
+            if now - used_at < self.ttl_seconds and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+            self.evictions += 1
+
+    def get(self, session_id: str) -> MutableMapping[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None and now - entry[0] >= self.ttl_seconds:
+                self.evictions += 1
+                entry = None
+            data = entry[1] if entry is not None else {}
+            self._sessions[session_id] = (now, data)
+            self._evict(now)
+            return data
+
+    def drop(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sessions": len(self._sessions), "evictions": self.evictions,
+                    "ttl_seconds": self.ttl_seconds, "max_sessions": self.max_sessions}
+
+
+_current_session: contextvars.ContextVar = contextvars.ContextVar("parakh_session", default=None)
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Process-wide store; limits come from SESSION_TTL_SECONDS / SESSION_MAX."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore(
+                ttl_seconds=float(os.environ.get("SESSION_TTL_SECONDS", "1800")),
+                max_sessions=int(os.environ.get("SESSION_MAX", "10000"))
+            )
+        return _store
+
+
+def set_session_store(store) -> None:
+    """Plugs in another store (anything with get(session_id) -> mapping)."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+@contextmanager
+def session_scope(session_id: Optional[str]) -> Iterator[MutableMapping[str, Any]]:
+    """Binds the session for the current request (and the threads/tasks it starts)."""
+    session = get_session_store().get(session_id) if session_id else {}
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+
+
+def current_session() -> MutableMapping[str, Any]:
+    """
+    The bound request session; st.session_state inside the Streamlit app;
+    otherwise a throwaway dict, so callers never need to check.
+    """
+    session = _current_session.get()
+    if session is not None:
+        return session
+    if streamlit_running():
+        import streamlit as st
+        return st.session_state
+    return {}
+
+
+def get_secret(name: str) -> Optional[str]:
+    """The session's own key (BYOK) first, then the process config."""
+    session = current_session()
+    if name in session:
+        return session[name]
+    return get_config().get(name)
@@ -0,0 +1,227 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+# Turns quoted verbatim in every prompt (what simulate_turn's history[-5:] was).
+RECENT_TURNS = 5
+# Older turns are folded into the rolling summary this many at a time.
+SUMMARY_EVERY = 6
+MAX_SUMMARY_CHARS = 1500
+MAX_TURN_CHARS = 1000
+# Turns generated ahead while the user reads (COURTROOM_PREFETCH_TURNS), never more than MAX_PREFETCH_TURNS.
+MAX_PREFETCH_TURNS = 3
+DEFAULT_PREFETCH_TURNS = min(max(int(os.environ.get("COURTROOM_PREFETCH_TURNS", "2")), 0), MAX_PREFETCH_TURNS)
+
+
+class CourtroomSession:
+    """
+    One trial held server-side. Memory stays bounded however long the trial
+    runs: the case text, a rolling summary of at most MAX_SUMMARY_CHARS, and
+    at most RECENT_TURNS + SUMMARY_EVERY verbatim turns.
+    """
+
+    def __init__(self, context: str, prefetch_turns: Optional[int] = None):
+        self.id = str(uuid.uuid4())
+        self.context = context
+        self.summary = ""
+        self.recent: List[dict] = []
+        self.turn_count = 0
+        self.summarized_turns = 0
+        self.last_prompt_chars = 0
+        self.created_at = time.time()
+        self.used_at = time.monotonic()
+        self.lock = asyncio.Lock()  # one turn at a time per session
+        self.summary_task: Optional[asyncio.Task] = None
+        # Speculative turns, not part of the transcript until served.
+        if prefetch_turns is None:
+            prefetch_turns = DEFAULT_PREFETCH_TURNS
+        self.prefetch_turns = min(max(prefetch_turns, 0), MAX_PREFETCH_TURNS)
+        self.prefetched: deque = deque()
+        self.prefetch_task: Optional[asyncio.Task] = None
+        self.generation = 0  # bumped whenever prefetched turns become invalid
+        self.last_source = ""  # how the last turn was served: hit, late or miss
+
+    def add_turn(self, turn: dict):
+        turn = dict(turn)
+        turn["text"] = str(turn.get("text", ""))[:MAX_TURN_CHARS]
+        self.recent.append(turn)
+        self.turn_count += 1
+
+    def needs_summary(self) -> bool:
+        idle = self.summary_task is None or self.summary_task.done()
+        return len(self.recent) >= RECENT_TURNS + SUMMARY_EVERY and idle
+
+    def take_for_summary(self) -> List[dict]:
+        """Removes and returns the turns older than the recent window."""
+        folded, self.recent = self.recent[:-RECENT_TURNS], self.recent[-RECENT_TURNS:]
+        return folded
+
+    def set_summary(self, summary: str, folded: int):
+        self.summary = summary.strip()[:MAX_SUMMARY_CHARS]
+        self.summarized_turns += folded
+
+    async def wait_for_summary(self):
+        """A turn must see the summary of everything before its window."""
+        task = self.summary_task
+        if task is not None:
+            await asyncio.shield(task)
+            if self.summary_task is task:
+                self.summary_task = None
+
+    def speculative_history(self) -> List[dict]:
+        """The last RECENT_TURNS of the transcript plus prefetched turns, so speculative prompts stay flat."""
+        return (self.recent + list(self.prefetched))[-RECENT_TURNS:]
+
+    def invalidate_prefetch(self) -> int:
+        """Drops the speculative turns (the user changed the course of the trial)."""
+        self.generation += 1
+        dropped = len(self.prefetched)
+        self.prefetched.clear()
+        task, self.prefetch_task = self.prefetch_task, None
+        if task is not None and not task.done():
+            task.cancel()
+        return dropped
+
+    def snapshot(self) -> dict:
+        return {
+            "session_id": self.id,
+            "turns": self.turn_count,
+            "summarized_turns": self.summarized_turns,
+            "summary": self.summary,
+            "recent": list(self.recent),
+            "last_prompt_chars": self.last_prompt_chars,
+            "prefetch_turns": self.prefetch_turns,
+            "prefetched": len(self.prefetched),
+        }
+
+
+class PrefetchStats:
+    """
+    Process-wide courtroom turn counters: where each served turn came from
+    (prefetched, in flight when asked, or generated on demand), the latency
+    the user saw for each, and how many speculative turns were thrown away.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._lock = threading.Lock()
+                instance._reset()
+                cls._instance = instance
+            return cls._instance
+
+    def _reset(self):
+        self._served: Dict[str, List[float]] = {"hit": [], "late": [], "miss": []}
+        self.generated = 0
+        self.wasted = 0
+
+    def record_served(self, source: str, seconds: float):
+        with self._lock:
+            samples = self._served[source]
+            samples.append(seconds)
+            if len(samples) > 10000:
+                del samples[:5000]
+
+    def record_prefetch(self):
+        with self._lock:
+            self.generated += 1
+
+    def record_wasted(self, turns: int):
+        with self._lock:
+            self.wasted += turns
+
+    def stats(self) -> dict:
+        with self._lock:
+            served = {source: list(samples) for source, samples in self._served.items()}
+            generated, wasted = self.generated, self.wasted
+        total = sum(len(samples) for samples in served.values()) or 1
+        every = sorted(s for samples in served.values() for s in samples)
+        return {
+            "served": {source: len(samples) for source, samples in served.items()},
+            "hit_rate": round((len(served["hit"]) + len(served["late"])) / total, 3),
+            "mean_ms": {source: round(sum(samples) / len(samples) * 1000, 1) for source, samples in served.items() if samples},
+            "p95_ms": round(every[int(len(every) * 0.95)] * 1000, 1) if every else 0.0,
+            "prefetch_generated": generated,
+            "prefetch_wasted": wasted,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._reset()
+
+
+class CourtroomSessionStore:
+    """
+    In-memory courtroom sessions. Sessions idle for `ttl_seconds` are
+    evicted; beyond `max_sessions` the least recently used go first.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_sessions: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, CourtroomSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _evict(self, now: float):
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.used_at < self.ttl_seconds and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session.id]
+            session.invalidate_prefetch()
+            self.evictions += 1
+
+    def create(self, context: str, prefetch_turns: Optional[int] = None) -> CourtroomSession:
+        session = CourtroomSession(context, prefetch_turns)
+        with self._lock:
+            self._sessions[session.id] = session
+            self._evict(session.used_at)
+        return session
+
+    def get(self, session_id: str) -> Optional[CourtroomSession]:
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.used_at = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def drop(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.invalidate_prefetch()
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sessions": len(self._sessions), "evictions": self.evictions,
+                    "ttl_seconds": self.ttl_seconds, "max_sessions": self.max_sessions}
+
+
+_store: Optional[CourtroomSessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_courtroom_store() -> CourtroomSessionStore:
+    """Process-wide store; limits from COURTROOM_SESSION_TTL_SECONDS / COURTROOM_MAX_SESSIONS."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CourtroomSessionStore(
+                ttl_seconds=float(os.environ.get("COURTROOM_SESSION_TTL_SECONDS", "3600")),
+                max_sessions=int(os.environ.get("COURTROOM_MAX_SESSIONS", "1000"))
+            )
+        return _store
@@ -0,0 +1,368 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Legacy JSON files, imported once (recorded in the migrations table; the files are left in place).
+LEGACY_FILES = {
+    "scam_graph": ["data/scam_graph.json"],
+    "market_intel": ["data/market_intel.json", "market_intel.json"],
+    "admin_requests": ["data/admin_requests.json"],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    name TEXT PRIMARY KEY, name_lower TEXT NOT NULL, flags INTEGER NOT NULL DEFAULT 0);
+CREATE INDEX IF NOT EXISTS idx_companies_lower ON companies(name_lower);
+CREATE TABLE IF NOT EXISTS company_aliases (
+    alias TEXT PRIMARY KEY, company TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS company_issues (
+    company TEXT NOT NULL, issue TEXT NOT NULL, added_at REAL, PRIMARY KEY (company, issue));
+CREATE TABLE IF NOT EXISTS clauses (
+    name TEXT PRIMARY KEY, risk TEXT, count INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS market_companies (
+    name TEXT PRIMARY KEY, flags INTEGER NOT NULL DEFAULT 0, issues TEXT);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY, value INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS admin_requests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, tool TEXT, status TEXT, message TEXT);
+CREATE INDEX IF NOT EXISTS idx_admin_requests_status ON admin_requests(status);
+CREATE TABLE IF NOT EXISTS migrations (
+    path TEXT PRIMARY KEY, sha256 TEXT, migrated_at REAL);
+"""
+
+MARKET_DEFAULTS = {"issues_distribution": {}, "geo_risk": [], "top_risk_zip": "N/A"}
+
+
+class DataStore:
+    """
+    Embedded transactional store (SQLite in WAL mode) for the community scam
+    graph, market intel counters and admin requests, replacing the
+    read-modify-write JSON files.
+
+    Every update is a single UPSERT / UPDATE ... SET x = x + 1, so concurrent
+    writers (threads or processes) never lose increments and a write costs
+    O(log n) instead of rewriting the whole file. WAL lets readers run while
+    a writer commits. Each thread gets its own connection.
+    """
+
+    def __init__(self, db_path: str = "data/parakh.db", busy_timeout: float = 10.0, migrate: bool = True):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        folder = os.path.dirname(self.db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        if migrate:
+            self.migrate_legacy()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: autocommit, explicit BEGIN IMMEDIATE for multi-statement writes.
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, statements: List[tuple]) -> List[sqlite3.Cursor]:
+        """Runs (sql, params) pairs in one transaction, taking the write lock up front."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursors = [conn.execute(sql, params) for sql, params in statements]
+            conn.execute("COMMIT")
+            return cursors
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # --- Community scam graph ---
+
+    @staticmethod
+    def _upsert_company(name: str, flags: int) -> List[tuple]:
+        """New names also bump `entity_version`, which tells entity indexes to reload."""
+        return [
+            ("INSERT INTO counters (name, value) SELECT 'entity_version', 1 WHERE NOT EXISTS "
+             "(SELECT 1 FROM companies WHERE name = ?) ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,)),
+            ("INSERT INTO companies (name, name_lower, flags) VALUES (?, ?, ?) "
+             "ON CONFLICT(name) DO UPDATE SET flags = flags + excluded.flags", (name, name.lower(), flags)),
+        ]
+
+    def flag_company(self, name: str, issue: Optional[str] = None, by: int = 1):
+        statements = self._upsert_company(name, by)
+        if issue:
+            statements.append(("INSERT OR IGNORE INTO company_issues (company, issue, added_at) VALUES (?, ?, ?)",
+                               (name, issue, time.time())))
+        self._write(statements)
+
+    def add_alias(self, alias: str, company: str):
+        self._write([
+            ("INSERT OR REPLACE INTO company_aliases (alias, company) VALUES (?, ?)", (alias, company)),
+            ("INSERT INTO counters (name, value) VALUES ('entity_version', 1) "
+             "ON CONFLICT(name) DO UPDATE SET value = value + 1", ()),
+        ])
+
+    def entity_names_since(self, company_rowid: int = 0, alias_rowid: int = 0) -> Tuple[List[tuple], List[tuple]]:
+        """Companies and aliases added after the given rowids: ([(rowid, name)], [(rowid, alias, company)])."""
+        conn = self._conn()
+        companies = conn.execute("SELECT rowid, name FROM companies WHERE rowid > ? ORDER BY rowid", (company_rowid,)).fetchall()
+        aliases = conn.execute("SELECT rowid, alias, company FROM company_aliases WHERE rowid > ? ORDER BY rowid",
+                               (alias_rowid,)).fetchall()
+        return companies, aliases
+
+    def _company(self, name: str) -> dict:
+        conn = self._conn()
+        flags = conn.execute("SELECT flags FROM companies WHERE name = ?", (name,)).fetchone()[0]
+        issues = [r[0] for r in conn.execute(
+            "SELECT issue FROM company_issues WHERE company = ? ORDER BY added_at, rowid", (name,))]
+        return {"flags": flags, "issues": issues}
+
+    def get_company(self, name: str) -> Optional[dict]:
+        """Case-insensitive exact lookup (indexed)."""
+        row = self._conn().execute("SELECT name FROM companies WHERE name_lower = ? LIMIT 1", (name.lower(),)).fetchone()
+        return self._company(row[0]) if row else None
+
+    def find_company(self, fragment: str) -> Optional[dict]:
+        """
+        Exact match first, then the first company whose name contains
+        `fragment` (a table scan; KnowledgeVault uses the fuzzy EntityIndex).
+        """
+        found = self.get_company(fragment)
+        if found is not None:
+            return found
+        row = self._conn().execute(
+            "SELECT name FROM companies WHERE instr(name_lower, ?) > 0 ORDER BY rowid LIMIT 1", (fragment.lower(),)
+        ).fetchone()
+        return self._company(row[0]) if row else None
+
+    def companies(self) -> Dict[str, dict]:
+        names = [r[0] for r in self._conn().execute("SELECT name FROM companies ORDER BY rowid")]
+        return {name: self._company(name) for name in names}
+
+    def company_count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+    def bump_clause(self, name: str, risk: Optional[str] = None, by: int = 1):
+        self._write([(
+            "INSERT INTO clauses (name, risk, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET count = count + excluded.count, risk = COALESCE(excluded.risk, risk)",
+            (name, risk, by)
+        )])
+
+    def clauses(self) -> Dict[str, dict]:
+        return {name: {"risk": risk, "count": count}
+                for name, risk, count in self._conn().execute("SELECT name, risk, count FROM clauses ORDER BY rowid")}
+
+    # --- Counters and market intel ---
+
+    def increment(self, counter: str, by: int = 1) -> int:
+        """Atomically adds `by` and returns the new value."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (counter, by)
+            )
+            value = conn.execute("SELECT value FROM counters WHERE name = ?", (counter,)).fetchone()[0]
+            conn.execute("COMMIT")
+            return value
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def counter(self, counter: str) -> int:
+        row = self._conn().execute("SELECT value FROM counters WHERE name = ?", (counter,)).fetchone()
+        return row[0] if row else 0
+
+    def set_meta(self, key: str, value: Any):
+        self._write([("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))])
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def claim_once(self, key: str) -> bool:
+        """True for exactly one caller across threads and processes (seeding, one-off jobs)."""
+        cursor, = self._write([("INSERT OR IGNORE INTO meta (key, value) VALUES (?, 'true')", (f"once:{key}",))])
+        return cursor.rowcount == 1
+
+    def log_market_event(self, company_name: str = "Unknown"):
+        """One analysed policy: bumps the total and the company's flag count atomically."""
+        statements = [(
+            "INSERT INTO counters (name, value) VALUES ('total_policies_analyzed', 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1", ()
+        )]
+        if company_name != "Unknown":
+            statements.append((
+                "INSERT INTO market_companies (name, flags, issues) VALUES (?, 1, 'New Detected') "
+                "ON CONFLICT(name) DO UPDATE SET flags = flags + 1",
+                (company_name,)
+            ))
+        self._write(statements)
+
+    def market_intel(self) -> dict:
+        """The market_intel.json document the dashboards expect."""
+        conn = self._conn()
+        return {
+            "companies": [{"name": name, "flags": flags, "issues": issues} for name, flags, issues in
+                          conn.execute("SELECT name, flags, issues FROM market_companies ORDER BY rowid")],
+            "issues_distribution": self.get_meta("issues_distribution", MARKET_DEFAULTS["issues_distribution"]),
+            "metrics": {
+                "total_policies_analyzed": self.counter("total_policies_analyzed"),
+                "top_risk_zip": self.get_meta("top_risk_zip", MARKET_DEFAULTS["top_risk_zip"]),
+            },
+            "geo_risk": self.get_meta("geo_risk", MARKET_DEFAULTS["geo_risk"]),
+        }
+
+    # --- Admin requests ---
+
+    def add_admin_request(self, tool: str, status: str, message: str, timestamp: Optional[str] = None) -> int:
+        cursor, = self._write([(
+            "INSERT INTO admin_requests (timestamp, tool, status, message) VALUES (?, ?, ?, ?)",
+            (timestamp or str(datetime.now()), tool, status, message)
+        )])
+        return cursor.lastrowid
+
+    def admin_requests(self, status: Optional[str] = None) -> List[dict]:
+        sql = "SELECT id, timestamp, tool, status, message FROM admin_requests"
+        params = ()
+        if status is not None:
+            sql, params = sql + " WHERE status = ?", (status,)
+        rows = self._conn().execute(sql + " ORDER BY id", params)
+        return [{"id": i, "timestamp": ts, "tool": tool, "status": st, "message": msg} for i, ts, tool, st, msg in rows]
+
+    def admin_request_id_at(self, index: int) -> Optional[int]:
+        """Id of the index-th request in list order (the admin UI addresses rows by position)."""
+        if index < 0:
+            return None
+        row = self._conn().execute("SELECT id FROM admin_requests ORDER BY id LIMIT 1 OFFSET ?", (index,)).fetchone()
+        return row[0] if row else None
+
+    def update_admin_request(self, request_id: int, status: str) -> bool:
+        cursor, = self._write([("UPDATE admin_requests SET status = ? WHERE id = ?", (status, request_id))])
+        return cursor.rowcount > 0
+
+    # --- Migration from data/*.json ---
+
+    def import_scam_graph(self, data: dict):
+        self._write(self._scam_graph_statements(data))
+
+    def import_market_intel(self, data: dict):
+        self._write(self._market_intel_statements(data))
+
+    def import_admin_requests(self, data: list):
+        self._write(self._admin_requests_statements(data))
+
+    def _scam_graph_statements(self, data: dict) -> List[tuple]:
+        statements = []
+        for name, info in data.get("companies", {}).items():
+            statements.extend(self._upsert_company(name, int(info.get("flags", 0))))
+            for issue in info.get("issues", []):
+                statements.append(("INSERT OR IGNORE INTO company_issues (company, issue, added_at) VALUES (?, ?, ?)",
+                                   (name, issue, time.time())))
+        for alias, company in data.get("aliases", {}).items():
+            statements.append(("INSERT OR REPLACE INTO company_aliases (alias, company) VALUES (?, ?)", (alias, company)))
+        for name, info in data.get("clauses", {}).items():
+            statements.append((
+                "INSERT INTO clauses (name, risk, count) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET count = count + excluded.count",
+                (name, info.get("risk"), int(info.get("count", 0)))
+            ))
+        return statements
+
+    @staticmethod
+    def _market_intel_statements(data: dict) -> List[tuple]:
+        metrics = data.get("metrics", {})
+        statements = [(
+            "INSERT INTO counters (name, value) VALUES ('total_policies_analyzed', ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (int(metrics.get("total_policies_analyzed", 0)),)
+        )]
+        for comp in data.get("companies", []):
+            statements.append((
+                "INSERT INTO market_companies (name, flags, issues) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET flags = flags + excluded.flags",
+                (comp["name"], int(comp.get("flags", 0)), comp.get("issues"))
+            ))
+        for key in ("issues_distribution", "geo_risk"):
+            if data.get(key):
+                statements.append(("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(data[key]))))
+        if metrics.get("top_risk_zip", "N/A") != "N/A":
+            statements.append(("INSERT OR REPLACE INTO meta (key, value) VALUES ('top_risk_zip', ?)",
+                               (json.dumps(metrics["top_risk_zip"]),)))
+        return statements
+
+    @staticmethod
+    def _admin_requests_statements(data: list) -> List[tuple]:
+        return [(
+            "INSERT INTO admin_requests (timestamp, tool, status, message) VALUES (?, ?, ?, ?)",
+            (entry.get("timestamp"), entry.get("tool"), entry.get("status"), entry.get("message"))
+        ) for entry in data]
+
+    def migrations(self) -> Dict[str, float]:
+        """Legacy files already imported: path -> time of import."""
+        return dict(self._conn().execute("SELECT path, migrated_at FROM migrations ORDER BY migrated_at"))
+
+    def migrate_legacy(self, files: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        """
+        Imports each legacy JSON file not yet recorded in the migrations
+        table. The files are left untouched (some are tracked in git). The
+        migrations row is inserted in the same transaction as the data, so
+        when two workers start together the second one's insert fails on
+        the primary key and rolls back. A file that an earlier version
+        renamed to <file>.migrated is only recorded, not imported again.
+        Unreadable files are reported and retried on the next start.
+        """
+        builders = {
+            "scam_graph": self._scam_graph_statements,
+            "market_intel": self._market_intel_statements,
+            "admin_requests": self._admin_requests_statements,
+        }
+        done = self.migrations()
+        migrated = []
+        for kind, paths in (files or LEGACY_FILES).items():
+            for path in paths:
+                key = os.path.normpath(path)
+                if key in done or not os.path.exists(path):
+                    continue
+                claim = ("INSERT INTO migrations (path, sha256, migrated_at) VALUES (?, ?, ?)",)
+                try:
+                    if os.path.exists(path + ".migrated"):
+                        self._write([claim + ((key, None, time.time()),)])
+                        continue
+                    with open(path, "rb") as f:
+                        raw = f.read()
+                    statements = builders[kind](json.loads(raw))
+                    self._write([claim + ((key, hashlib.sha256(raw).hexdigest(), time.time()),)] + statements)
+                    migrated.append(path)
+                    print(f"DataStore: migrated {path}")
+                except sqlite3.IntegrityError:
+                    continue  # another worker recorded it first
+                except Exception as e:
+                    print(f"DataStore: could not migrate {path}: {e}")
+        return migrated
+
+
+_store: Optional[DataStore] = None
+_store_lock = threading.Lock()
+
+
+def get_data_store() -> DataStore:
+    """Process-wide store; location comes from the PARAKH_DB_PATH env var."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DataStore(db_path=os.environ.get("PARAKH_DB_PATH", "data/parakh.db"))
+        return _store
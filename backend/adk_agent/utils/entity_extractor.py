@@ -0,0 +1,372 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .clause_index import document_id
+from .entity_index import normalize_entity
+
+# Built-in gazetteer of Indian insurers: canonical name -> other spellings.
+INSURERS = {
+    "Star Health": ["Star Health and Allied Insurance", "Star Health Insurance"],
+    "HDFC Ergo": ["HDFC ERGO General Insurance", "HDFC Ergo Health"],
+    "ICICI Lombard": ["ICICI Lombard General Insurance"],
+    "Niva Bupa": ["Niva Bupa Health Insurance", "Max Bupa"],
+    "Care Health": ["Care Health Insurance", "Religare Health Insurance"],
+    "Bajaj Allianz": ["Bajaj Allianz General Insurance"],
+    "Tata AIG": ["Tata AIG General Insurance"],
+    "Aditya Birla Health": ["Aditya Birla Health Insurance", "Aditya Birla Capital Health"],
+    "ManipalCigna": ["ManipalCigna Health Insurance", "Manipal Cigna"],
+    "New India Assurance": ["The New India Assurance"],
+    "United India Insurance": [],
+    "Oriental Insurance": ["The Oriental Insurance"],
+    "National Insurance": ["National Insurance Company"],
+    "SBI General": ["SBI General Insurance"],
+    "Reliance General": ["Reliance General Insurance", "Reliance Health Insurance"],
+    "Digit Insurance": ["Go Digit General Insurance", "Go Digit"],
+    "Acko": ["Acko General Insurance"],
+}
+
+# "<Capitalised words> Pvt. Ltd." and friends on one line; "and"/"of" may join the words.
+COMPANY_RE = re.compile(
+    r"\b[A-Z][A-Za-z0-9&'-]*(?: (?:(?:and|of) )?[A-Z][A-Za-z0-9&'-]*){0,6}? "
+    r"(?:Private Limited|Pvt\.? ?Ltd\.?|Limited|Ltd\.?|LLP)"
+    r"(?![A-Za-z])"
+)
+# A person named as a party: "Mr. Ramesh Kumar (the Landlord)".
+PERSON_RE = re.compile(r"\b(?:Mr|Mrs|Ms|Shri|Smt|Dr)\.? [A-Z][a-z]+(?: [A-Z][a-z]+){0,3}")
+PARTY_RE = re.compile(r"\b(landlord|landlady|lessor|licensor|owner|tenant|lessee|licensee)\b")
+LANDLORD_PARTIES = {"landlord", "landlady", "lessor", "licensor", "owner"}
+ROLE_CUES = {
+    "insurer": re.compile(r"\b(?:insurer|insurance|assurance|policy|premium|sum insured|claim)\b"),
+    "landlord": re.compile(r"\b(?:landlord|landlady|lessor|licensor|owner|rent|lease|premises)\b"),
+    "employer": re.compile(r"\b(?:employer|employment|employee|offer|appointment|joining|salary|ctc|designation)\b"),
+}
+INSURER_NAME_RE = re.compile(r"\b(?:insurance|assurance|lombard|allianz|bupa|cigna|ergo)\b", re.IGNORECASE)
+TPA_NAME_RE = re.compile(r"\b(?:tpa|third party administrators?)\b", re.IGNORECASE)
+DOC_TYPE_ROLES = {"Insurance": "insurer", "Rent": "landlord", "Job": "employer"}
+MARKET_ROLES = ("insurer", "landlord", "employer")
+CONTEXT_CHARS = 120
+PARTY_CHARS = 40
+# Vault names added since the last full build live in a small second automaton;
+# past this many they are folded into a full rebuild.
+MAX_DELTA_NAMES = 2000
+# A cached document is rechecked against at most this many new names before
+# being extracted again.
+MAX_RECHECK_NAMES = 64
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: one pass over the text finds every occurrence of
+    every pattern, whatever the gazetteer size.
+
+    Outputs are kept as tuples, only for nodes that have any: a list per
+    node made hundreds of thousands of objects the garbage collector had
+    to scan, and its full passes stalled every other thread for 200+ ms.
+    """
+
+    def __init__(self, patterns: Dict[str, object]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: Dict[int, Tuple[Tuple[int, object], ...]] = {}
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                node = nxt
+            self._out[node] = self._out.get(node, ()) + ((len(pattern), value),)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0) if node else 0
+                inherited = self._out.get(self._fail[child])
+                if inherited:
+                    self._out[child] = self._out.get(child, ()) + inherited
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int, object]]:
+        """Yields (start, end, value) for every match, including overlapping ones."""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out.get(node, ()):
+                yield i - length + 1, i + 1, value
+
+
+class DocumentEntities:
+    def __init__(self, doc_id: str, mentions: List[dict]):
+        self.doc_id = doc_id
+        self.mentions = mentions
+
+    def by_role(self, role: str) -> List[dict]:
+        return [m for m in self.mentions if m["role"] == role]
+
+    def primary(self, role: str) -> Optional[str]:
+        """Most mentioned entity in `role` (earliest first on ties)."""
+        candidates = self.by_role(role)
+        if not candidates:
+            return None
+        return min(candidates, key=lambda m: (-m["count"], m["offset"]))["name"]
+
+    def company(self) -> Optional[str]:
+        """
+        The insurer, landlord or employer as an organisation: a gazetteer or
+        company-suffix match, never a person named as a party.
+        """
+        for role in MARKET_ROLES:
+            candidates = [m for m in self.by_role(role) if m["source"] != "person"]
+            if candidates:
+                return min(candidates, key=lambda m: (-m["count"], m["offset"]))["name"]
+        return None
+
+    def names(self) -> List[str]:
+        return [m["name"] for m in self.mentions]
+
+    def to_dict(self) -> dict:
+        return {"document_id": self.doc_id, "mentions": self.mentions,
+                "insurer": self.primary("insurer"), "landlord": self.primary("landlord"), "employer": self.primary("employer"),
+                "company": self.company()}
+
+
+def _boundary(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+def _flatten(text: str) -> Tuple[str, str]:
+    # Whitespace collapsed, line breaks kept for the patterns (a heading is not part of a
+    # name) but blanked for the automaton; both strings share offsets.
+    flat = "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+    return flat, flat.lower().replace("\n", " ")
+
+
+class EntityExtractor:
+    """
+    Local entity extraction (no LLM call): a gazetteer automaton over the
+    built-in insurer list plus every KnowledgeVault company and alias, and
+    regex patterns for Indian company suffixes (Pvt. Ltd., Limited, LLP) and
+    for landlords named as persons. Each mention gets a role (insurer,
+    tpa, landlord, tenant, employer, other) from the name, the words around it and the
+    document type.
+
+    Results are cached per document (LRU), so the auditor, Sentinel and
+    market-intel logging share one extraction per upload. When the vault's
+    entity_version changes only the names added since the last sync are
+    loaded, into a small delta automaton; the full automaton is rebuilt once
+    the delta passes `max_delta` names. A cached document is only extracted
+    again if one of the new names occurs in it.
+    """
+
+    def __init__(self, store=None, max_documents: int = 128, max_delta: int = MAX_DELTA_NAMES):
+        self._store = store
+        self.max_documents = max_documents
+        self.max_delta = max_delta
+        self._automaton: Optional[AhoCorasick] = None
+        self._entries: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._delta: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._delta_automaton: Optional[AhoCorasick] = None
+        self._version = None
+        self.company_rowid = 0
+        self.alias_rowid = 0
+        # Surfaces added by each delta sync, in order; a cached document remembers
+        # how many it has been checked against.
+        self._added: List[str] = []
+        self._documents: "OrderedDict[Tuple[str, str], Tuple[DocumentEntities, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            from .data_store import get_data_store
+            self._store = get_data_store()
+        return self._store
+
+    def _vault_names(self, entries: Dict[str, Tuple[str, Optional[str]]]) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Vault companies and aliases added since the last sync that `entries` does not know yet."""
+        new: Dict[str, Tuple[str, Optional[str]]] = {}
+
+        def add(surface: str, canonical: str):
+            key = " ".join(surface.lower().split())
+            if len(key) >= 3 and key not in entries and key not in new:
+                new[key] = (canonical, None)
+
+        companies, aliases = self.store.entity_names_since(self.company_rowid, self.alias_rowid)
+        for rowid, name in companies:
+            add(name, name)
+            self.company_rowid = rowid
+        for rowid, alias, company in aliases:
+            add(alias, company)
+            self.alias_rowid = rowid
+        return new
+
+    def _build(self):
+        entries: Dict[str, Tuple[str, Optional[str]]] = {}
+        for canonical, spellings in INSURERS.items():
+            for surface in [canonical, *spellings]:
+                key = " ".join(surface.lower().split())
+                entries.setdefault(key, (canonical, "insurer"))
+        entries.update(self._vault_names(entries))
+        self._entries = entries
+        self._automaton = AhoCorasick(entries)
+        self._delta, self._delta_automaton = {}, None
+
+    def _sync(self):
+        new = self._vault_names({**self._entries, **self._delta})
+        if not new:
+            return
+        self._added.extend(new)
+        self._delta.update(new)
+        if len(self._delta) > self.max_delta:
+            self._entries.update(self._delta)
+            self._automaton = AhoCorasick(self._entries)
+            self._delta, self._delta_automaton = {}, None
+        else:
+            self._delta_automaton = AhoCorasick(self._delta)
+
+    def automaton(self) -> AhoCorasick:
+        """The full automaton, after loading any vault names added since the last call."""
+        version = self.store.counter("entity_version")
+        with self._lock:
+            if self._automaton is None:
+                self._build()
+            elif version != self._version:
+                self._sync()
+            self._version = version
+            return self._automaton
+
+    def _matches(self, lowered: str) -> Iterator[Tuple[int, int, object]]:
+        self.automaton()
+        with self._lock:
+            automata = [a for a in (self._automaton, self._delta_automaton) if a is not None]
+        for automaton in automata:
+            yield from automaton.iter(lowered)
+
+    @staticmethod
+    def _role(name: str, kind: Optional[str], context: str, doc_type: str) -> str:
+        if kind:
+            return kind
+        if TPA_NAME_RE.search(name):
+            return "tpa"
+        if INSURER_NAME_RE.search(name):
+            return "insurer"
+        scores = {role: len(cue.findall(context)) for role, cue in ROLE_CUES.items()}
+        role, hits = max(scores.items(), key=lambda kv: kv[1])
+        if hits:
+            return role
+        return DOC_TYPE_ROLES.get(doc_type, "other")
+
+    def _mentions(self, text: str, doc_type: str) -> List[dict]:
+        flat, lowered = _flatten(text)
+        found: Dict[str, dict] = {}
+
+        def add(name: str, start: int, end: int, source: str, kind: Optional[str] = None):
+            key = normalize_entity(name)
+            if not key:
+                return
+            mention = found.get(key)
+            if mention is None:
+                context = lowered[max(0, start - CONTEXT_CHARS):end + CONTEXT_CHARS]
+                found[key] = {"name": name, "role": self._role(name, kind, context, doc_type),
+                              "count": 1, "offset": start, "source": source}
+            else:
+                mention["count"] += 1
+
+        # Longest gazetteer match wins where matches overlap.
+        spans = sorted((m for m in self._matches(lowered) if _boundary(lowered, m[0], m[1])),
+                       key=lambda m: (m[0], -(m[1] - m[0])))
+        covered, known = -1, []
+        for start, end, (canonical, kind) in spans:
+            if start < covered:
+                continue
+            add(canonical, start, end, "gazetteer", kind)
+            known.append((start, end))
+            covered = end
+
+        for match in COMPANY_RE.finditer(flat):
+            if any(start < match.end() and match.start() < end for start, end in known):
+                continue  # "Star Health and Allied Insurance Co. Ltd." is the gazetteer's Star Health
+            add(match.group(0).strip(), match.start(), match.end(), "pattern")
+
+        for match in PERSON_RE.finditer(flat):
+            # Only the party named right after the person counts ("Mr. X (the Licensor)").
+            party = PARTY_RE.search(lowered, match.end(), match.end() + PARTY_CHARS)
+            if party:
+                role = "landlord" if party.group(1) in LANDLORD_PARTIES else "tenant"
+                add(match.group(0).strip(), match.start(), match.end(), "person", role)
+
+        return sorted(found.values(), key=lambda m: m["offset"])
+
+    def _still_valid(self, text: str, checked: int) -> bool:
+        """True if none of the names added after the first `checked` occurs in the text."""
+        with self._lock:
+            new = self._added[checked:]
+        if len(new) > MAX_RECHECK_NAMES:
+            return False
+        lowered = _flatten(text)[1]
+        return not any(surface in lowered for surface in new)
+
+    def extract(self, text: str, doc_type: str = "Insurance") -> DocumentEntities:
+        self.automaton()
+        key = (document_id(text or ""), doc_type)
+        with self._lock:
+            added = len(self._added)
+            cached = self._documents.get(key)
+            if cached is not None:
+                self._documents.move_to_end(key)
+        if cached is not None:
+            entities, checked = cached
+            if checked == added or self._still_valid(text or "", checked):
+                with self._lock:
+                    if key in self._documents:
+                        self._documents[key] = (entities, added)
+                return entities
+        entities = DocumentEntities(key[0], self._mentions(text or "", doc_type))
+        with self._lock:
+            self._documents[key] = (entities, added)
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+        return entities
+
+    def find_in_text(self, text: str) -> List[str]:
+        """Known entities named in a short text such as a chat prompt (gazetteer only, not cached)."""
+        lowered = " ".join((text or "").lower().split())
+        names = []
+        for start, end, (canonical, _) in self._matches(lowered):
+            if _boundary(lowered, start, end) and canonical not in names:
+                names.append(canonical)
+        return names
+
+
+_extractor: Optional[EntityExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_entity_extractor() -> EntityExtractor:
+    """Process-wide extractor; the per-document cache size comes from ENTITY_CACHE_DOCUMENTS."""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = EntityExtractor(max_documents=int(os.environ.get("ENTITY_CACHE_DOCUMENTS", "128")))
+        return _extractor
+
+
+def extract_entities(text: str, doc_type: str = "Insurance") -> DocumentEntities:
+    return get_entity_extractor().extract(text, doc_type)
@@ -0,0 +1,137 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Dropped from names before matching ("Star Health Pvt. Ltd." == "star health").
+LEGAL_SUFFIXES = {"ltd", "limited", "pvt", "private", "co", "company", "inc", "corp", "corporation", "llp", "the"}
+
+
+def normalize_entity(name: str) -> str:
+    text = unicodedata.normalize("NFKC", name or "").lower().replace("&", " and ")
+    tokens = [t for t in re.findall(r"[a-z0-9]+", text) if t not in LEGAL_SUFFIXES]
+    return " ".join(tokens)
+
+
+def trigrams(normalized: str) -> Set[str]:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EntityMatch:
+    def __init__(self, entity: str, matched: str, score: float):
+        self.entity = entity    # canonical name
+        self.matched = matched  # the name or alias that matched
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"EntityMatch({self.entity!r}, via {self.matched!r}, {self.score:.2f})"
+
+
+class EntityIndex:
+    """
+    In-memory fuzzy lookup over entity names and aliases.
+
+    Names are normalized (case, punctuation, legal suffixes) and indexed by
+    character trigrams. Exact normalized names are a dict hit. Otherwise the
+    query's trigram postings (numpy arrays) are counted with one bincount,
+    skipping trigrams shared by more than `common_share` of all names
+    ("health", "insurance"), and only the `max_candidates` names sharing the
+    most trigrams are scored: well under a millisecond at 100k entities.
+
+    Scoring: exact normalized match 1.0; every query token is a whole token
+    of the name (the old substring check) 0.9-0.99; otherwise trigram Dice
+    similarity. Matches below `min_score` are not returned.
+    """
+
+    def __init__(self, min_score: float = 0.6, max_candidates: int = 50, common_share: float = 0.05):
+        self.min_score = min_score
+        self.max_candidates = max_candidates
+        self.common_share = common_share
+        self._names: List[Tuple[str, str, frozenset]] = []  # (normalized, original, tokens)
+        self._entities: List[str] = []
+        self._trigrams: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._exact: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, entity: Optional[str] = None):
+        """Indexes `name` (a company name or an alias of `entity`)."""
+        normalized = normalize_entity(name)
+        if not normalized:
+            return
+        with self._lock:
+            if normalized in self._exact:
+                return
+            idx = len(self._names)
+            grams = trigrams(normalized)
+            self._names.append((normalized, name, frozenset(normalized.split())))
+            self._entities.append(entity or name)
+            self._trigrams.append(grams)
+            self._exact[normalized] = idx
+            for gram in grams:
+                self._postings[gram].append(idx)
+                self._arrays.pop(gram, None)
+
+    def _posting(self, gram: str) -> Optional[np.ndarray]:
+        array = self._arrays.get(gram)
+        if array is None and gram in self._postings:
+            array = self._arrays[gram] = np.array(self._postings[gram], dtype=np.int32)
+        return array
+
+    def _score(self, query: str, query_tokens: Set[str], query_grams: Set[str], idx: int) -> float:
+        normalized, _, tokens = self._names[idx]
+        if normalized == query:
+            return 1.0
+        grams = self._trigrams[idx]
+        dice = 2 * len(query_grams & grams) / (len(query_grams) + len(grams))
+        if query_tokens <= tokens:
+            # Closer names rank first among containment matches ("star" -> "Star Health").
+            return 0.9 + 0.09 * dice
+        return dice
+
+    def search(self, query: str, limit: int = 5) -> List[EntityMatch]:
+        normalized = normalize_entity(query)
+        if not normalized:
+            return []
+        exact = self._exact.get(normalized)
+        if exact is not None and limit == 1:
+            return [EntityMatch(self._entities[exact], self._names[exact][1], 1.0)]
+
+        query_grams = trigrams(normalized)
+        query_tokens = set(normalized.split())
+        with self._lock:
+            size = len(self._names)
+            postings = [p for p in (self._posting(g) for g in query_grams) if p is not None]
+        if not postings:
+            return []
+        common = max(self.max_candidates, int(self.common_share * size))
+        selected = [p for p in postings if len(p) <= common] or [min(postings, key=len)]
+        counts = np.bincount(np.concatenate(selected), minlength=size)
+        # Near-best candidates only; a typo costs a name at most 3 shared trigrams.
+        candidates = np.flatnonzero(counts >= counts.max() - 3)
+        if len(candidates) > self.max_candidates:
+            candidates = candidates[np.argpartition(counts[candidates], -self.max_candidates)[-self.max_candidates:]]
+        candidates = candidates.tolist()
+        if exact is not None and exact not in candidates:
+            candidates.append(exact)
+
+        best: Dict[str, EntityMatch] = {}
+        for idx in candidates:
+            score = self._score(normalized, query_tokens, query_grams, idx)
+            entity = self._entities[idx]
+            if score >= self.min_score and (entity not in best or score > best[entity].score):
+                best[entity] = EntityMatch(entity, self._names[idx][1], score)
+        return sorted(best.values(), key=lambda m: (-m.score, m.entity))[:limit]
+
+    def lookup(self, query: str) -> Optional[EntityMatch]:
+        matches = self.search(query, limit=1)
+        return matches[0] if matches else None
@@ -1,13 +1,12 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
 import os
 from langchain_groq import ChatGroq
-from utils.security import SecurityManager
-import streamlit as st
+from .security import SecurityManager
 
 class GroqClient:
     def __init__(self):
         self.security = SecurityManager()
-        # Try to get Groq key from secrets or session state (BYOK)
+        # Try to get Groq key from the session (BYOK) or the process config
         self.api_key = self.security.get_secret("GROQ_API_KEY")
         
     def get_llm(self, temperature=0.7):
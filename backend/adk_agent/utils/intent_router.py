@@ -0,0 +1,358 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .entity_extractor import PERSON_RE
+
+AGENTS = ["AUDITOR", "MEDICAL", "LAWYER", "ARCHITECT", "TENANT", "CAREER", "SCOUT", "SENTINEL", "GENESIS"]
+
+# Strong cues pick an agent on their own; weak cues only make a query ambiguous.
+STRONG_CUES = {
+    "AUDITOR": [r"\bsum insured\b", r"\broom rent\b", r"\bco-?pay(?:ment)?\b", r"\bwaiting period\b", r"\bexclu(?:sion|sions|ded)\b",
+                r"\bsub-?limits?\b", r"\bdeductible\b", r"\bpre-?existing\b", r"\bped\b", r"\bcashless\b", r"\brider\b", r"\baudit\b",
+                r"\bfull report\b"],
+    "MEDICAL": [r"\bdiagnos(?:is|ed)\b", r"\bmri\b", r"\bct scan\b", r"\bblood test\b", r"\bhba1c\b", r"\bcholesterol\b",
+                r"\bcataract\b", r"\bangioplasty\b", r"\bdiabet(?:es|ic)\b", r"\bhypertension\b", r"\btumou?r\b", r"\bsymptoms?\b",
+                r"\bprescription\b", r"\bmedical (?:report|term)\b", r"\blab report\b", r"\bbiopsy\b", r"\bstent\b"],
+    "LAWYER": [r"\bsue\b", r"\bcourt\b", r"\blegal (?:action|notice|case)\b", r"\blawyer\b", r"\bconsumer forum\b", r"\bombudsman\b",
+               r"\bclaim (?:was |got |is )?(?:rejected|denied|repudiated)\b", r"\bdispute\b", r"\bfight\b", r"\btrial\b"],
+    "ARCHITECT": [r"\binflation\b", r"\bforecast\b", r"\bfuture costs?\b", r"\bin \d+ years\b", r"\bprojection\b", r"\bcorpus\b"],
+    "TENANT": [r"\brent(?:al)? agreement\b", r"\blandlord\b", r"\btenant\b", r"\bsecurity deposit\b", r"\blease\b", r"\beviction\b",
+               r"\block-?in\b"],
+    "CAREER": [r"\boffer letter\b", r"\bjob offer\b", r"\b(?:service |employment )?bond\b", r"\bnon-?compete\b", r"\bnotice period\b",
+               r"\bemployment contract\b", r"\bctc\b", r"\bemployer\b"],
+    "SCOUT": [r"\bbetter (?:policy|plan|option)\b", r"\bcompar(?:e|ison)\b", r"\balternatives?\b", r"\bcheaper\b", r"\bbest (?:policy|plan|insurer)\b",
+              r"\bswitch (?:insurer|policy)\b", r"\bport(?:ability| my policy)\b"],
+    "SENTINEL": [r"\bscam(?:mer)?s?\b", r"\bfraud\b", r"\breputation\b", r"\btrustworthy\b", r"\blegit(?:imate)?\b", r"\breviews\b",
+                 r"\bclaim settlement ratio\b", r"\bgenuine\b", r"\bnews\b"],
+}
+# Generic document words: an AUDITOR cue only when no domain owner below claims the query.
+GENERIC_CUES = {
+    "AUDITOR": [r"\bpolic(?:y|ies)\b", r"\bcover(?:ed|age)?\b", r"\bclauses?\b"],
+}
+WEAK_CUES = {
+    "AUDITOR": [r"\bclaim\b", r"\binsurance\b", r"\bhospitali[sz]ation\b"],
+    "MEDICAL": [r"\bsurgery\b", r"\breport\b", r"\bdoctor\b", r"\bdisease\b"],
+    "SCOUT": [r"\bpremium\b", r"\bplans?\b"],
+    "SENTINEL": [r"\bcompany\b", r"\binsurer\b"],
+    "CAREER": [r"\bjob\b", r"\bsalary\b", r"\bcontract\b"],
+    "TENANT": [r"(?<!room )\brent\b", r"\bflat\b"],
+    "ARCHITECT": [r"\bcost\b", r"\bsavings\b"],
+}
+# When the key agent is picked, these agents' generic and weak cues are just
+# its vocabulary ("claim", "insurer", "policy"), not a competing intent.
+SUBSUMES = {
+    "LAWYER": {"AUDITOR", "SENTINEL"},
+    "SCOUT": {"AUDITOR", "SENTINEL"},
+    "SENTINEL": {"AUDITOR"},
+    "ARCHITECT": {"AUDITOR"},
+    "TENANT": {"AUDITOR"},
+    "CAREER": {"AUDITOR"},
+}
+DOMAIN_OWNERS = {"ARCHITECT", "TENANT", "CAREER", "SCOUT"}
+GREETING_RE = re.compile(
+    r"^\s*(?:hi+|hello|hey|namaste|good (?:morning|afternoon|evening)|thanks?(?: you)?|thank you|ok(?:ay)?|"
+    r"who are you|what can you do|how are you|bye)\b[\s!.?]*$", re.IGNORECASE)
+AUDIT_VERB_RE = re.compile(r"\b(?:audit|analy[sz]e|check|review|report|scan)\b", re.IGNORECASE)
+# What the routing log keeps of a prompt: enough words to learn the intent, no contact details or names.
+LOG_PROMPT_CHARS = 200
+REDACTIONS = [
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "<email>"),
+    (PERSON_RE, "<person>"),
+    (re.compile(r"\d[\d /-]{3,}\d"), "<number>"),  # phone, policy, claim and account numbers
+]
+
+
+def _compile(cues: Dict[str, List[str]]) -> Dict[str, re.Pattern]:
+    return {agent: re.compile("|".join(patterns), re.IGNORECASE) for agent, patterns in cues.items()}
+
+
+class RouteDecision:
+    def __init__(self, agents: List[str], confidence: float, source: str):
+        self.agents = agents
+        self.confidence = confidence
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"RouteDecision({self.agents}, {self.confidence:.2f}, {self.source})"
+
+
+class RuleClassifier:
+    """
+    Keyword/regex tier. One alternation per agent, so a query costs one regex
+    scan per agent (microseconds). Generic words ("policy", "cover") only
+    pick the AUDITOR when no domain owner (rent, job, forecast, market)
+    matched. Confidence is tiered:
+    - greeting / small talk only: 0.95 -> GENESIS
+    - strong cues and no competing weak-only agents: 0.9
+    - strong cues plus weak cues for other agents: 0.65
+    - only weak cues, or nothing: 0.0 (no decision)
+    """
+
+    def __init__(self):
+        self.strong = _compile(STRONG_CUES)
+        self.generic = _compile(GENERIC_CUES)
+        self.weak = _compile(WEAK_CUES)
+
+    def predict(self, prompt: str) -> RouteDecision:
+        if GREETING_RE.match(prompt):
+            return RouteDecision(["GENESIS"], 0.95, "rules")
+        picked = [agent for agent in AGENTS if agent in self.strong and self.strong[agent].search(prompt)]
+        owned = DOMAIN_OWNERS.intersection(picked)
+        for agent, pattern in self.generic.items():
+            if agent not in picked and not owned and pattern.search(prompt):
+                picked.append(agent)
+        if not picked:
+            return RouteDecision([], 0.0, "rules")
+        subsumed = set().union(*(SUBSUMES.get(agent, set()) for agent in picked))
+        competing = [agent for agent, pattern in self.weak.items()
+                     if agent not in picked and agent not in subsumed and pattern.search(prompt)]
+        if len(picked) > 3:
+            return RouteDecision(picked, 0.5, "rules")
+        return RouteDecision(picked, 0.65 if competing else 0.9, "rules")
+
+
+def redact_prompt(prompt: str) -> str:
+    """Emails, persons and long numbers masked, capped at LOG_PROMPT_CHARS."""
+    for pattern, token in REDACTIONS:
+        prompt = pattern.sub(token, prompt)
+    return " ".join(prompt.split())[:LOG_PROMPT_CHARS]
+
+
+def _features(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+class TfidfRouterModel:
+    """
+    Multi-label TF-IDF + one-vs-rest logistic regression, trained with plain
+    numpy gradient descent on logged (prompt, agents) routing decisions.
+    """
+
+    def __init__(self, max_features: int = 5000, epochs: int = 300, learning_rate: float = 2.0, l2: float = 1e-4):
+        self.max_features = max_features
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.vocab: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.weights: Optional[np.ndarray] = None
+        self.bias: Optional[np.ndarray] = None
+        self.examples = 0
+
+    @property
+    def trained(self) -> bool:
+        return self.weights is not None
+
+    def _vectorize(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), len(self.vocab)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in Counter(_features(text)).items():
+                col = self.vocab.get(feature)
+                if col is not None:
+                    matrix[row, col] = 1 + math.log(count)
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def fit(self, examples: List[Tuple[str, List[str]]]):
+        texts = [text for text, _ in examples]
+        doc_freq = Counter(f for text in texts for f in set(_features(text)))
+        self.vocab = {f: i for i, (f, _) in enumerate(doc_freq.most_common(self.max_features))}
+        n = len(texts)
+        self.idf = np.array([math.log((1 + n) / (1 + doc_freq[f])) + 1 for f in self.vocab], dtype=np.float32)
+
+        x = self._vectorize(texts)
+        y = np.array([[1.0 if agent in labels else 0.0 for agent in AGENTS] for _, labels in examples], dtype=np.float32)
+        w = np.zeros((x.shape[1], len(AGENTS)), dtype=np.float32)
+        b = np.zeros(len(AGENTS), dtype=np.float32)
+        for _ in range(self.epochs):
+            p = 1 / (1 + np.exp(-(x @ w + b)))
+            grad = p - y
+            w -= self.learning_rate * (x.T @ grad / n + self.l2 * w)
+            b -= self.learning_rate * grad.mean(axis=0)
+        self.weights, self.bias = w, b
+        self.examples = n
+
+    def predict(self, prompt: str) -> RouteDecision:
+        if not self.trained:
+            return RouteDecision([], 0.0, "model")
+        p = 1 / (1 + np.exp(-(self._vectorize([prompt]) @ self.weights + self.bias)))[0]
+        picked = [agent for agent, prob in zip(AGENTS, p) if prob >= 0.5]
+        if not picked:
+            return RouteDecision([], 0.0, "model")
+        # Sure about every agent picked, and about every agent left out.
+        confidence = float(min(min(prob if prob >= 0.5 else 1 - prob for prob in p), 1.0))
+        return RouteDecision(picked, confidence, "model")
+
+
+class IntentRouter:
+    """
+    Local tiers in front of the LLM smart_router:
+    1. RuleClassifier (regex cues) if its confidence >= rule_threshold
+    2. TfidfRouterModel (trained from recorded LLM decisions) if >= model_threshold
+    3. Otherwise None: the caller asks the LLM and `record()`s its answer.
+
+    Recorded prompts are redacted (redact_prompt) and only the newest
+    `max_examples` are kept. They are written to `log_path` only if one is
+    given, and the log is compacted back to `max_examples` lines. The model
+    is retrained in a background thread and swapped in when done, so
+    record() never waits for a fit.
+    """
+
+    def __init__(self, rule_threshold: float = 0.8, model_threshold: float = 0.8,
+                 log_path: Optional[str] = None, min_examples: int = 50, retrain_every: int = 100,
+                 max_examples: int = 5000):
+        self.rule_threshold = rule_threshold
+        self.model_threshold = model_threshold
+        self.log_path = log_path
+        self.min_examples = min_examples
+        self.retrain_every = retrain_every
+        self.max_examples = max_examples
+        self.rules = RuleClassifier()
+        self.model = TfidfRouterModel()
+        self.training_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._examples: "deque[Tuple[str, List[str]]]" = deque(maxlen=max_examples)
+        self._since_fit = 0
+        self._logged = 0
+        self.counts = Counter()
+        self._load_log()
+
+    def _load_log(self):
+        if not self.log_path or not os.path.exists(self.log_path):
+            return
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self._examples.append((redact_prompt(entry["prompt"]), entry["agents"]))
+                    self._logged += 1
+        except Exception as e:
+            print(f"Routing log unreadable, starting empty: {e}")
+        if len(self._examples) >= self.min_examples:
+            with self._lock:
+                self._start_training()
+
+    def _start_training(self):
+        # Caller holds self._lock.
+        if self.training_thread is not None and self.training_thread.is_alive():
+            return
+        self._since_fit = 0
+        self.training_thread = threading.Thread(target=self._train, args=(list(self._examples),),
+                                                name="intent-router-train", daemon=True)
+        self.training_thread.start()
+
+    def _train(self, examples: List[Tuple[str, List[str]]]):
+        model = TfidfRouterModel()
+        try:
+            model.fit(examples)
+        except Exception as e:
+            print(f"Intent model training failed: {e}")
+            return
+        with self._lock:
+            self.model = model
+            if self.log_path and self._logged > self.max_examples:
+                self._compact_log()
+
+    def _compact_log(self):
+        # Caller holds self._lock; rewrites the log as the examples kept in memory.
+        try:
+            tmp_path = self.log_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for prompt, agents in self._examples:
+                    f.write(json.dumps({"prompt": prompt, "agents": agents}) + "\n")
+            os.replace(tmp_path, self.log_path)
+            self._logged = len(self._examples)
+        except Exception as e:
+            print(f"Routing log compaction failed: {e}")
+
+    def route(self, prompt: str) -> Optional[RouteDecision]:
+        decision = self.rules.predict(prompt)
+        if decision.agents and decision.confidence >= self.rule_threshold:
+            self.counts["rules"] += 1
+            return decision
+        decision = self.model.predict(prompt)
+        if decision.agents and decision.confidence >= self.model_threshold:
+            self.counts["model"] += 1
+            return decision
+        self.counts["llm"] += 1
+        return None
+
+    def classify(self, prompt: str) -> Optional[str]:
+        """Fast path for classify_intent; None means ask the LLM."""
+        decision = self.route(prompt)
+        if decision is None:
+            return None
+        if "LAWYER" in decision.agents:
+            return "COURTROOM_REQUEST"
+        if "AUDITOR" in decision.agents and AUDIT_VERB_RE.search(prompt):
+            return "AUDIT_REQUEST"
+        if decision.agents == ["GENESIS"]:
+            return "GENERAL_QUERY"
+        return None
+
+    def record(self, prompt: str, agents: List[str]):
+        """Keeps an LLM routing decision (redacted) and periodically retrains the model tier in the background."""
+        agents = [a for a in agents if a in AGENTS]
+        if not agents:
+            return
+        prompt = redact_prompt(prompt)
+        with self._lock:
+            self._examples.append((prompt, agents))
+            self._since_fit += 1
+            if self.log_path:
+                try:
+                    os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                    with open(self.log_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps({"prompt": prompt, "agents": agents}) + "\n")
+                    self._logged += 1
+                except Exception as e:
+                    print(f"Routing log write failed: {e}")
+            if len(self._examples) >= self.min_examples and (not self.model.trained or self._since_fit >= self.retrain_every):
+                self._start_training()
+
+    def stats(self) -> dict:
+        total = sum(self.counts.values())
+        return {
+            "routed": dict(self.counts),
+            "local_share": round((self.counts["rules"] + self.counts["model"]) / total, 3) if total else 0.0,
+            "model_examples": self.model.examples,
+            "examples": len(self._examples),
+            "logging": bool(self.log_path),
+            "training": bool(self.training_thread and self.training_thread.is_alive()),
+            "rule_threshold": self.rule_threshold,
+            "model_threshold": self.model_threshold
+        }
+
+
+_router: Optional[IntentRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_intent_router() -> IntentRouter:
+    """
+    Process-wide router; thresholds from INTENT_RULE_CONFIDENCE /
+    INTENT_MODEL_CONFIDENCE. Routing decisions are written to
+    INTENT_LOG_PATH only with INTENT_LOG_ROUTING=1 (off by default);
+    INTENT_MAX_EXAMPLES caps what is kept.
+    """
+    global _router
+    with _router_lock:
+        if _router is None:
+            logging = os.environ.get("INTENT_LOG_ROUTING", "0") == "1"
+            _router = IntentRouter(
+                rule_threshold=float(os.environ.get("INTENT_RULE_CONFIDENCE", "0.8")),
+                model_threshold=float(os.environ.get("INTENT_MODEL_CONFIDENCE", "0.8")),
+                log_path=os.environ.get("INTENT_LOG_PATH", "data/routing_log.jsonl") if logging else None,
+                max_examples=int(os.environ.get("INTENT_MAX_EXAMPLES", "5000"))
+            )
+        return _router
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional
+
+
+class BatchJob:
+    """
+    Progress and results of one batch audit. Results are appended in
+    completion order; `follow()` replays them and then waits for more.
+    """
+
+    def __init__(self, total: int, unique: int, workers: int):
+        self.id = str(uuid.uuid4())
+        self.status = "RUNNING"
+        self.total = total
+        self.unique = unique
+        self.workers = workers
+        self.completed = 0
+        self.failed = 0
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.results: List[dict] = []
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status != "RUNNING"
+
+    async def add_results(self, lines: List[dict]):
+        async with self._changed:
+            self.results.extend(lines)
+            for line in lines:
+                if line["status"] == "DONE":
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            self._changed.notify_all()
+
+    async def finish(self, status: str = "DONE"):
+        async with self._changed:
+            self.status = status
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    async def follow(self) -> AsyncIterator[dict]:
+        """Yields every result line, including ones recorded before the call."""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.results) > sent or self.done)
+                lines = self.results[sent:]
+                finished = self.done
+            sent += len(lines)
+            for line in lines:
+                yield line
+            if finished and sent >= len(self.results):
+                return
+
+    def snapshot(self) -> dict:
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "unique": self.unique,
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending": self.total - self.completed - self.failed,
+            "elapsed_s": round(end - self.created_at, 2)
+        }
+
+
+class JobStore:
+    """
+    In-memory registry of batch jobs. Holds at most `max_jobs`; when full the
+    oldest finished job is dropped. Running jobs are never evicted.
+    """
+
+    def __init__(self, max_jobs: int = 64):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, total: int, unique: int, workers: int) -> BatchJob:
+        job = BatchJob(total, unique, workers)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                finished = next((job_id for job_id, j in self._jobs.items() if j.done), None)
+                if finished is None:
+                    break
+                del self._jobs[finished]
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def running(self) -> int:
+        with self._lock:
+            return sum(not j.done for j in self._jobs.values())
+
+
+_store: Optional[JobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Process-wide store; size set by BATCH_MAX_JOBS."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore(max_jobs=int(os.environ.get("BATCH_MAX_JOBS", "64")))
+        return _store
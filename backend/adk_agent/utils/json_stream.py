@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import json
+from typing import List
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally pulls complete objects out of one array in a streamed JSON
+    document, e.g. the courtroom "script" lines, before the rest of the
+    document has arrived. Markdown fences and leading chatter are ignored.
+
+        parser = JSONArrayStreamParser("script")
+        for chunk in stream:
+            for line in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.buffer = ""
+        self._pos = 0            # Next unread index in buffer
+        self._in_array = False
+        self._done = False
+        self._depth = 0          # Brace depth inside the array
+        self._obj_start = None
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[dict]:
+        self.buffer += chunk
+        if self._done:
+            return []
+        if not self._in_array and not self._find_array_start():
+            return []
+        return self._scan()
+
+    def _find_array_start(self) -> bool:
+        marker = self.buffer.find(f'"{self.key}"')
+        if marker == -1:
+            return False
+        bracket = self.buffer.find("[", marker)
+        if bracket == -1:
+            return False
+        self._in_array = True
+        self._pos = bracket + 1
+        return True
+
+    def _scan(self) -> List[dict]:
+        found = []
+        buf = self.buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._obj_start = i
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._obj_start is not None:
+                    try:
+                        found.append(json.loads(buf[self._obj_start:i + 1]))
+                    except ValueError:
+                        pass  # Malformed line; the final full parse still has a chance
+                    self._obj_start = None
+            elif ch == "]" and self._depth == 0:
+                self._done = True
+                i += 1
+                break
+            i += 1
+        self._pos = i
+        return found
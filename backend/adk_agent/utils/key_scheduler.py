@@ -0,0 +1,295 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+RETRY_AFTER_RE = re.compile(r"retry[ _](?:in|after|delay)\D*?(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def is_quota_error(error: Exception) -> bool:
+    """Rate Limit (429) or other transient key exhaustion errors."""
+    err_str = str(error).lower()
+    return "429" in err_str or "quota" in err_str or "exhausted" in err_str
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-suggested wait from a 429 ("Please retry in 17.5s", "retry_delay { seconds: 17 }")."""
+    match = RETRY_AFTER_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class NoKeyAvailableError(RuntimeError):
+    """Every key for the model is cooling down or out of tokens past the wait budget."""
+
+
+class _Lane:
+    """Scheduling state of one (api key, model) pair. Gemini quotas are per model."""
+    __slots__ = ("rate", "tokens", "refilled_at", "cooldown_until", "strikes", "in_flight", "calls", "throttled", "last_used")
+
+    def __init__(self, rate_per_minute: float, burst: float, now: float):
+        self.rate = rate_per_minute / 60.0  # Calls per second; shrinks if the key 429s
+        self.tokens = burst
+        self.refilled_at = now
+        self.cooldown_until = 0.0
+        self.strikes = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+        self.last_used = 0.0
+
+
+class KeyScheduler:
+    """
+    Process-wide, thread-safe API key scheduler replacing per-session round robin.
+
+    Every (key, model) lane has a token bucket (`rate_per_minute`, `burst`), a
+    cooldown set from 429s (the server's retry delay when given, else
+    exponential backoff) and an in-flight count. A lane that 429s has its
+    rate halved and earns it back on success, so a key whose real quota is
+    lower than configured (e.g. shared with another project) stops being
+    over-picked. `pick()` returns the healthy lane with the fewest calls in
+    flight, so concurrent requests from any thread or task spread across
+    keys instead of piling onto one.
+
+    Tokens are charged per LLM call, in `begin()` (KeyUsageCallback calls it
+    as each call starts), not when a key is picked for a client: one pooled
+    client may make many calls, or none.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._lock = threading.Lock()
+                instance._keys = []
+                instance._lanes = {}
+                instance.clock = time.monotonic
+                instance.rate_per_minute = float(os.environ.get("GEMINI_KEY_RPM", "10"))
+                instance.burst = float(os.environ.get("GEMINI_KEY_BURST", "3"))
+                instance.base_cooldown = float(os.environ.get("GEMINI_KEY_COOLDOWN_SECONDS", "20"))
+                instance.max_cooldown = 300.0
+                # Longest a call waits for its lane's token before going ahead anyway.
+                instance.call_wait = float(os.environ.get("GEMINI_KEY_CALL_WAIT_SECONDS", "30"))
+                cls._instance = instance
+            return cls._instance
+
+    def configure(self, rate_per_minute: Optional[float] = None, burst: Optional[float] = None,
+                  base_cooldown: Optional[float] = None, clock: Optional[Callable[[], float]] = None):
+        """Changes limits and forgets all lane state (used by benchmarks)."""
+        with self._lock:
+            if rate_per_minute is not None:
+                self.rate_per_minute = rate_per_minute
+            if burst is not None:
+                self.burst = burst
+            if base_cooldown is not None:
+                self.base_cooldown = base_cooldown
+            if clock is not None:
+                self.clock = clock
+            self._keys = []
+            self._lanes = {}
+
+    def register(self, keys: Iterable[str]):
+        """Adds keys to the pool; already known keys are ignored."""
+        with self._lock:
+            for key in keys:
+                if key not in self._keys:
+                    self._keys.append(key)
+
+    def _lane(self, key: str, model: str, now: float) -> _Lane:
+        lane = self._lanes.get((key, model))
+        if lane is None:
+            lane = self._lanes[(key, model)] = _Lane(self.rate_per_minute, self.burst, now)
+        return lane
+
+    def _refill(self, lane: _Lane, now: float):
+        lane.tokens = min(self.burst, lane.tokens + (now - lane.refilled_at) * lane.rate)
+        lane.refilled_at = now
+
+    def _ready_in(self, lane: _Lane, now: float) -> float:
+        """Seconds until the lane can take a call (0 = now)."""
+        wait = max(0.0, lane.cooldown_until - now)
+        if lane.tokens < 1:
+            wait = max(wait, (1 - lane.tokens) / lane.rate if lane.rate > 0 else float("inf"))
+        return wait
+
+    def _take(self, model: str, force: bool) -> Tuple[Optional[str], float]:
+        """
+        Returns (key, 0) if a lane was ready, else (None or soonest key if
+        force, wait). Charges nothing; begin() does, per call.
+        """
+        with self._lock:
+            if not self._keys:
+                raise NoKeyAvailableError("No API keys registered.")
+            now = self.clock()
+            ready, waiting = [], []
+            for key in self._keys:
+                lane = self._lane(key, model, now)
+                self._refill(lane, now)
+                wait = self._ready_in(lane, now)
+                (ready if wait == 0 else waiting).append((lane.in_flight, -lane.tokens, lane.last_used, wait, key))
+            if ready:
+                chosen, wait = min(ready)[4], 0.0
+            else:
+                soonest = min(waiting, key=lambda c: (c[3], c[0]))
+                chosen, wait = (soonest[4] if force else None), soonest[3]
+            if chosen is not None:
+                self._lanes[(chosen, model)].last_used = now
+            return chosen, wait
+
+    def pick(self, model: str = "default") -> str:
+        """
+        Never blocks: the least-loaded healthy key, or if every key is
+        throttled, the one that frees up first. Charges no token.
+        """
+        key, _ = self._take(model, force=True)
+        return key
+
+    def acquire(self, model: str = "default", timeout: float = 10.0) -> str:
+        """Blocks the calling thread until a healthy key has a token (charged by begin())."""
+        deadline = self.clock() + timeout
+        while True:
+            key, wait = self._take(model, force=False)
+            if key is not None:
+                return key
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                raise NoKeyAvailableError(f"No healthy key for {model} within {timeout}s.")
+            time.sleep(min(wait, remaining))
+
+    async def aacquire(self, model: str = "default", timeout: float = 10.0) -> str:
+        """Like acquire(), but waits with asyncio.sleep."""
+        deadline = self.clock() + timeout
+        while True:
+            key, wait = self._take(model, force=False)
+            if key is not None:
+                return key
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                raise NoKeyAvailableError(f"No healthy key for {model} within {timeout}s.")
+            await asyncio.sleep(min(wait, remaining))
+
+    def ready_in(self, model: str = "default") -> float:
+        """Seconds until any key can take a call for `model`."""
+        with self._lock:
+            now = self.clock()
+            waits = []
+            for key in self._keys:
+                lane = self._lane(key, model, now)
+                self._refill(lane, now)
+                waits.append(self._ready_in(lane, now))
+            return min(waits) if waits else float("inf")
+
+    def begin(self, key: str, model: str = "default") -> float:
+        """
+        Starts a call on the lane and charges it a token. Returns how long
+        the caller should wait before sending: 0 if a token was there, else
+        until the lane's cooldown ends and the token it went into debt for
+        has refilled. Debt makes the lane look busy to pick() meanwhile.
+        """
+        with self._lock:
+            now = self.clock()
+            lane = self._lane(key, model, now)
+            self._refill(lane, now)
+            wait = self._ready_in(lane, now)
+            lane.tokens -= 1
+            lane.in_flight += 1
+            lane.calls += 1
+            lane.last_used = now
+            return wait
+
+    def end(self, key: str, model: str = "default", error: Optional[BaseException] = None) -> bool:
+        """
+        Marks a call finished. A quota error puts the lane into cooldown and
+        returns True; success clears its backoff.
+        """
+        with self._lock:
+            now = self.clock()
+            lane = self._lane(key, model, now)
+            lane.in_flight = max(0, lane.in_flight - 1)
+            configured = self.rate_per_minute / 60.0
+            if error is None:
+                lane.strikes = 0
+                lane.rate = min(configured, lane.rate + configured * 0.05)
+                return False
+            if not is_quota_error(error):
+                return False
+            lane.strikes += 1
+            lane.throttled += 1
+            lane.tokens = min(lane.tokens, 0.0)
+            lane.rate = max(configured * 0.05, lane.rate * 0.5)
+            delay = retry_after_seconds(error)
+            if delay is None:
+                delay = min(self.max_cooldown, self.base_cooldown * 2 ** (lane.strikes - 1))
+            lane.cooldown_until = max(lane.cooldown_until, now + delay)
+            return True
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-lane counters; keys are masked to their last 4 characters."""
+        with self._lock:
+            now = self.clock()
+            return [
+                {
+                    "key": f"...{key[-4:]}",
+                    "model": model,
+                    "in_flight": lane.in_flight,
+                    "tokens": round(lane.tokens, 2),
+                    "rate_per_minute": round(lane.rate * 60, 1),
+                    "cooldown_s": round(max(0.0, lane.cooldown_until - now), 1),
+                    "calls": lane.calls,
+                    "throttled": lane.throttled
+                }
+                for (key, model), lane in self._lanes.items()
+            ]
+
+
+class KeyUsageCallback(BaseCallbackHandler):
+    """
+    Attached to every pooled client so the scheduler sees every call and 429
+    from all agents, not only the Genesis retry loop. Each call takes its
+    lane's token as it starts and, if the lane is out of tokens, waits for
+    one (up to KeyScheduler.call_wait) before it is sent. The start hooks
+    are coroutines so async calls wait with asyncio.sleep; LangChain runs
+    them on a private loop for sync calls.
+    """
+    run_inline = True
+
+    def __init__(self, api_key: str, model: str):
+        self.api_key = api_key
+        self.model = model
+        self._runs = set()
+        self._lock = threading.Lock()
+
+    async def _start(self, run_id: UUID):
+        with self._lock:
+            self._runs.add(run_id)
+        scheduler = KeyScheduler()
+        wait = scheduler.begin(self.api_key, self.model)
+        if wait > 0:
+            await asyncio.sleep(min(wait, scheduler.call_wait))
+
+    def _finish(self, run_id: UUID, error: Optional[BaseException] = None):
+        with self._lock:
+            if run_id not in self._runs:
+                return
+            self._runs.discard(run_id)
+        KeyScheduler().end(self.api_key, self.model, error)
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+        await self._start(run_id)
+
+    async def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any):
+        await self._start(run_id)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any):
+        self._finish(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self._finish(run_id, error)
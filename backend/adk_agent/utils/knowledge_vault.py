@@ -1,54 +1,100 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
-import json
-import os
-from typing import Optional
+import threading
+from typing import Dict, Optional
+from .data_store import DataStore, get_data_store
+from .entity_index import EntityIndex
+
+# Seed data with some common scams
+SEED_DATA = {
+    "companies": {
+        "Star Health": {"flags": 15, "issues": ["Room Rent Capping", "Co-Pay Hidden"]},
+        "NestAway": {"flags": 8, "issues": ["Security Deposit Refund Delay"]},
+        "TCS": {"flags": 5, "issues": ["Bond Period Enforceability"]}
+    },
+    "aliases": {
+        "Star Health and Allied Insurance": "Star Health",
+        "Tata Consultancy Services": "TCS"
+    },
+    "clauses": {
+        "room_rent_capping": {"risk": "High", "count": 120},
+        "non_compete_2_years": {"risk": "Medium", "count": 45}
+    }
+}
+
+class VaultIndex:
+    """
+    EntityIndex kept in sync with one DataStore. The store bumps
+    `entity_version` whenever a company or alias is added; on a version
+    change only the rows added since the last sync are indexed. Flag
+    increments do not touch the index.
+    """
+
+    def __init__(self, store: DataStore):
+        self.store = store
+        self.index = EntityIndex()
+        self.version = None
+        self.company_rowid = 0
+        self.alias_rowid = 0
+        self._lock = threading.Lock()
+
+    def refresh(self) -> EntityIndex:
+        version = self.store.counter("entity_version")
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    companies, aliases = self.store.entity_names_since(self.company_rowid, self.alias_rowid)
+                    for rowid, name in companies:
+                        self.index.add(name)
+                        self.company_rowid = rowid
+                    for rowid, alias, company in aliases:
+                        self.index.add(alias, company)
+                        self.alias_rowid = rowid
+                    self.version = version
+        return self.index
+
+
+_indexes: Dict[str, VaultIndex] = {}
+_seeded = set()
+_registry_lock = threading.Lock()
+
 
 class KnowledgeVault:
-    def __init__(self, db_path="data/scam_graph.json"):
-        self.db_path = db_path
+    """
+    Community Scam Graph, stored in the shared DataStore (data/scam_graph.json
+    is migrated on first use). Lookups go through a process-wide fuzzy
+    EntityIndex per store instead of scanning every company.
+    """
+
+    def __init__(self, store: Optional[DataStore] = None):
+        self.store = store or get_data_store()
         self._ensure_db()
+        with _registry_lock:
+            if self.store.db_path not in _indexes:
+                _indexes[self.store.db_path] = VaultIndex(self.store)
+            self._index = _indexes[self.store.db_path]
 
     def _ensure_db(self):
-        if not os.path.exists("data"):
-            os.makedirs("data")
-        if not os.path.exists(self.db_path):
-            # Seed data with some common scams
-            seed_data = {
-                "companies": {
-                    "Star Health": {"flags": 15, "issues": ["Room Rent Capping", "Co-Pay Hidden"]},
-                    "NestAway": {"flags": 8, "issues": ["Security Deposit Refund Delay"]},
-                    "TCS": {"flags": 5, "issues": ["Bond Period Enforceability"]}
-                },
-                "clauses": {
-                    "room_rent_capping": {"risk": "High", "count": 120},
-                    "non_compete_2_years": {"risk": "Medium", "count": 45}
-                }
-            }
-            with open(self.db_path, "w") as f:
-                json.dump(seed_data, f)
+        with _registry_lock:
+            if self.store.db_path in _seeded:
+                return
+            if self.store.claim_once("scam_graph_seed") and self.store.company_count() == 0:
+                self.store.import_scam_graph(SEED_DATA)
+            _seeded.add(self.store.db_path)
 
     def check_entity(self, entity_name: str) -> Optional[dict]:
-        """Checks if a company/entity has been flagged by the community."""
-        with open(self.db_path, "r") as f:
-            data = json.load(f)
-        
-        # Simple fuzzy match simulation
-        for company, info in data["companies"].items():
-            if entity_name.lower() in company.lower():
-                return info
-        return None
+        """
+        Checks if a company/entity has been flagged by the community.
+        Tolerates case, legal suffixes, aliases and small typos; the result
+        names the matched company and the match score.
+        """
+        match = self._index.refresh().lookup(entity_name)
+        if match is None:
+            return None
+        info = self.store.get_company(match.entity)
+        if info is None:
+            return None
+        return {"name": match.entity, "score": round(match.score, 3), **info}
 
     def flag_entity(self, entity_name: str, issue: str):
-        """Adds a new flag to the community graph."""
-        with open(self.db_path, "r") as f:
-            data = json.load(f)
-        
-        if entity_name not in data["companies"]:
-            data["companies"][entity_name] = {"flags": 0, "issues": []}
-        
-        data["companies"][entity_name]["flags"] += 1
-        if issue not in data["companies"][entity_name]["issues"]:
-            data["companies"][entity_name]["issues"].append(issue)
-            
-        with open(self.db_path, "w") as f:
-            json.dump(data, f)
+        """Adds a new flag to the community graph (atomic increment)."""
+        self.store.flag_company(entity_name, issue)
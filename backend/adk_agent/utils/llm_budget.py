@@ -0,0 +1,89 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import threading
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class LLMBudgetExceeded(RuntimeError):
+    """A request tried to make more LLM calls than its cap allows."""
+
+
+class LLMCallBudget(BaseCallbackHandler):
+    """
+    Per-request LLM call counter with an optional hard cap. Pass it as a
+    callback to every call the request makes (llm.invoke(config=...),
+    agent.run(callbacks=...)); the call past `max_calls` raises
+    LLMBudgetExceeded before anything is sent.
+    """
+    run_inline = True
+    raise_error = True
+
+    def __init__(self, max_calls: Optional[int] = None):
+        self.max_calls = max_calls
+        self.calls = 0
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self.max_calls is not None and self.calls >= self.max_calls:
+                raise LLMBudgetExceeded(f"LLM call cap of {self.max_calls} reached")
+            self.calls += 1
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+        self._start()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any):
+        self._start()
+
+    @property
+    def seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+class AgentRunStats:
+    """
+    Process-wide per (agent, mode) counters: runs, LLM calls per run and
+    wall time, so the ReAct and planned modes can be compared in production.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._runs = {}
+                instance._lock = threading.Lock()
+                cls._instance = instance
+            return cls._instance
+
+    def record(self, agent: str, mode: str, llm_calls: int, seconds: float, failed: bool = False):
+        with self._lock:
+            run = self._runs.setdefault((agent, mode), {"runs": 0, "failed": 0, "llm_calls": 0, "max_llm_calls": 0,
+                                                        "seconds": 0.0, "max_seconds": 0.0})
+            run["runs"] += 1
+            run["failed"] += failed
+            run["llm_calls"] += llm_calls
+            run["max_llm_calls"] = max(run["max_llm_calls"], llm_calls)
+            run["seconds"] += seconds
+            run["max_seconds"] = max(run["max_seconds"], seconds)
+
+    def record_budget(self, agent: str, mode: str, budget: LLMCallBudget, failed: bool = False):
+        self.record(agent, mode, budget.calls, budget.seconds, failed)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            runs = {f"{agent}/{mode}": dict(run) for (agent, mode), run in self._runs.items()}
+        for run in runs.values():
+            run["mean_llm_calls"] = round(run.pop("llm_calls") / run["runs"], 2)
+            run["mean_seconds"] = round(run.pop("seconds") / run["runs"], 3)
+            run["max_seconds"] = round(run["max_seconds"], 3)
+        return runs
+
+    def reset(self):
+        with self._lock:
+            self._runs.clear()
@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+def _default_factory(**kwargs):
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from .key_scheduler import KeyUsageCallback
+    # Reports in-flight calls and 429s for this key back to the KeyScheduler.
+    callbacks = [KeyUsageCallback(kwargs["google_api_key"], kwargs["model"])]
+    return ChatGoogleGenerativeAI(callbacks=callbacks, **kwargs)
+
+
+class LLMRegistry:
+    """
+    Process-wide pool of chat model clients.
+
+    Building a ChatGoogleGenerativeAI also builds its HTTP transport, so doing
+    it per request throws away connection pools and keep-alive. Clients are
+    keyed by (model, api key, temperature, extra options) and kept in a bounded
+    LRU, so every agent and router shares warm connections.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._clients = OrderedDict()
+                instance._lock = threading.Lock()
+                instance.max_size = int(os.environ.get("LLM_REGISTRY_MAX_SIZE", "32"))
+                instance.factory = _default_factory
+                instance.hits = 0
+                instance.misses = 0
+                cls._instance = instance
+            return cls._instance
+
+    @staticmethod
+    def _make_key(model: str, api_key: str, temperature: float, options: dict) -> tuple:
+        return (model, api_key, float(temperature), tuple(sorted(options.items())))
+
+    def get(self, model: str, api_key: str, temperature: float = 0.7, **options: Any):
+        """Returns a pooled client, building it on first use."""
+        key = self._make_key(model, api_key, temperature, options)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+            self.misses += 1
+
+        # Build outside the lock; a racing builder just loses to the first insert.
+        client = self.factory(model=model, google_api_key=api_key, temperature=temperature, **options)
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                return existing
+            self._clients[key] = client
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+        return client
+
+    def invalidate_key(self, api_key: str) -> int:
+        """Drops every client built with `api_key` (e.g. after the key is revoked)."""
+        with self._lock:
+            stale = [k for k in self._clients if k[1] == api_key]
+            for k in stale:
+                del self._clients[k]
+        return len(stale)
+
+    def clear(self, factory: Optional[Callable[..., Any]] = None):
+        """Empties the pool. Optionally swaps the client factory (used by benchmarks)."""
+        with self._lock:
+            self._clients.clear()
+            self.hits = 0
+            self.misses = 0
+            if factory is not None:
+                self.factory = factory
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -1,21 +1,19 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
 import datetime
 import json
-import streamlit as st
 from typing import Optional
-from utils.drive_storage import DriveManager
+from .config import current_session
 
 class AgentLogger:
     def __init__(self):
-        if 'agent_logs' not in st.session_state:
-            st.session_state['agent_logs'] = []
+        current_session().setdefault('agent_logs', [])
         # Supabase client is stateless, so we just init when needed or keep a ref
         # self.drive = DriveManager() # Removed
 
     def log_step(self, agent_name: str, input_data: str, output_data: str, metadata: Optional[dict] = None):
         """Logs a single step in the agent's execution."""
         try:
-            from utils.supabase_client import SupabaseManager
+            from .supabase_client import SupabaseManager
             sb = SupabaseManager().get_client()
             
             entry = {
@@ -1,53 +1,18 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
-import json
-import os
-import streamlit as st
 import random
+from .data_store import get_data_store
 
 def log_market_intel(data: dict, consent_given: bool = True):
     """
     Safely logs anonymous data only if consent_given is True.
-    Appends to a local JSON file (market_intel.json).
+    Counts the policy and the company's flag in the DataStore (atomic
+    increments; the old market_intel.json is migrated on first use).
     """
     if not consent_given:
         return
 
-    file_path = "market_intel.json"
-    
-    # Ensure file exists
-    if not os.path.exists(file_path):
-        # Create with default structure if missing
-        default_data = {
-            "companies": [],
-            "issues_distribution": {},
-            "metrics": {"total_policies_analyzed": 0, "top_risk_zip": "N/A"},
-            "geo_risk": []
-        }
-        with open(file_path, "w") as f:
-            json.dump(default_data, f)
-
     try:
-        with open(file_path, "r") as f:
-            current_data = json.load(f)
-        
-        # Update Metrics
-        current_data["metrics"]["total_policies_analyzed"] += 1
-        
-        # Update Company Flags (Simple Logic)
-        company_name = data.get("company_name", "Unknown")
-        found = False
-        for comp in current_data["companies"]:
-            if comp["name"] == company_name:
-                comp["flags"] += 1
-                found = True
-                break
-        if not found and company_name != "Unknown":
-            current_data["companies"].append({"name": company_name, "flags": 1, "issues": "New Detected"})
-            
-        # Save back
-        with open(file_path, "w") as f:
-            json.dump(current_data, f)
-            
+        get_data_store().log_market_event(data.get("company_name", "Unknown"))
     except Exception as e:
         print(f"Logging failed: {e}")
 
@@ -64,6 +29,7 @@ def show_funny_error(error_msg: str):
         "Our monkeys are working on this. Please hold."
     ]
     
+    import streamlit as st
     msg = random.choice(funny_messages)
     st.error(f"**{msg}**")
     st.caption(f"Technical Details: {error_msg}")
@@ -1,11 +1,12 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
-import streamlit as st
 import json
+from .config import current_session
 
 class FamilyMemory:
     def __init__(self):
-        if 'family_profile' not in st.session_state:
-            st.session_state['family_profile'] = []
+        # st.session_state in the Streamlit app, the request's session in FastAPI.
+        self.session = current_session()
+        self.session.setdefault('family_profile', [])
         
         # Auto-Load from Drive
         self.load_memory()
@@ -17,35 +18,33 @@ class FamilyMemory:
             "age": age,
             "conditions": conditions
         }
-        st.session_state['family_profile'].append(member)
+        self.session['family_profile'].append(member)
         self.save_memory()
 
     def get_profile_string(self) -> str:
         """Returns the family profile as a string for the LLM."""
-        if not st.session_state['family_profile']:
+        if not self.session['family_profile']:
             return "No family profile found."
         
         profile_str = "Family Profile:\n"
-        for m in st.session_state['family_profile']:
+        for m in self.session['family_profile']:
             profile_str += f"- {m['name']} (Age: {m['age']}): {m['conditions']}\n"
         return profile_str
 
     def add_case_history(self, case_data: dict):
         """Stores a verified case/report for future reference."""
-        if 'case_history' not in st.session_state:
-            st.session_state['case_history'] = []
-        st.session_state['case_history'].append(case_data)
+        self.session.setdefault('case_history', []).append(case_data)
         # TODO: Persist case history too if needed
 
     def get_case_history(self):
         """Retrieves past cases."""
-        return st.session_state.get('case_history', [])
+        return self.session.get('case_history', [])
 
     # --- Persistent Memory (Supabase) ---
     def save_memory(self):
         """Saves family profile to Supabase."""
         try:
-            from utils.supabase_client import SupabaseManager
+            from .supabase_client import SupabaseManager
             manager = SupabaseManager()
             
             # CIRCUIT BREAKER: If DB down, skip save (Session State still holds data)
@@ -65,9 +64,9 @@ class FamilyMemory:
             sb.table("family_profiles").delete().eq("user_id", user_id).execute()
             
             # 2. Insert new
-            if st.session_state['family_profile']:
+            if self.session['family_profile']:
                 data = []
-                for m in st.session_state['family_profile']:
+                for m in self.session['family_profile']:
                     data.append({
                         "user_id": user_id,
                         "name": m["name"],
@@ -83,10 +82,10 @@ class FamilyMemory:
         """Loads family profile from Supabase."""
         try:
             # Only load if session is empty
-            if st.session_state['family_profile']:
+            if self.session['family_profile']:
                 return
 
-            from utils.supabase_client import SupabaseManager
+            from .supabase_client import SupabaseManager
             manager = SupabaseManager()
             
             # CIRCUIT BREAKER
@@ -101,7 +100,7 @@ class FamilyMemory:
             response = sb.table("family_profiles").select("*").eq("user_id", user_id).execute()
             
             if response.data:
-                st.session_state['family_profile'] = response.data
-                st.toast("🧠 Memory Restored from Supabase", icon="⚡")
+                self.session['family_profile'] = response.data
+                print("🧠 Memory Restored from Supabase")
         except Exception as e:
             print(f"Memory Load Failed: {e}")
@@ -0,0 +1,448 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class AllModelsFailedError(RuntimeError):
+    """No route produced an answer (all failed, were unavailable or had open circuits)."""
+
+
+class CircuitBreaker:
+    """
+    closed -> (failure_threshold consecutive failures) -> open
+    open -> (reset_timeout elapsed) -> half_open: one probe call is let through
+    half_open -> probe succeeds -> closed / probe fails -> open again
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self.probing = False
+
+    def available(self) -> bool:
+        """Peek: could a call be let through right now?"""
+        with self._lock:
+            self._refresh()
+            return self.state == self.CLOSED or (self.state == self.HALF_OPEN and not self.probing)
+
+    def allow(self) -> bool:
+        """Reserve a call. In half-open only one probe is allowed at a time."""
+        with self._lock:
+            self._refresh()
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def release_probe(self):
+        """The reserved half-open probe was never made (e.g. cancelled)."""
+        with self._lock:
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self.probing = False
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ModelRoute:
+    """
+    One candidate model. `factory` returns a LangChain chat model (or None if
+    it is not configured, e.g. no Groq key). `retry_delay(error)` may return
+    seconds to wait before retrying the same route (e.g. on a 429 when another
+    key is free), or None to give up on it. `busy()` returning True (e.g. its
+    key lanes are out of tokens) keeps the route from being used as a hedge.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], max_attempts: int = 1,
+                 retry_delay: Optional[Callable[[Exception], Optional[float]]] = None,
+                 busy: Optional[Callable[[], bool]] = None):
+        self.name = name
+        self.factory = factory
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.busy = busy
+
+
+class ModelRouter:
+    """
+    Process-wide routing across models (Genesis Pro -> Flash -> Groq).
+
+    - Each model has a CircuitBreaker, so during an outage requests skip the
+      broken model instead of paying a failed round trip each time.
+    - Latency-aware ordering: routes whose recent p95 exceeds
+      `latency_budget` move behind the routes that are within budget.
+    - Hedging: if the first route has not answered after its own p95
+      (clamped to [min_hedge, max_hedge]), the next route is raced against
+      it and the first successful answer wins. Hedges are budgeted: at most
+      `hedge_ratio` (10%) of the requests in flight may have a hedge
+      running, and never more than one while fewer than 1/hedge_ratio
+      requests are in flight; a request that finds no free slot tries again
+      every hedge delay while its first call is still running. No hedge
+      goes to a route whose circuit has recent failures or that reports
+      itself busy (e.g. Flash key lanes out of tokens).
+    - Streaming (`astream`) fails over, retries and hedges the same way up
+      to the first chunk, then follows the stream that produced it.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._lock = threading.Lock()
+                instance._breakers = {}
+                instance._latency = {}
+                instance._counters = {}
+                instance.clock = time.monotonic
+                instance.failure_threshold = int(os.environ.get("MODEL_BREAKER_FAILURES", "3"))
+                instance.reset_timeout = float(os.environ.get("MODEL_BREAKER_RESET_SECONDS", "30"))
+                instance.latency_budget = float(os.environ.get("MODEL_LATENCY_BUDGET_SECONDS", "25"))
+                instance.default_hedge = float(os.environ.get("MODEL_HEDGE_AFTER_SECONDS", "12"))
+                instance.min_hedge = 0.5
+                instance.max_hedge = 30.0
+                instance.min_samples = 20
+                instance.hedge_ratio = float(os.environ.get("MODEL_HEDGE_RATIO", "0.1"))
+                instance._in_flight = 0
+                instance._hedging = 0
+                cls._instance = instance
+            return cls._instance
+
+    def configure(self, **settings: Any):
+        """Overrides tuning attributes and forgets all health state (used by benchmarks)."""
+        with self._lock:
+            for name, value in settings.items():
+                if not hasattr(self, name):
+                    raise AttributeError(name)
+                setattr(self, name, value)
+            self._breakers = {}
+            self._latency = {}
+            self._counters = {}
+
+    def _health(self, name: str) -> Tuple[CircuitBreaker, LatencyTracker, dict]:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(self.failure_threshold, self.reset_timeout, self.clock)
+                self._latency[name] = LatencyTracker()
+                self._counters[name] = {"calls": 0, "failures": 0, "skipped": 0, "hedges": 0, "hedge_wins": 0,
+                                        "hedges_skipped": 0}
+            return self._breakers[name], self._latency[name], self._counters[name]
+
+    def _count(self, name: str, counter: str):
+        _, _, counters = self._health(name)
+        with self._lock:
+            counters[counter] += 1
+
+    def p95(self, name: str) -> Optional[float]:
+        _, latency, _ = self._health(name)
+        return latency.percentile(0.95) if len(latency) >= self.min_samples else None
+
+    def hedge_delay(self, name: str) -> float:
+        p95 = self.p95(name)
+        if p95 is None:
+            return self.default_hedge
+        return min(self.max_hedge, max(self.min_hedge, p95))
+
+    def _take_hedge(self, backup: ModelRoute) -> bool:
+        """Reserves a hedge slot if the budget allows one and `backup` is healthy and not busy."""
+        breaker, _, _ = self._health(backup.name)
+        if breaker.state != CircuitBreaker.CLOSED or breaker.failures:
+            return False
+        if backup.busy is not None and backup.busy():
+            return False
+        with self._lock:
+            if self._hedging >= max(1, int(self.hedge_ratio * self._in_flight)):
+                return False
+            self._hedging += 1
+            return True
+
+    def _end_hedge(self, _task=None):
+        with self._lock:
+            self._hedging -= 1
+
+    def ordered(self, routes: List[ModelRoute]) -> List[ModelRoute]:
+        """Routes whose circuit may pass a call, within-budget ones first (stable)."""
+        usable = []
+        for route in routes:
+            breaker, _, _ = self._health(route.name)
+            if breaker.available():
+                usable.append(route)
+            else:
+                self._count(route.name, "skipped")
+        fast = [r for r in usable if (self.p95(r.name) or 0.0) <= self.latency_budget]
+        return fast + [r for r in usable if r not in fast]
+
+    def allow(self, name: str) -> bool:
+        breaker, _, _ = self._health(name)
+        if breaker.allow():
+            return True
+        self._count(name, "skipped")
+        return False
+
+    def record(self, name: str, seconds: float, error: Optional[BaseException] = None):
+        breaker, latency, counters = self._health(name)
+        with self._lock:
+            counters["calls"] += 1
+            if error is not None:
+                counters["failures"] += 1
+        if error is None:
+            breaker.record_success()
+            latency.add(seconds)
+        else:
+            breaker.record_failure()
+
+    def release(self, name: str):
+        """A reserved half-open probe was abandoned (hedge loser); let the next call probe."""
+        breaker, _, _ = self._health(name)
+        breaker.release_probe()
+
+    def _model(self, route: ModelRoute):
+        """A fresh client per attempt (so retries rotate keys); unconfigured routes are not failures."""
+        model = route.factory()
+        if model is None:
+            self.release(route.name)
+            raise AllModelsFailedError(f"{route.name} is not configured")
+        return model
+
+    def _retry_delay(self, route: ModelRoute, error: Exception, attempt: int) -> Optional[float]:
+        if route.retry_delay is None or attempt + 1 >= route.max_attempts:
+            return None
+        return route.retry_delay(error)
+
+    async def _aretry(self, route: ModelRoute, call: Callable[[Any], Awaitable[Any]]) -> Tuple[Any, float]:
+        """
+        Runs `call(model)` on a fresh client for `route`, retrying while
+        route.retry_delay allows. Failures are recorded here; returns
+        (result, start) so the caller records success once the call is over.
+        """
+        for attempt in range(route.max_attempts):
+            model = self._model(route)
+            start = self.clock()
+            try:
+                return await call(model), start
+            except Exception as e:
+                delay = self._retry_delay(route, e, attempt)
+                if delay is None:
+                    self.record(route.name, self.clock() - start, e)
+                    raise
+                await asyncio.sleep(delay)
+
+    async def _aattempt(self, route: ModelRoute, prompt: Any) -> Tuple[str, str]:
+        response, start = await self._aretry(route, lambda model: model.ainvoke(prompt))
+        self.record(route.name, self.clock() - start)
+        return response.content, route.name
+
+    async def _aopen(self, route: ModelRoute, prompt: Any) -> Tuple[str, Optional[AsyncIterator], float, ModelRoute]:
+        """Starts a stream on `route` and waits for its first chunk. Returns (chunk, rest of the stream, start, route)."""
+        async def first_chunk(model):
+            stream = model.astream(prompt)
+            async for chunk in stream:
+                if chunk.content:
+                    return chunk.content, stream
+            return "", None
+
+        (first, stream), start = await self._aretry(route, first_chunk)
+        return first, stream, start, route
+
+    def _attempt(self, route: ModelRoute, prompt: Any) -> Tuple[str, str]:
+        for attempt in range(route.max_attempts):
+            model = self._model(route)
+            start = self.clock()
+            try:
+                response = model.invoke(prompt)
+            except Exception as e:
+                delay = self._retry_delay(route, e, attempt)
+                if delay is None:
+                    self.record(route.name, self.clock() - start, e)
+                    raise
+                time.sleep(delay)
+                continue
+            self.record(route.name, self.clock() - start)
+            return response.content, route.name
+
+    def invoke(self, prompt: Any, routes: List[ModelRoute]) -> Tuple[str, str]:
+        """Sequential failover (no hedging). Returns (answer, route name)."""
+        errors = []
+        for route in self.ordered(routes):
+            if not self.allow(route.name):
+                continue
+            try:
+                return self._attempt(route, prompt)
+            except Exception as e:
+                errors.append(f"{route.name}: {e}")
+        raise AllModelsFailedError("; ".join(errors) or "every circuit is open")
+
+    async def ainvoke(self, prompt: Any, routes: List[ModelRoute], hedge: bool = True) -> Tuple[str, str]:
+        """Failover with hedging. Returns (answer, route name)."""
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return await self._arace(routes, lambda route: self._aattempt(route, prompt), hedge)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def astream(self, prompt: Any, routes: List[ModelRoute], hedge: bool = True,
+                      status: Optional[dict] = None) -> AsyncIterator[str]:
+        """
+        Streams the answer chunk by chunk. Until the first chunk arrives,
+        routes are failed over, retried and hedged exactly as in ainvoke;
+        after that an error is raised to the caller, since text already
+        sent cannot be taken back. status["route"] names the route that
+        streamed. Raises AllModelsFailedError if no route produced a chunk.
+        """
+        with self._lock:
+            self._in_flight += 1
+        stream = None
+        try:
+            first, stream, start, route = await self._arace(routes, lambda r: self._aopen(r, prompt), hedge)
+            if status is not None:
+                status["route"] = route.name
+            try:
+                if first:
+                    yield first
+                if stream is not None:
+                    async for chunk in stream:
+                        if chunk.content:
+                            yield chunk.content
+            except Exception as e:
+                self.record(route.name, self.clock() - start, e)
+                raise
+            except BaseException:
+                # The consumer stopped reading (disconnect, cancellation).
+                self.release(route.name)
+                raise
+            self.record(route.name, self.clock() - start)
+        finally:
+            if stream is not None:
+                await stream.aclose()
+            with self._lock:
+                self._in_flight -= 1
+
+    async def _arace(self, routes: List[ModelRoute], attempt: Callable[[ModelRoute], Awaitable[Any]], hedge: bool) -> Any:
+        """Runs `attempt(route)` down the failover order with hedging; returns the first success."""
+        errors = []
+        queue = self.ordered(routes)
+
+        def next_route() -> Optional[ModelRoute]:
+            while queue:
+                route = queue.pop(0)
+                if self.allow(route.name):
+                    return route
+            return None
+
+        running: Dict[asyncio.Task, ModelRoute] = {}
+        try:
+            route = next_route()
+            while route is not None:
+                running[asyncio.create_task(attempt(route))] = route
+                if hedge and queue:
+                    delay = self.hedge_delay(route.name)
+                    done, _ = await asyncio.wait(running, timeout=delay)
+                    hedged = bool(done)
+                    while not done and queue:
+                        if self._take_hedge(queue[0]):
+                            backup = next_route()
+                            if backup is None:
+                                self._end_hedge()
+                            else:
+                                self._count(route.name, "hedges")
+                                task = asyncio.create_task(attempt(backup))
+                                task.add_done_callback(self._end_hedge)
+                                running[task] = backup
+                                hedged = True
+                            break
+                        done, _ = await asyncio.wait(running, timeout=delay)
+                    if not hedged:
+                        self._count(route.name, "hedges_skipped")
+
+                while running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        finished = running.pop(task)
+                        if task.exception() is None:
+                            if finished is not route:
+                                self._count(route.name, "hedge_wins")
+                            return task.result()
+                        errors.append(f"{finished.name}: {task.exception()}")
+                route = next_route()
+            raise AllModelsFailedError("; ".join(errors) or "every circuit is open")
+        finally:
+            # The hedge loser, or every call still running if the caller was
+            # cancelled (wait_for timeout, client disconnect): stop spending
+            # quota on them and free any half-open probe they reserved.
+            for task, task_route in running.items():
+                task.cancel()
+                self.release(task_route.name)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            names = list(self._breakers)
+        out = {}
+        for name in names:
+            breaker, latency, counters = self._health(name)
+            p50 = latency.percentile(0.5)
+            p95 = latency.percentile(0.95)
+            out[name] = {
+                "state": breaker.state,
+                "consecutive_failures": breaker.failures,
+                "trips": breaker.trips,
+                "p50_s": round(p50, 3) if p50 is not None else None,
+                "p95_s": round(p95, 3) if p95 is not None else None,
+                **counters
+            }
+        return out
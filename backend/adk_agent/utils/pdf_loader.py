@@ -1,16 +1,145 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import hashlib
 import io
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
 from pypdf import PdfReader
 
-def extract_text_from_pdf(pdf_file) -> str:
+# Documents with at least this many uncached pages are split across processes.
+PARALLEL_PAGE_THRESHOLD = 64
+PAGES_PER_TASK = 25
+
+
+class PDFExtractionError(ValueError):
+    """The document could not be opened or parsed at all."""
+
+
+class PageCache:
+    """LRU of extracted page text keyed by (file sha256, page number), bounded by characters."""
+
+    def __init__(self, max_chars: int = 50_000_000):
+        self.max_chars = max_chars
+        self._pages = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_hash: str, page: int) -> Optional[str]:
+        with self._lock:
+            text = self._pages.get((file_hash, page))
+            if text is not None:
+                self._pages.move_to_end((file_hash, page))
+            return text
+
+    def put(self, file_hash: str, page: int, text: str):
+        with self._lock:
+            if (file_hash, page) in self._pages:
+                return
+            self._pages[(file_hash, page)] = text
+            self._chars += len(text)
+            while self._chars > self.max_chars and self._pages:
+                _, old = self._pages.popitem(last=False)
+                self._chars -= len(old)
+
+
+page_cache = PageCache()
+
+
+def _open_source(pdf_file) -> Tuple[object, str, Optional[str]]:
     """
-    Extracts text from a PDF file object (Streamlit UploadedFile or file path).
+    Returns (stream, sha256, path). On-disk files are memory-mapped instead of
+    read into memory; uploads (Streamlit UploadedFile, bytes) are used as-is.
     """
+    if isinstance(pdf_file, (str, os.PathLike)):
+        path = os.fspath(pdf_file)
+        with open(path, "rb") as f:
+            stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return stream, hashlib.sha256(stream).hexdigest(), path
+    if isinstance(pdf_file, (bytes, bytearray)):
+        data = bytes(pdf_file)
+    else:
+        data = pdf_file.getvalue() if hasattr(pdf_file, "getvalue") else pdf_file.read()
+    return io.BytesIO(data), hashlib.sha256(data).hexdigest(), None
+
+
+def _extract_range(source, pages: List[int]) -> List[Tuple[int, str, float, Optional[str]]]:
+    """Process-pool worker: opens its own reader (mmap for paths) and extracts `pages`."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        stream = io.BytesIO(source)
+    reader = PdfReader(stream)
+    return [_extract_page(reader, n) for n in pages]
+
+
+def _extract_page(reader: PdfReader, n: int) -> Tuple[int, str, float, Optional[str]]:
+    start = time.perf_counter()
     try:
-        reader = PdfReader(pdf_file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        text, error = reader.pages[n].extract_text() or "", None
     except Exception as e:
-        return f"Error reading PDF: {str(e)}"
+        text, error = "", str(e)
+    return n, text, time.perf_counter() - start, error
+
+
+def iter_pdf_pages(pdf_file, workers: Optional[int] = None, parallel_threshold: int = PARALLEL_PAGE_THRESHOLD) -> Iterator[dict]:
+    """
+    Yields {"page", "text", "seconds", "cached", "error"} per page, in page
+    order, as soon as each page is available. Large documents are extracted
+    in parallel across a process pool; already-seen pages come from the
+    page cache. A page that fails to parse yields empty text plus "error".
+    `workers` defaults to the CPU count; a single worker stays in-process.
+    """
+    try:
+        stream, file_hash, path = _open_source(pdf_file)
+        reader = PdfReader(stream)
+        page_count = len(reader.pages)
+    except Exception as e:
+        raise PDFExtractionError(f"Error reading PDF: {str(e)}") from e
+
+    missing = []
+    for n in range(page_count):
+        if page_cache.get(file_hash, n) is None:
+            missing.append(n)
+
+    def from_cache(n):
+        return {"page": n, "text": page_cache.get(file_hash, n) or "", "seconds": 0.0, "cached": True, "error": None}
+
+    def fresh(result):
+        n, text, seconds, error = result
+        if error is None:
+            page_cache.put(file_hash, n, text)
+        return {"page": n, "text": text, "seconds": seconds, "cached": False, "error": error}
+
+    workers = workers or os.cpu_count() or 1
+    if len(missing) < parallel_threshold or workers <= 1:
+        missing_set = set(missing)
+        for n in range(page_count):
+            yield fresh(_extract_page(reader, n)) if n in missing_set else from_cache(n)
+        return
+
+    source = path if path is not None else stream.getvalue()
+    batches = [missing[i:i + PAGES_PER_TASK] for i in range(0, len(missing), PAGES_PER_TASK)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {batch[0]: pool.submit(_extract_range, source, batch) for batch in batches}
+        pending = {}
+        for n in range(page_count):
+            if n in futures:
+                pending.update({r[0]: r for r in futures.pop(n).result()})
+            if n in pending:
+                yield fresh(pending.pop(n))
+            else:
+                yield from_cache(n)
+
+
+def extract_text_from_pdf(pdf_file, workers: Optional[int] = None) -> str:
+    """
+    Extracts text from a PDF file object (Streamlit UploadedFile, bytes or file path).
+    Raises PDFExtractionError if the document cannot be read.
+    """
+    return "".join(f"{page['text']}\n" for page in iter_pdf_pages(pdf_file, workers=workers))
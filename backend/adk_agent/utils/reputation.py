@@ -0,0 +1,198 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from .entity_index import normalize_entity
+from .result_cache import get_result_cache, make_cache_key
+
+ResearchFn = Callable[[str], str]
+
+
+class ReputationService:
+    """
+    Cached, rate-limited reputation lookups for Sentinel.
+
+    Summaries (per company) and raw search results (per query) are kept in
+    the persistent ResultCache, so every worker shares them. An entry is
+    fresh for `ttl_seconds`; after that it is still served while one
+    background refresh replaces it (and kept if the refresh fails), until
+    the ResultCache itself expires it. Concurrent lookups of the same
+    company or query share one in-flight call, and live searches across all
+    threads go through a token bucket (`search_rate` per second, bursts of
+    `search_burst`, so a planned Sentinel run's parallel queries go out at
+    once); a falsy rate disables the limit.
+
+    The search backend is pluggable (tools.search_tools): DuckDuckGo live,
+    or a local fixture corpus.
+    """
+    SUMMARY_VERSION = "v1"
+
+    def __init__(self, backend=None, cache=None, ttl_seconds: float = 6 * 3600,
+                 search_ttl_seconds: float = 24 * 3600, search_rate: float = 1.0, search_burst: int = 4,
+                 refresh_workers: int = 2):
+        self._backend = backend
+        self._cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.search_ttl_seconds = search_ttl_seconds
+        self.search_rate = search_rate
+        self.search_burst = search_burst
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._search_lock = threading.Lock()
+        self._search_tokens = float(search_burst)
+        self._search_refilled = time.monotonic()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="reputation-refresh")
+        self._metrics = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0,
+                         "refresh_failures": 0, "search_hits": 0, "searches": 0, "throttled_seconds": 0.0}
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            from ..tools.search_tools import get_search_backend
+            self._backend = get_search_backend()
+        return self._backend
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = get_result_cache()
+        return self._cache
+
+    def _count(self, field: str, by: float = 1):
+        with self._lock:
+            self._metrics[field] += by
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """The in-flight call for `key`, and whether the caller must run it."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._metrics["coalesced"] += 1
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def _run(self, key: str, future: Future, fn: Callable[[], dict]):
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _once(self, key: str, fn: Callable[[], dict]) -> dict:
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, fn)
+        return future.result()
+
+    def _throttle(self):
+        if not self.search_rate:
+            return
+        with self._search_lock:
+            now = time.monotonic()
+            self._search_tokens = min(float(self.search_burst),
+                                      self._search_tokens + (now - self._search_refilled) * self.search_rate)
+            self._search_refilled = now
+            # Going negative reserves a later slot for this caller.
+            self._search_tokens -= 1
+            wait = -self._search_tokens / self.search_rate if self._search_tokens < 0 else 0.0
+        if wait:
+            self._count("throttled_seconds", wait)
+            time.sleep(wait)
+
+    def search(self, query: str) -> str:
+        """Cached, coalesced and rate-limited web search."""
+        key = make_cache_key("reputation_search", " ".join(query.lower().split()), "", self.SUMMARY_VERSION, self.backend.name)
+        cached = self.cache.get("reputation_search", key)
+        if cached is not None and time.time() - cached["fetched_at"] < self.search_ttl_seconds:
+            self._count("search_hits")
+            return cached["text"]
+
+        def fetch() -> dict:
+            self._throttle()
+            self._count("searches")
+            entry = {"text": self.backend.search(query), "fetched_at": time.time()}
+            self.cache.put("reputation_search", key, entry)
+            return entry
+
+        try:
+            return self._once(key, fetch)["text"]
+        except Exception as e:
+            if cached is None:
+                raise
+            print(f"Search failed, serving cached results: {e}")
+            return cached["text"]
+
+    def _company_key(self, company: str) -> str:
+        name = normalize_entity(company) or " ".join(company.lower().split())
+        return make_cache_key("reputation", name, "", self.SUMMARY_VERSION, "")
+
+    def _research(self, key: str, company: str, research: ResearchFn) -> dict:
+        entry = {"company": company, "summary": research(company), "fetched_at": time.time()}
+        self.cache.put("reputation", key, entry)
+        return entry
+
+    def _refresh_in_background(self, key: str, company: str, research: ResearchFn):
+        future, leader = self._join(key)
+        if not leader:
+            return
+        self._count("refreshes")
+
+        def refresh():
+            self._run(key, future, lambda: self._research(key, company, research))
+            if future.exception() is not None:
+                self._count("refresh_failures")
+                print(f"Reputation refresh for {company} failed: {future.exception()}")
+
+        self._refresher.submit(refresh)
+
+    def lookup(self, company: str, research: ResearchFn) -> dict:
+        """
+        {"company", "summary", "fetched_at", "status"}; status is "fresh",
+        "stale" (a refresh is running) or "miss" (`research` just ran).
+        Errors from `research` propagate on a miss and are never cached.
+        """
+        key = self._company_key(company)
+        entry = self.cache.get("reputation", key)
+        if entry is not None:
+            if time.time() - entry["fetched_at"] < self.ttl_seconds:
+                self._count("fresh_hits")
+                return dict(entry, status="fresh")
+            self._count("stale_hits")
+            self._refresh_in_background(key, company, research)
+            return dict(entry, status="stale")
+        self._count("misses")
+        return dict(self._once(key, lambda: self._research(key, company, research)), status="miss")
+
+    def check(self, company: str, research: ResearchFn) -> str:
+        return self.lookup(company, research)["summary"]
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._metrics, in_flight=len(self._inflight))
+        stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+        return dict(stats, backend=self.backend.name, ttl_seconds=self.ttl_seconds,
+                    search_ttl_seconds=self.search_ttl_seconds, search_rate=self.search_rate, search_burst=self.search_burst)
+
+
+_service: Optional[ReputationService] = None
+_service_lock = threading.Lock()
+
+
+def get_reputation_service() -> ReputationService:
+    """Process-wide service; TTLs and the search rate limit come from REPUTATION_* env vars."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ReputationService(
+                ttl_seconds=float(os.environ.get("REPUTATION_TTL_SECONDS", 6 * 3600)),
+                search_ttl_seconds=float(os.environ.get("REPUTATION_SEARCH_TTL_SECONDS", 24 * 3600)),
+                search_rate=float(os.environ.get("REPUTATION_SEARCH_RATE", "1.0")),
+                search_burst=int(os.environ.get("REPUTATION_SEARCH_BURST", "4"))
+            )
+        return _service
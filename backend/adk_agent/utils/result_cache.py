@@ -0,0 +1,130 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Optional
+
+
+def normalize_text(text: str) -> str:
+    """Collapses the cosmetic differences between two uploads of the same PDF."""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split())
+
+
+def make_cache_key(namespace: str, text: str, doc_type: str, prompt_version: str, model: str, extra: str = "") -> str:
+    """sha256 over normalized text + everything that changes the LLM's answer."""
+    h = hashlib.sha256()
+    for part in (namespace, doc_type, prompt_version, model, extra, normalize_text(text)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent LLM result cache on SQLite.
+
+    Entries expire `ttl_seconds` after being written. Once the table holds
+    more than `max_entries` rows, the least recently read ones are evicted.
+    Hit/miss counters are kept per namespace (audit, full_report, critic).
+    """
+
+    def __init__(self, db_path: str = "data/result_cache.db", ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._ensure_db()
+
+    def _ensure_db(self):
+        folder = os.path.dirname(self.db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, namespace TEXT, value TEXT, created_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed_at)")
+        self._conn.commit()
+
+    def _count(self, namespace: str, field: str):
+        stats = self._metrics.setdefault(namespace, {"hits": 0, "misses": 0, "writes": 0, "evictions": 0})
+        stats[field] += 1
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count(namespace, "misses")
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                self._count(namespace, "misses")
+                self._count(namespace, "evictions")
+                return None
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._count(namespace, "hits")
+        return json.loads(row[0])
+
+    def put(self, namespace: str, key: str, value: Any):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, namespace, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, json.dumps(value), now, now)
+            )
+            self._count(namespace, "writes")
+            overflow = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self._count(namespace, "evictions")
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM results WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+            return cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            namespaces = {k: dict(v) for k, v in self._metrics.items()}
+        for stats in namespaces.values():
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "namespaces": namespaces
+        }
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide cache; location and limits come from RESULT_CACHE_* env vars."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(
+                db_path=os.environ.get("RESULT_CACHE_PATH", "data/result_cache.db"),
+                ttl_seconds=float(os.environ.get("RESULT_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+                max_entries=int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "5000"))
+            )
+        return _cache
@@ -1,74 +1,36 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
 import os
-import streamlit as st
-import random
-from typing import List, Optional
+from typing import Optional
+from .key_scheduler import KeyScheduler
+from .config import get_config, get_secret, streamlit_running
 
 class SecurityManager:
     def __init__(self):
-        self.api_keys = self._load_api_keys()
-        self.admin_key = st.secrets.get("ADMIN_KEY", "admin123") # Default for dev, change in prod
-        
-        if "key_index" not in st.session_state:
-            st.session_state.key_index = 0
-
-    def _load_api_keys(self) -> List[str]:
-        """Loads Gemini API keys from Streamlit secrets."""
-        keys = []
-        # Support for multiple keys: GEMINI_KEY_1, GEMINI_KEY_2, etc.
-        # Or a single list in GEMINI_KEYS
-        if "GEMINI_KEYS" in st.secrets:
-            keys = st.secrets["GEMINI_KEYS"]
-        else:
-            # Fallback to checking individual keys
-            i = 1
-            while True:
-                key_name = f"GEMINI_KEY_{i}"
-                if key_name in st.secrets:
-                    keys.append(st.secrets[key_name])
-                    i += 1
-                else:
-                    break
-        
-        if not keys and "GEMINI_API_KEY" in st.secrets:
-             keys.append(st.secrets["GEMINI_API_KEY"])
-
-        if not keys:
-            st.error("No Gemini API Keys found in secrets.toml!")
-            return []
-        
-        return keys
+        # Keys and secrets are parsed once per process by the ConfigProvider;
+        # agents construct SecurityManager on every request.
+        config = get_config()
+        self.api_keys = config.api_keys()
+        self.admin_key = config.get("ADMIN_KEY", "admin123") # Default for dev, change in prod
+        KeyScheduler().register(self.api_keys)
 
     def get_key_count(self) -> int:
         return len(self.api_keys)
 
-    def get_next_api_key(self) -> str:
-        """Round-robin selection of API key."""
+    def get_next_api_key(self, model: str = "default") -> str:
+        """
+        Least-loaded healthy key for `model`, chosen by the process-wide
+        KeyScheduler (token buckets, 429 cooldowns, in-flight counts).
+        """
         if not self.api_keys:
             raise ValueError("No API keys available.")
         
-        # Get current key
-        idx = st.session_state.key_index % len(self.api_keys)
-        key = self.api_keys[idx]
-        
-        # Rotate for next call
-        st.session_state.key_index += 1
-        
-        return key
+        return KeyScheduler().pick(model)
 
     def get_secret(self, key_name: str) -> Optional[str]:
         """
-        Retrieves a secret from Streamlit secrets or Session State (BYOK).
+        Retrieves a secret from the session (BYOK), then env / .env / secrets.toml.
         """
-        # 1. Check Session State (User provided key)
-        if key_name in st.session_state:
-            return st.session_state[key_name]
-            
-        # 2. Check Secrets.toml
-        if key_name in st.secrets:
-            return st.secrets[key_name]
-            
-        return None
+        return get_secret(key_name)
 
     def generate_admin_token(self, action_details: str) -> str:
         """
@@ -88,7 +50,11 @@ class SecurityManager:
         """
         # In a real app, this would trigger a UI modal for approval.
         # For now, we simulate it by checking if the Admin Key is provided.
+        # Headless (FastAPI, ADK) there is nobody to ask: block with a token.
+        if not streamlit_running():
+            return False, self.generate_admin_token(action_description)
         
+        import streamlit as st
         st.warning(f"⚠️ **SECURITY ALERT**: An agent is attempting a High-Risk Action: `{action_description}`")
         
         admin_key = self.get_secret("ADMIN_KEY")
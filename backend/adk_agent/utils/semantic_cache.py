@@ -0,0 +1,302 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import asyncio
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+    import faiss  # faiss-cpu from requirements.txt
+except ImportError:  # numpy brute force is fine for small caches
+    faiss = None
+
+EmbeddingFn = Callable[[str], np.ndarray]
+
+
+def hashing_embedding(text: str, dim: int = 256) -> np.ndarray:
+    """
+    Local, dependency-free embedding: hashed word unigrams plus character
+    trigrams, L2-normalized. Good for ranking clauses against a question;
+    too coarse to decide two questions are the same (a "not" or a changed
+    number barely moves it), so SemanticCache never uses it.
+    """
+    vec = np.zeros(dim, dtype=np.float32)
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    features = list(words)
+    for word in words:
+        padded = f" {word} "
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    for feature in features:
+        digest = hashlib.md5(feature.encode("utf-8")).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vec[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+# Expanded before normalizing, so "isn't" keeps its "not".
+CONTRACTIONS = {"what's": "what is", "it's": "it is", "how's": "how is", "can't": "can not",
+                "cannot": "can not", "won't": "will not", "n't": " not"}
+NEGATIONS = {"not", "no", "never", "without", "none", "neither", "nor", "except", "excluding", "excluded"}
+NUMBER_RE = re.compile(r"\d+(?:\.\d+)?%?")
+
+
+def normalize_query(text: str) -> str:
+    """
+    Exact-tier cache key: lowercase words and numbers, contractions
+    expanded, punctuation dropped. "What's angioplasty?" and "what is
+    angioplasty" share a key; "after 2 years" and "after 4 years" do not.
+    """
+    text = (text or "").lower().replace("\u2019", "'")
+    for short, long in CONTRACTIONS.items():
+        text = text.replace(short, long)
+    return " ".join(re.findall(r"\d+(?:\.\d+)?%?|[a-z]+", text))
+
+
+def query_guard(text: str) -> tuple:
+    """(numbers, negations) two questions must share to count as the same question."""
+    key = normalize_query(text)
+    words = key.split()
+    return tuple(NUMBER_RE.findall(key)), tuple(sorted(w for w in words if w in NEGATIONS))
+
+
+def gemini_embedding(model: str) -> EmbeddingFn:
+    """Gemini embeddings (e.g. models/text-embedding-004), unit length for inner-product search."""
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    from .config import get_config
+
+    keys = get_config().api_keys()
+    embeddings = GoogleGenerativeAIEmbeddings(model=model, google_api_key=keys[0] if keys else None)
+
+    def embed(text: str) -> np.ndarray:
+        vec = np.asarray(embeddings.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    return embed
+
+
+class VectorIndex:
+    """Inner-product index over unit vectors; faiss when installed, numpy otherwise."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        if faiss is not None:
+            self._faiss = faiss.IndexIDMap(faiss.IndexFlatIP(dim))
+        else:
+            self._faiss = None
+            self._ids = []
+            self._vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self._faiss.ntotal if self._faiss is not None else len(self._ids)
+
+    def add(self, entry_id: int, vector: np.ndarray):
+        if self._faiss is not None:
+            self._faiss.add_with_ids(vector.reshape(1, -1), np.array([entry_id], dtype=np.int64))
+        else:
+            self._ids.append(entry_id)
+            self._vectors = np.vstack([self._vectors, vector.reshape(1, -1)])
+
+    def remove(self, entry_id: int):
+        if self._faiss is not None:
+            self._faiss.remove_ids(np.array([entry_id], dtype=np.int64))
+        else:
+            pos = self._ids.index(entry_id)
+            self._ids.pop(pos)
+            self._vectors = np.delete(self._vectors, pos, axis=0)
+
+    def search(self, vector: np.ndarray, k: int):
+        """Returns up to k (entry_id, score) pairs, best first."""
+        k = min(k, len(self))
+        if k == 0:
+            return []
+        if self._faiss is not None:
+            scores, ids = self._faiss.search(vector.reshape(1, -1), k)
+            return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i != -1]
+        scores = self._vectors @ vector
+        order = np.argsort(-scores)[:k]
+        return [(self._ids[pos], float(scores[pos])) for pos in order]
+
+    def best(self, vector: np.ndarray):
+        """Returns (entry_id, score) of the nearest vector, or (None, -1)."""
+        hits = self.search(vector, 1)
+        return hits[0] if hits else (None, -1.0)
+
+
+class SemanticCache:
+    """
+    Answer cache for repeat questions, in two tiers:
+
+    - exact: the normalized question (see normalize_query) was answered
+      before in the same namespace. Always on.
+    - semantic: a previously answered question has cosine similarity >=
+      `threshold` and the same numbers and negations (see query_guard).
+      Only with a real embedding model (`embed_fn`); hashing_embedding
+      scores "covered" vs "not covered" or "1%" vs "2%" above any usable
+      threshold, so it is never used here.
+
+    Memory is bounded by `max_bytes` (vectors + stored text); the least
+    recently used answers are evicted first.
+    """
+
+    def __init__(self, embed_fn: Optional[EmbeddingFn] = None, threshold: float = 0.85, max_bytes: int = 16 * 1024 * 1024):
+        self.embed_fn = embed_fn
+        self.semantic = embed_fn is not None
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # entry_id -> (namespace, key, guard, answer, size, indexed)
+        self._exact = {}  # (namespace, normalized query) -> entry_id
+        self._indexes = {}
+        self._next_id = 0
+        self._bytes = 0
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.embedding_errors = 0
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            return np.asarray(self.embed_fn(text), dtype=np.float32)
+        except Exception as e:
+            print(f"Semantic cache embedding failed: {e}")
+            with self._lock:
+                self.embedding_errors += 1
+            return None
+
+    def _answer(self, entry_id: Optional[int]) -> Optional[str]:
+        if entry_id is None or entry_id not in self._entries:
+            return None
+        self._entries.move_to_end(entry_id)
+        return self._entries[entry_id][3]
+
+    def _nearest(self, namespace: str, vector: np.ndarray, guard: tuple) -> Optional[int]:
+        index = self._indexes.get(namespace)
+        if index is None:
+            return None
+        for entry_id, score in index.search(vector, 5):
+            if score < self.threshold:
+                break
+            if self._entries[entry_id][2] == guard:
+                return entry_id
+        return None
+
+    def lookup(self, namespace: str, query: str) -> Optional[str]:
+        with self._lock:
+            answer = self._answer(self._exact.get((namespace, normalize_query(query))))
+        semantic = False
+        if answer is None and self.semantic:
+            vector = self._embed(query)
+            if vector is not None:
+                with self._lock:
+                    answer = self._answer(self._nearest(namespace, vector, query_guard(query)))
+                semantic = answer is not None
+        with self._lock:
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.semantic_hits += semantic
+        return answer
+
+    def store(self, namespace: str, query: str, answer: str):
+        key = normalize_query(query)
+        vector = self._embed(query) if self.semantic else None
+        size = len(key.encode("utf-8")) + len(answer.encode("utf-8")) + (vector.nbytes if vector is not None else 0)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._exact.get((namespace, key))
+            if old is not None:
+                self._remove(old)
+            entry_id = self._next_id
+            self._next_id += 1
+            if vector is not None:
+                index = self._indexes.get(namespace)
+                if index is None:
+                    index = self._indexes[namespace] = VectorIndex(vector.shape[0])
+                index.add(entry_id, vector)
+            self._entries[entry_id] = (namespace, key, query_guard(query), answer, size, vector is not None)
+            self._exact[(namespace, key)] = entry_id
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    async def alookup(self, namespace: str, query: str) -> Optional[str]:
+        """lookup() off the event loop when it has to call the embedding model."""
+        if self.semantic:
+            return await asyncio.to_thread(self.lookup, namespace, query)
+        return self.lookup(namespace, query)
+
+    async def astore(self, namespace: str, query: str, answer: str):
+        if self.semantic:
+            return await asyncio.to_thread(self.store, namespace, query, answer)
+        return self.store(namespace, query, answer)
+
+    def _remove(self, entry_id: int):
+        namespace, key, _, _, size, indexed = self._entries.pop(entry_id)
+        del self._exact[(namespace, key)]
+        if indexed:
+            index = self._indexes[namespace]
+            index.remove(entry_id)
+            if len(index) == 0:
+                del self._indexes[namespace]
+        self._bytes -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "mode": "semantic" if self.semantic else "exact",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "embedding_errors": self.embedding_errors,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "backend": "faiss" if faiss is not None else "numpy"
+            }
+
+
+def context_namespace(prefix: str, context: str) -> str:
+    """Answers are only reusable for the same grounding context."""
+    return f"{prefix}:{hashlib.sha256((context or '').encode('utf-8')).hexdigest()[:16]}"
+
+
+_cache: Optional[SemanticCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """
+    Process-wide cache; tuned by SEMANTIC_CACHE_THRESHOLD / SEMANTIC_CACHE_MAX_BYTES.
+    The semantic tier is on only when SEMANTIC_CACHE_EMBEDDING_MODEL names
+    an embedding model; otherwise questions must match exactly (normalized).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            model = os.environ.get("SEMANTIC_CACHE_EMBEDDING_MODEL")
+            embed_fn = None
+            if model:
+                try:
+                    embed_fn = gemini_embedding(model)
+                except Exception as e:
+                    print(f"Semantic cache embedding model unavailable, using exact matches: {e}")
+            _cache = SemanticCache(
+                embed_fn=embed_fn,
+                threshold=float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.85")),
+                max_bytes=int(os.environ.get("SEMANTIC_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+            )
+        return _cache
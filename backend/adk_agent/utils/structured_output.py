@@ -0,0 +1,542 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+import json
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+PromptLike = Union[str, Callable[[], str]]
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+LITERALS = {"true": "true", "false": "false", "null": "null", "True": "true", "False": "false", "None": "null"}
+CLOSERS = {"{": "}", "[": "]"}
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text or "") // 4)
+
+
+class JSONRepairParser:
+    """
+    Tolerant, incremental JSON parser for LLM output.
+
+    Feed the text in any number of chunks; `value()` returns the best
+    complete document that the text so far supports, at any time:
+    markdown fences and chatter around the document are skipped, trailing
+    commas dropped, Python literals (True/None) and single-quoted strings
+    converted, raw newlines in strings escaped, and a truncated document is
+    closed after its last complete value (a half-written string value is
+    kept as far as it got).
+
+        parser = JSONRepairParser()
+        for chunk in stream:
+            parser.feed(chunk)
+            partial = parser.value()
+    """
+
+    def __init__(self):
+        self.out: List[str] = []
+        self.stack: List[str] = []      # open containers, "{" or "["
+        self.expect: List[str] = []     # per container: key | colon | value | comma
+        self.quote: Optional[str] = None
+        self.escaped = False
+        self.string_is_key = False
+        self.token = ""
+        self.started = False
+        self.done = False
+        self.safe: Tuple[int, Tuple[str, ...]] = (0, ())
+
+    def _mark_safe(self):
+        self.safe = (len(self.out), tuple(self.stack))
+
+    def _value_done(self):
+        if self.expect:
+            self.expect[-1] = "comma"
+        self._mark_safe()
+
+    def _flush_token(self):
+        """Emits a finished bare token; anything but a JSON scalar is dropped."""
+        token, self.token = self.token, ""
+        if token in LITERALS:
+            self.out.append(LITERALS[token])
+        elif NUMBER_RE.fullmatch(token):
+            self.out.append(token)
+        else:
+            return
+        self._value_done()
+
+    def feed(self, chunk: str):
+        for ch in chunk:
+            if self.done:
+                return
+            if not self.started:
+                if ch in "{[":
+                    self.started = True
+                else:
+                    continue
+            if self.quote:
+                self._string_char(ch)
+            elif self.token and (ch.isalnum() or ch in ".-+"):
+                self.token += ch
+            else:
+                if self.token:
+                    self._flush_token()
+                self._structural(ch)
+
+    def _string_char(self, ch: str):
+        if self.escaped:
+            self.escaped = False
+            self.out.append(ch)
+        elif ch == "\\":
+            self.escaped = True
+            self.out.append(ch)
+        elif ch == self.quote:
+            self.quote = None
+            self.out.append('"')
+            if self.string_is_key:
+                self.expect[-1] = "colon"
+            else:
+                self._value_done()
+        elif ch == '"':
+            self.out.append('\\"')  # inside a single-quoted string
+        elif ch == "\n":
+            self.out.append("\\n")
+        elif ch in "\r\t":
+            self.out.append("\\r" if ch == "\r" else "\\t")
+        else:
+            self.out.append(ch)
+
+    def _structural(self, ch: str):
+        if ch in "{[":
+            self.stack.append(ch)
+            self.expect.append("key" if ch == "{" else "value")
+            self.out.append(ch)
+            self._mark_safe()
+        elif ch in "}]":
+            if not self.stack:
+                return
+            if self.out and self.out[-1] == ",":
+                self.out.pop()  # trailing comma
+            self.expect.pop()
+            self.out.append(CLOSERS[self.stack.pop()])
+            if not self.stack:
+                self.done = True
+            self._value_done()
+        elif ch in "\"'":
+            self.quote = ch
+            self.string_is_key = bool(self.expect) and self.expect[-1] == "key"
+            self.out.append('"')
+        elif ch == ":":
+            if self.expect:
+                self.expect[-1] = "value"
+            self.out.append(ch)
+        elif ch == ",":
+            if self.expect:
+                self.expect[-1] = "key" if self.stack[-1] == "{" else "value"
+            self.out.append(ch)
+        elif ch.isalnum() or ch in "-+.":
+            self.token = ch
+        # Anything else outside strings (whitespace, stray characters) is dropped.
+
+    def text(self) -> Optional[str]:
+        """The repaired JSON text so far, or None before the document starts."""
+        if not self.started:
+            return None
+        if self.done:
+            return "".join(self.out)
+        out, stack = self.out, self.stack
+        if self.quote and not self.string_is_key:
+            tail = self.out[:-1] if self.escaped else self.out
+            return "".join(tail) + '"' + "".join(CLOSERS[c] for c in reversed(stack))
+        if self.token and not self.quote:
+            token = self.token
+            if token in LITERALS or NUMBER_RE.fullmatch(token):
+                literal = LITERALS.get(token, token)
+                return "".join(out) + literal + "".join(CLOSERS[c] for c in reversed(stack))
+        length, stack = self.safe
+        return "".join(out[:length]) + "".join(CLOSERS[c] for c in reversed(stack))
+
+    def value(self) -> Any:
+        text = self.text()
+        if text is None:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+
+def strip_fences(text: str) -> str:
+    return (text or "").replace("```json", "").replace("```", "").strip()
+
+
+def repair_json(text: str) -> Any:
+    """Strict parse first, then the tolerant parser; None if nothing usable."""
+    try:
+        return json.loads(strip_fences(text))
+    except ValueError:
+        parser = JSONRepairParser()
+        parser.feed(text or "")
+        return parser.value()
+
+
+class Field:
+    """
+    One output field. `kind` is str, float, bool, list or dict. Fields with
+    a `default` are filled silently when missing; fields without one are
+    required and trigger a targeted re-ask.
+    """
+    _MISSING = object()
+
+    def __init__(self, kind: type, default: Any = _MISSING, items: Any = None, schema: "OutputSchema" = None,
+                 description: str = ""):
+        self.kind = kind
+        self.default = default
+        self.items = items      # list element: a type or an OutputSchema
+        self.schema = schema    # nested OutputSchema for dict fields
+        self.description = description
+
+    @property
+    def required(self) -> bool:
+        return self.default is Field._MISSING
+
+    def empty(self) -> Any:
+        if not self.required:
+            return json.loads(json.dumps(self.default))
+        return {str: "Unknown", float: 0, bool: False, list: [], dict: {}}[self.kind]
+
+    def coerce(self, value: Any) -> Tuple[bool, Any]:
+        """(usable, value converted to the field's kind)."""
+        if value is None:
+            return False, None
+        if self.kind is str:
+            if isinstance(value, str):
+                return bool(value.strip()), value
+            if isinstance(value, list):
+                return bool(value), ", ".join(str(v) for v in value)
+            if isinstance(value, dict):
+                return bool(value), json.dumps(value)
+            return True, str(value)
+        if self.kind is float:
+            if isinstance(value, bool):
+                return False, None
+            if isinstance(value, (int, float)):
+                return True, value
+            match = NUMBER_RE.search(str(value))
+            if not match:
+                return False, None
+            number = float(match.group(0))
+            return True, int(number) if number.is_integer() else number
+        if self.kind is bool:
+            if isinstance(value, bool):
+                return True, value
+            lowered = str(value).strip().lower()
+            if lowered in ("true", "yes", "y", "1", "accurate"):
+                return True, True
+            if lowered in ("false", "no", "n", "0", "inaccurate"):
+                return True, False
+            return False, None
+        if self.kind is list:
+            if isinstance(value, list):
+                if isinstance(self.items, OutputSchema):
+                    value = [self.items.fill(v) for v in value if isinstance(v, dict)]
+                return True, value
+            if isinstance(value, str) and value.strip():
+                return True, [value]
+            return False, None
+        if self.kind is dict:
+            if not isinstance(value, dict):
+                return False, None
+            return True, self.schema.fill(value) if self.schema else value
+        return True, value
+
+    def openapi(self) -> dict:
+        kinds = {str: "string", float: "number", bool: "boolean", list: "array", dict: "object"}
+        spec: Dict[str, Any] = {"type": kinds[self.kind]}
+        if self.description:
+            spec["description"] = self.description
+        if self.kind is list:
+            spec["items"] = self.items.openapi() if isinstance(self.items, OutputSchema) else {"type": "string"}
+        if self.kind is dict and self.schema:
+            spec.update(self.schema.openapi())
+        return spec
+
+
+class OutputSchema:
+    def __init__(self, name: str, fields: Dict[str, Field]):
+        self.name = name
+        self.fields = fields
+
+    def validate(self, data: Any) -> Tuple[dict, List[str]]:
+        """(coerced fields, names of required fields that are missing or unusable)."""
+        result, missing = {}, []
+        data = data if isinstance(data, dict) else {}
+        for name, field in self.fields.items():
+            ok, value = field.coerce(data.get(name))
+            if ok:
+                result[name] = value
+            elif field.required:
+                missing.append(name)
+            else:
+                result[name] = field.empty()
+        for name, value in data.items():
+            result.setdefault(name, value)  # extra keys pass through
+        return result, missing
+
+    def fill(self, data: dict) -> dict:
+        """Lenient: every missing field gets its default / empty value."""
+        result, missing = self.validate(data)
+        for name in missing:
+            result[name] = self.fields[name].empty()
+        return result
+
+    def openapi(self) -> dict:
+        return {
+            "type": "object",
+            "properties": {name: field.openapi() for name, field in self.fields.items()},
+            "required": [name for name, field in self.fields.items() if field.required],
+        }
+
+    def example(self, names: Optional[List[str]] = None) -> str:
+        kinds = {str: '"..."', float: "0", bool: "true/false", list: "[...]", dict: "{...}"}
+        names = names or list(self.fields)
+        return "{" + ", ".join(f'"{n}": {kinds[self.fields[n].kind]}' for n in names) + "}"
+
+
+class StructuredOutputError(ValueError):
+    """The model's answer could not be turned into the schema, even after a re-ask."""
+
+
+class ParseMetrics:
+    """
+    Process-wide per-agent counters. `strict_failures` is what the old
+    fence-strip + json.loads would have thrown away; `recovered_tokens` is
+    the output those answers cost, now kept by repair or re-ask.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._agents = {}
+                instance._lock = threading.Lock()
+                cls._instance = instance
+            return cls._instance
+
+    def record(self, agent: str, **counts: int):
+        with self._lock:
+            stats = self._agents.setdefault(agent, {
+                "responses": 0, "strict_failures": 0, "repaired": 0, "reasked": 0, "failed": 0,
+                "response_tokens": 0, "reask_tokens": 0, "recovered_tokens": 0, "wasted_tokens": 0,
+            })
+            for name, value in counts.items():
+                stats[name] += value
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            agents = {agent: dict(stats) for agent, stats in self._agents.items()}
+        for stats in agents.values():
+            responses = stats["responses"] or 1
+            stats["strict_failure_rate"] = round(stats["strict_failures"] / responses, 3)
+            stats["failure_rate"] = round(stats["failed"] / responses, 3)
+        return agents
+
+    def reset(self):
+        with self._lock:
+            self._agents.clear()
+
+
+def native_json(llm, schema: Optional[OutputSchema] = None):
+    """
+    Gemini JSON mode (plus a response schema when given) for `llm`; other
+    models are returned unchanged. GEMINI_JSON_MODE=0 turns it off.
+    """
+    if os.environ.get("GEMINI_JSON_MODE", "1") == "0":
+        return llm
+    try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+    except ImportError:
+        return llm
+    if not isinstance(llm, ChatGoogleGenerativeAI):
+        return llm
+    options = {"response_mime_type": "application/json"}
+    if schema is not None:
+        options["response_schema"] = schema.openapi()
+    return llm.bind(**options)
+
+
+class StructuredOutput:
+    """
+    Shared structured-output step for one agent: native JSON mode where the
+    model supports it, tolerant repair of whatever comes back, type coercion
+    to the agent's schema, and one targeted re-ask for only the required
+    fields still missing. Answers are only thrown away when even that fails.
+
+        structured = StructuredOutput("TENANT", TENANT_REPORT)
+        report = structured.run(llm, prompt)
+    """
+
+    def __init__(self, agent: str, schema: OutputSchema, reask: bool = True):
+        self.agent = agent
+        self.schema = schema
+        self.reask = reask
+
+    def model(self, llm):
+        return native_json(llm, self.schema)
+
+    def _reask_prompt(self, prompt: PromptLike, data: dict, missing: List[str]) -> str:
+        original = prompt() if callable(prompt) else prompt
+        return f"""
+        {original}
+
+        Your previous answer was missing these fields or had unusable values: {", ".join(missing)}.
+        Previous answer (keep it, do not repeat it): {json.dumps(data)[:2000]}
+
+        Reply with ONLY a JSON object with exactly these keys:
+        {self.schema.example(missing)}
+        """
+
+    def _parse(self, response: str) -> Tuple[dict, List[str], bool, bool]:
+        """(fields, missing required fields, strict json.loads worked, any object found)."""
+        strict_ok = True
+        try:
+            data = json.loads(strip_fences(response))
+        except ValueError:
+            strict_ok = False
+            parser = JSONRepairParser()
+            parser.feed(response or "")
+            data = parser.value()
+        result, missing = self.schema.validate(data)
+        return result, missing, strict_ok, isinstance(data, dict)
+
+    def _merge(self, result: dict, missing: List[str], reply: str) -> Tuple[dict, List[str]]:
+        extra, _ = self.schema.validate(repair_json(reply))
+        still = []
+        for name in missing:
+            ok, value = self.schema.fields[name].coerce(extra.get(name))
+            if ok:
+                result[name] = value
+            else:
+                still.append(name)
+        return result, still
+
+    def _finish(self, result: dict, missing: List[str], strict_ok: bool, response: str, reask_tokens: int) -> dict:
+        tokens = estimate_tokens(response)
+        counts = {"responses": 1, "response_tokens": tokens, "reask_tokens": reask_tokens,
+                  "strict_failures": int(not strict_ok), "reasked": int(reask_tokens > 0)}
+        if missing:
+            self._record(failed=1, wasted_tokens=tokens + reask_tokens, **counts)
+            raise StructuredOutputError(f"{self.agent}: no usable {', '.join(missing)} in the model output")
+        repaired = not strict_ok or reask_tokens > 0
+        self._record(repaired=int(not strict_ok), recovered_tokens=tokens if repaired else 0, **counts)
+        return result
+
+    def _record(self, **counts: int):
+        ParseMetrics().record(self.agent, **counts)
+
+    def parse(self, response: str, llm=None, prompt: PromptLike = None) -> dict:
+        """
+        Schema-shaped dict from `response`. With `llm` and `prompt`, missing
+        required fields are re-asked once; raises StructuredOutputError if
+        they are still missing.
+        """
+        result, missing, strict_ok, _ = self._parse(response)
+        reask_tokens = 0
+        if missing and self.reask and llm is not None and prompt is not None:
+            question = self._reask_prompt(prompt, result, missing)
+            try:
+                reply = self.model(llm).invoke(question).content
+                reask_tokens = estimate_tokens(question) + estimate_tokens(reply)
+                result, missing = self._merge(result, missing, reply)
+            except Exception as e:
+                print(f"{self.agent} re-ask failed: {e}")
+        return self._finish(result, missing, strict_ok, response, reask_tokens)
+
+    async def aparse(self, response: str, llm=None, prompt: PromptLike = None) -> dict:
+        result, missing, strict_ok, _ = self._parse(response)
+        reask_tokens = 0
+        if missing and self.reask and llm is not None and prompt is not None:
+            question = self._reask_prompt(prompt, result, missing)
+            try:
+                reply = (await self.model(llm).ainvoke(question)).content
+                reask_tokens = estimate_tokens(question) + estimate_tokens(reply)
+                result, missing = self._merge(result, missing, reply)
+            except Exception as e:
+                print(f"{self.agent} re-ask failed: {e}")
+        return self._finish(result, missing, strict_ok, response, reask_tokens)
+
+    def parse_lenient(self, response: str) -> dict:
+        """No re-ask: missing fields get their empty values (chunk audits, partial streams)."""
+        result, missing, strict_ok, found = self._parse(response)
+        if not found:
+            return self._finish(result, list(self.schema.fields), strict_ok, response, 0)
+        for name in missing:
+            result[name] = self.schema.fields[name].empty()
+        return self._finish(result, [], strict_ok, response, 0)
+
+    def run(self, llm, prompt: str) -> dict:
+        return self.parse(self.model(llm).invoke(prompt).content, llm, prompt)
+
+    async def arun(self, llm, prompt: str) -> dict:
+        response = await self.model(llm).ainvoke(prompt)
+        return await self.aparse(response.content, llm, prompt)
+
+
+# --- Per-agent schemas ---
+
+AUDIT_REPORT = OutputSchema("audit_report", {
+    "room_rent": Field(str),
+    "co_pay": Field(str),
+    "sub_limits": Field(str),
+    "waiting_periods": Field(str),
+    "exclusions": Field(list, default=[]),
+    "risk_score": Field(float, description="0-100"),
+    "risk_reason": Field(str),
+})
+
+CRITIC_REVIEW = OutputSchema("critic_review", {
+    "is_accurate": Field(bool),
+    "corrections": Field(str, default="None"),
+    "missing_clauses": Field(list, default=[]),
+    "final_verdict": Field(str, description="Safe to buy, Avoid or Negotiate"),
+})
+
+TENANT_REPORT = OutputSchema("tenant_report", {
+    "lock_in": Field(str),
+    "security_deposit": Field(str),
+    "maintenance": Field(str),
+    "notice_period": Field(str),
+    "eviction_terms": Field(str),
+    "risk_score": Field(float, description="0-100"),
+    "risk_reason": Field(str),
+})
+
+CAREER_REPORT = OutputSchema("career_report", {
+    "bond": Field(str),
+    "notice_period": Field(str),
+    "non_compete": Field(str),
+    "ip_rights": Field(str),
+    "variable_pay": Field(str),
+    "risk_score": Field(float, description="0-100"),
+    "risk_reason": Field(str),
+})
+
+COURTROOM_TURN = OutputSchema("courtroom_turn", {
+    "speaker": Field(str),
+    "text": Field(str),
+    "type": Field(str, default="judge"),
+})
+
+COURTROOM_CASE = OutputSchema("courtroom_case", {
+    "script": Field(list, items=COURTROOM_TURN),
+    "verdict": Field(dict, schema=OutputSchema("verdict", {
+        "winner": Field(str),
+        "probability": Field(str),
+        "summary": Field(str),
+    })),
+    "swot": Field(dict, default={"strengths": [], "weaknesses": []}, schema=OutputSchema("swot", {
+        "strengths": Field(list, default=[]),
+        "weaknesses": Field(list, default=[]),
+    })),
+})
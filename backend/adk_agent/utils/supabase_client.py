@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Deepak Kushwah. All rights reserved.
-import streamlit as st
 from supabase import create_client, Client
 from typing import Optional
+from .config import get_config
 
 class SupabaseManager:
     _instance = None
@@ -16,13 +16,12 @@ class SupabaseManager:
     @staticmethod
     def _init_client() -> Optional[Client]:
         try:
-            # Try loading from secrets
-            if "supabase" not in st.secrets:
+            # [supabase] in secrets.toml, or SUPABASE_URL / SUPABASE_KEY
+            settings = get_config().section("supabase")
+            if not settings.get("url") or not settings.get("key"):
                 return None
                 
-            url = st.secrets["supabase"]["url"]
-            key = st.secrets["supabase"]["key"]
-            return create_client(url, key)
+            return create_client(settings["url"], settings["key"])
         except Exception as e:
             # Log internally but don't crash the app
             print(f"Supabase Connection Failed: {e}")
@@ -0,0 +1,55 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Load benchmark: fires concurrent requests at every router handler against a
+stubbed LLM and compares the blocking path with the ainvoke path.
+
+    python -m backend.benchmarks.bench_async_load --requests 20 --latency 0.2
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from .stubs import StubChatModel, install_stub_llm
+
+
+def _calls(n: int):
+    from ..routers import audit, chat, courtroom, medical
+
+    policy = "Room rent is capped at 1% of sum insured. Co-payment of 20% applies."
+    return {
+        # Unique text per request so the result and semantic caches never short-circuit the LLM.
+        "chat": lambda: chat.chat(chat.ChatRequest(message="Is cataract covered?", context=f"{policy} Ref {uuid.uuid4()}")),
+        "audit": lambda: audit.audit_policy(audit.AuditRequest(policy_text=f"{policy} Ref {uuid.uuid4()}")),
+        "medical": lambda: medical.analyze_report(medical.MedicalAnalysisRequest(query="Grade 2 cataract")),
+        "courtroom": lambda: courtroom.simulate_turn(courtroom.SimulationRequest(history=[], context=policy)),
+    }
+
+
+async def _run(make_call, n: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(make_call() for _ in range(n)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{args.requests} concurrent requests, stub latency {args.latency}s")
+    print(f"{'endpoint':<12}{'blocking (s)':>14}{'async (s)':>12}{'overlap':>10}")
+    for name in _calls(args.requests):
+        results = {}
+        for blocking in (True, False):
+            install_stub_llm(StubChatModel(latency=args.latency, blocking=blocking))
+            results[blocking] = asyncio.run(_run(_calls(args.requests)[name], args.requests))
+        # Overlap = how many requests were in flight at once on average.
+        # The audit handler makes two sequential LLM calls (auditor + critic).
+        serial = args.requests * args.latency * (2 if name == "audit" else 1)
+        print(f"{name:<12}{results[True]:>14.2f}{results[False]:>12.2f}{serial / results[False]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+A brokerage portfolio through POST /audit/ one policy at a time (today) vs
+one POST /audit/batch job, against a stubbed LLM. Duplicates answered from
+the result cache must not be counted again in market intel.
+
+    python -m backend.benchmarks.bench_batch_audit --policies 100 --duplicates 0.25
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from .stubs import StubChatModel, install_stub_llm
+
+
+class CountingStub(StubChatModel):
+    """Tracks the peak number of concurrent LLM calls."""
+    in_flight: int = 0
+    peak: int = 0
+
+    async def _agenerate(self, *args, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super()._agenerate(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+def portfolio(n: int, duplicate_ratio: float, seed: int = 7):
+    rng = random.Random(seed)
+    unique = [f"Policy {uuid.uuid4()}: room rent capped at {rng.randint(1, 3)}% of sum insured." for _ in range(max(1, int(n * (1 - duplicate_ratio))))]
+    policies = unique + [rng.choice(unique) for _ in range(n - len(unique))]
+    rng.shuffle(policies)
+    return [{"id": f"P{i:04d}", "policy_text": text} for i, text in enumerate(policies)]
+
+
+async def one_by_one(items):
+    from ..routers import audit
+    for item in items:
+        await audit.audit_policy(audit.AuditRequest(policy_text=item["policy_text"]))
+
+
+async def batch(items):
+    from ..routers import audit
+    job = await audit.audit_batch(audit.BatchAuditRequest(policies=items))
+    response = await audit.get_batch_results(job["job_id"])
+    lines = [json.loads(line) async for line in response.body_iterator]
+    return job, lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--policies", type=int, default=100)
+    parser.add_argument("--duplicates", type=float, default=0.25)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Different (uuid-tagged) documents per run so the result cache never answers.
+    from ..adk_agent.utils.data_store import get_data_store
+    model = CountingStub(latency=args.latency)
+    install_stub_llm(model)
+    serial_items = portfolio(args.policies, args.duplicates, seed=1)
+    analyzed = get_data_store().counter("total_policies_analyzed")
+    start = time.perf_counter()
+    asyncio.run(one_by_one(serial_items))
+    serial_s = time.perf_counter() - start
+    logged = get_data_store().counter("total_policies_analyzed") - analyzed
+
+    model.peak = 0
+    items = portfolio(args.policies, args.duplicates, seed=2)
+    start = time.perf_counter()
+    job, lines = asyncio.run(batch(items))
+    batch_s = time.perf_counter() - start
+
+    results, summary = lines[:-1], lines[-1]
+    assert summary["stage"] == "summary" and summary["status"] == "DONE", summary
+    assert sorted(r["index"] for r in results) == list(range(len(items))), "every policy reported exactly once"
+    assert all(r["id"] == items[r["index"]]["id"] for r in results)
+    assert all(r["status"] == "DONE" for r in results)
+    duplicates = [r for r in results if r["duplicate_of"] is not None]
+    assert all(items[r["index"]]["policy_text"] == items[r["duplicate_of"]]["policy_text"] for r in duplicates)
+    assert model.peak <= job["workers"], f"{model.peak} concurrent calls > {job['workers']} workers"
+    assert logged == len({item["policy_text"] for item in serial_items}), "cache hits are not analysed policies"
+
+    print(f"{len(items)} policies ({job['unique']} unique), stub latency {args.latency}s, {job['workers']} workers")
+    print(f"{'mode':<12}{'total s':>9}{'policies/s':>12}")
+    print(f"{'one-by-one':<12}{serial_s:>9.2f}{len(items) / serial_s:>12.1f}")
+    print(f"{'batch':<12}{batch_s:>9.2f}{len(items) / batch_s:>12.1f}")
+    print(f"deduplicated: {len(duplicates)}; peak concurrent LLM calls: {model.peak}; speedup {serial_s / batch_s:.1f}x")
+    print(f"market intel counted {logged} of {len(serial_items)} one-by-one audits (the rest were cache hits)")
+
+
+if __name__ == "__main__":
+    main()
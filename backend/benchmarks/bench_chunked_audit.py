@@ -0,0 +1,171 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Map-reduce audit benchmark on a synthetic 80-page policy.
+
+Compares one giant prompt with the chunked audit, and checks that the merged
+report is identical across runs even though chunk calls finish in random
+order (the stub adds jitter), that it holds every section's finding, the
+ordered union of exclusions and the riskiest chunk's score, and that an
+audit with failed chunks is not cached.
+
+    python -m backend.benchmarks.bench_chunked_audit --runs 5
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+
+from .stubs import StubChatModel, install_stub_llm
+
+SECTION_FINDINGS = {
+    "ROOM RENT": ("room_rent", "Capped at 1% of Sum Insured per day", 70),
+    "CO-PAYMENT": ("co_pay", "20% co-pay for insured aged 60+", 55),
+    "SUB-LIMITS": ("sub_limits", "Cataract limited to Rs 40,000 per eye", 60),
+    "WAITING PERIODS": ("waiting_periods", "PED covered after 48 months", 65),
+}
+
+
+def synthetic_policy(pages: int = 80) -> str:
+    filler = "The Company shall indemnify the Insured as per the terms of this Policy. " * 30
+    sections = []
+    for page in range(pages):
+        heading = list(SECTION_FINDINGS)[(page // 10) % len(SECTION_FINDINGS)] if page % 10 == 3 else f"SECTION {page + 1} GENERAL CONDITIONS"
+        exclusion = f"Exclusion E{page % 7}: Treatment {page % 7} is not covered." if page % 5 == 0 else ""
+        sections.append(f"{heading}\n{filler}\n{exclusion}")
+    return "\n\n".join(sections)
+
+
+def policy_responder(prompt: str) -> str:
+    """Answers from whatever sections the chunk actually contains."""
+    text = prompt.split("Policy Text:", 1)[-1]
+    report = {"room_rent": "Not mentioned", "co_pay": "Not mentioned", "sub_limits": "Not mentioned",
+              "waiting_periods": "Not mentioned", "exclusions": [], "risk_score": 20, "risk_reason": "General terms only."}
+    for heading, (field, finding, risk) in SECTION_FINDINGS.items():
+        if heading in text:
+            report[field] = finding
+            if risk > report["risk_score"]:
+                report["risk_score"], report["risk_reason"] = risk, f"{heading.title()}: {finding}"
+    report["exclusions"] = sorted(set(re.findall(r"Exclusion E\d: Treatment \d is not covered", text)))
+    return json.dumps(report)
+
+
+async def _audit(policy: str, chunked: bool) -> dict:
+    from ..adk_agent.agents.auditor import AuditorAgent
+    auditor = AuditorAgent()
+    if chunked:
+        return await auditor.aaudit_policy_chunked(policy)
+    response = await auditor._build_audit_chain(policy).arun(policy_text=policy)
+    return auditor._parse_report(response)
+
+
+def check_merge(merged: dict, chunks: list):
+    """The merged report against what each chunk's audit answered, in document order."""
+    from ..adk_agent.agents.auditor import MAX_MERGED_EXCLUSIONS
+
+    answers = [json.loads(policy_responder(f"Policy Text:\n{chunk['text']}")) for chunk in chunks]
+    for field, finding, _ in SECTION_FINDINGS.values():
+        assert finding in merged[field], (field, merged[field])
+    union = []
+    for answer in answers:
+        union += [e for e in answer["exclusions"] if e not in union]
+    assert merged["exclusions"] == union[:MAX_MERGED_EXCLUSIONS], (merged["exclusions"], union)
+    top = max(a["risk_score"] for a in answers)
+    earliest = next(a for a in answers if a["risk_score"] == top)
+    assert (merged["risk_score"], merged["risk_reason"]) == (top, earliest["risk_reason"]), merged
+    assert merged["chunks_audited"] == len(chunks) and merged["chunks_failed"] == 0, merged
+
+
+def check_merge_rules():
+    """Ties, duplicates, unknown values and a failed (None) chunk."""
+    from ..adk_agent.agents.auditor import merge_chunk_reports
+
+    merged = merge_chunk_reports([
+        {"room_rent": "Capped at 1%", "co_pay": "Not mentioned", "exclusions": ["Dental", "Cosmetic"],
+         "risk_score": 40, "risk_reason": "low"},
+        None,
+        {"room_rent": "capped at 1%.", "co_pay": "20% at 60+", "exclusions": ["cosmetic", "Maternity"],
+         "risk_score": 80, "risk_reason": "riskiest, earliest"},
+        {"room_rent": "N/A", "exclusions": "Hearing aids", "risk_score": "80", "risk_reason": "riskiest, later"},
+    ])
+    assert merged == {
+        "room_rent": "Capped at 1%", "co_pay": "20% at 60+", "sub_limits": "Not mentioned",
+        "waiting_periods": "Not mentioned", "exclusions": ["Dental", "Cosmetic", "Maternity", "Hearing aids"],
+        "risk_score": 80, "risk_reason": "riskiest, earliest", "chunks_audited": 4, "chunks_failed": 1,
+    }, merged
+    assert merge_chunk_reports([None, None]) is None
+
+
+def check_partial_not_cached(policy: str, model: StubChatModel) -> tuple:
+    """Audits with the waiting-period chunk throttled, then healthy; returns result-cache entries after each."""
+    import tempfile
+    from ..adk_agent.agents.auditor import AuditorAgent
+    from ..adk_agent.utils import result_cache
+
+    def throttled(prompt: str) -> str:
+        if "WAITING PERIODS" in prompt.split("Policy Text:", 1)[-1]:
+            raise RuntimeError("429 Resource has been exhausted (e.g. check quota).")
+        return policy_responder(prompt)
+
+    with tempfile.TemporaryDirectory() as folder:
+        result_cache._cache = result_cache.ResultCache(db_path=f"{folder}/cache.db")
+        try:
+            model.responder = throttled
+            partial = asyncio.run(AuditorAgent().aaudit_policy(policy))
+            after_partial = result_cache._cache.stats()["entries"]
+            model.responder = policy_responder
+            complete = asyncio.run(AuditorAgent().aaudit_policy(policy))
+            after_complete = result_cache._cache.stats()["entries"]
+        finally:
+            model.responder = policy_responder
+            result_cache._cache = None
+    assert partial["chunks_failed"] > 0 and partial["waiting_periods"] == "Not mentioned", partial
+    assert after_partial == 0, "a partial chunked audit was cached"
+    assert complete["chunks_failed"] == 0 and after_complete == 1, (complete, after_complete)
+    return partial["chunks_failed"], complete["chunks_audited"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=80)
+    args = parser.parse_args()
+
+    from ..adk_agent.agents.auditor import AuditorAgent
+    from ..adk_agent.utils.chunking import chunk_document
+
+    policy = synthetic_policy(args.pages)
+    chunks = chunk_document(policy, AuditorAgent.CHUNK_MAX_CHARS)
+    print(f"policy: {len(policy):,} chars, {len(chunks)} chunks, concurrency {AuditorAgent.CHUNK_CONCURRENCY}")
+
+    # Prompt cost dominates on long inputs: 0.05s per 1k chars.
+    model = StubChatModel(latency=0.3, prompt_latency_per_1k=0.05, jitter=0.2, responder=policy_responder)
+    install_stub_llm(model)
+
+    start = time.perf_counter()
+    single = asyncio.run(_audit(policy, chunked=False))
+    single_s = time.perf_counter() - start
+
+    merged_runs, chunked_s = [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        merged_runs.append(asyncio.run(_audit(policy, chunked=True)))
+        chunked_s.append(time.perf_counter() - start)
+
+    deterministic = all(json.dumps(r, sort_keys=True) == json.dumps(merged_runs[0], sort_keys=True) for r in merged_runs)
+    print(f"single prompt: {single_s:.2f}s  chunked (mean of {args.runs}): {sum(chunked_s) / len(chunked_s):.2f}s")
+    print(f"merge deterministic across runs: {deterministic}")
+    print(f"single-prompt exclusions: {len(single['exclusions'])}, merged exclusions: {len(merged_runs[0]['exclusions'])}")
+    print(json.dumps(merged_runs[0], indent=2))
+    if not deterministic:
+        raise SystemExit("merge_chunk_reports produced different reports for the same input")
+    check_merge(merged_runs[0], chunks)
+    check_merge_rules()
+    print("merged report matches the per-chunk answers")
+
+    failed, audited = check_partial_not_cached(policy, model)
+    print(f"partial audit ({failed} of {audited} chunks throttled) returned uncached; complete audit cached")
+
+
+if __name__ == "__main__":
+    main()
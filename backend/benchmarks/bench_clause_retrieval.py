@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Prefix slicing vs clause retrieval on a long synthetic policy: does the
+context handed to the agent contain the clause the question is about?
+Also checks that arelevant_context builds a new document's index without
+stalling the event loop.
+
+    python -m backend.benchmarks.bench_clause_retrieval --pages 80
+"""
+import argparse
+import asyncio
+import time
+
+from .bench_chunked_audit import synthetic_policy
+
+# (question, section heading, clause text) planted at spread-out positions.
+NEEDLES = [
+    ("Is cataract surgery covered?", "SECTION 12 CATARACT", "Cataract surgery is limited to Rs 25,000 per eye."),
+    ("What is the room rent limit for ICU?", "SECTION 31 ICU CHARGES", "ICU room rent is capped at 2% of Sum Insured per day."),
+    ("Is angioplasty covered from day one?", "SECTION 47 CARDIAC PROCEDURES", "Angioplasty is covered after a 24 month waiting period."),
+    ("Are maternity expenses covered?", "SECTION 63 MATERNITY", "Maternity expenses are excluded for the first 36 months."),
+    ("Is there a co-payment for senior citizens?", "SECTION 78 SENIOR CITIZEN CO-PAYMENT", "A 30% co-payment applies to insured persons above 61 years."),
+]
+
+
+async def loop_stall(policy: str, question: str, budget: int) -> tuple:
+    """Longest gap between 1 ms ticks while arelevant_context indexes `policy`, and the build's wall time."""
+    from ..adk_agent.utils.clause_index import arelevant_context
+    done, gaps = False, []
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await arelevant_context(policy, question, budget)
+    wall = time.perf_counter() - start
+    done = True
+    await tick
+    return max(gaps) * 1000, wall * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=80)
+    parser.add_argument("--budget", type=int, default=5000)
+    args = parser.parse_args()
+
+    from ..adk_agent.utils.clause_index import get_clause_index, relevant_context
+
+    sections = synthetic_policy(args.pages).split("\n\n")
+    for n, (_, heading, clause) in enumerate(NEEDLES):
+        sections.insert(int(len(sections) * (n + 1) / (len(NEEDLES) + 1)), f"{heading}\n{clause}")
+    policy = "\n\n".join(sections)
+
+    start = time.perf_counter()
+    index = get_clause_index(policy)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"policy: {len(policy):,} chars, {len(index)} clauses, index built in {build_ms:.0f} ms (once per upload)")
+
+    prefix_hits = retrieval_hits = 0
+    retrieval_chars = query_ms = 0.0
+    for question, _, clause in NEEDLES:
+        prefix = policy[:args.budget]
+        start = time.perf_counter()
+        context = relevant_context(policy, question, args.budget)
+        query_ms += (time.perf_counter() - start) * 1000
+        prefix_hits += clause in prefix
+        retrieval_hits += clause in context
+        retrieval_chars += len(context)
+
+    n = len(NEEDLES)
+    print(f"{'strategy':<12}{'recall':>8}{'avg context chars':>20}")
+    print(f"{'prefix':<12}{prefix_hits / n:>8.0%}{args.budget:>20,}")
+    print(f"{'retrieval':<12}{retrieval_hits / n:>8.0%}{retrieval_chars / n:>20,.0f}")
+    print(f"average retrieval latency: {query_ms / n:.1f} ms")
+
+    stall_ms, async_ms = asyncio.run(loop_stall(policy + "\n\nSECTION 99 AMENDMENT\nRevised terms.", NEEDLES[0][0], args.budget))
+    print(f"arelevant_context on a new document: {async_ms:.0f} ms, longest event-loop stall {stall_ms:.1f} ms")
+
+    assert retrieval_hits == n, "every planted clause must be retrieved"
+    assert stall_ms < async_ms / 4, "the index must be built off the event loop"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Micro-benchmark: per-request setup cost of an agent before and after the
+pooled LLMRegistry. Builds real ChatGoogleGenerativeAI clients with dummy
+keys (construction needs no network).
+
+    python -m backend.benchmarks.bench_client_setup --iterations 200
+"""
+import argparse
+import time
+
+from .stubs import StubSecurity
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from ..adk_agent.utils.ai_engine import AIEngine
+    from ..adk_agent.utils.llm_registry import LLMRegistry
+    from ..adk_agent.agents.auditor import AuditorAgent
+
+    security = StubSecurity(keys=3)
+    AIEngine.__init__ = lambda self: setattr(self, "security", security)
+
+    def unpooled():
+        # What get_flash_model() did before: a fresh client + transport per call.
+        ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=security.get_next_api_key(), temperature=0.7, streaming=True)
+
+    registry = LLMRegistry()
+    registry.clear()
+
+    before_model = _per_call_us(unpooled, args.iterations)
+    after_model = _per_call_us(lambda: AIEngine().get_flash_model(), args.iterations)
+
+    registry.max_size = 0  # Every lookup misses: emulates per-request construction end to end
+    registry.clear()  # else the clients pooled above would still be hits
+    before_agent = _per_call_us(AuditorAgent, args.iterations)
+    registry.max_size = 32
+    registry.clear()
+    after_agent = _per_call_us(AuditorAgent, args.iterations)
+
+    print(f"{'setup step':<28}{'before (us)':>14}{'after (us)':>14}")
+    print(f"{'flash model client':<28}{before_model:>14.1f}{after_model:>14.1f}")
+    print(f"{'AuditorAgent()':<28}{before_agent:>14.1f}{after_agent:>14.1f}")
+    stats = registry.stats()
+    print(f"registry: {stats}")
+    # A broken stub makes get_flash_model() return None before touching the registry; don't time that.
+    assert stats["hits"] > 0 and stats["misses"] > 0, stats
+
+
+if __name__ == "__main__":
+    main()
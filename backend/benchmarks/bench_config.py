@@ -0,0 +1,141 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Per-request config/secret overhead in the FastAPI backend: the old
+Streamlit path (st.secrets / st.session_state read on every SecurityManager
+and get_secret call) vs the headless ConfigProvider + SessionStore. Each
+side runs in a fresh interpreter against the same .streamlit/secrets.toml,
+and the new side must never import Streamlit.
+
+Also checks that a BYOK key stays in its own session (bare-mode
+st.session_state is one dict shared by every request) and that idle
+sessions are evicted.
+
+    python -m backend.benchmarks.bench_config --requests 5000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SECRETS = """GEMINI_KEYS = ["key-1", "key-2", "key-3"]
+ADMIN_KEY = "admin-secret"
+GROQ_API_KEY = "groq-shared"
+
+[supabase]
+url = "https://example.supabase.co"
+key = "anon"
+"""
+
+LEGACY = """
+import resource, sys, time
+start = time.perf_counter()
+import streamlit as st
+
+def request(i):
+    # What SecurityManager() + GroqClient() read per request before.
+    keys = st.secrets["GEMINI_KEYS"] if "GEMINI_KEYS" in st.secrets else []
+    admin = st.secrets.get("ADMIN_KEY", "admin123")
+    groq = st.session_state["GROQ_API_KEY"] if "GROQ_API_KEY" in st.session_state else st.secrets.get("GROQ_API_KEY")
+    return keys, admin, groq
+
+request(0)
+first = time.perf_counter() - start
+# A BYOK key set by one client...
+st.session_state["GROQ_API_KEY"] = "groq-client-a"
+leaked = request(1)[2] == "groq-client-a"  # ...is what the next client gets
+del st.session_state["GROQ_API_KEY"]
+t = time.perf_counter()
+for i in range(N):
+    request(i)
+per_request = (time.perf_counter() - t) / N
+"""
+
+HEADLESS = """
+import resource, sys, time
+start = time.perf_counter()
+from backend.adk_agent.utils.config import get_secret, get_session_store, session_scope
+from backend.adk_agent.utils.security import SecurityManager
+
+def request(i):
+    with session_scope(f"client-{i % 100}"):
+        security = SecurityManager()
+        return security.api_keys, security.admin_key, get_secret("GROQ_API_KEY")
+
+request(0)
+first = time.perf_counter() - start
+with session_scope("client-a") as session:
+    session["GROQ_API_KEY"] = "groq-client-a"
+    own = get_secret("GROQ_API_KEY") == "groq-client-a"
+leaked = request(1)[2] == "groq-client-a"
+assert own and request(0)[0] == ["key-1", "key-2", "key-3"]
+t = time.perf_counter()
+for i in range(N):
+    request(i)
+per_request = (time.perf_counter() - t) / N
+assert "streamlit" not in sys.modules, "headless path imported streamlit"
+"""
+
+REPORT = """
+import json
+print(json.dumps({"first": first, "per_request_us": per_request * 1e6, "leaked": leaked,
+                  "streamlit": "streamlit" in sys.modules,
+                  "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def run(body: str, folder: str, n: int) -> dict:
+    repo = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=repo, PYTHONWARNINGS="ignore", HOME=folder)
+    for name in ("GEMINI_KEYS", "GEMINI_API_KEY", "GOOGLE_API_KEY", "GROQ_API_KEY", "ADMIN_KEY", "SECRETS_TOML_PATH"):
+        env.pop(name, None)
+    code = f"N = {n}\n{body}\n{REPORT}"
+    out = subprocess.run([sys.executable, "-c", code], cwd=folder, env=env, capture_output=True, text=True)
+    if out.returncode:
+        raise RuntimeError(out.stderr[-2000:])
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check_eviction():
+    from ..adk_agent.utils.config import SessionStore
+
+    store = SessionStore(ttl_seconds=0.05, max_sessions=3)
+    store.get("a")["GROQ_API_KEY"] = "a-key"
+    assert store.get("a")["GROQ_API_KEY"] == "a-key"
+    time.sleep(0.06)
+    assert "GROQ_API_KEY" not in store.get("a"), "idle session survived its TTL"
+    for name in "bcde":
+        store.get(name)
+    assert store.stats()["sessions"] == 3 and store.stats()["evictions"] == 3, store.stats()
+    return store.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        os.makedirs(os.path.join(folder, ".streamlit"))
+        with open(os.path.join(folder, ".streamlit", "secrets.toml"), "w") as f:
+            f.write(SECRETS)
+        legacy = run(LEGACY, folder, args.requests)
+        headless = run(HEADLESS, folder, args.requests)
+
+    print(f"{args.requests} requests, secrets from .streamlit/secrets.toml")
+    print(f"{'path':<22}{'first req s':>12}{'us/request':>12}{'RSS MB':>8}{'streamlit':>10}{'BYOK leak':>10}")
+    for name, r in (("streamlit (old)", legacy), ("headless config", headless)):
+        print(f"{name:<22}{r['first']:>12.3f}{r['per_request_us']:>12.1f}{r['rss_mb']:>8.0f}"
+              f"{str(r['streamlit']):>10}{str(r['leaked']):>10}")
+    stats = check_eviction()
+    print(f"session TTL/LRU eviction: {stats}")
+
+    assert not headless["streamlit"] and not headless["leaked"]
+    assert headless["per_request_us"] < legacy["per_request_us"], (headless, legacy)
+    assert headless["first"] < legacy["first"], (headless, legacy)
+
+
+if __name__ == "__main__":
+    main()
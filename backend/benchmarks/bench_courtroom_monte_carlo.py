@@ -0,0 +1,141 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Monte Carlo courtroom (/courtroom/simulate/monte-carlo) against a stubbed
+model with a programmable verdict distribution: the consumer wins each
+run with probability p (0.2, 0.5 and 0.85; seeded per run), a share of runs end without a
+usable verdict, and one strength is raised by most runs.
+
+Checks that the 95% Wilson interval covers the true probability, that no
+more than `concurrency` runs are in flight, that every run gets its own
+temperature, that the wall-clock budget cuts the simulation short, and
+that the SWOT consensus surfaces the point most runs raise.
+
+    python -m backend.benchmarks.bench_courtroom_monte_carlo --trials 40 --concurrency 8 --latency 0.1
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from .stubs import StubChatModel, install_stub_llm
+
+RUN_RE = re.compile(r"Quick Trial #(\d+)")
+CONSENSUS = "Arthritis was disclosed on the 2019 proposal form"
+OTHER_POINTS = ["Clause 4.2 is ambiguous", "Cashless pre-authorisation was granted",
+                "Treating doctor's note supports the claim", "Insurer missed the 30-day decision deadline"]
+
+
+class Tracker:
+    in_flight = 0
+    peak = 0
+    temperatures = []
+
+    @classmethod
+    def reset(cls):
+        cls.in_flight, cls.peak, cls.temperatures = 0, 0, []
+
+
+class TrackingChatModel(StubChatModel):
+    """StubChatModel that records concurrency and the temperature of each call."""
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        Tracker.temperatures.append(self.temperature)
+        Tracker.in_flight += 1
+        Tracker.peak = max(Tracker.peak, Tracker.in_flight)
+        try:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+        finally:
+            Tracker.in_flight -= 1
+
+
+class VerdictResponder:
+    """Short trials whose verdicts follow a set distribution; seeded per run, so repeatable."""
+
+    def __init__(self, p_consumer: float, p_undecided: float = 0.1, seed: int = 7):
+        self.p_consumer = p_consumer
+        self.p_undecided = p_undecided
+        self.seed = seed
+
+    def __call__(self, prompt: str) -> str:
+        match = RUN_RE.search(prompt)
+        rng = random.Random(self.seed * 100003 + int(match.group(1)) if match else self.seed)
+        if rng.random() < self.p_undecided:
+            winner = "Consumer/Company"  # the template echoed back
+        else:
+            winner = "Consumer" if rng.random() < self.p_consumer else "Company"
+        strengths = rng.sample(OTHER_POINTS, 2)
+        if rng.random() < 0.8:
+            strengths.insert(rng.randint(0, 2), CONSENSUS)
+        return json.dumps({
+            "script": [{"speaker": "Judge Dredd", "text": f"Judgment for the {winner}.", "type": "judge"}],
+            "verdict": {"winner": winner, "probability": "85%", "summary": "Decided on the disclosure."},
+            "swot": {"strengths": strengths, "weaknesses": ["Late intimation of the claim"]},
+        })
+
+
+def simulate(client, trials: int, concurrency: int, budget: float) -> dict:
+    Tracker.reset()
+    body = {"policy_text": "Clause 4.2: pre-existing diseases are excluded for 48 months.",
+            "scenario": "Knee replacement claim rejected as pre-existing arthritis.",
+            "trials": trials, "concurrency": concurrency, "budget_seconds": budget}
+    start = time.perf_counter()
+    response = client.post("/courtroom/simulate/monte-carlo", json=body)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    result["wall"] = time.perf_counter() - start
+    result["peak"] = Tracker.peak
+    result["temperatures"] = sorted(Tracker.temperatures)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trials", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per stubbed LLM call")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from ..main import app
+
+    model = TrackingChatModel(latency=args.latency, responder=VerdictResponder(0.5))
+    install_stub_llm(model)
+    rows = []
+    with TestClient(app) as client:
+        client.post("/courtroom/simulate/monte-carlo", json={"policy_text": "", "scenario": "", "trials": 1})  # import the agent
+        for p in (0.2, 0.5, 0.85):
+            model.responder = VerdictResponder(p)
+            rows.append((p, simulate(client, args.trials, args.concurrency, budget=60)))
+        model.responder = VerdictResponder(0.5)
+        sequential = simulate(client, args.trials, 1, budget=60)
+        budget = 4.5 * args.latency
+        capped = simulate(client, args.trials, 4, budget=budget)
+
+    print(f"{args.trials} trials, concurrency {args.concurrency}, LLM {args.latency}s per run")
+    print(f"{'true p':>7}{'estimate':>10}{'95% CI':>16}{'decided':>9}{'peak':>6}{'wall s':>8}   top strength (runs)")
+    for p, r in rows:
+        low, high = r["confidence_interval"]
+        top = r["swot"]["strengths"][0]
+        print(f"{p:>7.2f}{r['win_probability']:>10.3f}{f'{low:.3f}-{high:.3f}':>16}{r['runs']['decided']:>9}"
+              f"{r['peak']:>6}{r['wall']:>8.2f}   {top} ({r['swot_support']['strengths'][top]})")
+    print(f"sequential (concurrency 1): {sequential['wall']:.2f}s")
+    print(f"budget {budget:.2f}s at concurrency 4: {capped['runs']} in {capped['wall']:.2f}s")
+
+    for p, r in rows:
+        low, high = r["confidence_interval"]
+        assert low <= p <= high, (p, r["confidence_interval"])
+        assert r["peak"] <= args.concurrency, r["peak"]
+        assert r["runs"]["completed"] == args.trials and r["outcomes"]["undecided"] > 0, r["runs"]
+        assert r["runs"]["decided"] == args.trials - r["outcomes"]["undecided"]
+        assert len(set(r["temperatures"])) == args.trials, "every run should sample at its own temperature"
+        assert r["swot"]["strengths"][0] == CONSENSUS, r["swot"]
+        assert r["verdict"]["winner"] == ("Consumer" if r["win_probability"] >= 0.5 else "Company")
+    assert rows[0][1]["win_probability"] < rows[1][1]["win_probability"] < rows[2][1]["win_probability"]
+    assert sequential["peak"] == 1 and sequential["wall"] > 3 * rows[1][1]["wall"], (sequential["wall"], rows[1][1]["wall"])
+    assert capped["runs"]["timed_out"] > 0 and 0 < capped["runs"]["completed"] < args.trials, capped["runs"]
+    assert capped["wall"] < budget + 0.5, capped["wall"]
+
+
+if __name__ == "__main__":
+    main()
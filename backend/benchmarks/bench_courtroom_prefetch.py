@@ -0,0 +1,89 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Perceived turn latency in a courtroom session, through the real FastAPI
+routes with a stubbed model, with the next turns generated speculatively
+while the user reads (prefetch depth 0 = off, 1, 2).
+
+The user reads each line for --think seconds; every --argue-every turns
+they type their own argument, which throws the speculative turns away.
+Prints, per depth, the hit rate (turns already prefetched or in flight),
+mean/p95 latency the user waited, and the turns generated for nothing.
+
+    python -m backend.benchmarks.bench_courtroom_prefetch --turns 30 --latency 0.3 --think 0.5
+"""
+import argparse
+import statistics
+import time
+
+from .bench_courtroom_sessions import CASE, TrialResponder
+from .stubs import StubChatModel, install_stub_llm
+
+
+def run_trial(client, responder: TrialResponder, turns: int, prefetch: int, think: float, argue_every: int) -> dict:
+    from ..adk_agent.utils.courtroom_sessions import PrefetchStats
+    PrefetchStats().reset()
+    responder.longest_turn_prompt = 0
+    session_id = client.post("/courtroom/sessions", json={"context": CASE, "prefetch": prefetch}).json()["session_id"]
+    waits, sources = [], []
+    for n in range(1, turns + 1):
+        argument = f"My argument {n}: the 2019 disclosure was accepted by the insurer." if n % argue_every == 0 else ""
+        start = time.perf_counter()
+        response = client.post(f"/courtroom/sessions/{session_id}/turn", json={"argument": argument})
+        waits.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+        sources.append(response.json()["source"])
+        time.sleep(think)  # the user reading the line
+    stats = client.get("/admin/courtroom-stats").json()
+    snapshot = client.get(f"/courtroom/sessions/{session_id}").json()
+    client.delete(f"/courtroom/sessions/{session_id}")
+    waits.sort()
+    return {"prefetch": prefetch, "mean": statistics.mean(waits), "p95": waits[int(len(waits) * 0.95)],
+            "hit_rate": stats["hit_rate"], "served": stats["served"],
+            "generated": stats["prefetch_generated"], "wasted": stats["prefetch_wasted"],
+            "depth": snapshot["prefetch_turns"], "prompt": responder.longest_turn_prompt}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per stubbed LLM call")
+    parser.add_argument("--think", type=float, default=0.5, help="seconds the user reads each line")
+    parser.add_argument("--argue-every", type=int, default=10, help="the user argues every n-th turn")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from ..main import app
+
+    from ..adk_agent.utils.courtroom_sessions import MAX_PREFETCH_TURNS
+
+    responder = TrialResponder()
+    install_stub_llm(StubChatModel(latency=args.latency, responder=responder))
+    with TestClient(app) as client:
+        rows = [run_trial(client, responder, args.turns, depth, args.think, args.argue_every) for depth in (0, 1, 2)]
+        # A client asking for far more speculation gets MAX_PREFETCH_TURNS.
+        greedy = run_trial(client, responder, args.turns, 1000, args.think, args.argue_every)
+
+    print(f"{args.turns}-turn session, LLM {args.latency}s, user reads {args.think}s, argues every {args.argue_every} turns")
+    print(f"{'prefetch':>9}{'depth':>6}{'hit rate':>10}{'mean ms':>9}{'p95 ms':>9}{'hit/late/miss':>15}"
+          f"{'generated':>11}{'wasted':>8}{'max prompt':>12}")
+    for r in rows + [greedy]:
+        served = "/".join(str(r["served"][s]) for s in ("hit", "late", "miss"))
+        print(f"{r['prefetch']:>9}{r['depth']:>6}{r['hit_rate']:>10.2f}{r['mean'] * 1000:>9.1f}{r['p95'] * 1000:>9.1f}"
+              f"{served:>15}{r['generated']:>11}{r['wasted']:>8}{r['prompt']:>12}")
+
+    off, one, two = rows
+    assert off["hit_rate"] == 0 and off["generated"] == 0, off
+    assert off["mean"] >= args.latency, off
+    for r in (one, two):
+        assert r["hit_rate"] >= 0.8, r
+        assert r["mean"] < off["mean"] / 2, (r, off)
+    # Each argument throws away at most the prefetch depth.
+    assert two["wasted"] <= 2 * (args.turns // args.argue_every) + 2, two
+    assert greedy["depth"] == MAX_PREFETCH_TURNS, greedy
+    assert greedy["generated"] <= args.turns + MAX_PREFETCH_TURNS * (args.turns // args.argue_every + 1), greedy
+    # Speculative prompts quote no more turns than on-demand ones.
+    assert greedy["prompt"] <= off["prompt"], (greedy["prompt"], off["prompt"])
+
+
+if __name__ == "__main__":
+    main()
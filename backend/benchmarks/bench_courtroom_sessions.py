@@ -0,0 +1,120 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Courtroom over long trials, through the real FastAPI routes with a stubbed
+model: the stateless /courtroom/simulate-turn (client resends the whole
+history, prompt keeps history[-5:]) vs server-side sessions with a rolling
+summary (/courtroom/sessions/{id}/turn). Prefetch is off here, so every
+prompt measured is an on-demand one (bench_courtroom_prefetch covers it).
+
+Every tenth turn states a new fact ("FACT-n"). Prints request payload,
+prompt size, latency and how many of the facts stated so far the prompt
+still carries, every 10 turns of a 100-turn trial.
+
+    python -m backend.benchmarks.bench_courtroom_sessions --turns 100 --think 0.1
+"""
+import argparse
+import json
+import re
+import statistics
+import time
+
+from .stubs import StubChatModel, install_stub_llm
+
+FACT_RE = re.compile(r"FACT-\d+")
+CASE = ("Claim CLM-2291 for a knee replacement was rejected under clause 4.2 (pre-existing disease). "
+        "The policyholder disclosed arthritis on the proposal form in 2019.") * 6
+
+
+class TrialResponder:
+    """Courtroom turns that state a new fact every tenth line; a clerk that keeps every fact."""
+
+    def __init__(self):
+        self.turns = 0
+        self.last_turn_prompt = ""
+        self.longest_turn_prompt = 0
+        self.summaries = 0
+
+    def __call__(self, prompt: str) -> str:
+        if "Court Clerk" in prompt:
+            self.summaries += 1
+            facts = sorted(set(FACT_RE.findall(prompt)), key=lambda f: int(f.split("-")[1]))
+            return f"Claim CLM-2291 disputed under clause 4.2. Established so far: {', '.join(facts) or 'nothing'}."
+        self.last_turn_prompt = prompt
+        self.longest_turn_prompt = max(self.longest_turn_prompt, len(prompt))
+        self.turns += 1
+        speaker = ["Judge Dredd", "Mr. Wolf", "Ms. Hope"][self.turns % 3]
+        fact = f" The record now shows FACT-{self.turns}." if self.turns % 10 == 1 else ""
+        text = f"Turn {self.turns}: a dramatic but short argument about clause 4.2 and the 2019 disclosure.{fact}"
+        return json.dumps({"speaker": speaker, "text": text, "type": "judge"})
+
+
+def run_trial(client, responder: TrialResponder, turns: int, session: bool, think: float) -> list:
+    responder.turns = 0
+    rows, history, stated = [], [], set()
+    session_id = client.post("/courtroom/sessions", json={"context": CASE, "prefetch": 0}).json()["session_id"] if session else None
+    for n in range(1, turns + 1):
+        if session:
+            body = {"argument": ""}
+            url = f"/courtroom/sessions/{session_id}/turn"
+        else:
+            body = {"context": CASE, "history": history}
+            url = "/courtroom/simulate-turn"
+        payload = json.dumps(body)
+        start = time.perf_counter()
+        response = client.post(url, content=payload, headers={"Content-Type": "application/json"})
+        seconds = time.perf_counter() - start
+        assert response.status_code == 200, response.text
+        turn = response.json()["turn"] if session else response.json()
+        history.append(turn)
+        prompt = responder.last_turn_prompt
+        carried = set(FACT_RE.findall(prompt))
+        rows.append({"turn": n, "payload": len(payload), "prompt": len(prompt), "seconds": seconds,
+                     "retained": len(stated & carried), "stated": len(stated)})
+        stated |= set(FACT_RE.findall(turn["text"]))
+        time.sleep(think)  # the user reading the line
+    if session:
+        rows[-1]["state"] = len(json.dumps(client.get(f"/courtroom/sessions/{session_id}").json()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per stubbed LLM call")
+    parser.add_argument("--prompt-latency", type=float, default=0.01, help="extra seconds per 1k prompt chars")
+    parser.add_argument("--think", type=float, default=0.05, help="seconds the user reads each line")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from ..main import app
+
+    responder = TrialResponder()
+    install_stub_llm(StubChatModel(latency=args.latency, prompt_latency_per_1k=args.prompt_latency, responder=responder))
+    with TestClient(app) as client:
+        legacy = run_trial(client, responder, args.turns, session=False, think=args.think)
+        sessions = run_trial(client, responder, args.turns, session=True, think=args.think)
+
+    print(f"{args.turns}-turn trial, LLM {args.latency}s + {args.prompt_latency}s/1k prompt chars, "
+          f"user reads {args.think}s; {responder.summaries} summary calls")
+    print(f"{'':>5}{'--- stateless simulate-turn ---':>38}   {'--- server-side session ---':>38}")
+    print(f"{'turn':>5}" + f"{'payload B':>10}{'prompt':>8}{'ms':>8}{'facts':>9}   " * 2)
+    for a, b in zip(legacy, sessions):
+        if a["turn"] % 10 and a["turn"] != 1:
+            continue
+        print(f"{a['turn']:>5}" + "".join(
+            f"{r['payload']:>10}{r['prompt']:>8}{r['seconds'] * 1000:>8.1f}{r['retained']:>5}/{r['stated']:<3}   "
+            for r in (a, b)))
+    print(f"session state after {args.turns} turns: {sessions[-1]['state']} bytes")
+
+    tail = sessions[len(sessions) // 5:]
+    assert legacy[-1]["payload"] > 5 * legacy[9]["payload"], "stateless payload should grow with the trial"
+    assert max(r["payload"] for r in sessions) < 100, "session requests should not carry the transcript"
+    assert max(r["prompt"] for r in tail) - min(r["prompt"] for r in tail) < 1500, "session prompt should stay flat"
+    assert sessions[-1]["retained"] == sessions[-1]["stated"] > 0, sessions[-1]
+    assert legacy[-1]["retained"] < legacy[-1]["stated"] / 2, legacy[-1]
+    assert statistics.median(r["seconds"] for r in tail) < 2 * statistics.median(r["seconds"] for r in sessions[:10])
+    assert sessions[-1]["state"] < 6000, sessions[-1]["state"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Concurrent-writer stress test: the old read-modify-write JSON scam graph vs
+the SQLite (WAL) DataStore. Writer threads in several processes flag the
+same few companies and log admin requests; every lost update shows up as a
+missing flag. Also checks the migration from the legacy data/*.json files.
+
+    python -m backend.benchmarks.bench_data_store --processes 4 --threads 4 --writes 200
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+COMPANIES = ["Star Health", "HDFC Ergo", "Niva Bupa", "Care Health"]
+
+
+def legacy_flag_entity(db_path: str, entity_name: str, issue: str):
+    """The previous KnowledgeVault.flag_entity (plus tolerance for half-written files)."""
+    try:
+        with open(db_path, "r") as f:
+            data = json.load(f)
+    except (ValueError, OSError):
+        data = {"companies": {}, "clauses": {}}
+    if entity_name not in data["companies"]:
+        data["companies"][entity_name] = {"flags": 0, "issues": []}
+    data["companies"][entity_name]["flags"] += 1
+    if issue not in data["companies"][entity_name]["issues"]:
+        data["companies"][entity_name]["issues"].append(issue)
+    with open(db_path, "w") as f:
+        json.dump(data, f)
+
+
+def writer_process(backend: str, path: str, threads: int, writes: int, worker: int):
+    from ..adk_agent.utils.data_store import DataStore
+
+    store = DataStore(db_path=path, migrate=False) if backend == "sqlite" else None
+    errors = []
+
+    def write(thread: int):
+        for i in range(writes):
+            company = COMPANIES[(worker + thread + i) % len(COMPANIES)]
+            try:
+                if store is None:
+                    legacy_flag_entity(path, company, "Claim Delay")
+                else:
+                    store.flag_company(company, "Claim Delay")
+                    store.add_admin_request("stress", "PENDING", f"{worker}-{thread}-{i}")
+            except Exception as e:
+                errors.append(str(e))
+
+    pool = [threading.Thread(target=write, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    if errors:
+        raise SystemExit(f"{len(errors)} write errors, e.g. {errors[0]}")
+
+
+def run(backend: str, path: str, processes: int, threads: int, writes: int):
+    start = time.perf_counter()
+    pool = [multiprocessing.Process(target=writer_process, args=(backend, path, threads, writes, w)) for w in range(processes)]
+    for p in pool:
+        p.start()
+    for p in pool:
+        p.join()
+    seconds = time.perf_counter() - start
+    assert all(p.exitcode == 0 for p in pool), [p.exitcode for p in pool]
+    if backend == "sqlite":
+        from ..adk_agent.utils.data_store import DataStore
+        store = DataStore(db_path=path, migrate=False)
+        flags = sum(info["flags"] for info in store.companies().values())
+        requests = len(store.admin_requests())
+    else:
+        with open(path) as f:
+            flags = sum(info["flags"] for info in json.load(f)["companies"].values())
+        requests = None
+    return flags, requests, seconds
+
+
+def check_migration(folder: str):
+    from ..adk_agent.utils.data_store import DataStore
+
+    files = {
+        "scam_graph": [os.path.join(folder, "scam_graph.json")],
+        "market_intel": [os.path.join(folder, "market_intel.json")],
+        "admin_requests": [os.path.join(folder, "admin_requests.json")],
+    }
+    with open(files["scam_graph"][0], "w") as f:
+        json.dump({"companies": {"Star Health": {"flags": 15, "issues": ["Room Rent Capping"]}},
+                   "clauses": {"room_rent_capping": {"risk": "High", "count": 120}}}, f)
+    with open(files["market_intel"][0], "w") as f:
+        json.dump({"companies": [{"name": "Acko", "flags": 3, "issues": "Claim Delay"}], "issues_distribution": {"Co-pay": 40},
+                   "metrics": {"total_policies_analyzed": 42, "top_risk_zip": "560001"}, "geo_risk": []}, f)
+    with open(files["admin_requests"][0], "w") as f:
+        json.dump([{"timestamp": "2025-01-01", "tool": "SERP_API", "status": "FAILED", "message": "no key"}], f)
+
+    # Renamed by an older version, then restored by a git checkout: recorded, not imported again.
+    restored = os.path.join(folder, "restored.json")
+    for path in (restored, restored + ".migrated"):
+        with open(path, "w") as f:
+            json.dump([{"timestamp": "2024-01-01", "tool": "OLD", "status": "DONE", "message": ""}], f)
+    files["admin_requests"].append(restored)
+
+    store = DataStore(db_path=os.path.join(folder, "migrated.db"), migrate=False)
+    assert len(store.migrate_legacy(files)) == 3
+    assert store.migrate_legacy(files) == [], "a migrated file must not be imported twice"
+    assert DataStore(db_path=os.path.join(folder, "migrated.db"), migrate=False).migrate_legacy(files) == []
+    assert sorted(store.migrations()) == sorted(os.path.normpath(p) for paths in files.values() for p in paths)
+    assert store.find_company("star") == {"flags": 15, "issues": ["Room Rent Capping"]}
+    intel = store.market_intel()
+    assert intel["metrics"] == {"total_policies_analyzed": 42, "top_risk_zip": "560001"}, intel
+    assert intel["companies"][0]["flags"] == 3 and intel["issues_distribution"] == {"Co-pay": 40}
+    assert [r["tool"] for r in store.admin_requests()] == ["SERP_API"]
+    assert all(os.path.exists(p) for paths in files.values() for p in paths), "legacy files are left in place"
+    assert not os.path.exists(files["scam_graph"][0] + ".migrated")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=200, help="flags per writer thread")
+    args = parser.parse_args()
+
+    expected = args.processes * args.threads * args.writes
+    print(f"{args.processes} processes x {args.threads} threads x {args.writes} flags = {expected} updates")
+    print(f"{'store':<10}{'flags kept':>12}{'lost':>8}{'seconds':>9}{'writes/s':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        results = {}
+        for backend, name in (("json", "scam_graph.json"), ("sqlite", "parakh.db")):
+            flags, requests, seconds = run(backend, os.path.join(folder, name), args.processes, args.threads, args.writes)
+            results[backend] = (flags, requests)
+            writes = expected * (2 if backend == "sqlite" else 1)
+            print(f"{backend:<10}{flags:>12}{expected - flags:>8}{seconds:>9.2f}{writes / seconds:>10.0f}")
+
+        assert results["sqlite"] == (expected, expected), results["sqlite"]
+        check_migration(folder)
+    print("sqlite: no lost flags or admin requests; legacy JSON migration imported once")
+
+
+if __name__ == "__main__":
+    main()
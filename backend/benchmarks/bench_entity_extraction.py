@@ -0,0 +1,175 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Local entity extraction (gazetteer automaton + suffix patterns) vs an LLM
+extraction round trip: accuracy on labelled insurance, rent and job
+documents, cold and cached cost per document, how cost grows with the
+KnowledgeVault's company count, and what one newly flagged company costs
+(a delta sync, not a full rebuild; unaffected cached documents survive),
+and that an async audit on a cold extractor builds it off the event loop.
+
+    python -m backend.benchmarks.bench_entity_extraction --entities 20000 --pages 40
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from .bench_chunked_audit import synthetic_policy
+from .bench_entity_lookup import synthetic_names
+
+# (doc_type, text, expected {role: name})
+DOCUMENTS = [
+    ("Insurance", "POLICY SCHEDULE\nStar Health and Allied Insurance Co. Ltd. (the Insurer) agrees to indemnify the "
+                  "insured. Claims are settled by Medi Assist India TPA Private Limited. Premium payable to STAR HEALTH.",
+     {"insurer": "Star Health", "tpa": "Medi Assist India TPA Private Limited"}),
+    ("Insurance", "This policy is underwritten by ICICI Lombard General Insurance Company Limited. Port-in from "
+                  "Max Bupa is allowed after renewal.", {"insurer": "ICICI Lombard"}),
+    ("Insurance", "Shady Shield Health (the Company) will pay the Sum Insured subject to the exclusions below.",
+     {"insurer": "Shady Shield Health"}),
+    ("Insurance", "Kaveri Mutual Health Assurance Limited shall not be liable for claims arising from pre-existing "
+                  "diseases.", {"insurer": "Kaveri Mutual Health Assurance Limited"}),
+    ("Rent", "LEAVE AND LICENSE AGREEMENT between Mr. Ramesh Kumar Sharma (hereinafter the Licensor) and Ms. Priya "
+             "Nair (the Licensee). Monthly rent Rs 25,000 payable by the 5th.",
+     {"landlord": "Mr. Ramesh Kumar Sharma", "tenant": "Ms. Priya Nair"}),
+    ("Rent", "RENTAL AGREEMENT. Sunrise Realty Private Limited (the Lessor) lets the premises at Flat 402 to the "
+             "Lessee for 11 months.", {"landlord": "Sunrise Realty Private Limited"}),
+    ("Job", "Offer of Employment. Infosys Limited is pleased to offer you the designation of Analyst. Your CTC "
+            "will be Rs 8,00,000 per annum.", {"employer": "Infosys Limited"}),
+    ("Job", "APPOINTMENT LETTER\nBrightpath Analytics Pvt. Ltd. (the Employer) appoints you as Data Engineer. "
+            "Salary and notice period as per Annexure A.", {"employer": "Brightpath Analytics Pvt. Ltd."}),
+]
+
+
+def accuracy(extractor) -> float:
+    hits = total = 0
+    for doc_type, text, expected in DOCUMENTS:
+        entities = extractor.extract(text, doc_type)
+        for role, name in expected.items():
+            total += 1
+            found = entities.primary(role)
+            if found == name:
+                hits += 1
+            else:
+                print(f"  miss: {role} expected {name!r}, got {found!r} in {text[:40]!r}")
+    return hits / total
+
+
+def market_companies(extractor) -> list:
+    """The name market intel would log for each labelled document."""
+    return [extractor.extract(text, doc_type).company() for doc_type, text, _ in DOCUMENTS]
+
+
+def timed(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+async def audit_loop_stall(auditor, text: str) -> tuple:
+    """Longest gap between 1 ms ticks while aaudit_policy attaches community notes, and the audit's wall time."""
+    done, gaps = False, []
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await auditor.aaudit_policy(text)
+    wall = time.perf_counter() - start
+    done = True
+    await tick
+    return max(gaps) * 1000, wall * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entities", type=int, default=20000, help="companies in the KnowledgeVault")
+    parser.add_argument("--pages", type=int, default=40, help="size of the long policy")
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="seconds per stubbed LLM extraction call")
+    args = parser.parse_args()
+
+    from ..adk_agent.agents.auditor import AuditorAgent
+    from ..adk_agent.utils import entity_extractor, result_cache
+    from ..adk_agent.utils.data_store import DataStore
+    from ..adk_agent.utils.entity_extractor import EntityExtractor
+    from .stubs import StubChatModel, install_stub_llm
+
+    long_policy = ("Niva Bupa Health Insurance Company Limited (the Insurer)\n\n" + synthetic_policy(args.pages))
+    llm = StubChatModel(latency=args.llm_latency, responder=lambda prompt: '{"insurer": "Niva Bupa"}')
+
+    with tempfile.TemporaryDirectory() as folder:
+        store = DataStore(db_path=os.path.join(folder, "parakh.db"), migrate=False)
+        store.flag_company("Shady Shield Health", "Claim Delay")
+        extractor = EntityExtractor(store=store)
+
+        print(f"accuracy on {len(DOCUMENTS)} labelled documents:")
+        acc = accuracy(extractor)
+        print(f"  {acc:.0%} of expected parties found with the right role")
+
+        print(f"{'vault companies':<18}{'build ms':>10}{'states':>10}{'long cold ms':>14}{'cached ms':>11}")
+        rows, names, imported = {}, synthetic_names(args.entities), 0
+        for size in (0, args.entities // 4, args.entities):
+            graph = {n: {"flags": 1, "issues": []} for n in names[imported:size]}
+            store.import_scam_graph({"companies": graph, "clauses": {}})
+            imported = size
+            build_ms = timed(extractor.automaton, 1)
+            cold_ms = timed(lambda: extractor._mentions(long_policy, "Insurance"), 3)
+            extractor.extract(long_policy)
+            cached_ms = timed(lambda: extractor.extract(long_policy), 20)
+            rows[size] = cold_ms
+            print(f"{store.company_count():<18}{build_ms:>10.0f}{len(extractor.automaton()):>10}{cold_ms:>14.1f}{cached_ms:>11.3f}")
+
+        start = time.perf_counter()
+        llm.invoke(f"Extract the insurer, landlord and employer as JSON:\n{long_policy[:8000]}")
+        llm_ms = (time.perf_counter() - start) * 1000
+        # One new vault company: a delta sync, and cached documents that do not name it stay cached.
+        mentions_new = "Pinnacle Shield Cover (the Company) settles claims within 30 days."
+        extractor.extract(mentions_new)
+        calls = []
+        mentions = extractor._mentions
+        extractor._mentions = lambda *a: calls.append(a[0]) or mentions(*a)
+        store.flag_company("Pinnacle Shield Cover", "Claim Delay")
+        sync_ms = timed(extractor.automaton, 1)
+        recheck_ms = timed(lambda: extractor.extract(long_policy), 1)
+        found = extractor.extract(mentions_new).primary("insurer")
+        extractor._mentions = mentions
+        print(f"one new vault company: sync {sync_ms:.1f} ms (full build {build_ms:.0f} ms), "
+              f"cached long policy rechecked in {recheck_ms:.1f} ms, re-extracted {len(calls)} document(s)")
+        logged = market_companies(extractor)
+        print(f"market intel would log: {logged}")
+
+        # First audit after startup: the process-wide extractor is cold.
+        install_stub_llm(StubChatModel(latency=0.05))
+        entity_extractor._extractor = EntityExtractor(store=store)
+        result_cache._cache = result_cache.ResultCache(db_path=os.path.join(folder, "cache.db"))
+        try:
+            stall_ms, audit_ms = asyncio.run(audit_loop_stall(AuditorAgent(), DOCUMENTS[0][1]))
+        finally:
+            entity_extractor._extractor = None
+            result_cache._cache = None
+        print(f"aaudit_policy on a cold extractor: {audit_ms:.0f} ms, longest event-loop stall {stall_ms:.1f} ms")
+
+        print(f"LLM extraction round trip (stub, {args.llm_latency}s): {llm_ms:.0f} ms per document")
+        print(f"policy: {len(long_policy):,} chars; local extraction is {llm_ms / rows[args.entities]:.0f}x cheaper")
+
+        assert acc == 1.0, "every labelled party must be found with its role"
+        assert extractor.extract(long_policy).primary("insurer") == "Niva Bupa"
+        assert rows[args.entities] < llm_ms / 10, "local extraction must be far cheaper than an LLM call"
+        assert sync_ms < build_ms / 10, (sync_ms, build_ms)
+        assert calls == [mentions_new] and found == "Pinnacle Shield Cover", (calls, found)
+        assert "Mr. Ramesh Kumar Sharma" not in logged and "Sunrise Realty Private Limited" in logged, logged
+        assert stall_ms < build_ms / 4, "the automaton must be built off the event loop"
+
+
+if __name__ == "__main__":
+    main()
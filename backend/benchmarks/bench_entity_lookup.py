@@ -0,0 +1,133 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Community scam graph lookups at 100k entities: the old KnowledgeVault
+(re-read scam_graph.json, substring scan), the DataStore's SQL scan and the
+fuzzy EntityIndex behind KnowledgeVault.check_entity. Queries are exact
+names in other casing/suffixes, and names with a one-letter typo.
+
+    python -m backend.benchmarks.bench_entity_lookup --entities 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+SYLLABLES = [c + v for c in ["b", "bh", "ch", "d", "dh", "g", "h", "j", "k", "kh", "l", "m", "n", "p", "r", "s", "sh", "t", "v", "y", "z"]
+             for v in ["a", "e", "i", "o", "u", "aa", "ee"]]
+SECTORS = ["Health", "General", "Life", "Realty", "Finserv", "Motors", "Infotech", "Logistics", "Homes", "Capital", "Labs"]
+SUFFIXES = ["", " Pvt Ltd", " Limited", " Co"]
+
+
+def synthetic_names(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        second = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+        names.add(f"{word} {second} {rng.choice(SECTORS)}")
+    return sorted(names)
+
+
+def typo(name: str, rng: random.Random) -> str:
+    words = name.split()
+    i = max(range(len(words)), key=lambda w: len(words[w]))
+    word = words[i]
+    pos = rng.randint(1, len(word) - 2)
+    words[i] = word[:pos] + word[pos + 1:] if rng.random() < 0.5 else word[:pos] + rng.choice("aeiou") + word[pos + 1:]
+    return " ".join(words)
+
+
+def legacy_check_entity(db_path: str, entity_name: str):
+    """The previous KnowledgeVault.check_entity."""
+    with open(db_path, "r") as f:
+        data = json.load(f)
+    for company, info in data["companies"].items():
+        if entity_name.lower() in company.lower():
+            return dict(info, name=company)
+    return None
+
+
+def measure(lookup, queries):
+    hits, times = 0, []
+    for query, expected in queries:
+        start = time.perf_counter()
+        found = lookup(query)
+        times.append(time.perf_counter() - start)
+        hits += bool(found) and found.get("name") == expected
+    return hits / len(queries), statistics.mean(times) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entities", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--legacy-queries", type=int, default=20, help="the JSON path re-reads the file per call")
+    args = parser.parse_args()
+
+    from ..adk_agent.utils.data_store import DataStore
+    from ..adk_agent.utils.knowledge_vault import KnowledgeVault
+
+    rng = random.Random(7)
+    names = synthetic_names(args.entities)
+    graph = {"companies": {n: {"flags": rng.randint(1, 30), "issues": ["Claim Delay"]} for n in names}, "clauses": {}}
+    targets = rng.sample(names, args.queries)
+    exact = [(n.upper() + rng.choice(SUFFIXES), n) for n in targets]
+    typos = [(typo(n, rng), n) for n in targets]
+
+    with tempfile.TemporaryDirectory() as folder:
+        json_path = os.path.join(folder, "scam_graph.json")
+        with open(json_path, "w") as f:
+            json.dump(graph, f)
+        store = DataStore(db_path=os.path.join(folder, "parakh.db"), migrate=False)
+        start = time.perf_counter()
+        store.import_scam_graph(graph)
+        load_s = time.perf_counter() - start
+        store.claim_once("scam_graph_seed")
+
+        vault = KnowledgeVault(store)
+        start = time.perf_counter()
+        vault.check_entity("warm up")
+        build_s = time.perf_counter() - start
+
+        def sql_lookup(query):
+            """DataStore.find_company's substring scan, with the legal suffix stripped and the name reported."""
+            for suffix in SUFFIXES[1:]:
+                query = query[:-len(suffix)] if query.endswith(suffix) else query
+            row = store._conn().execute("SELECT name FROM companies WHERE instr(name_lower, ?) > 0 ORDER BY rowid LIMIT 1",
+                                        (query.lower(),)).fetchone()
+            return {"name": row[0]} if row else None
+
+        print(f"{args.entities} entities; SQLite import {load_s:.1f}s, index build {build_s:.2f}s")
+        print(f"{'lookup':<26}{'exact acc':>10}{'typo acc':>10}{'mean us':>11}")
+        legacy_n = args.legacy_queries
+        rows = {
+            "json re-read + scan": (lambda q: legacy_check_entity(json_path, q), exact[:legacy_n], typos[:legacy_n]),
+            "sqlite instr scan": (sql_lookup, exact[:legacy_n * 5], typos[:legacy_n * 5]),
+            "entity index": (vault.check_entity, exact, typos),
+        }
+        results = {}
+        for label, (lookup, exact_q, typo_q) in rows.items():
+            exact_acc, exact_us = measure(lookup, exact_q)
+            typo_acc, typo_us = measure(lookup, typo_q)
+            results[label] = (exact_acc, typo_acc, (exact_us + typo_us) / 2)
+            print(f"{label:<26}{exact_acc:>10.0%}{typo_acc:>10.0%}{results[label][2]:>11.0f}")
+
+        # New companies become visible without a rebuild.
+        start = time.perf_counter()
+        store.flag_company("Zzyzx Mutual Health", "Fake Policies")
+        found = vault.check_entity("zzyzx mutual health ltd")
+        refresh_ms = (time.perf_counter() - start) * 1000
+        assert found and found["name"] == "Zzyzx Mutual Health", found
+        print(f"new company visible after {refresh_ms:.1f}ms (incremental refresh)")
+
+    index = results["entity index"]
+    assert index[0] == 1.0, "every exact name (any case / legal suffix) must resolve"
+    assert index[1] >= 0.9, "one-letter typos should still resolve"
+    assert index[2] * 50 < results["json re-read + scan"][2], "index should be far faster than re-reading the JSON"
+
+
+if __name__ == "__main__":
+    main()
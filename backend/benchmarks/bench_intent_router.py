@@ -0,0 +1,152 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Local intent routing (regex rules, then a TF-IDF model trained on logged
+LLM decisions) vs sending every message to the Flash smart_router.
+Latency and accuracy are measured on the labeled fixtures in
+fixtures/routing_fixtures.jsonl; escalated queries are charged the stub LLM
+latency and assumed to be routed correctly.
+
+Also records a stream of LLM decisions through record(): it must never
+wait for a retrain, keep a bounded number of redacted examples, and keep
+the opt-in log file compact.
+
+    python -m backend.benchmarks.bench_intent_router --llm-latency 0.6
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "routing_fixtures.jsonl")
+
+# Phrases for a synthetic routing log, worded differently from the fixtures.
+LOG_TEMPLATES = {
+    "AUDITOR": ["does my plan pay for {x}", "is {x} included in the cover", "limit on {x} in the document", "what does clause {n} say about {x}"],
+    "MEDICAL": ["what is {m}", "explain my {m} result", "is {m} dangerous", "meaning of {m} in my reports"],
+    "LAWYER": ["they refused my claim for {x}, what are my legal options", "how to complain against the insurer about {x}", "can I get compensation for {x} rejection"],
+    "ARCHITECT": ["how expensive will {x} be later", "plan my health savings for {x}", "how much money for {x} after retirement"],
+    "TENANT": ["owner wants to keep my deposit for {t}", "rent increase of {n} percent, is it allowed", "house owner asking {t}"],
+    "CAREER": ["company wants me to pay if I leave before {n} months", "hr says I cannot join a rival for {n} years", "joining letter asks {t}"],
+    "SCOUT": ["suggest a plan without {x} limits", "which insurer is good for {x}", "cheapest family floater with {x}"],
+    "SENTINEL": ["are people complaining about {c}", "can I trust {c}", "has {c} been in trouble"],
+    "GENESIS": ["what's up", "tell me something interesting", "how is your day", "what is the time in london", "translate hello to hindi"],
+}
+SLOTS = {
+    "x": ["dialysis", "knee replacement", "dental care", "ambulance", "ayush treatment", "day care procedures", "icu charges"],
+    "m": ["creatinine", "ecg changes", "fatty liver", "ldl", "thyroid nodule", "ejection fraction"],
+    "t": ["painting charges", "two months advance", "a notarised undertaking", "a police verification fee"],
+    "c": ["Star Health", "Niva Bupa", "Care Health", "Acko", "this agent"],
+    "n": ["3", "6", "12", "24", "4.2"],
+}
+
+
+def load_fixtures():
+    with open(FIXTURES, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def synthetic_log(size: int, seed: int = 11):
+    rng = random.Random(seed)
+    agents = list(LOG_TEMPLATES)
+    log = []
+    for _ in range(size):
+        picked = [rng.choice(agents)]
+        if rng.random() < 0.15:
+            extra = rng.choice(agents)
+            if extra not in picked and "GENESIS" not in (extra, picked[0]):
+                picked.append(extra)
+        text = " and ".join(rng.choice(LOG_TEMPLATES[a]) for a in picked)
+        text = text.format(**{k: rng.choice(v) for k, v in SLOTS.items()})
+        log.append((text, picked))
+    return log
+
+
+def evaluate(router, fixtures, llm_latency: float):
+    local_hits = local_total = 0
+    latencies, local_us = [], []
+    for fixture in fixtures:
+        start = time.perf_counter()
+        decision = router.route(fixture["query"])
+        spent = time.perf_counter() - start
+        local_us.append(spent * 1e6)
+        if decision is None:
+            latencies.append(spent + llm_latency)
+            continue
+        latencies.append(spent)
+        local_total += 1
+        local_hits += sorted(decision.agents) == sorted(fixture["agents"])
+    n = len(fixtures)
+    return {
+        "local_share": local_total / n,
+        "local_accuracy": local_hits / local_total if local_total else 1.0,
+        "overall_accuracy": (local_hits + (n - local_total)) / n,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "local_p50_us": statistics.median(local_us),
+    }
+
+
+def record_stream(log: list, log_path: str, max_examples: int) -> dict:
+    from ..adk_agent.utils.intent_router import IntentRouter
+    router = IntentRouter(log_path=log_path, min_examples=50, retrain_every=100, max_examples=max_examples)
+    secret = "call me on 98765 43210 or ramesh.k@example.com, Mr. Ramesh Kumar"
+    waits, fits = [], 0
+    for i, (text, agents) in enumerate(log):
+        start = time.perf_counter()
+        router.record(f"{text} ({secret})" if i == 0 else text, agents)
+        waits.append(time.perf_counter() - start)
+        if router.training_thread is not None and router.training_thread.is_alive():
+            fits += 1
+            router.training_thread.join()
+    start = time.perf_counter()
+    router.model.fit(list(router._examples))
+    fit_ms = (time.perf_counter() - start) * 1000
+    with open(log_path, "r", encoding="utf-8") as f:
+        logged = f.read()
+    return {"max_record_ms": max(waits) * 1000, "fit_ms": fit_ms, "fits": fits, "examples": router.stats()["examples"],
+            "log_lines": logged.count("\n"), "leaked": any(s in logged for s in ("98765", "ramesh", "Ramesh"))}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-latency", type=float, default=0.6, help="seconds per Flash routing call")
+    parser.add_argument("--log-size", type=int, default=400)
+    args = parser.parse_args()
+
+    from ..adk_agent.utils.intent_router import IntentRouter
+
+    fixtures = load_fixtures()
+    log = synthetic_log(args.log_size)
+    print(f"{len(fixtures)} labeled fixtures; model tier trained on {len(log)} logged decisions")
+    print(f"{'router':<26}{'local':>7}{'local acc':>11}{'overall acc':>13}{'mean ms':>9}{'local p50 us':>14}")
+    print(f"{'LLM only':<26}{0:>7.0%}{'-':>11}{1:>13.0%}{args.llm_latency * 1000:>9.0f}{'-':>14}")
+
+    results = {}
+    for threshold in (0.6, 0.8, 0.9):
+        for with_model in (False, True):
+            router = IntentRouter(rule_threshold=threshold, model_threshold=threshold, log_path=None)
+            if with_model:
+                router.model.fit(log)
+            r = evaluate(router, fixtures, args.llm_latency)
+            results[(threshold, with_model)] = r
+            label = f"rules{' + model' if with_model else ''} @ {threshold}"
+            print(f"{label:<26}{r['local_share']:>7.0%}{r['local_accuracy']:>11.0%}{r['overall_accuracy']:>13.0%}"
+                  f"{r['mean_ms']:>9.0f}{r['local_p50_us']:>14.1f}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        stream = record_stream(synthetic_log(1000, seed=3), os.path.join(folder, "routing_log.jsonl"), max_examples=300)
+    print(f"record() x1000: slowest {stream['max_record_ms']:.2f} ms while {stream['fits']} fits ran in the background "
+          f"(one fit {stream['fit_ms']:.0f} ms); kept {stream['examples']} examples, log {stream['log_lines']} lines")
+
+    default = results[(0.8, True)]
+    assert default["local_share"] >= 0.5, "at the default threshold most fixtures should be routed locally"
+    assert default["local_accuracy"] >= 0.9, "locally routed fixtures should be routed like the LLM would"
+    assert stream["max_record_ms"] < stream["fit_ms"] / 4, "record() must not wait for a retrain"
+    assert stream["examples"] == 300 and stream["log_lines"] <= 300 + 100, stream
+    assert not stream["leaked"], "phone numbers, emails and names must be redacted from the routing log"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Simulated rate-limited Gemini backend: shared round-robin with immediate
+retry on 429 (the old SecurityManager) vs the KeyScheduler. Async tasks and
+worker threads share one scheduler, as FastAPI handlers and to_thread
+agents do.
+
+    python -m backend.benchmarks.bench_key_scheduler --requests 200 --rate 10
+"""
+import argparse
+import asyncio
+import itertools
+import statistics
+import threading
+import time
+
+MODEL = "gemini-2.5-flash"
+
+
+class RateLimitedBackend:
+    """
+    Per-key server-side token buckets. Over-limit calls fail fast with a 429
+    carrying the server's retry delay, like the Gemini API.
+    """
+
+    def __init__(self, keys, rate: float, burst: float, latency: float, slow_key_factor: float):
+        self.latency = latency
+        self._lock = threading.Lock()
+        # The first key is shared with another project, so it really has less quota.
+        self.rates = {k: rate * (slow_key_factor if i == 0 else 1.0) for i, k in enumerate(keys)}
+        self.burst = burst
+        self.tokens = {k: burst for k in keys}
+        self.stamp = {k: time.monotonic() for k in keys}
+        self.throttled = 0
+
+    def _admit(self, key: str):
+        with self._lock:
+            now = time.monotonic()
+            rate = self.rates[key]
+            self.tokens[key] = min(self.burst, self.tokens[key] + (now - self.stamp[key]) * rate)
+            self.stamp[key] = now
+            if self.tokens[key] < 1:
+                self.throttled += 1
+                retry = (1 - self.tokens[key]) / rate
+                raise RuntimeError(f"429 Resource has been exhausted (e.g. check quota). Please retry in {retry:.3f}s.")
+            self.tokens[key] -= 1
+
+    async def acall(self, key: str):
+        self._admit(key)
+        await asyncio.sleep(self.latency)
+
+    def call(self, key: str):
+        self._admit(key)
+        time.sleep(self.latency)
+
+
+def round_robin_client(backend, keys):
+    counter = itertools.count()
+
+    async def acall():
+        for _ in range(len(keys)):
+            key = keys[next(counter) % len(keys)]
+            try:
+                return await backend.acall(key)
+            except RuntimeError:
+                continue  # Immediately hammer the next key
+        raise RuntimeError("All keys exhausted")
+
+    def call():
+        for _ in range(len(keys)):
+            key = keys[next(counter) % len(keys)]
+            try:
+                return backend.call(key)
+            except RuntimeError:
+                continue
+        raise RuntimeError("All keys exhausted")
+
+    return acall, call
+
+
+def scheduler_client(backend, keys, timeout: float):
+    from ..adk_agent.utils.key_scheduler import KeyScheduler
+    scheduler = KeyScheduler()
+
+    async def acall():
+        for _ in range(len(keys) + 1):
+            key = await scheduler.aacquire(MODEL, timeout=timeout)
+            await asyncio.sleep(scheduler.begin(key, MODEL))
+            try:
+                await backend.acall(key)
+            except RuntimeError as e:
+                scheduler.end(key, MODEL, e)
+                continue
+            scheduler.end(key, MODEL)
+            return
+        raise RuntimeError("All keys exhausted")
+
+    def call():
+        for _ in range(len(keys) + 1):
+            key = scheduler.acquire(MODEL, timeout=timeout)
+            time.sleep(scheduler.begin(key, MODEL))
+            try:
+                backend.call(key)
+            except RuntimeError as e:
+                scheduler.end(key, MODEL, e)
+                continue
+            scheduler.end(key, MODEL)
+            return
+        raise RuntimeError("All keys exhausted")
+
+    return acall, call
+
+
+def reused_client(backend, key: str, latency: float, scheduled: bool):
+    """
+    One pooled client (one key) making many calls, as a chunked audit, a
+    batch worker or Monte Carlo trials do. With `scheduled` it carries
+    KeyUsageCallback, which charges and waits per call.
+    """
+    from .stubs import StubChatModel
+    from ..adk_agent.utils.key_scheduler import KeyUsageCallback
+
+    def responder(prompt: str) -> str:
+        backend._admit(key)
+        return "ok"
+
+    callbacks = [KeyUsageCallback(key, MODEL)] if scheduled else []
+    return StubChatModel(latency=latency, responder=responder, callbacks=callbacks)
+
+
+async def drive_reused(model, calls: int):
+    results = await asyncio.gather(*(model.ainvoke(f"chunk {i}") for i in range(calls)), return_exceptions=True)
+    return sum(isinstance(r, Exception) for r in results)
+
+
+async def drive(acall, call, requests: int, concurrency: int, thread_share: float):
+    latencies, failures = [], 0
+    queue = list(range(requests))
+
+    async def one(sync: bool):
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            if sync:
+                await asyncio.to_thread(call)
+            else:
+                await acall()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            failures += 1
+
+    async def worker(sync: bool):
+        while queue:
+            queue.pop()
+            await one(sync)
+
+    threads = int(concurrency * thread_share)
+    await asyncio.gather(*(worker(i < threads) for i in range(concurrency)))
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--keys", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=10.0, help="calls per second per key")
+    parser.add_argument("--burst", type=float, default=3.0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=24)
+    parser.add_argument("--threads", type=float, default=0.25, help="share of clients calling from threads")
+    args = parser.parse_args()
+
+    from ..adk_agent.utils.key_scheduler import KeyScheduler
+
+    keys = [f"sim-key-{i}" for i in range(args.keys)]
+    print(f"{args.requests} requests, {args.concurrency} clients ({args.threads:.0%} threads), "
+          f"{args.keys} keys x {args.rate}/s (key 0 at half quota), burst {args.burst}")
+    print(f"{'strategy':<14}{'ok':>6}{'failed':>8}{'429s':>7}{'wall s':>8}{'p50 ms':>8}{'p95 ms':>8}")
+
+    results = {}
+    for name in ("round-robin", "scheduler"):
+        backend = RateLimitedBackend(keys, args.rate, args.burst, args.latency, slow_key_factor=0.5)
+        if name == "round-robin":
+            acall, call = round_robin_client(backend, keys)
+        else:
+            KeyScheduler().configure(rate_per_minute=args.rate * 60, burst=args.burst, base_cooldown=1.0)
+            KeyScheduler().register(keys)
+            acall, call = scheduler_client(backend, keys, timeout=30.0)
+        start = time.perf_counter()
+        latencies, failures = asyncio.run(drive(acall, call, args.requests, args.concurrency, args.threads))
+        wall = time.perf_counter() - start
+        q = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else [0] * 19
+        results[name] = (failures, backend.throttled)
+        print(f"{name:<14}{len(latencies):>6}{failures:>8}{backend.throttled:>7}{wall:>8.2f}"
+              f"{statistics.median(latencies) * 1000:>8.0f}{q[18] * 1000:>8.0f}")
+
+    assert results["scheduler"][0] == 0, "scheduler should never give up within its wait budget"
+    assert results["scheduler"][1] < results["round-robin"][1], "scheduler should provoke fewer 429s"
+    lanes = KeyScheduler().stats()
+    assert all(lane["in_flight"] == 0 for lane in lanes), "in-flight counts must return to zero"
+    print("per-key calls (scheduler): " + ", ".join(f"{l['key']}={l['calls']} (429s {l['throttled']})" for l in lanes))
+
+    # One client picked once, then called many times concurrently.
+    calls = int(args.rate * 2)
+    print(f"\none reused client, {calls} concurrent calls on one key")
+    reused = {}
+    for scheduled in (False, True):
+        backend = RateLimitedBackend(keys, args.rate, args.burst, args.latency, slow_key_factor=1.0)
+        KeyScheduler().configure(rate_per_minute=args.rate * 60, burst=args.burst, base_cooldown=1.0)
+        KeyScheduler().register(keys)
+        model = reused_client(backend, KeyScheduler().pick(MODEL), args.latency, scheduled)
+        start = time.perf_counter()
+        failures = asyncio.run(drive_reused(model, calls))
+        reused[scheduled] = (failures, backend.throttled)
+        name = "per-call tokens" if scheduled else "no per-call limit"
+        print(f"{name:<18} failed {failures:>3}  429s {backend.throttled:>3}  wall {time.perf_counter() - start:.2f}s")
+    calls_charged = sum(lane["calls"] for lane in KeyScheduler().stats())
+    # Clock jitter between the two buckets can still let one early call through.
+    assert reused[True][1] <= 1 and reused[False][1] >= 5 * max(1, reused[True][1]), reused
+    assert calls_charged == calls, f"every call should be charged once, got {calls_charged}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Fault-injection checks for the Genesis model router (Pro -> Flash -> Groq)
+against stub models: outages, slow tails, recovery and total failure.
+Each scenario asserts its expected behaviour and prints what it measured.
+
+    python -m backend.benchmarks.bench_model_router
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Tuple
+
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from .stubs import FaultyChatModel, StubSecurity
+
+KEYS = 3
+
+
+def setup(pro: FaultyChatModel, flash: FaultyChatModel, groq: FaultyChatModel, **router_settings):
+    """Points AIEngine's three routes at the stubs and resets router/scheduler state."""
+    from ..adk_agent.utils.ai_engine import AIEngine
+    from ..adk_agent.utils.key_scheduler import KeyScheduler
+    from ..adk_agent.utils.model_router import ModelRouter
+
+    def _init(self):
+        self.security = StubSecurity(KEYS)
+
+    AIEngine.__init__ = _init
+    AIEngine.get_genesis_model = lambda self: pro
+    AIEngine.get_flash_model = lambda self: flash
+    AIEngine.get_groq_model = lambda self: groq
+    KeyScheduler().configure()
+    KeyScheduler().register(StubSecurity(KEYS).api_keys)
+    ModelRouter().configure(**{"failure_threshold": 3, "reset_timeout": 0.5, "default_hedge": 10.0,
+                               "min_hedge": 0.05, "min_samples": 20, **router_settings})
+    return AIEngine()
+
+
+def models(pro_latency=0.05, flash_latency=0.03, groq_latency=0.04):
+    return (FaultyChatModel(name="pro", latency=pro_latency),
+            FaultyChatModel(name="flash", latency=flash_latency),
+            FaultyChatModel(name="groq", latency=groq_latency))
+
+
+def legacy_genesis(engine, prompt: str) -> str:
+    """The previous loop: every key on Pro, then Flash."""
+    for _ in range(engine.security.get_key_count()):
+        try:
+            return engine.get_genesis_model().invoke(prompt).content
+        except Exception as e:
+            if engine._is_quota_error(e):
+                continue
+            return f"Error: {e}"
+    try:
+        return engine.get_flash_model().invoke(prompt).content
+    except Exception as e:
+        return f"Flash Error: {e}"
+
+
+def scenario_pro_outage(requests: int):
+    quota = "429 Resource has been exhausted (e.g. check quota)."
+    results = {}
+    for mode in ("legacy", "router"):
+        pro, flash, groq = models()
+        pro.down, pro.error_message = True, quota
+        engine = setup(pro, flash, groq, reset_timeout=30.0)
+        start = time.perf_counter()
+        answers = [legacy_genesis(engine, "q") if mode == "legacy" else engine.run_genesis_agent("q") for _ in range(requests)]
+        results[mode] = (time.perf_counter() - start, pro.calls, answers)
+
+    legacy_s, legacy_pro, _ = results["legacy"]
+    router_s, router_pro, answers = results["router"]
+    assert all(a == "flash: ok" for a in answers), answers[:3]
+    # Until the breaker opens each request retries Pro on every key, then never again.
+    assert router_pro <= 3 * KEYS, router_pro
+    return f"Pro calls {legacy_pro} -> {router_pro}; {requests} requests {legacy_s:.2f}s -> {router_s:.2f}s"
+
+
+def slow_tail(requests: int, concurrency: int, hedge: bool, flash_keys_drained: bool = False) -> Tuple[float, dict, int]:
+    """p99 latency, Pro's router stats and the peak of concurrent hedges when every 33rd Pro call (3%) takes 1s."""
+    from ..adk_agent.utils.ai_engine import FLASH_MODEL
+    from ..adk_agent.utils.key_scheduler import KeyScheduler
+    from ..adk_agent.utils.model_router import ModelRouter
+
+    pro, flash, groq = models(pro_latency=0.05, flash_latency=0.03)
+    engine = setup(pro, flash, groq)
+    latencies = []
+
+    async def client(n, record=True):
+        for _ in range(n):
+            start = time.perf_counter()
+            await ModelRouter().ainvoke("q", engine._genesis_routes(), hedge=hedge)
+            if record:
+                latencies.append(time.perf_counter() - start)
+
+    async def run_all():
+        # Warm-up: the hedge delay comes from Pro's observed p95.
+        await client(ModelRouter().min_samples, record=False)
+        pro.slow_every, pro.slow_latency = 33, 1.0
+        if flash_keys_drained:
+            for key in StubSecurity(KEYS).api_keys:
+                for _ in range(int(KeyScheduler().burst) + 1):
+                    KeyScheduler().begin(key, FLASH_MODEL)
+        await asyncio.gather(*(client(requests // concurrency) for _ in range(concurrency)))
+
+    asyncio.run(run_all())
+    # Pro never fails here, so every Flash call is a hedge.
+    return statistics.quantiles(latencies, n=100)[98], ModelRouter().stats()["gemini-2.5-pro"], flash.peak_in_flight
+
+
+def scenario_slow_tail(requests: int, concurrency: int):
+    from ..adk_agent.utils.model_router import ModelRouter
+
+    p99 = {hedge: slow_tail(requests, concurrency, hedge) for hedge in (False, True)}
+    _, stats, peak = p99[True]
+    budget = max(1, int(ModelRouter().hedge_ratio * concurrency))
+    assert p99[True][0] < p99[False][0] / 2, p99
+    assert stats["hedge_wins"] > 0, stats
+    assert peak <= budget, (peak, budget)
+    return (f"p99 {p99[False][0] * 1000:.0f}ms -> {p99[True][0] * 1000:.0f}ms; hedges {stats['hedges']} "
+            f"(at most {peak} at once, budget {budget}), won by Flash {stats['hedge_wins']}")
+
+
+def scenario_hedge_pressure(requests: int, concurrency: int):
+    # Every Flash key lane out of tokens: hedging would only add 429s, so none are sent.
+    _, stats, _ = slow_tail(requests, concurrency, hedge=True, flash_keys_drained=True)
+    assert stats["hedges"] == 0 and stats["hedges_skipped"] > 0, stats
+    return f"no hedges while Flash keys are exhausted ({stats['hedges_skipped']} skipped)"
+
+
+def scenario_caller_cancelled():
+    from ..adk_agent.utils.model_router import ModelRouter
+
+    pro, flash, groq = models(pro_latency=0.5, flash_latency=0.5)
+    engine = setup(pro, flash, groq, default_hedge=0.05)
+
+    async def cancelled():
+        # A caller giving up (orchestrator timeout, SSE disconnect) mid-hedge.
+        try:
+            await asyncio.wait_for(ModelRouter().ainvoke("q", engine._genesis_routes()), 0.1)
+        except asyncio.TimeoutError:
+            pass
+        await asyncio.sleep(0.01)
+        return pro.in_flight, flash.in_flight
+
+    assert asyncio.run(cancelled()) == (0, 0), "calls kept running after the caller was cancelled"
+    assert pro.calls == flash.calls == 1, (pro.calls, flash.calls)
+
+    # A cancelled half-open probe must not keep the circuit reserved.
+    pro.down = True
+    for _ in range(3):
+        asyncio.run(engine.arun_genesis_agent("q"))
+    pro.down = False
+    time.sleep(0.6)
+    asyncio.run(cancelled())
+    assert ModelRouter().allow("gemini-2.5-pro"), "cancelled probe left the circuit reserved"
+    return "cancelling the caller stops the Pro call and its hedge and frees the half-open probe"
+
+
+def scenario_recovery():
+    from ..adk_agent.utils.model_router import ModelRouter
+
+    pro, flash, groq = models()
+    pro.down = True
+    engine = setup(pro, flash, groq)
+    for _ in range(5):
+        assert asyncio.run(engine.arun_genesis_agent("q")) == "flash: ok"
+    assert ModelRouter().stats()["gemini-2.5-pro"]["state"] == "open"
+    calls_while_open = pro.calls
+
+    pro.down = False
+    assert asyncio.run(engine.arun_genesis_agent("q")) == "flash: ok", "circuit still open before reset_timeout"
+    assert pro.calls == calls_while_open
+    time.sleep(0.6)
+    assert asyncio.run(engine.arun_genesis_agent("q")) == "pro: ok", "half-open probe should reach Pro"
+    assert ModelRouter().stats()["gemini-2.5-pro"]["state"] == "closed"
+    return f"open after {calls_while_open} Pro failures, closed by first probe after reset"
+
+
+def scenario_groq_fallback(requests: int):
+    from ..adk_agent.utils.model_router import ModelRouter
+
+    pro, flash, groq = models()
+    pro.down = flash.down = True
+    engine = setup(pro, flash, groq)
+    answers = [asyncio.run(engine.arun_genesis_agent("q")) for _ in range(requests)]
+    assert all(a == "groq: ok" for a in answers), answers[:3]
+    stats = ModelRouter().stats()
+    assert stats["gemini-2.5-pro"]["state"] == stats["gemini-2.5-flash"]["state"] == "open"
+    return f"{requests} answers from Groq; Pro calls {pro.calls}, Flash calls {flash.calls}"
+
+
+def scenario_streaming_failover():
+    pro, flash, groq = models()
+    pro.down = True
+    engine = setup(pro, flash, groq)
+
+    async def collect():
+        return "".join([chunk async for chunk in engine.astream_genesis_agent("q")])
+
+    assert asyncio.run(collect()) == "flash: ok"
+    return "stream fails over to Flash before the first chunk"
+
+
+class QuotaOnceChatModel(FaultyChatModel):
+    """Streams normally, except that the first call hits a 429 on its key."""
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.calls == 0:
+            self.calls += 1
+            raise RuntimeError(f"{self.name}: 429 Resource has been exhausted (e.g. check quota).")
+        async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+            yield chunk
+
+
+def scenario_streaming_routes():
+    from ..adk_agent.utils.ai_engine import FLASH_MODEL
+    from ..adk_agent.utils.key_scheduler import KeyScheduler
+
+    async def collect(engine, status):
+        return "".join([chunk async for chunk in engine.astream_genesis_agent("q", status=status)])
+
+    # A Pro 429 is retried on another key, as in arun_genesis_agent.
+    _, flash, groq = models()
+    pro = QuotaOnceChatModel(name="pro", latency=0.01)
+    engine = setup(pro, flash, groq)
+    status = {}
+    assert asyncio.run(collect(engine, status)) == "pro: ok" and status["route"] == "gemini-2.5-pro", status
+    assert pro.calls == 2 and flash.calls == 0, (pro.calls, flash.calls)
+
+    # A slow first chunk from Pro is hedged with Flash...
+    pro, flash, groq = models(pro_latency=0.5)
+    engine = setup(pro, flash, groq, default_hedge=0.05)
+    status = {}
+    assert asyncio.run(collect(engine, status)) == "flash: ok" and status["route"] == FLASH_MODEL, status
+
+    # ...but not while every Flash key lane is out of tokens.
+    pro, flash, groq = models(pro_latency=0.3)
+    engine = setup(pro, flash, groq, default_hedge=0.05)
+    for key in StubSecurity(KEYS).api_keys:
+        for _ in range(int(KeyScheduler().burst) + 1):
+            KeyScheduler().begin(key, FLASH_MODEL)
+    assert asyncio.run(collect(engine, {})) == "pro: ok" and flash.calls == 0, flash.calls
+    return "stream retries a Pro 429 on another key, hedges a slow first chunk, skips busy Flash"
+
+
+class CutOffChatModel(FaultyChatModel):
+    """Streams part of an answer, then fails (a dropped connection mid-report)."""
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="## Policy Report\nRoom rent is cap"))
+        raise RuntimeError(f"{self.name}: connection reset")
+
+
+def scenario_stream_cut_off():
+    import tempfile
+    from ..adk_agent.agents.auditor import AuditorAgent
+    from ..adk_agent.utils import result_cache
+
+    _, flash, groq = models()
+    pro = CutOffChatModel(name="pro", latency=0.01)
+    engine = setup(pro, flash, groq)
+
+    async def collect(agen):
+        return "".join([chunk async for chunk in agen])
+
+    status = {}
+    text = asyncio.run(collect(engine.astream_genesis_agent("q", status=status)))
+    assert text.startswith("## Policy Report") and "Error: " in text, text
+    assert status == {"complete": False, "route": "gemini-2.5-pro"}, status
+
+    with tempfile.TemporaryDirectory() as folder:
+        result_cache._cache = result_cache.ResultCache(db_path=f"{folder}/cache.db")
+        try:
+            auditor = AuditorAgent()
+            asyncio.run(collect(auditor.astream_full_report("Room rent is capped at 1% of sum insured.")))
+            asyncio.run(collect(auditor.astream_full_report("Room rent is capped at 1% of sum insured.")))
+            cached = result_cache._cache.stats()["entries"]
+        finally:
+            result_cache._cache = None
+    assert cached == 0 and pro.calls == 3, "the cut-off report must not be cached"
+    return f"cut-off stream reported incomplete; report not cached ({pro.calls} Pro streams for 1 + 2 requests)"
+
+
+def scenario_fallback_report_not_cached():
+    import tempfile
+    from ..adk_agent.agents.auditor import AuditorAgent
+    from ..adk_agent.utils import result_cache
+
+    pro, flash, groq = models()
+    pro.down = True
+    engine = setup(pro, flash, groq)
+    policy = "Room rent is capped at 1% of sum insured."
+
+    async def collect(agen):
+        return "".join([chunk async for chunk in agen])
+
+    with tempfile.TemporaryDirectory() as folder:
+        result_cache._cache = result_cache.ResultCache(db_path=f"{folder}/cache.db")
+        try:
+            auditor = AuditorAgent()
+            # During the Pro outage every path answers from Flash without caching it...
+            assert auditor.generate_full_report(policy) == "flash: ok"
+            assert asyncio.run(auditor.agenerate_full_report(policy)) == "flash: ok"
+            assert asyncio.run(collect(auditor.astream_full_report(policy))) == "flash: ok"
+            during_outage = result_cache._cache.stats()["entries"]
+            # ...so once Pro is back the next request gets (and caches) Pro's report.
+            pro.down = False
+            setup(pro, flash, groq)  # closes Pro's circuit
+            first = asyncio.run(auditor.agenerate_full_report(policy))
+            second = asyncio.run(auditor.agenerate_full_report(policy))
+            after = result_cache._cache.stats()["entries"]
+        finally:
+            result_cache._cache = None
+    assert during_outage == 0, "a fallback answer was cached as the Pro report"
+    assert first == second == "pro: ok" and after == 1, (first, second, after)
+    return "Flash answers during a Pro outage are served uncached; Pro's report is cached once back"
+
+
+def scenario_all_down():
+    pro, flash, groq = models()
+    pro.down = flash.down = groq.down = True
+    engine = setup(pro, flash, groq)
+    first = asyncio.run(engine.arun_genesis_agent("q"))
+    calls = pro.calls + flash.calls + groq.calls
+    second = asyncio.run(engine.arun_genesis_agent("q"))
+    assert first.startswith("Error") and second.startswith("Error")
+    return f"error answer, no exception; {calls} model calls for the first request"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("pro outage (429 on every key)", lambda: scenario_pro_outage(30)),
+        ("pro slow tail, hedging", lambda: scenario_slow_tail(args.requests, args.concurrency)),
+        ("hedging, flash keys exhausted", lambda: scenario_hedge_pressure(args.requests, args.concurrency)),
+        ("caller cancelled mid-hedge", scenario_caller_cancelled),
+        ("breaker recovery", scenario_recovery),
+        ("pro + flash down", lambda: scenario_groq_fallback(10)),
+        ("streaming failover", scenario_streaming_failover),
+        ("streaming retry and hedging", scenario_streaming_routes),
+        ("stream cut off mid-answer", scenario_stream_cut_off),
+        ("fallback report not cached", scenario_fallback_report_not_cached),
+        ("everything down", scenario_all_down),
+    ]
+    failed = 0
+    for name, run in scenarios:
+        try:
+            print(f"PASS  {name:<32} {run()}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {name:<32} {e}")
+    if failed:
+        raise SystemExit(f"{failed} scenario(s) failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Multi-agent answers against a stubbed LLM: agents one after another (the old
+chat view) vs the AgentOrchestrator's concurrent fan-out, plus partial
+failure and per-agent timeout checks.
+
+    python -m backend.benchmarks.bench_orchestrator --latency 0.3
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from .stubs import StubChatModel, install_stub_llm
+
+AGENTS = ["TENANT", "CAREER", "SCOUT", "MEDICAL", "GENESIS"]
+
+
+async def sequential(orchestrator, agents, prompt: str, context: str):
+    return [await orchestrator._run_one(agent, prompt, context) for agent in agents]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    from ..adk_agent.agents.orchestrator import AGENT_ORDER, AgentOrchestrator
+    from ..adk_agent.utils.ai_engine import AIEngine
+
+    install_stub_llm(StubChatModel(latency=args.latency))
+    print(f"agents {', '.join(AGENTS)}; stub latency {args.latency}s per LLM call")
+    print(f"{'mode':<12}{'mean s':>8}{'max s':>8}")
+
+    timings = {"sequential": [], "concurrent": []}
+    for _ in range(args.rounds):
+        # Unique text per round so the result and semantic caches never short-circuit the LLM.
+        context = f"Lock-in 11 months. Bond of 2 years. Ref {uuid.uuid4()}"
+        prompt = f"Check this agreement and my HbA1c report {uuid.uuid4()}"
+        orchestrator = AgentOrchestrator(AIEngine())
+        start = time.perf_counter()
+        asyncio.run(sequential(orchestrator, AGENTS, prompt, context))
+        timings["sequential"].append(time.perf_counter() - start)
+
+        shuffled = random.sample(AGENTS, len(AGENTS))
+        prompt = f"Check this agreement and my HbA1c report {uuid.uuid4()}"
+        result = orchestrator.run(shuffled, prompt, context + " again")
+        timings["concurrent"].append(result.seconds)
+        assert not result.failed, [r.to_dict() for r in result.results]
+        assert [r.agent for r in result.results] == [a for a in AGENT_ORDER if a in AGENTS], "order must not depend on input or finish order"
+
+    for mode, values in timings.items():
+        print(f"{mode:<12}{sum(values) / len(values):>8.2f}{max(values):>8.2f}")
+    assert max(timings["concurrent"]) < min(timings["sequential"]) / 2, timings
+
+    # Partial failure and timeouts: the rest still answer, failures are reported.
+    orchestrator = AgentOrchestrator(AIEngine(), timeout=5.0, timeouts={"CAREER": 0.2})
+
+    async def broken(prompt, context):
+        raise RuntimeError("search backend down")
+
+    async def stuck(prompt, context):
+        await asyncio.sleep(10)
+
+    orchestrator.handlers["SCOUT"] = broken
+    orchestrator.handlers["CAREER"] = stuck
+    result = orchestrator.run(AGENTS, f"Check my lease {uuid.uuid4()}", f"Lock-in 11 months {uuid.uuid4()}")
+    statuses = {r.agent: r.status for r in result.results}
+    assert statuses == {"TENANT": "ok", "CAREER": "timeout", "SCOUT": "error", "MEDICAL": "ok", "GENESIS": "ok"}, statuses
+    assert result.seconds < 5.0, result.seconds
+    assert "search backend down" in result.response
+    print(f"partial failure: {statuses}; answered in {result.seconds:.2f}s")
+
+    # Nothing succeeded: Genesis answers as the fallback.
+    orchestrator = AgentOrchestrator(AIEngine())
+    orchestrator.handlers["SCOUT"] = broken
+    result = orchestrator.run(["SCOUT"], f"Any cheaper plans? {uuid.uuid4()}")
+    assert [r.agent for r in result.results] == ["SCOUT", "GENESIS"] and result.results[1].ok
+    print("all agents failed: Genesis fallback answered")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Sentinel reputation checks on a repeated, concurrent workload: a fresh ReAct
+research run per request (the old check_reputation) vs the ReputationService
+(TTL cache, request coalescing, stale-while-refresh). The ReAct agent runs
+against a stubbed LLM and the offline fixture search backend, so no network
+is touched.
+
+    python -m backend.benchmarks.bench_reputation --requests 60 --threads 8
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .stubs import StubChatModel, install_stub_llm
+
+CORPUS = {
+    "Star Health": ["Star Health claim settlement ratio 82% (FY24).", "IRDAI fined Star Health Rs 1 crore in 2023."],
+    "HDFC Ergo": ["HDFC Ergo claim settlement ratio 98%.", "Few ombudsman complaints per 10,000 policies."],
+    "Niva Bupa": ["Niva Bupa listed on NSE in 2024.", "Complaints mostly about cashless delays."],
+    "Care Health": ["Care Health consumer court order on a rejected claim, 2024."],
+    "Acko": ["Acko digital-only insurer; complaints about claim documentation."],
+}
+TOPICS = ["scams", "regulatory fines", "claim rejection ratio"]
+
+
+class CountingBackend:
+    """FixtureSearchBackend with a network-like delay and a call counter."""
+    name = "fixture"
+
+    def __init__(self, latency: float):
+        from ..adk_agent.tools.search_tools import FixtureSearchBackend
+        self.fixture = FixtureSearchBackend(CORPUS)
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search(self, query: str) -> str:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return self.fixture.search(query)
+
+
+def react_responder(calls: list):
+    """ReAct turns: one search per topic, then a Final Answer."""
+    lock = threading.Lock()
+
+    def respond(prompt: str) -> str:
+        with lock:
+            calls.append(1)
+        company = re.search(r"insurance company: (.+?) in India", prompt).group(1)
+        done = prompt.count("Thought: searching")
+        if done < len(TOPICS):
+            return f"Thought: searching {TOPICS[done]}\nAction: web_search\nAction Input: {company} {TOPICS[done]}"
+        return f"Final Answer: - {company}: reputation summary from {done} searches."
+
+    return respond
+
+
+def run_workload(check, companies, requests: int, threads: int) -> float:
+    rng = random.Random(3)
+    picks = [rng.choice(companies) for _ in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(check, picks))
+    assert all(r and "reputation summary" in r for r in results), results[:3]
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per stubbed LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    from ..adk_agent.agents.sentinel import SentinelAgent
+    from ..adk_agent.utils.reputation import ReputationService
+    from ..adk_agent.utils.result_cache import ResultCache
+
+    llm_calls = []
+    install_stub_llm(StubChatModel(latency=args.latency, responder=react_responder(llm_calls)))
+    companies = list(CORPUS)
+    print(f"{args.requests} checks over {len(companies)} companies, {args.threads} threads; "
+          f"LLM {args.latency}s/call, search {args.search_latency}s/call")
+    print(f"{'mode':<22}{'seconds':>9}{'LLM calls':>11}{'searches':>10}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        def service(**kwargs):
+            kwargs.setdefault("search_rate", 0)
+            return ReputationService(backend=backend, cache=ResultCache(db_path=os.path.join(folder, f"{time.time_ns()}.db")), **kwargs)
+
+        rows = {}
+        backend = CountingBackend(args.search_latency)
+        uncached = SentinelAgent(service(), mode="react")
+        uncached.search_tool.func = backend.search
+        seconds = run_workload(uncached._research, companies, args.requests, args.threads)
+        rows["research every call"] = (seconds, len(llm_calls), backend.calls)
+
+        llm_calls.clear()
+        backend = CountingBackend(args.search_latency)
+        sentinel = SentinelAgent(service(), mode="react")
+        seconds = run_workload(sentinel.check_reputation, companies, args.requests, args.threads)
+        rows["reputation service"] = (seconds, len(llm_calls), backend.calls)
+        for label, (seconds, calls, searches) in rows.items():
+            print(f"{label:<22}{seconds:>9.2f}{calls:>11}{searches:>10}")
+        print(f"service stats: {sentinel.reputation.stats()}")
+
+        per_research = len(TOPICS) + 1
+        assert rows["reputation service"][1] == len(companies) * per_research, "one research run per company, coalesced"
+        assert rows["reputation service"][2] == len(companies) * len(TOPICS)
+        assert rows["reputation service"][0] * 2 < rows["research every call"][0]
+
+        # Stale entries are served at once while one background refresh runs.
+        llm_calls.clear()
+        backend = CountingBackend(args.search_latency)
+        sentinel = SentinelAgent(service(ttl_seconds=0.5, search_ttl_seconds=0.5), mode="react")
+        first = sentinel.reputation.lookup("Acko", sentinel._research)
+        time.sleep(0.6)
+        start = time.perf_counter()
+        stale = [sentinel.reputation.lookup("Acko Ltd", sentinel._research) for _ in range(5)]
+        stale_ms = (time.perf_counter() - start) * 1000
+        deadline = time.time() + 10
+        while sentinel.reputation.stats()["in_flight"] and time.time() < deadline:
+            time.sleep(0.05)
+        fresh = sentinel.reputation.lookup("ACKO", sentinel._research)
+        assert first["status"] == "miss" and all(s["status"] == "stale" for s in stale), stale
+        assert fresh["status"] == "fresh" and fresh["fetched_at"] > first["fetched_at"]
+        assert sentinel.reputation.stats()["refreshes"] == 1, sentinel.reputation.stats()
+        print(f"stale-while-refresh: 5 stale reads in {stale_ms:.1f}ms, one background refresh, then fresh")
+
+        # Live searches beyond the burst wait for the token bucket.
+        backend = CountingBackend(0.0)
+        limited = service(search_rate=5.0, search_burst=1)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            list(pool.map(limited.search, [f"Star Health {t}" for t in ("a", "b", "c", "d", "e")]))
+        spread = time.perf_counter() - start
+        assert spread >= 0.75 and backend.calls == 5, (spread, backend.calls)
+        print(f"rate limit: 5 distinct searches at 5/s (burst 1) took {spread:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Sentinel research modes on cold lookups (no reputation cache): the ReAct
+loop (one LLM call per search step, searches one after another) vs the
+planned mode (all topic searches in parallel, one summarization call).
+Reports LLM calls per request and wall time from AgentRunStats, and checks
+the per-request LLM call cap.
+
+    python -m backend.benchmarks.bench_sentinel_modes --latency 0.5 --search-latency 0.4
+"""
+import argparse
+import os
+import tempfile
+
+from .bench_reputation import CORPUS, TOPICS, CountingBackend, react_responder
+from .stubs import StubChatModel, install_stub_llm
+
+
+def responder(calls: list):
+    """ReAct turns for the agent prompt, a summary for the planned prompt."""
+    react = react_responder(calls)
+
+    def respond(prompt: str) -> str:
+        if "Action Input" in prompt:
+            return react(prompt)
+        calls.append(1)
+        return "- reputation summary from the planned searches."
+
+    return respond
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per stubbed LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.4)
+    parser.add_argument("--rounds", type=int, default=2, help="cold lookups per company and mode")
+    args = parser.parse_args()
+
+    from ..adk_agent.agents.sentinel import SEARCH_TOPICS, SentinelAgent
+    from ..adk_agent.utils.llm_budget import AgentRunStats
+    from ..adk_agent.utils.reputation import ReputationService
+    from ..adk_agent.utils.result_cache import ResultCache
+
+    calls = []
+    install_stub_llm(StubChatModel(latency=args.latency, prompt_latency_per_1k=0.05, responder=responder(calls)))
+    stats = AgentRunStats()
+    stats.reset()
+    companies = list(CORPUS)[:3]
+
+    with tempfile.TemporaryDirectory() as folder:
+        def agent(mode: str, n: int, **kwargs) -> SentinelAgent:
+            cache = ResultCache(db_path=os.path.join(folder, f"{mode}-{n}.db"))
+            service = ReputationService(backend=CountingBackend(args.search_latency), cache=cache, search_rate=0)
+            return SentinelAgent(service, mode=mode, **kwargs)
+
+        for mode in ("react", "planned"):
+            for n in range(args.rounds):
+                sentinel = agent(mode, n)
+                for company in companies:
+                    assert "reputation summary" in sentinel.check_reputation(company)
+
+        runs = stats.stats()
+        print(f"LLM {args.latency}s/call, search {args.search_latency}s/call; "
+              f"{args.rounds * len(companies)} cold lookups per mode")
+        print(f"{'mode':<10}{'LLM calls/req':>15}{'max':>6}{'mean s':>9}{'max s':>8}")
+        for mode in ("react", "planned"):
+            run = runs[f"SENTINEL/{mode}"]
+            print(f"{mode:<10}{run['mean_llm_calls']:>15.1f}{run['max_llm_calls']:>6}{run['mean_seconds']:>9.2f}{run['max_seconds']:>8.2f}")
+
+        react, planned = runs["SENTINEL/react"], runs["SENTINEL/planned"]
+        assert react["mean_llm_calls"] == len(TOPICS) + 1 and planned["max_llm_calls"] == 1, runs
+        assert planned["mean_seconds"] * 3 < react["mean_seconds"], runs
+        assert planned["failed"] == react["failed"] == 0
+
+        # The cap: a ReAct run needing 4 calls stops at 2 and nothing is cached.
+        capped = agent("react", 99, max_llm_calls=2)
+        answer = capped.check_reputation("Acko")
+        assert "limit of 2 AI calls" in answer, answer
+        assert AgentRunStats().stats()["SENTINEL/react"]["max_llm_calls"] == len(TOPICS) + 1
+        assert capped.reputation.cache.get("reputation", capped.reputation._company_key("Acko")) is None
+        print(f"cap: react run with max_llm_calls=2 stopped, nothing cached; planned mode needs 1 call "
+              f"for {len(SEARCH_TOPICS)} searches")
+
+
+if __name__ == "__main__":
+    main()
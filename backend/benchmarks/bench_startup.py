@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Backend cold start: import-time profile of `backend.main` and a startup
+regression check. Each measurement runs in a fresh interpreter.
+
+- lazy: `import backend.main` and answer /health (what a new container does)
+- eager: the same plus importing every registered agent, which is what
+  startup cost before the agent registry
+- first use: importing one agent after startup (paid by its first request,
+  or up front by WARMUP_AGENTS)
+
+Fails if backend.main pulls a heavy dependency back in at import time or
+the lazy /health time exceeds --budget.
+
+    python -m backend.benchmarks.bench_startup --runs 3 --top 15
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["langchain", "langchain_core", "langchain_google_genai", "langchain_experimental", "langchain_groq",
+                 "google.generativeai", "streamlit", "plotly", "pandas", "duckduckgo_search"]
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import backend.main
+from fastapi.testclient import TestClient
+client = TestClient(backend.main.app)
+assert client.get("/health").status_code == 200
+health = time.perf_counter() - start
+heavy = [m for m in HEAVY if m in sys.modules]
+from backend.adk_agent.agents.registry import AGENTS, AgentRegistry
+first_use = {}
+for name in AGENTS if MODE == "eager" else FIRST_USE:
+    t = time.perf_counter()
+    try:
+        AgentRegistry().agent_class(name)
+    except ImportError as e:
+        first_use[name] = None
+        continue
+    first_use[name] = time.perf_counter() - t
+print(json.dumps({"health": health, "total": time.perf_counter() - start, "heavy": heavy, "first_use": first_use}))
+"""
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    env.pop("WARMUP_AGENTS", None)
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+
+def probe(mode: str, first_use: list) -> dict:
+    code = f"HEAVY = {HEAVY_MODULES!r}\nMODE = {mode!r}\nFIRST_USE = {first_use!r}\n" + PROBE
+    return json.loads(_run(code).stdout.strip().splitlines()[-1])
+
+
+def import_profile(module: str) -> list:
+    """(cumulative us, self us, depth, module) for every module `import module` loads."""
+    rows = []
+    for line in _run(f"import {module}", "-X", "importtime").stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            rows.append((int(cumulative), int(own), len(indent) // 2, name))
+    return rows
+
+
+def by_package(rows: list) -> dict:
+    totals = {}
+    for _, own, _, name in rows:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + own
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--budget", type=float, default=1.5, help="max seconds from interpreter start to /health")
+    args = parser.parse_args()
+
+    rows = import_profile("backend.main")
+    total = next(r[0] for r in rows if r[3] == "backend.main")
+    print(f"import backend.main: {total / 1e6:.3f}s, {len(rows)} modules")
+    print(f"{'package':<28}{'self s':>8}")
+    for package, own in sorted(by_package(rows).items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{package:<28}{own / 1e6:>8.3f}")
+
+    lazy = [probe("lazy", ["AUDITOR"]) for _ in range(args.runs)]
+    eager = [probe("eager", []) for _ in range(args.runs)]
+    lazy_health = statistics.median(r["health"] for r in lazy)
+    eager_total = statistics.median(r["total"] for r in eager)
+    first_audit = statistics.median(r["first_use"]["AUDITOR"] for r in lazy)
+    skipped = sorted(name for name, s in eager[0]["first_use"].items() if s is None)
+    print(f"\n{'startup':<34}{'median s':>9}")
+    print(f"{'lazy: import + /health':<34}{lazy_health:>9.3f}")
+    print(f"{'eager: + every agent imported':<34}{eager_total:>9.3f}")
+    print(f"{'first AUDITOR use after lazy':<34}{first_audit:>9.3f}")
+    if skipped:
+        print(f"(not importable here, left out of eager: {', '.join(skipped)})")
+
+    heavy = sorted({m for r in lazy for m in r["heavy"]})
+    assert not heavy, f"backend.main imports heavy modules at startup: {heavy}"
+    assert lazy_health < args.budget, f"startup {lazy_health:.3f}s over the {args.budget}s budget"
+    assert lazy_health < eager_total, (lazy_health, eager_total)
+    print(f"\nok: no heavy imports at startup, /health in {lazy_health:.3f}s (budget {args.budget}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Structured-output layer vs the old fence-strip + json.loads parsing, on a
+corpus of the ways model JSON goes wrong in practice (fences, chatter,
+trailing commas, Python literals, raw newlines, truncation, missing fields,
+"62/100" scores). Every agent answer goes through the real agents with a
+stubbed model; a re-ask is answered with only the fields it asks for.
+
+Reports, per agent, how many answers the old parser threw away and the
+tokens a full re-run of those requests costs, against the repair rate and
+re-ask tokens of the new layer.
+
+    python -m backend.benchmarks.bench_structured_output --rounds 3
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+
+from .stubs import StubChatModel, install_stub_llm
+
+PAYLOADS = {
+    "AUDITOR": {
+        "room_rent": "1% of Sum Insured per day", "co_pay": "20% for age 60+", "sub_limits": "Cataract: 40,000",
+        "waiting_periods": "PED: 4 years", "exclusions": ["Cosmetic surgery", "Dental"], "risk_score": 62,
+        "risk_reason": "Room rent capping and co-pay.",
+    },
+    "TENANT": {
+        "lock_in": "6 months", "security_deposit": "3 months rent, painting deducted", "maintenance": "Tenant pays minor",
+        "notice_period": "2 months", "eviction_terms": "Immediate eviction on late rent", "risk_score": 40,
+        "risk_reason": "Harsh eviction clause.",
+    },
+    "CAREER": {
+        "bond": "Rs 2,00,000 within 2 years", "notice_period": "90 days", "non_compete": "12 months, India",
+        "ip_rights": "Company owns side projects", "variable_pay": "Discretionary", "risk_score": 35,
+        "risk_reason": "Bond and broad IP clause.",
+    },
+    "COURTROOM_TURN": {"speaker": "Mr. Wolf", "text": "Your honor, Clause 4.1 is clear.", "type": "prosecution"},
+}
+PROMPT_MARKERS = [("Tenant Guardian", "TENANT"), ("Career Shield", "CAREER"), ("NEXT SINGLE LINE", "COURTROOM_TURN"),
+                  ("Auditor Agent", "AUDITOR")]
+LAST_STRING_FIELD = {"AUDITOR": "risk_reason", "TENANT": "risk_reason", "CAREER": "risk_reason", "COURTROOM_TURN": "text"}
+
+
+def _trailing_comma(payload: dict, agent: str) -> str:
+    text = json.dumps(payload, indent=2)
+    return text[:-2] + ",\n}"
+
+
+def _raw_newline(payload: dict, agent: str) -> str:
+    field = LAST_STRING_FIELD[agent]
+    return json.dumps(dict(payload, **{field: payload[field] + "\\nSee clause 7."})).replace("\\\\n", "\n")
+
+
+def _missing_field(payload: dict, agent: str) -> str:
+    return json.dumps({k: v for k, v in payload.items() if k != LAST_STRING_FIELD[agent]})
+
+
+def _truncated(payload: dict, agent: str) -> str:
+    text = json.dumps(payload)
+    return text[:int(len(text) * 0.6)]
+
+
+MALFORMATIONS = [
+    ("clean", lambda p, a: json.dumps(p)),
+    ("fenced", lambda p, a: "```json\n" + json.dumps(p, indent=2) + "\n```"),
+    ("chatter", lambda p, a: "Sure! Here is the analysis:\n" + json.dumps(p) + "\nLet me know if you need more."),
+    ("trailing_comma", _trailing_comma),
+    ("python_literals", lambda p, a: repr(dict(p, verified=True, notes=None))),
+    ("raw_newline", _raw_newline),
+    ("score_as_text", lambda p, a: json.dumps(dict(p, risk_score=f"{p['risk_score']}/100") if "risk_score" in p else p)),
+    ("missing_field", _missing_field),
+    ("truncated", _truncated),
+]
+REASK_KEYS_RE = re.compile(r'"(\w+)":')
+
+
+def strict_parse(text: str):
+    """The parsing every agent used before: strip fences, json.loads."""
+    return json.loads(text.replace("```json", "").replace("```", "").strip())
+
+
+class Responder:
+    def __init__(self):
+        self.answers = []   # (agent, malformation, prompt, text) for first answers
+        self.turn = {}
+
+    def __call__(self, prompt: str) -> str:
+        agent = next(name for marker, name in PROMPT_MARKERS if marker in prompt)
+        payload = PAYLOADS[agent]
+        if "Your previous answer was missing" in prompt:
+            wanted = REASK_KEYS_RE.findall(prompt.rsplit("exactly these keys:", 1)[1])
+            return json.dumps({k: payload[k] for k in wanted if k in payload})
+        n = self.turn.get(agent, 0)
+        self.turn[agent] = n + 1
+        name, malform = MALFORMATIONS[n % len(MALFORMATIONS)]
+        text = malform(payload, agent)
+        self.answers.append((agent, name, prompt, text))
+        return text
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=2, help="passes over the malformation corpus per agent")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    os.environ["RESULT_CACHE_PATH"] = os.path.join(folder, "cache.db")
+    os.environ["PARAKH_DB_PATH"] = os.path.join(folder, "parakh.db")
+
+    from ..adk_agent.agents.auditor import AuditorAgent
+    from ..adk_agent.agents.career_shield import CareerShieldAgent
+    from ..adk_agent.agents.lawyer import CourtroomAgent
+    from ..adk_agent.agents.tenant_guardian import TenantGuardianAgent
+    from ..adk_agent.utils.structured_output import ParseMetrics, estimate_tokens
+
+    responder = Responder()
+    install_stub_llm(StubChatModel(latency=0, responder=responder))
+    metrics = ParseMetrics()
+    metrics.reset()
+
+    auditor, tenant, career, court = AuditorAgent(), TenantGuardianAgent(), CareerShieldAgent(), CourtroomAgent()
+    results = {name: [] for name in PAYLOADS}
+    for n in range(args.rounds * len(MALFORMATIONS)):
+        # Distinct texts so the audit result cache never answers.
+        results["AUDITOR"].append(auditor.audit_policy(f"Policy {n}: room rent is capped at 1% of Sum Insured."))
+        results["TENANT"].append(tenant.audit_rent_agreement(f"Agreement {n}: lock-in of 6 months."))
+        results["CAREER"].append(career.audit_offer_letter(f"Offer {n}: bond of Rs 2,00,000."))
+        results["COURTROOM_TURN"].append(court.simulate_turn([{"speaker": "Ms. Hope", "text": f"Objection {n}!"}],
+                                                            "Claim for cataract surgery."))
+
+    # What the old parser would have done with the same first answers.
+    old = {name: {"failed": 0, "rerun_tokens": 0, "incomplete": 0} for name in PAYLOADS}
+    failures_by_kind = {}
+    for agent, kind, prompt, text in responder.answers:
+        try:
+            data = strict_parse(text)
+            if any(k not in data for k in PAYLOADS[agent]):
+                old[agent]["incomplete"] += 1
+        except ValueError:
+            old[agent]["failed"] += 1
+            old[agent]["rerun_tokens"] += estimate_tokens(prompt) + estimate_tokens(text)
+            failures_by_kind[kind] = failures_by_kind.get(kind, 0) + 1
+
+    stats = metrics.stats()
+    print(f"{len(MALFORMATIONS)} malformations x {args.rounds} rounds per agent")
+    print(f"{'agent':<16}{'old failed':>11}{'old incompl':>12}{'rerun tok':>10}"
+          f"{'repaired':>9}{'re-asked':>9}{'failed':>7}{'re-ask tok':>11}")
+    for agent in PAYLOADS:
+        s, o = stats[agent], old[agent]
+        print(f"{agent:<16}{o['failed']:>11}{o['incomplete']:>12}{o['rerun_tokens']:>10}"
+              f"{s['repaired']:>9}{s['reasked']:>9}{s['failed']:>7}{s['reask_tokens']:>11}")
+    print("old parser failures by kind:", failures_by_kind)
+
+    for agent, reports in results.items():
+        s, o = stats[agent], old[agent]
+        assert s["responses"] == len(reports) and s["failed"] == 0, (agent, s)
+        assert all("error" not in r and r.get("text") != "Order! Proceed." for r in reports), (agent, reports)
+        assert all(set(PAYLOADS[agent]) <= set(r) for r in reports), agent
+        assert s["strict_failures"] == o["failed"] >= 5 * args.rounds, (agent, s, o)
+        assert s["reask_tokens"] < o["rerun_tokens"], (agent, s, o)
+    scores = [r["risk_score"] for r in results["TENANT"]]
+    assert all(isinstance(v, (int, float)) for v in scores), scores
+    print("every answer recovered; no request had to be re-run")
+
+
+if __name__ == "__main__":
+    main()
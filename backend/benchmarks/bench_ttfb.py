@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Time-to-first-byte benchmark: buffered endpoints vs their SSE variants
+against a stub LLM that streams tokens at a fixed rate.
+
+    python -m backend.benchmarks.bench_ttfb --latency 0.3 --token-latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from .stubs import StubChatModel, install_stub_llm
+
+
+def courtroom_responder(prompt: str) -> str:
+    lines = [{"speaker": "Judge Dredd", "text": f"Round {i}: order in the court!", "type": "judge"} for i in range(10)]
+    return json.dumps({
+        "script": lines,
+        "verdict": {"winner": "Consumer", "probability": "70%", "summary": "Disclosure was made."},
+        "swot": {"strengths": ["Disclosed PED"], "weaknesses": ["Late intimation"]}
+    })
+
+
+def report_responder(prompt: str) -> str:
+    return "# Policy Audit Report\n" + "\n".join(f"- Finding {i}: room rent capped" for i in range(60))
+
+
+async def _timed_buffered(call) -> tuple:
+    start = time.perf_counter()
+    await call()
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed  # Nothing reaches the client before the full body
+
+
+async def _timed_stream(call) -> tuple:
+    start = time.perf_counter()
+    response = await call()
+    first = None
+    async for _ in response.body_iterator:
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    from ..adk_agent.agents.registry import acreate_agent
+    from ..routers import audit, chat, courtroom
+
+    async def buffered_argument(policy_text: str, scenario: str):
+        court = await acreate_agent("LAWYER")
+        return await court.asimulate_argument(policy_text, scenario)
+
+    def policy():
+        return f"Room rent capped at 1%. Ref {uuid.uuid4()}"  # Bypass the result cache
+
+    cases = [
+        ("chat", report_responder,
+         lambda: chat.chat(chat.ChatRequest(message=f"Explain my cover {uuid.uuid4()}")),
+         lambda: chat.chat_stream(chat.ChatRequest(message=f"Explain my cover {uuid.uuid4()}"))),
+        ("full-report", report_responder,
+         lambda: audit.generate_full_report(audit.AuditRequest(policy_text=policy())),
+         lambda: audit.generate_full_report_stream(audit.AuditRequest(policy_text=policy()))),
+        ("courtroom", courtroom_responder,
+         lambda: buffered_argument(policy(), "Claim rejected for PED"),
+         lambda: courtroom.simulate_argument_stream(courtroom.ArgumentRequest(policy_text=policy(), scenario="Claim rejected for PED"))),
+    ]
+
+    print(f"{'endpoint':<14}{'buffered TTFB':>15}{'stream TTFB':>13}{'stream total':>14}")
+    for name, responder, buffered, streamed in cases:
+        install_stub_llm(StubChatModel(latency=args.latency, token_latency=args.token_latency, responder=responder))
+        b_first, _ = asyncio.run(_timed_buffered(buffered))
+        s_first, s_total = asyncio.run(_timed_stream(streamed))
+        print(f"{name:<14}{b_first:>14.2f}s{s_first:>12.2f}s{s_total:>13.2f}s")
+
+
+if __name__ == "__main__":
+    main()
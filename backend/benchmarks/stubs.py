@@ -0,0 +1,180 @@
+# Copyright (c) 2025 Deepak Kushwah. All rights reserved.
+"""
+Offline stand-ins for Gemini used by the benchmark scripts.
+
+Run any benchmark from the repository root, e.g.:
+    python -m backend.benchmarks.bench_async_load
+"""
+import asyncio
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+def default_responder(prompt: str) -> str:
+    """Returns a payload that satisfies every agent's JSON contract."""
+    return json.dumps({
+        "room_rent": "1% of Sum Insured",
+        "co_pay": "20% for age 60+",
+        "sub_limits": "Cataract: 40,000",
+        "waiting_periods": "PED: 4 years",
+        "exclusions": ["Cosmetic surgery", "Dental", "Self-inflicted injury"],
+        "risk_score": 62,
+        "risk_reason": "Room rent capping and co-pay.",
+        "is_accurate": True,
+        "corrections": "None",
+        "missing_clauses": [],
+        "final_verdict": "Negotiate",
+        "speaker": "Judge Dredd",
+        "text": "Order in the court!",
+        "type": "judge"
+    })
+
+
+class StubChatModel(BaseChatModel):
+    """
+    A chat model that sleeps for `latency` seconds and answers via `responder`.
+    With blocking=True the async path sleeps synchronously, reproducing a
+    handler that calls `invoke()` from inside the event loop.
+
+    Streaming waits `latency` for the first token, then emits `chunk_size`
+    characters every `token_latency` seconds. Non-streaming calls pay the
+    same total generation time before returning anything. `prompt_latency_per_1k`
+    models prompt processing cost and `jitter` adds random per-call delay.
+    `temperature` is only carried, so callers can vary it per call.
+    """
+    latency: float = 0.2
+    temperature: float = 0.7
+    blocking: bool = False
+    responder: Callable[[str], str] = default_responder
+    chunk_size: int = 16
+    token_latency: float = 0.0
+    prompt_latency_per_1k: float = 0.0
+    jitter: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    @staticmethod
+    def _prompt_of(messages: List[BaseMessage]) -> str:
+        return "\n".join(str(m.content) for m in messages)
+
+    def _generation_time(self, prompt: str, text: str) -> float:
+        chunks = -(-len(text) // self.chunk_size)
+        jitter = random.uniform(0, self.jitter) if self.jitter else 0.0
+        return self.latency + len(prompt) / 1000 * self.prompt_latency_per_1k + chunks * self.token_latency + jitter
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        prompt = self._prompt_of(messages)
+        text = self.responder(prompt)
+        time.sleep(self._generation_time(prompt, text))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        prompt = self._prompt_of(messages)
+        text = self.responder(prompt)
+        if self.blocking:
+            time.sleep(self._generation_time(prompt, text))
+        else:
+            await asyncio.sleep(self._generation_time(prompt, text))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[str]:
+        text = self.responder(self._prompt_of(messages))
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for piece in self._chunks(messages):
+            time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for piece in self._chunks(messages):
+            await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+
+
+class FaultyChatModel(StubChatModel):
+    """
+    StubChatModel with injectable faults for the model-routing checks:
+    `down` fails every call, `fail_every` fails every n-th call, and every
+    `slow_every`-th call takes `slow_latency` instead of `latency`. Faults
+    follow the call count, not chance, so every run sees the same pattern.
+    """
+    name: str = "stub"
+    down: bool = False
+    fail_every: int = 0
+    error_message: str = "503 Service Unavailable"
+    slow_every: int = 0
+    slow_latency: float = 5.0
+    calls: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def _outcome(self):
+        """(seconds the call takes, whether it fails). Failures still cost a round trip."""
+        self.calls += 1
+        failed = self.down or (self.fail_every > 0 and self.calls % self.fail_every == 0)
+        slow = self.slow_every > 0 and self.calls % self.slow_every == 0
+        return (self.slow_latency if slow else self.latency), failed
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        delay, failed = self._outcome()
+        time.sleep(delay)
+        if failed:
+            raise RuntimeError(f"{self.name}: {self.error_message}")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"{self.name}: ok"))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        delay, failed = self._outcome()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        if failed:
+            raise RuntimeError(f"{self.name}: {self.error_message}")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"{self.name}: ok"))])
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        delay, failed = self._outcome()
+        await asyncio.sleep(delay)
+        if failed:
+            raise RuntimeError(f"{self.name}: {self.error_message}")
+        yield ChatGenerationChunk(message=AIMessageChunk(content=f"{self.name}: ok"))
+
+
+class StubSecurity:
+    """SecurityManager replacement that needs no Streamlit secrets."""
+    def __init__(self, keys: int = 3):
+        self.api_keys = [f"stub-key-{i}" for i in range(keys)]
+        self._index = 0
+
+    def get_key_count(self) -> int:
+        return len(self.api_keys)
+
+    def get_next_api_key(self, model: str = None) -> str:
+        key = self.api_keys[self._index % len(self.api_keys)]
+        self._index += 1
+        return key
+
+
+def install_stub_llm(model: BaseChatModel):
+    """Points AIEngine (and therefore every agent) at `model`."""
+    from ..adk_agent.utils.ai_engine import AIEngine
+
+    def _init(self):
+        self.security = StubSecurity()
+
+    AIEngine.__init__ = _init
+    AIEngine.get_flash_model = lambda self: model
+    AIEngine.get_genesis_model = lambda self: model
@@ -18,7 +18,9 @@ origins = [
     "http://localhost:8000",
 ]
 
-from .routers import audit, chat, medical, courtroom, admin
+from .routers import audit, chat, medical, courtroom, admin, orchestrate
+from .adk_agent.agents.registry import AgentRegistry
+from .adk_agent.utils.config import session_scope
 
 # ... (previous code)
 
@@ -36,6 +38,18 @@ app.include_router(chat.router)
 app.include_router(medical.router)
 app.include_router(courtroom.router)
 app.include_router(admin.router)
+app.include_router(orchestrate.router)
+
+@app.middleware("http")
+async def bind_session(request, call_next):
+    # Per-client session state (BYOK keys, family profile) keyed by X-Session-Id.
+    with session_scope(request.headers.get("X-Session-Id")):
+        return await call_next(request)
+
+@app.on_event("startup")
+async def warm_up_agents():
+    # Agents import lazily on first use; WARMUP_AGENTS preloads some in the background.
+    AgentRegistry().start_warm_up()
 
 @app.get("/")
 async def root():
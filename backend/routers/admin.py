@@ -1,18 +1,13 @@
 from fastapi import APIRouter, HTTPException, Body
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
-import json
-import os
+from ..adk_agent.utils.data_store import get_data_store
 
 router = APIRouter(
     prefix="/admin",
     tags=["admin"]
 )
 
-DATA_DIR = "data"
-INTEL_FILE = os.path.join(DATA_DIR, "market_intel.json")
-REQUESTS_FILE = os.path.join(DATA_DIR, "admin_requests.json")
-
 class AdminRequest(BaseModel):
     id: Optional[str] = None
     tool: str
@@ -26,42 +21,145 @@ class UpdateStatusRequest(BaseModel):
 @router.get("/dashboard-stats")
 async def get_dashboard_stats():
     try:
-        if os.path.exists(INTEL_FILE):
-            with open(INTEL_FILE, "r") as f:
-                data = json.load(f)
-            return data
-        return {"error": "Market Intel not found"}
+        return get_data_store().market_intel()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/requests")
 async def get_requests():
     try:
-        if os.path.exists(REQUESTS_FILE):
-            with open(REQUESTS_FILE, "r") as f:
-                return json.load(f)
-        return []
+        return get_data_store().admin_requests()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/requests/{index}/status")
 async def update_request_status(index: int, update: UpdateStatusRequest):
+    """Updates the index-th request in GET /requests order (what the admin UI sends)."""
+    try:
+        store = get_data_store()
+        request_id = store.admin_request_id_at(index)
+        if request_id is None or not store.update_admin_request(request_id, update.status):
+            raise HTTPException(status_code=404, detail="Request not found")
+        return {"message": "Status updated", "id": request_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/requests/by-id/{request_id}/status")
+async def update_request_status_by_id(request_id: int, update: UpdateStatusRequest):
+    try:
+        if not get_data_store().update_admin_request(request_id, update.status):
+            raise HTTPException(status_code=404, detail="Request not found")
+        return {"message": "Status updated", "id": request_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Hit/miss metrics for the persistent audit result cache, the semantic
+    answer cache (Genesis chat, medical terms) and Sentinel's reputation cache.
+    """
+    try:
+        from ..adk_agent.utils.result_cache import get_result_cache
+        from ..adk_agent.utils.semantic_cache import get_semantic_cache
+        from ..adk_agent.utils.reputation import get_reputation_service
+        stats = get_result_cache().stats()
+        stats["semantic"] = get_semantic_cache().stats()
+        stats["reputation"] = get_reputation_service().stats()
+        return stats
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/key-stats")
+async def get_key_stats():
+    """
+    Per (API key, model) scheduler state: tokens, cooldown, in-flight and 429 counts.
+    """
+    try:
+        from ..adk_agent.utils.key_scheduler import KeyScheduler
+        return {"lanes": KeyScheduler().stats()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/model-health")
+async def get_model_health():
+    """
+    Circuit breaker state, latency percentiles and hedging counters per model.
+    """
+    try:
+        from ..adk_agent.utils.model_router import ModelRouter
+        return ModelRouter().stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/agent-runs")
+async def get_agent_runs():
+    """
+    LLM calls per request and wall time for Sentinel and Genesis, per mode (react, planned, cached).
+    """
+    try:
+        from ..adk_agent.utils.llm_budget import AgentRunStats
+        return AgentRunStats().stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/parse-stats")
+async def get_parse_stats():
+    """
+    Structured-output counters per agent: strict JSON failures, repairs,
+    re-asks, hard failures and the output tokens recovered or wasted.
+    """
+    try:
+        from ..adk_agent.utils.structured_output import ParseMetrics
+        return ParseMetrics().stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/agents")
+async def get_agents():
+    """
+    Agent registry: which agents are imported yet and how long each first
+    import took, plus whether the WARMUP_AGENTS preload is still running.
+    """
+    try:
+        from ..adk_agent.agents.registry import AgentRegistry
+        return AgentRegistry().stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/config")
+async def get_config_status():
+    """
+    Where settings were loaded from, how many Gemini keys are configured and
+    the session store's size. Never returns secret values.
+    """
+    try:
+        from ..adk_agent.utils.config import get_config, get_session_store
+        config = get_config()
+        return {
+            "sources": config.sources,
+            "loads": config.loads,
+            "gemini_keys": len(config.api_keys()),
+            "sessions": get_session_store().stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/courtroom-stats")
+async def get_courtroom_stats():
+    """
+    Courtroom sessions: how turns were served (prefetched, in flight, on
+    demand) with the latency of each, and speculative turns thrown away.
+    """
     try:
-        if os.path.exists(REQUESTS_FILE):
-            with open(REQUESTS_FILE, "r") as f:
-                data = json.load(f)
-            
-            # Sort to match frontend display if needed, but index reliance is risky.
-            # Ideally we use IDs. For now, assuming consistent order or simple list.
-            # To be safe, let's just update by index if valid.
-            if 0 <= index < len(data):
-                data[index]["status"] = update.status
-                with open(REQUESTS_FILE, "w") as f:
-                    json.dump(data, f, indent=2)
-                return {"message": "Status updated"}
-            else:
-                raise HTTPException(status_code=404, detail="Request not found")
-        return {"error": "No requests file"}
+        from ..adk_agent.utils.courtroom_sessions import PrefetchStats, get_courtroom_store
+        stats = PrefetchStats().stats()
+        stats["sessions"] = get_courtroom_store().stats()
+        return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -72,8 +170,8 @@ async def trigger_agent(agent_name: str = Body(...), payload: Dict[str, Any] = B
     """
     try:
         # Dynamic import to avoid circular deps if possible, or just standard import
-        from ..adk_agent.utils.ai_engine import AIEngine
-        engine = AIEngine()
+        from ..adk_agent.agents.registry import acreate_agent
+        engine = await acreate_agent("ENGINE")
         
         # This is a simplified "God Mode" trigger. 
         # In a real app, we'd map agent_name to specific classes.
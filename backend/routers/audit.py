@@ -1,41 +1,201 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
-from ..adk_agent.agents.auditor import AuditorAgent
-from ..adk_agent.agents.critic import CriticAgent
+from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+import asyncio
+import json
+import uuid
+from ..adk_agent.agents.registry import acreate_agent
+from ..adk_agent.utils.job_store import get_job_store
+from .sse import sse_event, sse_response
 
 router = APIRouter(
     prefix="/audit",
     tags=["audit"]
 )
 
+MAX_BATCH_POLICIES = 1000
+
+# Critic reviews still running (or finished but not yet collected) for deferred audits.
+MAX_PENDING_REVIEWS = 256
+_pending_reviews: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
 class AuditRequest(BaseModel):
     policy_text: str
     doc_type: str = "Insurance"
+    defer_review: bool = False  # Return the report first and poll /audit/review/{review_id}
+
+class BatchPolicy(BaseModel):
+    id: Optional[str] = None  # Caller's reference, echoed back on each result line
+    policy_text: str
+    doc_type: str = "Insurance"
+
+class BatchAuditRequest(BaseModel):
+    policies: List[BatchPolicy]
+    include_review: bool = True
+
+class IndexRequest(BaseModel):
+    policy_text: str
+    doc_type: str = "Insurance"
 
 class AuditResponse(BaseModel):
     report: Dict[str, Any]
     critic_review: Optional[Dict[str, Any]] = None
+    review_id: Optional[str] = None
+    timings: Dict[str, float] = {}
+
+def _remember_review(task: asyncio.Task, timings: Dict[str, float]) -> str:
+    review_id = str(uuid.uuid4())
+    _pending_reviews[review_id] = {"task": task, "timings": timings}
+    while len(_pending_reviews) > MAX_PENDING_REVIEWS:
+        _, oldest = _pending_reviews.popitem(last=False)
+        oldest["task"].cancel()
+    return review_id
+
+def _log_market_intel(report: Dict[str, Any], status: Dict[str, Any]):
+    """
+    Counts a freshly analysed policy. Re-served cached reports are not
+    counted again, and only organisations are logged, never a person named
+    as landlord or tenant.
+    """
+    if status.get("cached"):
+        return
+    from ..adk_agent.utils.market_utils import log_market_intel
+    entities = report.get("entities") or {}
+    log_market_intel({"company_name": entities.get("company") or "Unknown"})
+
+@router.post("/index")
+async def index_policy(request: IndexRequest):
+    """
+    Upload-time hook: builds the clause retrieval index and extracts the
+    named entities once, so chat, medical, courtroom, critic, audit and
+    Sentinel calls reuse them.
+    """
+    try:
+        from ..adk_agent.utils.clause_index import get_clause_index, document_id
+        from ..adk_agent.utils.entity_extractor import extract_entities
+        index = await asyncio.to_thread(get_clause_index, request.policy_text)
+        entities = await asyncio.to_thread(extract_entities, request.policy_text, request.doc_type)
+        return {"document_id": document_id(request.policy_text), "clauses": len(index), "entities": entities.to_dict()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/", response_model=AuditResponse)
 async def audit_policy(request: AuditRequest):
     try:
-        auditor = AuditorAgent()
-        report = auditor.audit_policy(request.policy_text, request.doc_type)
+        pipeline = await acreate_agent("AUDIT_PIPELINE")
+        status = {}
+        if request.defer_review:
+            report, review_task, timings = await pipeline.start(request.policy_text, request.doc_type, status)
+            review_id = _remember_review(review_task, timings)
+            await asyncio.to_thread(_log_market_intel, report, status)
+            return AuditResponse(report=report, review_id=review_id, timings=timings)
         
-        # Optional: Run Critic
-        critic = CriticAgent()
-        review = critic.review_audit(request.policy_text, report)
-        
-        return AuditResponse(report=report, critic_review=review)
+        result = await pipeline.run(request.policy_text, request.doc_type, status)
+        await asyncio.to_thread(_log_market_intel, result["report"], status)
+        return AuditResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/review/{review_id}")
+async def get_review(review_id: str):
+    entry = _pending_reviews.get(review_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    
+    task = entry["task"]
+    if not task.done():
+        return {"status": "PENDING", "timings": entry["timings"]}
+    
+    _pending_reviews.pop(review_id, None)
+    try:
+        return {"status": "DONE", "critic_review": task.result(), "timings": entry["timings"]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stream")
+async def audit_policy_stream(request: AuditRequest):
+    """
+    NDJSON stream: the Auditor report line arrives first, the Critic review follows.
+    """
+    pipeline = await acreate_agent("AUDIT_PIPELINE")
+
+    async def lines():
+        try:
+            async for event in pipeline.stream(request.policy_text, request.doc_type):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({"stage": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.post("/full-report")
 async def generate_full_report(request: AuditRequest):
     try:
-        auditor = AuditorAgent()
-        report_md = auditor.generate_full_report(request.policy_text)
+        auditor = await acreate_agent("AUDITOR")
+        report_md = await auditor.agenerate_full_report(request.policy_text)
         return {"report_markdown": report_md}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/full-report/stream")
+async def generate_full_report_stream(request: AuditRequest):
+    """
+    SSE variant of /audit/full-report: Markdown arrives as `token` events.
+    """
+    async def events():
+        try:
+            auditor = await acreate_agent("AUDITOR")
+            async for chunk in auditor.astream_full_report(request.policy_text):
+                yield sse_event("token", {"text": chunk})
+            yield sse_event("done", {})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return sse_response(events())
+
+@router.post("/batch")
+async def audit_batch(request: BatchAuditRequest):
+    """
+    Starts a bulk audit job and returns its ID straight away. Identical
+    documents are audited once. Poll /audit/batch/{job_id} for progress or
+    read /audit/batch/{job_id}/results for NDJSON results as they finish.
+    """
+    if not request.policies:
+        raise HTTPException(status_code=400, detail="No policies supplied")
+    if len(request.policies) > MAX_BATCH_POLICIES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_POLICIES} policies per batch")
+    try:
+        job = (await acreate_agent("BATCH_AUDITOR")).submit([p.dict() for p in request.policies], include_review=request.include_review)
+        return job.snapshot()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/batch/{job_id}")
+async def get_batch(job_id: str):
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job.snapshot()
+
+@router.get("/batch/{job_id}/results")
+async def get_batch_results(job_id: str):
+    """
+    NDJSON: one line per input policy, in completion order, followed by a
+    final `{"stage": "summary", ...}` line once the job is finished.
+    Safe to call while the job runs or after it is done.
+    """
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+
+    async def lines():
+        try:
+            async for result in job.follow():
+                yield json.dumps(result) + "\n"
+            yield json.dumps({"stage": "summary", **job.snapshot()}) + "\n"
+        except Exception as e:
+            yield json.dumps({"stage": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
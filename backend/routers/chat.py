@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from ..adk_agent.utils.ai_engine import AIEngine
+from ..adk_agent.agents.registry import acreate_agent
+from .sse import sse_event, sse_response
 
 router = APIRouter(
     prefix="/chat",
@@ -10,12 +11,30 @@ router = APIRouter(
 class ChatRequest(BaseModel):
     message: str
     context: str = ""
+    use_semantic_cache: bool = False  # Opt in to cached answers for repeat questions
 
 @router.post("/")
 async def chat(request: ChatRequest):
     try:
-        engine = AIEngine()
-        response = engine.run_genesis_agent(request.message, request.context)
+        engine = await acreate_agent("ENGINE")
+        response = await engine.arun_genesis_agent(request.message, request.context, use_semantic_cache=request.use_semantic_cache)
         return {"response": response}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    SSE variant of /chat/: `token` events as Genesis writes, then `done`.
+    """
+    engine = await acreate_agent("ENGINE")
+
+    async def events():
+        try:
+            async for chunk in engine.astream_genesis_agent(request.message, request.context, use_semantic_cache=request.use_semantic_cache):
+                yield sse_event("token", {"text": chunk})
+            yield sse_event("done", {})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return sse_response(events())
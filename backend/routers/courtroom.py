@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from ..adk_agent.agents.lawyer import CourtroomAgent
+from typing import List, Dict, Any, Optional
+from ..adk_agent.agents.registry import acreate_agent
+from ..adk_agent.utils.courtroom_sessions import MAX_PREFETCH_TURNS, get_courtroom_store
+from .sse import sse_event, sse_response
 
 router = APIRouter(
     prefix="/courtroom",
@@ -12,11 +14,108 @@ class SimulationRequest(BaseModel):
     history: List[Dict[str, Any]]
     context: str
 
+class SessionRequest(BaseModel):
+    context: str
+    prefetch: Optional[int] = None  # Turns generated ahead (at most MAX_PREFETCH_TURNS); default COURTROOM_PREFETCH_TURNS, 0 disables
+
+class SessionTurnRequest(BaseModel):
+    argument: str = ""  # The user's own line, added before the next turn
+    speaker: str = "Policyholder"
+
+class ArgumentRequest(BaseModel):
+    policy_text: str
+    scenario: str
+    architect_data: str = ""
+    sentinel_data: str = ""
+
+class MonteCarloRequest(ArgumentRequest):
+    trials: Optional[int] = None  # Defaults come from COURTROOM_MC_TRIALS / _CONCURRENCY / _BUDGET_SECONDS
+    concurrency: Optional[int] = None
+    budget_seconds: Optional[float] = None
+
+# Per-request ceilings, whatever the client asks for.
+MAX_TRIALS = 50
+MAX_CONCURRENCY = 10
+MAX_BUDGET_SECONDS = 120.0
+
 @router.post("/simulate-turn")
 async def simulate_turn(request: SimulationRequest):
     try:
-        court = CourtroomAgent()
-        turn = court.simulate_turn(request.history, request.context)
+        court = await acreate_agent("LAWYER")
+        turn = await court.asimulate_turn(request.history, request.context)
         return turn
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/sessions")
+async def create_session(request: SessionRequest):
+    """
+    Starts a server-side trial. Send turns to /sessions/{session_id}/turn
+    instead of resending the whole history to /simulate-turn. While the
+    user reads a turn the next ones are generated ahead, so a turn with no
+    new argument usually comes back without waiting on the model.
+    """
+    prefetch = min(max(request.prefetch, 0), MAX_PREFETCH_TURNS) if request.prefetch is not None else None
+    session = get_courtroom_store().create(request.context, prefetch)
+    return {"session_id": session.id}
+
+@router.post("/sessions/{session_id}/turn")
+async def session_turn(session_id: str, request: SessionTurnRequest):
+    session = get_courtroom_store().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Courtroom session not found")
+    try:
+        court = await acreate_agent("LAWYER")
+        turn = await court.asession_turn(session, request.argument, request.speaker)
+        return {"turn": turn, "turn_index": session.turn_count - 1, "prompt_chars": session.last_prompt_chars,
+                "source": session.last_source}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    session = get_courtroom_store().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Courtroom session not found")
+    return session.snapshot()
+
+@router.delete("/sessions/{session_id}")
+async def end_session(session_id: str):
+    if not get_courtroom_store().drop(session_id):
+        raise HTTPException(status_code=404, detail="Courtroom session not found")
+    return {"status": "ended"}
+
+@router.post("/simulate/stream")
+async def simulate_argument_stream(request: ArgumentRequest):
+    """
+    SSE courtroom drama: one `line` event per script line as it is generated,
+    then a `verdict` event with the verdict and SWOT.
+    """
+    async def events():
+        try:
+            court = await acreate_agent("LAWYER")
+            async for item in court.astream_argument(request.policy_text, request.scenario, request.architect_data, request.sentinel_data):
+                yield sse_event(item["event"], item["data"])
+            yield sse_event("done", {})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return sse_response(events())
+
+@router.post("/simulate/monte-carlo")
+async def simulate_monte_carlo(request: MonteCarloRequest):
+    """
+    Runs many short independent trials and returns the empirical win
+    probability with a 95% confidence interval, plus the SWOT points most
+    runs agree on and the share of runs that raised each one.
+    """
+    try:
+        court = await acreate_agent("LAWYER")
+        return await court.asimulate_trials(
+            request.policy_text, request.scenario, request.architect_data, request.sentinel_data,
+            trials=min(request.trials, MAX_TRIALS) if request.trials else None,
+            concurrency=min(request.concurrency, MAX_CONCURRENCY) if request.concurrency else None,
+            budget_seconds=min(request.budget_seconds, MAX_BUDGET_SECONDS) if request.budget_seconds else None
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from ..adk_agent.agents.medical_expert import MedicalExpertAgent
+from ..adk_agent.agents.registry import acreate_agent
 
 router = APIRouter(
     prefix="/medical",
@@ -14,8 +14,8 @@ class MedicalAnalysisRequest(BaseModel):
 @router.post("/analyze")
 async def analyze_report(request: MedicalAnalysisRequest):
     try:
-        expert = MedicalExpertAgent()
-        analysis = expert.analyze_medical_report(request.query, request.policy_context)
+        expert = await acreate_agent("MEDICAL")
+        analysis = await expert.aanalyze_medical_report(request.query, request.policy_context)
         return {"analysis": analysis}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -23,8 +23,8 @@ async def analyze_report(request: MedicalAnalysisRequest):
 @router.get("/explain/{term}")
 async def explain_term(term: str):
     try:
-        expert = MedicalExpertAgent()
-        explanation = expert.explain_term(term)
+        expert = await acreate_agent("MEDICAL")
+        explanation = await expert.aexplain_term(term)
         return {"explanation": explanation}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,37 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Optional
+from ..adk_agent.agents.registry import acreate_agent
+from ..adk_agent.agents.orchestrator import AGENT_ORDER, AgentOrchestrator
+
+router = APIRouter(
+    prefix="/orchestrate",
+    tags=["orchestrate"]
+)
+
+class OrchestrateRequest(BaseModel):
+    message: str
+    context: str = ""
+    agents: Optional[List[str]] = None  # Skip the smart router and run these
+    timeout: Optional[float] = None  # Per-agent seconds (default ORCHESTRATOR_TIMEOUT_SECONDS)
+
+@router.post("/")
+async def orchestrate(request: OrchestrateRequest):
+    """
+    Routes the message (unless `agents` is given), runs the picked agents
+    concurrently and returns the combined answer plus one result per agent.
+    Agents that fail or time out are listed in `failed`; the others still answer.
+    """
+    if request.agents is not None:
+        unknown = [a for a in request.agents if a.strip().upper() not in AGENT_ORDER]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown agents: {', '.join(unknown)}")
+    try:
+        engine = await acreate_agent("ENGINE")
+        agents = request.agents or await asyncio.to_thread(engine.smart_router, request.message)
+        orchestrator = AgentOrchestrator(engine, timeout=request.timeout)
+        result = await orchestrator.arun(agents, request.message, request.context)
+        return result.to_dict()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -61,3 +61,33 @@ export async function simulateCourtroomTurn(caseDetails: string, history: any[]
   if (!res.ok) throw new Error("Failed to simulate courtroom turn");
   return res.json();
 }
+
+export async function startCourtroomSession(caseDetails: string) {
+  const res = await fetch(`${API_BASE_URL}/courtroom/sessions`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ context: caseDetails }),
+  });
+  if (!res.ok) throw new Error("Failed to start courtroom session");
+  return res.json();
+}
+
+export async function nextCourtroomSessionTurn(sessionId: string, argument: string = "") {
+  const res = await fetch(`${API_BASE_URL}/courtroom/sessions/${sessionId}/turn`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ argument }),
+  });
+  if (!res.ok) throw new Error("Failed to simulate courtroom turn");
+  return res.json();
+}
+
+export async function simulateCourtroomTrials(policyText: string, scenario: string, trials?: number) {
+  const res = await fetch(`${API_BASE_URL}/courtroom/simulate/monte-carlo`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ policy_text: policyText, scenario, trials }),
+  });
+  if (!res.ok) throw new Error("Failed to simulate courtroom trials");
+  return res.json();
+}